@@ -2,101 +2,68 @@
 Ambient Listening API - Real-time Audio Transcription with Speaker Diarization
 
 WebSocket endpoint for streaming audio from clinical encounters,
-transcribing with Whisper, and identifying speakers with pyannote.
+transcribing with Whisper (faster-whisper int8 or openai-whisper), and
+identifying speakers with pyannote.
 """
 
 import logging
 import base64
 import json
 import asyncio
-import tempfile
 import numpy as np
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from typing import Optional, Dict, List
-import os
+
+from app.config import settings
+from app.core.security import verify_token
+from app.services.ambient import (
+    AmbientEntityTracker,
+    AudioChunk,
+    IncrementalDiarizer,
+    PCMRingBuffer,
+    SpeakerTurn,
+    UtteranceSegmenter,
+    get_diarization_executor,
+    get_transcription_executor,
+)
+from app.services.ambient.diarizer import align_segments, utterance_speaker
+from app.services.ambient.speech import diarize_pcm, get_diarization_pipeline
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-# Global model instances (lazy-loaded)
-_whisper_model = None
-_diarization_pipeline = None
-
-
-def get_whisper_model():
-    """Get or initialize Whisper model."""
-    global _whisper_model
-
-    if _whisper_model is None:
-        try:
-            import whisper
-            logger.info("Loading Whisper model (medium.en)...")
-            _whisper_model = whisper.load_model("medium.en")
-            logger.info("Whisper model loaded successfully")
-        except ImportError:
-            logger.error("Whisper not installed. Install with: pip install openai-whisper")
-            raise
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {e}")
-            raise
-
-    return _whisper_model
-
-
-def get_diarization_pipeline():
-    """Get or initialize pyannote speaker diarization pipeline."""
-    global _diarization_pipeline
-
-    if _diarization_pipeline is None:
-        try:
-            from pyannote.audio import Pipeline
-
-            # Check for HuggingFace token
-            hf_token = os.getenv('HUGGINGFACE_TOKEN')
-            if not hf_token:
-                logger.warning(
-                    "HUGGINGFACE_TOKEN not set. Speaker diarization will be disabled. "
-                    "Get token from: https://huggingface.co/settings/tokens"
-                )
-                return None
-
-            logger.info("Loading pyannote speaker diarization pipeline...")
-            _diarization_pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
-                use_auth_token=hf_token
-            )
-            logger.info("Pyannote pipeline loaded successfully")
-
-        except ImportError:
-            logger.warning(
-                "Pyannote not installed. Speaker diarization disabled. "
-                "Install with: pip install pyannote-audio"
-            )
-            return None
-        except Exception as e:
-            logger.error(f"Failed to load pyannote pipeline: {e}")
-            return None
-
-    return _diarization_pipeline
-
-
 @router.websocket("/stream")
 async def ambient_listening_stream(websocket: WebSocket):
     """
     WebSocket endpoint for real-time audio transcription with speaker diarization.
 
+    **Authentication:**
+    Connect with ?token=<access JWT> (browsers cannot send the Authorization
+    header on WebSockets). Connections without a valid access token are
+    closed with 1008 before any model is loaded or audio is accepted.
+
     **Protocol:**
 
-    Client → Server (Audio Stream):
+    Client → Server (Audio Stream, preferred):
+    Binary frames of raw little-endian PCM16, mono, 16 kHz (any frame size)
+
+    Client → Server (Audio Stream, JSON; 33% larger on the wire):
     {
         "type": "audio",
-        "data": "<base64-encoded audio chunk>",
-        "format": "wav" | "webm",
+        "data": "<base64-encoded PCM16 chunk>",
+        "format": "pcm16",
         "sample_rate": 16000
     }
 
+    Audio is never decoded server-side: both forms carry raw PCM16 mono at
+    16 kHz. Encoded audio (wav, webm, ...) or another sample rate is
+    rejected with an "error" message; "format" and "sample_rate" may be
+    omitted.
+
+    All other client messages are JSON text frames.
+
     Server → Client (Transcription with Speaker):
     {
         "type": "transcription",
@@ -109,7 +76,26 @@ async def ambient_listening_stream(websocket: WebSocket):
         "confidence": 0.95
     }
 
-    Server → Client (Entities):
+    Server → Client (Speaker for an earlier transcription, once diarized):
+    {
+        "type": "transcription_speaker",
+        "speaker": "SPEAKER_00",
+        "speaker_label": "Clinician" | null,
+        "start_time": 0.0,
+        "end_time": 2.5
+    }
+
+    Server → Client (Partial Transcription - utterance still in progress,
+    superseded by the "transcription" message for the same start_time):
+    {
+        "type": "transcription_partial",
+        "text": "Transcribed text so far",
+        "start_time": 12.4,
+        "end_time": 14.0
+    }
+
+    Server → Client (Entities; only fields that are new or whose value
+    changed since the last message):
     {
         "type": "entities",
         "entities": [
@@ -132,6 +118,13 @@ async def ambient_listening_stream(websocket: WebSocket):
         "label": "Clinician"
     }
 
+    Server → Client (Audio Dropped - session fell behind real time):
+    {
+        "type": "audio_dropped",
+        "reason": "backlog" | "stale" | "overwritten",
+        "duration": 2.0
+    }
+
     Server → Client (Error):
     {
         "type": "error",
@@ -141,44 +134,96 @@ async def ambient_listening_stream(websocket: WebSocket):
     **HIPAA Compliance:**
     - Audio chunks are transcribed immediately and deleted
     - Transcribed text is sent to client but NOT stored server-side
-    - No PHI persisted to disk or database
+    - No PHI persisted to disk or database (models read in-memory arrays,
+      no temporary audio files)
     - All processing in-memory only
+
+    **Concurrency:**
+    - Whisper runs in the shared transcription pool and pyannote in a
+      separate diarization pool (AMBIENT_DIARIZATION_WORKERS), never on the
+      event loop; diarization never holds a transcription worker and other
+      endpoints stay responsive during inference
+    - Chunks are queued per session (AMBIENT_SESSION_QUEUE_CHUNKS) and dropped
+      once they lag more than AMBIENT_MAX_LAG_SECONDS behind real time
+    - Audio is cut into utterances at pauses (voice activity detection);
+      silence is never transcribed and each utterance is prompted with the
+      preceding transcript
+    - Audio is kept in a preallocated per-stream ring buffer
+      (AMBIENT_RING_BUFFER_SECONDS); chunks and diarization windows are
+      zero-copy views into it
+    - Speaker IDs are stable for the whole session: each diarization window's
+      speakers are matched to running centroid embeddings
+      (IncrementalDiarizer), and transcript words are aligned to speaker
+      turns with a sweep line
     """
     await websocket.accept()
 
+    payload = verify_token(websocket.query_params.get("token") or "")
+    if not payload or payload.get("type") != "access" or not payload.get("sub"):
+        logger.warning("Ambient listening WebSocket rejected: invalid or missing token")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Could not validate credentials")
+        return
+
     logger.info("Ambient listening WebSocket connection established")
 
-    # Audio buffer for accumulating chunks
-    audio_buffer = bytearray()
-    accumulated_audio = bytearray()  # For diarization of longer segments
-    chunk_duration_seconds = 2.0  # Process every 2 seconds
     diarization_window_seconds = 30.0  # Diarize every 30 seconds
     sample_rate = 16000
-    bytes_per_second = sample_rate * 2  # 16-bit audio = 2 bytes per sample
-    chunk_size_bytes = int(chunk_duration_seconds * bytes_per_second)
-    diarization_window_bytes = int(diarization_window_seconds * bytes_per_second)
+    diarization_window_samples = int(diarization_window_seconds * sample_rate)
+
+    # Preallocated ring buffer; utterances and diarization windows are
+    # views into it. It must outlive the longest window plus the time a
+    # queued utterance may wait before it is dropped as stale.
+    ring_seconds = max(
+        settings.AMBIENT_RING_BUFFER_SECONDS,
+        diarization_window_seconds + settings.AMBIENT_MAX_LAG_SECONDS + settings.AMBIENT_MAX_UTTERANCE_SECONDS
+    )
+    ring = PCMRingBuffer(int(ring_seconds * sample_rate))
+    segmenter = UtteranceSegmenter(sample_rate)  # Utterances end at pauses; silence is skipped
+    diarize_position = 0  # Next sample to diarize
 
     # Speaker label mapping (user can customize)
     speaker_labels: Dict[str, str] = {}  # speaker_id -> label
 
+    # Session speakers; final utterances wait here until their audio is diarized
+    diarizer = IncrementalDiarizer()
+    announced_speakers: set = set()
+    recent_turns: List[SpeakerTurn] = []  # Last two windows
+    diarized_until = 0.0  # Stream time covered by diarization so far
+    unlabeled: List[dict] = []
+
+    executor = get_transcription_executor()
+    session = None
+    entity_tracker = None
+    diarization_task: Optional[asyncio.Task] = None
+
     try:
         # Import entity extractor
         from app.services.entity_extractor import ClinicalEntityExtractor
         extractor = ClinicalEntityExtractor()
 
-        # Get Whisper model
+        async def send_entities(entities: List[dict]):
+            await websocket.send_json({
+                "type": "entities",
+                "entities": entities
+            })
+
+        # Regex pass per utterance; debounced LLM pass over the recent
+        # transcript; only new or changed entities are sent
+        entity_tracker = AmbientEntityTracker(extractor, send_entities)
+
+        # Speech backend selected and loaded at startup; waits if still loading
         try:
-            whisper_model = get_whisper_model()
+            await executor.load_model()
         except Exception as e:
             await websocket.send_json({
                 "type": "error",
-                "message": f"Whisper model not available: {str(e)}"
+                "message": f"Speech model not available: {str(e)}"
             })
             await websocket.close()
             return
 
         # Get diarization pipeline (optional)
-        diarization_pipeline = get_diarization_pipeline()
+        diarization_pipeline = await get_diarization_executor().run(get_diarization_pipeline)
         diarization_enabled = diarization_pipeline is not None
 
         if not diarization_enabled:
@@ -187,106 +232,201 @@ async def ambient_listening_stream(websocket: WebSocket):
                 "message": "Speaker diarization disabled (pyannote not available or no HuggingFace token)"
             })
 
-        while True:
-            # Receive message from client
+        async def send_transcription(chunk: AudioChunk, transcription_result: Optional[dict]):
+            # Runs on the session's consumer task, in chunk order
+            if ring.oldest > chunk.position:
+                # The utterance was overwritten while the model was reading it
+                logger.warning("Transcription fell behind the audio ring buffer; utterance discarded")
+                if chunk.final:
+                    await send_dropped(chunk, "overwritten")
+                return
+
+            if transcription_result:
+                text = transcription_result.get('text', '').strip()
+
+                if text and not chunk.final:
+                    # Still speaking: caption only, replaced by the final text
+                    await websocket.send_json({
+                        "type": "transcription_partial",
+                        "text": text,
+                        "start_time": chunk.start_time,
+                        "end_time": chunk.start_time + chunk.duration
+                    })
+
+                elif text:
+                    utterance = utterance_words(chunk, transcription_result)
+                    speaker = None
+                    if utterance['end'] <= diarized_until:
+                        # Transcribed after its audio was diarized
+                        speaker = utterance_speaker(utterance['words'], recent_turns)
+                    elif diarization_enabled:
+                        unlabeled.append(utterance)
+
+                    # Send transcription to client (speaker follows once diarized)
+                    await websocket.send_json({
+                        "type": "transcription",
+                        "text": text,
+                        "speaker": speaker,
+                        "speaker_label": speaker_labels.get(speaker) if speaker else None,
+                        "start_time": chunk.start_time,
+                        "end_time": chunk.start_time + chunk.duration,
+                        "timestamp": asyncio.get_running_loop().time(),
+                        "confidence": transcription_result.get('confidence', 0.0)
+                    })
+
+                    # Extract clinical entities from transcription
+                    try:
+                        await entity_tracker.add_text(text)
+                    except Exception as e:
+                        logger.warning(f"Entity extraction failed: {e}")
+
+        async def send_dropped(chunk: AudioChunk, reason: str):
+            await websocket.send_json({
+                "type": "audio_dropped",
+                "reason": reason,
+                "duration": chunk.duration
+            })
+
+        async def diarize(start: int):
+            nonlocal recent_turns, diarized_until, unlabeled
+
+            diarization_result = await perform_speaker_diarization(
+                pipeline=diarization_pipeline,
+                audio_chunk=ring.window(start, diarization_window_samples),
+                sample_rate=sample_rate
+            )
+
+            if ring.oldest > start:
+                # The window was overwritten while pyannote was reading it
+                logger.warning("Diarization fell behind the audio ring buffer; window discarded")
+                return
+
+            if diarization_result:
+                window_start = start / sample_rate
+                turns = diarizer.update(diarization_result, offset=window_start)
+
+                # Send speaker information to client
+                for turn in turns:
+                    speaker_id = turn.speaker
+
+                    # Auto-suggest speaker labels based on turn order
+                    if speaker_id not in announced_speakers:
+                        suggested_label = "Clinician" if len(announced_speakers) == 0 else "Patient"
+                        announced_speakers.add(speaker_id)
+
+                        await websocket.send_json({
+                            "type": "speaker_identified",
+                            "speaker_id": speaker_id,
+                            "suggested_label": suggested_label,
+                            "start_time": turn.start,
+                            "end_time": turn.end
+                        })
+
+                # Utterances spanning a window boundary need the previous window's turns
+                reach = window_start - settings.AMBIENT_MAX_UTTERANCE_SECONDS
+                recent_turns = [turn for turn in recent_turns if turn.end > reach] + turns
+                diarized_until = window_start + diarization_window_seconds
+
+                # Label transcribed utterances this window covers; ones from
+                # a skipped window can no longer be labeled
+                waiting = []
+                for utterance in unlabeled:
+                    if utterance['end'] > diarized_until:
+                        waiting.append(utterance)
+                        continue
+                    if utterance['end'] <= window_start:
+                        continue
+                    speaker = utterance_speaker(utterance['words'], recent_turns)
+                    if speaker:
+                        await websocket.send_json({
+                            "type": "transcription_speaker",
+                            "speaker": speaker,
+                            "speaker_label": speaker_labels.get(speaker),
+                            "start_time": utterance['start'],
+                            "end_time": utterance['end']
+                        })
+                unlabeled = waiting
+
+        async def submit(segment):
+            # Partials are only worth decoding while the workers keep up
+            if not segment.final and session.pending:
+                return
+            evicted = session.submit(AudioChunk(
+                ring.window(segment.start, segment.length),
+                sample_rate,
+                position=segment.start,
+                final=segment.final
+            ))
+            if evicted is not None and evicted.final:
+                await send_dropped(evicted, "backlog")
+
+        async def ingest(frame):
+            # Append PCM16 to the ring buffer and queue utterances as the
+            # segmenter closes them; the receive loop never waits for
+            # Whisper or pyannote
+            nonlocal diarize_position, diarization_task
+
             try:
-                message = await websocket.receive_json()
-            except WebSocketDisconnect:
+                received = ring.written
+                ring.write(frame)
+
+                for segment in segmenter.push(ring.window(received, ring.written - received)):
+                    await submit(segment)
+
+                # Perform speaker diarization on accumulated audio
+                while diarization_enabled and ring.written - diarize_position >= diarization_window_samples:
+                    # Skip this window if the previous one is still running
+                    if diarization_task is None or diarization_task.done():
+                        diarization_task = asyncio.create_task(diarize(diarize_position))
+                    diarize_position += diarization_window_samples
+
+            except Exception as e:
+                logger.error(f"Audio processing error: {e}")
+                await websocket.send_json({
+                    "type": "error",
+                    "message": f"Audio processing failed: {str(e)}"
+                })
+
+        session = executor.open_session(send_transcription, on_drop=send_dropped)
+
+        while True:
+            # Receive message from client (binary audio or JSON control)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
                 logger.info("Client disconnected from ambient listening")
                 break
-            except Exception as e:
+
+            if frame.get("bytes") is not None:
+                # Binary frame: raw PCM16 mono at 16 kHz
+                await ingest(frame["bytes"])
+                continue
+
+            try:
+                message = json.loads(frame.get("text") or "")
+            except ValueError as e:
                 logger.error(f"Error receiving message: {e}")
                 continue
 
             if message.get('type') == 'audio':
-                # Decode base64 audio data
+                # JSON frame with base64 audio (PCM16 only, see docstring)
+                audio_format = message.get('format', 'pcm16')
+                audio_rate = message.get('sample_rate', sample_rate)
+                if audio_format != 'pcm16' or audio_rate != sample_rate:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": f"Unsupported audio ({audio_format} at {audio_rate} Hz): "
+                                   f"send PCM16 mono at {sample_rate} Hz"
+                    })
+                    continue
                 try:
                     audio_data = base64.b64decode(message.get('data', ''))
-                    audio_buffer.extend(audio_data)
-                    accumulated_audio.extend(audio_data)
-
-                    # Process when buffer reaches chunk size
-                    if len(audio_buffer) >= chunk_size_bytes:
-                        # Extract audio chunk
-                        audio_chunk = bytes(audio_buffer[:chunk_size_bytes])
-                        audio_buffer = audio_buffer[chunk_size_bytes:]
-
-                        # Transcribe with Whisper (no diarization yet)
-                        transcription_result = await transcribe_audio_chunk(
-                            model=whisper_model,
-                            audio_chunk=audio_chunk,
-                            sample_rate=sample_rate
-                        )
-
-                        if transcription_result:
-                            text = transcription_result.get('text', '').strip()
-
-                            if text:
-                                # Send transcription to client (speaker TBD)
-                                await websocket.send_json({
-                                    "type": "transcription",
-                                    "text": text,
-                                    "speaker": None,  # Will be updated after diarization
-                                    "speaker_label": None,
-                                    "timestamp": asyncio.get_event_loop().time(),
-                                    "confidence": transcription_result.get('confidence', 0.0)
-                                })
-
-                                # Extract clinical entities from transcription
-                                try:
-                                    entities = await extractor.extract_entities(text)
-                                    if entities:
-                                        await websocket.send_json({
-                                            "type": "entities",
-                                            "entities": entities
-                                        })
-                                except Exception as e:
-                                    logger.warning(f"Entity extraction failed: {e}")
-
-                        # IMPORTANT: Delete audio chunk immediately (HIPAA compliance)
-                        del audio_chunk
-
-                    # Perform speaker diarization on accumulated audio
-                    if diarization_enabled and len(accumulated_audio) >= diarization_window_bytes:
-                        # Extract diarization window
-                        diarization_chunk = bytes(accumulated_audio[:diarization_window_bytes])
-
-                        # Perform diarization
-                        diarization_result = await perform_speaker_diarization(
-                            pipeline=diarization_pipeline,
-                            audio_chunk=diarization_chunk,
-                            sample_rate=sample_rate
-                        )
-
-                        if diarization_result:
-                            # Send speaker information to client
-                            for segment in diarization_result['segments']:
-                                speaker_id = segment['speaker']
-
-                                # Auto-suggest speaker labels based on turn order
-                                if speaker_id not in speaker_labels:
-                                    suggested_label = "Clinician" if len(speaker_labels) == 0 else "Patient"
-
-                                    await websocket.send_json({
-                                        "type": "speaker_identified",
-                                        "speaker_id": speaker_id,
-                                        "suggested_label": suggested_label,
-                                        "start_time": segment['start'],
-                                        "end_time": segment['end']
-                                    })
-
-                        # Clear accumulated audio after diarization
-                        accumulated_audio = accumulated_audio[diarization_window_bytes:]
-
-                        # IMPORTANT: Delete diarization chunk (HIPAA)
-                        del diarization_chunk
-
-                except Exception as e:
-                    logger.error(f"Audio processing error: {e}")
+                except ValueError as e:
                     await websocket.send_json({
                         "type": "error",
                         "message": f"Audio processing failed: {str(e)}"
                     })
+                    continue
+                await ingest(audio_data)
 
             elif message.get('type') == 'label_speaker':
                 # User assigned a label to a speaker
@@ -304,11 +444,18 @@ async def ambient_listening_stream(websocket: WebSocket):
                     })
 
             elif message.get('type') == 'stop':
-                # Client requested to stop listening
+                # Client requested to stop listening; finish what is queued
                 logger.info("Client requested to stop ambient listening")
+                last_segment = segmenter.flush()
+                if last_segment:
+                    await submit(last_segment)
+                await session.close(drain=True)
+                await entity_tracker.close(flush=True)
                 await websocket.send_json({
                     "type": "stopped",
-                    "message": "Ambient listening stopped"
+                    "message": "Ambient listening stopped",
+                    "stats": session.stats,
+                    "entity_stats": entity_tracker.stats
                 })
                 break
 
@@ -327,129 +474,55 @@ async def ambient_listening_stream(websocket: WebSocket):
 
     finally:
         # Cleanup: Ensure all audio data is deleted
-        del audio_buffer
-        del accumulated_audio
+        if session is not None:
+            await session.close()
+            logger.info(f"Ambient session closed: {session.stats}")
+        if entity_tracker is not None:
+            await entity_tracker.close()
+        if diarization_task is not None:
+            diarization_task.cancel()
+        ring.clear()
         try:
             await websocket.close()
         except:
             pass
 
 
-async def transcribe_audio_chunk(model, audio_chunk: bytes, sample_rate: int = 16000) -> Optional[dict]:
-    """
-    Transcribe audio chunk using Whisper model.
-
-    Args:
-        model: Loaded Whisper model
-        audio_chunk: Raw audio bytes
-        sample_rate: Audio sample rate
-
-    Returns:
-        Dict with transcription result or None
-    """
-    import tempfile
-    import numpy as np
-    import soundfile as sf
-
-    try:
-        # Convert bytes to numpy array
-        audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
-
-        # Normalize to [-1, 1]
-        audio_float = audio_array.astype(np.float32) / 32768.0
-
-        # Write to temporary WAV file (Whisper requires file input)
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=True) as temp_file:
-            sf.write(temp_file.name, audio_float, sample_rate)
-
-            # Transcribe
-            result = model.transcribe(
-                temp_file.name,
-                language='en',
-                task='transcribe',
-                fp16=False,  # CPU compatibility
-                word_timestamps=True,
-                temperature=0.0  # Deterministic
-            )
-
-            # Calculate confidence from word-level probabilities
-            avg_confidence = 0.0
-            if 'segments' in result:
-                confidences = []
-                for segment in result['segments']:
-                    if 'words' in segment:
-                        for word in segment['words']:
-                            if 'probability' in word:
-                                confidences.append(word['probability'])
-
-                if confidences:
-                    avg_confidence = sum(confidences) / len(confidences)
-
-            return {
-                'text': result.get('text', ''),
-                'confidence': avg_confidence,
-                'language': result.get('language', 'en'),
-                'segments': result.get('segments', [])
-            }
-
-    except Exception as e:
-        logger.error(f"Whisper transcription failed: {e}")
-        return None
-
-
 async def perform_speaker_diarization(
     pipeline,
-    audio_chunk: bytes,
+    audio_chunk: np.ndarray,
     sample_rate: int = 16000
 ) -> Optional[dict]:
     """
-    Perform speaker diarization using pyannote.
+    Perform speaker diarization using pyannote (in the diarization pool).
 
     Args:
         pipeline: Loaded pyannote pipeline
-        audio_chunk: Raw audio bytes
+        audio_chunk: int16 PCM samples (a read-only PCMRingBuffer window view)
         sample_rate: Audio sample rate
 
     Returns:
         Dict with diarization results (speaker segments) or None
     """
-    import tempfile
-    import numpy as np
-    import soundfile as sf
-    from pyannote.core import Segment
+    return await get_diarization_executor().run(diarize_pcm, pipeline, audio_chunk, sample_rate)
 
-    try:
-        # Convert bytes to numpy array
-        audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
-
-        # Normalize to [-1, 1]
-        audio_float = audio_array.astype(np.float32) / 32768.0
-
-        # Write to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=True) as temp_file:
-            sf.write(temp_file.name, audio_float, sample_rate)
-
-            # Perform diarization
-            diarization = pipeline(temp_file.name)
-
-            # Extract speaker segments
-            segments = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                segments.append({
-                    'speaker': speaker,
-                    'start': turn.start,
-                    'end': turn.end,
-                    'duration': turn.end - turn.start
-                })
 
-            return {
-                'segments': segments,
-                'num_speakers': len(set(seg['speaker'] for seg in segments))
-            }
+def utterance_words(chunk: AudioChunk, transcription_result: dict) -> dict:
+    """
+    Stream-time extent of a final utterance and of its words.
 
-    except Exception as e:
-        logger.error(f"Speaker diarization failed: {e}")
-        return None
+    Falls back to segment times, then to the whole chunk, when the backend
+    returned no word timestamps.
+    """
+    offset = chunk.start_time
+    end = offset + chunk.duration
+    words = [
+        {'start': offset + word['start'], 'end': offset + word['end']}
+        for segment in transcription_result.get('segments', [])
+        for word in (segment.get('words') or [segment])
+        if 'start' in word and 'end' in word
+    ]
+    return {'start': offset, 'end': end, 'words': words or [{'start': offset, 'end': end}]}
 
 
 async def align_transcription_with_speakers(
@@ -466,36 +539,28 @@ async def align_transcription_with_speakers(
     Returns:
         List of transcription segments with speaker labels
     """
-    aligned_segments = []
-
-    for trans_seg in transcription_segments:
-        start_time = trans_seg.get('start', 0)
-        end_time = trans_seg.get('end', 0)
-        text = trans_seg.get('text', '')
-
-        # Find overlapping speaker segment
-        speaker = None
-        max_overlap = 0
-
-        for diar_seg in diarization_segments:
-            diar_start = diar_seg['start']
-            diar_end = diar_seg['end']
-
-            # Calculate overlap
-            overlap_start = max(start_time, diar_start)
-            overlap_end = min(end_time, diar_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
-
-            if overlap_duration > max_overlap:
-                max_overlap = overlap_duration
-                speaker = diar_seg['speaker']
-
-        aligned_segments.append({
-            'text': text,
+    # Sweep line over both lists in time order instead of an n x m overlap scan
+    order = sorted(range(len(transcription_segments)), key=lambda i: transcription_segments[i].get('start', 0))
+    segments = [
+        {'start': transcription_segments[i].get('start', 0), 'end': transcription_segments[i].get('end', 0)}
+        for i in order
+    ]
+    turns = sorted(
+        (SpeakerTurn(seg['speaker'], seg['start'], seg['end']) for seg in diarization_segments),
+        key=lambda turn: turn.start
+    )
+
+    speakers: List[Optional[str]] = [None] * len(transcription_segments)
+    for i, speaker in zip(order, align_segments(segments, turns)):
+        speakers[i] = speaker
+
+    return [
+        {
+            'text': trans_seg.get('text', ''),
             'speaker': speaker,
-            'start': start_time,
-            'end': end_time,
+            'start': trans_seg.get('start', 0),
+            'end': trans_seg.get('end', 0),
             'confidence': trans_seg.get('confidence', 0.0)
-        })
-
-    return aligned_segments
+        }
+        for trans_seg, speaker in zip(transcription_segments, speakers)
+    ]
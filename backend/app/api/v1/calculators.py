@@ -3,28 +3,50 @@ Clinical Calculator API endpoints
 Handles all 44 urological calculators
 """
 
+import json
 import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
+from app.config import settings
+from app.core.http_cache import PrecomputedJSONCache, precomputed_response
 from app.core.security import get_current_active_user, get_optional_user
 from app.database.sqlite_models import User
 from app.schemas.calculators import (
+    BatchCalculateRequest,
     CalculatorRequest,
     CalculatorResponse,
     CalculatorInfo,
-    CalculatorListResponse
+    CalculatorListResponse,
+    SensitivityRequest,
+    SensitivityResponse
 )
+from app.services.calculator_batch import stream_batch_results
+from calculators.base import ValidationError
 from calculators.registry import registry as calculator_registry
-from calculators.base import CalculatorCategory
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Catalog responses are fixed for the life of the process; serialize once
+_catalog_responses = PrecomputedJSONCache()
+
+
+def _build_calculator_list() -> CalculatorListResponse:
+    """Full calculator list, organized by category."""
+    catalog = calculator_registry.catalog
+    calculators_dict = {
+        category: [CalculatorInfo(**catalog.info[calc_id]) for calc_id in calc_ids]
+        for category, calc_ids in catalog.by_category.items()
+    }
+    return CalculatorListResponse(calculators=calculators_dict, total=len(catalog.info))
+
 
 @router.get("", response_model=CalculatorListResponse)
 async def list_calculators(
+    request: Request,
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """
@@ -35,42 +57,17 @@ async def list_calculators(
     - Category (prostate, kidney, bladder, etc.)
     - Required and optional inputs
     - References
+
+    Served from a pre-serialized catalog with an ETag; clients sending
+    If-None-Match get 304 Not Modified.
     """
     try:
-        # Get calculators organized by category
-        by_category = calculator_registry.list_by_category()
-
-        # Convert to CalculatorInfo schema
-        calculators_dict = {}
-        total = 0
-
-        for category, calcs in by_category.items():
-            calc_infos = []
-            for calc_meta in calcs:
-                # Get full calculator for detailed info
-                calc = calculator_registry.get(calc_meta["id"])
-                if calc:
-                    info = CalculatorInfo(
-                        id=calc.calculator_id,
-                        name=calc.name,
-                        description=calc.description,
-                        category=calc.category.value,
-                        required_inputs=calc.required_inputs,
-                        optional_inputs=calc.optional_inputs,
-                        references=calc.references
-                    )
-                    calc_infos.append(info)
-                    total += 1
-
-            calculators_dict[category] = calc_infos
+        payload = _catalog_responses.get("list", _build_calculator_list)
 
         user_id = current_user.id if current_user else "anonymous"
-        logger.info(f"Listed {total} calculators for user {user_id}")
+        logger.debug(f"Listed calculators for user {user_id}")
 
-        return CalculatorListResponse(
-            calculators=calculators_dict,
-            total=total
-        )
+        return precomputed_response(request, payload)
 
     except Exception as e:
         logger.error(f"Failed to list calculators: {e}", exc_info=True)
@@ -83,6 +80,7 @@ async def list_calculators(
 @router.get("/{calculator_id}", response_model=CalculatorInfo)
 async def get_calculator(
     calculator_id: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -95,46 +93,24 @@ async def get_calculator(
     - Input schema with rich metadata
     - References and citations
     """
-    try:
-        # Get calculator from registry
-        calculator = calculator_registry.get(calculator_id)
-
-        if not calculator:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Calculator '{calculator_id}' not found"
-            )
-
-        # Get input schema if available
-        input_schema = calculator.get_input_schema()
-        schema_dict = [metadata.to_dict() for metadata in input_schema] if input_schema else None
-
-        logger.info(f"Retrieved calculator info: {calculator_id}")
-
-        return CalculatorInfo(
-            id=calculator.calculator_id,
-            name=calculator.name,
-            description=calculator.description,
-            category=calculator.category.value,
-            required_inputs=calculator.required_inputs,
-            optional_inputs=calculator.optional_inputs,
-            references=calculator.references,
-            input_schema=schema_dict
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get calculator {calculator_id}: {e}", exc_info=True)
+    catalog = calculator_registry.catalog
+    if calculator_id not in catalog.info:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get calculator: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Calculator '{calculator_id}' not found"
         )
 
+    def build() -> CalculatorInfo:
+        schema = calculator_registry.get_input_schema(calculator_id)
+        return CalculatorInfo(**catalog.info[calculator_id], input_schema=schema or None)
+
+    return precomputed_response(request, _catalog_responses.get(f"info:{calculator_id}", build))
+
 
 @router.get("/{calculator_id}/input-schema")
 async def get_calculator_input_schema(
-    calculator_id: str
+    calculator_id: str,
+    request: Request
 ):
     """
     Get detailed input schema for a specific calculator.
@@ -151,39 +127,116 @@ async def get_calculator_input_schema(
     - Show acceptable value ranges and options
     - Pre-populate fields from clinical context
     """
-    try:
-        # Get calculator from registry
-        calculator = calculator_registry.get(calculator_id)
+    catalog = calculator_registry.catalog
+    if calculator_id not in catalog.info:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Calculator '{calculator_id}' not found"
+        )
 
-        if not calculator:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Calculator '{calculator_id}' not found"
-            )
+    def build() -> dict:
+        return {
+            "calculator_id": calculator_id,
+            "calculator_name": catalog.info[calculator_id]["name"],
+            "input_schema": calculator_registry.get_input_schema(calculator_id)
+        }
 
-        # Get input schema
-        input_schema = calculator.get_input_schema()
+    return precomputed_response(request, _catalog_responses.get(f"schema:{calculator_id}", build))
 
-        # Convert to dict format for JSON serialization
-        schema_dict = [metadata.to_dict() for metadata in input_schema]
 
-        logger.info(f"Retrieved input schema for calculator: {calculator_id}")
+@router.post("/batch/calculate")
+async def batch_calculate(
+    requests: list[dict],
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Execute multiple calculators in a single request.
+
+    Useful for running multiple related calculators simultaneously.
+    Items run concurrently on the calculator worker pool; results are
+    returned in request order. For large batches use
+    /batch/calculate/stream.
+
+    Request format:
+    ```
+    [
+        {"calculator_id": "pcpt_risk", "inputs": {...}},
+        {"calculator_id": "capra", "inputs": {...}}
+    ]
+    ```
+    """
+    if len(requests) > settings.CALCULATOR_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.CALCULATOR_BATCH_MAX_ITEMS} items"
+        )
+
+    try:
+        results = [None] * len(requests)
+
+        async for item_result in stream_batch_results(requests):
+            results[item_result.pop("index")] = item_result
+
+        logger.info(f"Batch calculation completed: {len(results)} calculators")
 
         return {
-            "calculator_id": calculator_id,
-            "calculator_name": calculator.name,
-            "input_schema": schema_dict
+            "results": results,
+            "total": len(results),
+            "successful": len([r for r in results if "error" not in r])
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Failed to get input schema for {calculator_id}: {e}", exc_info=True)
+        logger.error(f"Batch calculation failed: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get input schema: {str(e)}"
+            detail=f"Batch calculation failed: {str(e)}"
+        )
+
+
+@router.post("/batch/calculate/stream")
+async def batch_calculate_stream(
+    request: BatchCalculateRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Execute many calculators, streaming results as NDJSON as they finish.
+
+    Each line is one result tagged with the item's "index" (results arrive in
+    completion order, not request order), or {"index", "calculator_id",
+    "error"} for invalid, unknown or timed-out items. The last line is a
+    summary: {"summary": {"total", "successful", "failed"}}.
+
+    Formatted output is omitted by default; set include_formatted_output to
+    get it, or include_recommendations=false to drop recommendations.
+    """
+    if len(request.items) > settings.CALCULATOR_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.CALCULATOR_BATCH_MAX_ITEMS} items"
         )
 
+    items = [item.model_dump() for item in request.items]
+    logger.info(f"User {current_user.id} streaming batch of {len(items)} calculators")
+
+    async def ndjson_lines():
+        successful = 0
+        async for item_result in stream_batch_results(
+            items,
+            include_formatted_output=request.include_formatted_output,
+            include_recommendations=request.include_recommendations,
+            item_timeout=request.item_timeout_seconds,
+        ):
+            if "error" not in item_result:
+                successful += 1
+            yield json.dumps(item_result, default=str) + "\n"
+
+        yield json.dumps({
+            "summary": {"total": len(items), "successful": successful, "failed": len(items) - successful}
+        }) + "\n"
+        logger.info(f"Streaming batch completed: {successful}/{len(items)} successful")
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 
 @router.post("/{calculator_id}/calculate", response_model=CalculatorResponse)
 async def calculate(
@@ -224,7 +277,7 @@ async def calculate(
             )
 
         # Execute calculator
-        result = calculator.calculate(request.inputs)
+        result = calculator.run(request.inputs)
 
         # Build response
         response = CalculatorResponse(
@@ -236,7 +289,8 @@ async def calculate(
             metadata={
                 "calculator_name": calculator.name,
                 "category": calculator.category.value,
-                "references": calculator.references
+                "references": calculator.references,
+                "cache_hit": result.metadata.get("cache_hit", False)
             }
         )
 
@@ -254,9 +308,63 @@ async def calculate(
         )
 
 
+@router.post("/{calculator_id}/sensitivity", response_model=SensitivityResponse)
+async def sensitivity(
+    calculator_id: str,
+    request: SensitivityRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Show how much a result moves when inputs are uncertain.
+
+    Scores thousands of perturbed copies of the inputs in one vectorized
+    pass (milliseconds) and returns the score distribution, tornado-plot
+    data and input elasticities. Perturbations per input:
+    - {"low": 6.1, "high": 6.5}: uniform range
+    - {"mean": 6.5, "sd": 0.3}: normal (mean defaults to the input value)
+    - {"values": ["T1c", "T2a"], "weights": [0.7, 0.3]}: discrete
+    - {"probability": 0.5}: uncertain yes/no input
+
+    Available for calculators with vectorized scoring.
+    """
+    calculator = calculator_registry.get(calculator_id)
+    if not calculator:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Calculator '{calculator_id}' not found"
+        )
+    if request.samples > settings.CALCULATOR_SENSITIVITY_MAX_SAMPLES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Sensitivity analysis exceeds {settings.CALCULATOR_SENSITIVITY_MAX_SAMPLES} samples"
+        )
+
+    logger.info(f"User {current_user.id} running sensitivity analysis: {calculator_id}")
+
+    try:
+        analysis = calculator.sensitivity(
+            request.inputs,
+            request.perturbations,
+            samples=request.samples,
+            output=request.output,
+            seed=request.seed,
+        )
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Sensitivity analysis failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Sensitivity analysis failed: {str(e)}"
+        )
+
+    return SensitivityResponse(**analysis.to_dict())
+
+
 @router.get("/category/{category}")
 async def get_calculators_by_category(
     category: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -274,130 +382,28 @@ async def get_calculators_by_category(
     - stones
     - surgical
     """
-    try:
-        # Validate category
-        try:
-            cat_enum = CalculatorCategory(category)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid category: {category}"
-            )
-
-        # Get calculators in category
-        calculators = calculator_registry.get_by_category(cat_enum)
-
-        # Convert to response format
-        calc_list = []
-        for calc in calculators:
-            calc_list.append({
-                "id": calc.calculator_id,
-                "name": calc.name,
-                "description": calc.description,
-                "required_inputs": calc.required_inputs,
-                "optional_inputs": calc.optional_inputs
-            })
-
-        logger.info(f"Retrieved {len(calc_list)} calculators in category: {category}")
+    catalog = calculator_registry.catalog
+    if category not in catalog.by_category:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid category: {category}"
+        )
 
+    def build() -> dict:
+        calc_list = [
+            {
+                "id": calc_id,
+                "name": catalog.info[calc_id]["name"],
+                "description": catalog.info[calc_id]["description"],
+                "required_inputs": list(catalog.info[calc_id]["required_inputs"]),
+                "optional_inputs": list(catalog.info[calc_id]["optional_inputs"])
+            }
+            for calc_id in catalog.by_category[category]
+        ]
         return {
             "category": category,
             "calculators": calc_list,
             "total": len(calc_list)
         }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get calculators by category: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get calculators: {str(e)}"
-        )
-
-
-@router.post("/batch/calculate")
-async def batch_calculate(
-    requests: list[dict],
-    current_user: User = Depends(get_current_active_user)
-):
-    """
-    Execute multiple calculators in a single request.
-
-    Useful for running multiple related calculators simultaneously.
-
-    Request format:
-    ```
-    [
-        {"calculator_id": "pcpt_risk", "inputs": {...}},
-        {"calculator_id": "capra", "inputs": {...}}
-    ]
-    ```
-    """
-    try:
-        results = []
-
-        for req in requests:
-            calculator_id = req.get("calculator_id")
-            inputs = req.get("inputs", {})
-
-            if not calculator_id:
-                results.append({
-                    "calculator_id": None,
-                    "error": "Missing calculator_id"
-                })
-                continue
-
-            # Get calculator
-            calculator = calculator_registry.get(calculator_id)
-
-            if not calculator:
-                results.append({
-                    "calculator_id": calculator_id,
-                    "error": f"Calculator not found: {calculator_id}"
-                })
-                continue
-
-            # Validate and execute
-            try:
-                is_valid, error_message = calculator.validate_inputs(inputs)
-
-                if not is_valid:
-                    results.append({
-                        "calculator_id": calculator_id,
-                        "error": f"Invalid inputs: {error_message}"
-                    })
-                    continue
-
-                # Execute
-                result = calculator.calculate(inputs)
-
-                results.append({
-                    "calculator_id": calculator_id,
-                    "calculator_name": calculator.name,
-                    "result": result.result,
-                    "interpretation": result.interpretation,
-                    "recommendations": result.recommendations,
-                    "formatted_output": result.format_output()
-                })
-
-            except Exception as e:
-                results.append({
-                    "calculator_id": calculator_id,
-                    "error": str(e)
-                })
-
-        logger.info(f"Batch calculation completed: {len(results)} calculators")
-
-        return {
-            "results": results,
-            "total": len(results),
-            "successful": len([r for r in results if "error" not in r])
-        }
-
-    except Exception as e:
-        logger.error(f"Batch calculation failed: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Batch calculation failed: {str(e)}"
-        )
+    return precomputed_response(request, _catalog_responses.get(f"category:{category}", build))
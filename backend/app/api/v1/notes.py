@@ -3,19 +3,23 @@ Note Generation API endpoints
 Handles clinical note generation with LLM and RAG
 """
 
+import asyncio
 import logging
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_current_active_user
+from pydantic import ValidationError
+
+from app.core.security import get_current_active_user, verify_token
 from app.database.sqlite_models import User
 from app.database.sqlite_session import get_db
 from app.schemas.notes import (
     NoteGenerateRequest,
     NoteResponse,
     InitialNoteRequest,
+    InitialNoteRebuildRequest,
     InitialNoteResponse,
     FinalNoteRequest,
     FinalNoteResponse
@@ -241,10 +245,10 @@ async def generate_initial_note(
 
     The preliminary note allows clinicians to review organized data
     before selecting which calculators to run.
+
+    metadata.build_id can be passed to /generate-initial/rebuild to
+    regenerate incrementally after the clinician adds data.
     """
-    from app.schemas.notes import InitialNoteResponse, ExtractedEntity, CalculatorSuggestion
-    from app.services.entity_extractor import ClinicalEntityExtractor
-    from app.services.calculator_suggester import get_calculator_suggester
     from pathlib import Path
     import time
 
@@ -334,51 +338,361 @@ async def generate_initial_note(
         logger.info("Using agent-based note processing system for structured extraction")
 
         # Import the fixed note processing system
-        from app.services.note_processing.note_builder import build_urology_note
+        from app.services.note_processing.note_builder import build_urology_note_state
+        from app.services.note_processing.build_store import get_build_store
 
         # Use the agent-based system with all the extraction fixes
-        preliminary_note = build_urology_note(request.clinical_input)
+        build_metadata = {}
+        build_state = build_urology_note_state(request.clinical_input, metadata=build_metadata)
+        preliminary_note = build_state.final_note
+
+        # Keep the build state (in memory, TTL-bound) for incremental rebuilds
+        build_id = get_build_store().put(current_user.user_id, build_state)
 
         logger.info(f"Agent-based note builder complete: {len(preliminary_note)} chars generated")
 
-        # Step 4: Extract clinical entities from the organized preliminary note (not raw input)
-        # CRITICAL: Extract from preliminary_note to get most recent/relevant values,
-        # not from raw clinical_input which contains years of historical data
-        extractor = ClinicalEntityExtractor()
-        entities = await extractor.extract_entities(preliminary_note)
+        return await _initial_note_response(
+            preliminary_note,
+            start_time,
+            {
+                'note_type': request.note_type,
+                'llm_provider': request.llm_provider,
+                'build_id': build_id,
+                'extraction_cache': build_metadata.get('extraction_cache'),
+                'profile': build_metadata.get('profile')
+            },
+            auto_run_calculators=request.auto_run_calculators
+        )
 
-        logger.info(f"Extracted {len(entities)} clinical entities from preliminary note")
+    except Exception as e:
+        logger.error(f"Initial note generation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Initial note generation failed: {str(e)}"
+        )
 
-        # Step 5: Suggest calculators based on extracted entities
-        suggester = get_calculator_suggester()
-        suggestions = suggester.suggest_calculators(entities)
 
-        logger.info(f"Suggested {len(suggestions)} calculators")
+async def _initial_note_response(
+    preliminary_note: str,
+    start_time: float,
+    metadata: dict,
+    auto_run_calculators: bool = False
+) -> InitialNoteResponse:
+    """
+    Extract entities, suggest calculators and format a Stage 1 response.
 
-        # Format response
-        generation_time = time.time() - start_time
+    With auto_run_calculators, every calculator whose required inputs were
+    all detected is run in one batched pass and returned with the note.
+    """
+    from app.schemas.notes import ExtractedEntity, CalculatorSuggestion
+    from app.services.entity_extractor import ClinicalEntityExtractor
+    from app.services.calculator_suggester import get_calculator_suggester
+    import time
 
-        return InitialNoteResponse(
-            preliminary_note=preliminary_note,
-            extracted_entities=[ExtractedEntity(**e) for e in entities],
-            suggested_calculators=[CalculatorSuggestion(**s) for s in suggestions],
-            metadata={
-                'generation_time_seconds': round(generation_time, 2),
-                'entities_extracted': len(entities),
-                'calculators_suggested': len(suggestions),
+    # Extract clinical entities from the organized preliminary note (not raw input)
+    # CRITICAL: Extract from preliminary_note to get most recent/relevant values,
+    # not from raw clinical_input which contains years of historical data
+    extractor = ClinicalEntityExtractor()
+    entities = await extractor.extract_entities(preliminary_note)
+
+    logger.info(f"Extracted {len(entities)} clinical entities from preliminary note")
+
+    # Suggest calculators based on extracted entities
+    suggester = get_calculator_suggester()
+    suggestions = suggester.suggest_calculators(entities)
+
+    logger.info(f"Suggested {len(suggestions)} calculators")
+
+    calculator_results = []
+    if auto_run_calculators:
+        calculator_results = await suggester.run_satisfied(suggestions)
+        logger.info(f"Auto-ran {len(calculator_results)} fully satisfied calculators")
+
+    # Format response
+    generation_time = time.time() - start_time
+
+    return InitialNoteResponse(
+        preliminary_note=preliminary_note,
+        extracted_entities=[ExtractedEntity(**e) for e in entities],
+        suggested_calculators=[CalculatorSuggestion(**s) for s in suggestions],
+        calculator_results=calculator_results,
+        metadata={
+            'generation_time_seconds': round(generation_time, 2),
+            'entities_extracted': len(entities),
+            'calculators_suggested': len(suggestions),
+            'calculators_auto_run': len(calculator_results),
+            **metadata
+        }
+    )
+
+
+@router.post("/generate-initial/rebuild", response_model=InitialNoteResponse)
+async def rebuild_initial_note(
+    request: InitialNoteRebuildRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    STAGE 1 (incremental): Regenerate a preliminary note after adding data.
+
+    Reuses the build state from a previous /generate-initial call (referenced
+    by metadata.build_id). Only notes whose text changed are re-extracted and
+    only the section agents whose inputs changed are re-run, so appending a
+    lab panel does not re-run the LLM HPI synthesis.
+
+    Build states live in the memory of the worker that created them: with
+    several workers this endpoint needs sticky sessions (see build_store).
+    """
+    from app.services.note_processing.note_builder import rebuild_urology_note
+    from app.services.note_processing.build_store import get_build_store
+    import time
+
+    start_time = time.time()
+
+    store = get_build_store()
+    previous_state = store.get(current_user.user_id, request.build_id)
+    if previous_state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Build not found or expired - regenerate with /generate-initial"
+        )
+
+    try:
+        build_metadata = {}
+        build_state = rebuild_urology_note(
+            previous_state,
+            appended_text=request.appended_text,
+            clinical_document=request.clinical_input,
+            metadata=build_metadata
+        )
+        store.put(current_user.user_id, build_state, request.build_id)
+
+        logger.info(
+            f"Incremental Stage 1 rebuild: {len(build_state.rebuilt_sections)} sections re-synthesized"
+        )
+
+        return await _initial_note_response(
+            build_state.final_note,
+            start_time,
+            {
                 'note_type': request.note_type,
-                'llm_provider': request.llm_provider
-            }
+                'build_id': request.build_id,
+                'extraction_cache': build_metadata.get('extraction_cache'),
+                'profile': build_metadata.get('profile'),
+                'incremental': build_metadata.get('incremental')
+            },
+            auto_run_calculators=request.auto_run_calculators
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        logger.error(f"Initial note generation failed: {e}", exc_info=True)
+        logger.error(f"Incremental note rebuild failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Incremental note rebuild failed: {str(e)}"
+        )
+
+
+@router.post("/generate-initial/upload", response_model=InitialNoteResponse)
+async def generate_initial_note_upload(
+    request: Request,
+    note_type: str = Query(default="urology_clinic", pattern="^(urology_clinic|urology_consult)$"),
+    llm_provider: str = Query(default="ollama", pattern="^(ollama|anthropic|openai)$"),
+    auto_run_calculators: bool = Query(default=False),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    STAGE 1 for very large inputs: stream clinical_input as the request body.
+
+    Send the raw clinical text (text/plain, chunked transfer encoding welcome)
+    instead of a JSON string. STANDARD TITLE boundaries are detected while
+    the body is still uploading and each completed note is extracted in a
+    worker thread, so extraction overlaps with the upload. Input size is
+    capped by NOTE_STREAM_MAX_MB.
+    """
+    from app.config import settings
+    from app.services.note_processing.note_builder import build_urology_note_state
+    from app.services.note_processing.build_store import get_build_store
+    from app.services.note_processing.streaming_ingest import PayloadTooLargeError, StreamingNoteIngestor
+    import time
+
+    start_time = time.time()
+    ingestor = StreamingNoteIngestor(max_chars=settings.NOTE_STREAM_MAX_MB * 1024 * 1024)
+
+    try:
+        async for chunk in request.stream():
+            ingestor.feed(chunk)
+    except PayloadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    loop = asyncio.get_running_loop()
+
+    try:
+        clinical_input, notes_dict, note_extractions = await loop.run_in_executor(None, ingestor.finish)
+        if len(clinical_input.strip()) < 10:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Clinical input must be at least 10 characters"
+            )
+
+        logger.info(
+            f"User {current_user.id} streamed {len(clinical_input)} chars "
+            f"({ingestor.notes_dispatched} notes extracted during upload)"
+        )
+
+        build_metadata = {}
+        build_state = await loop.run_in_executor(
+            None,
+            lambda: build_urology_note_state(
+                clinical_input,
+                metadata=build_metadata,
+                notes_dict=notes_dict,
+                note_extractions=note_extractions
+            )
+        )
+        build_id = get_build_store().put(current_user.user_id, build_state)
+
+        return await _initial_note_response(
+            build_state.final_note,
+            start_time,
+            {
+                'note_type': note_type,
+                'llm_provider': llm_provider,
+                'build_id': build_id,
+                'extraction_cache': build_metadata.get('extraction_cache'),
+                'profile': build_metadata.get('profile'),
+                'notes_extracted_during_upload': ingestor.notes_dispatched
+            },
+            auto_run_calculators=auto_run_calculators
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Streaming initial note generation failed: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Initial note generation failed: {str(e)}"
         )
 
 
+@router.websocket("/generate-initial-stream")
+async def generate_initial_note_stream(websocket: WebSocket):
+    """
+    STAGE 1 with streaming: send each section as soon as its agent finishes.
+
+    Regex/template sections (PSA curve, labs, medications...) arrive first,
+    LLM-synthesized sections last, so perceived latency is the time to the
+    first section rather than the whole build.
+
+    **Protocol:**
+    1. Client sends JSON with InitialNoteRequest fields plus "token" (access JWT)
+    2. Server sends {"type": "section", "section", "content", "uses_llm", "index", "total"}
+       for every section
+    3. Server sends {"type": "complete", ...InitialNoteResponse fields} with the
+       assembled note, extracted entities and calculator suggestions
+    4. On failure the server sends {"type": "error", "message"}
+    """
+    from app.services.note_processing.note_builder import SYNTHESIS_ORDER, build_urology_note_state
+    from app.services.note_processing.build_store import get_build_store
+    import time
+
+    await websocket.accept()
+
+    try:
+        data = await websocket.receive_json()
+        start_time = time.time()
+
+        # WebSockets cannot carry the Authorization header from browsers
+        payload = verify_token(data.pop("token", None) or "")
+        if not payload or payload.get("type") != "access" or not payload.get("sub"):
+            await websocket.send_json({"type": "error", "message": "Could not validate credentials"})
+            return
+
+        try:
+            request = InitialNoteRequest(**data)
+        except ValidationError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            return
+
+        logger.info(f"WebSocket Stage 1 generation started (type: {request.note_type})")
+
+        # The builder is synchronous (regex + blocking LLM calls): run it in a
+        # worker thread and forward sections through a queue as they complete
+        loop = asyncio.get_running_loop()
+        sections: asyncio.Queue = asyncio.Queue()
+        build_metadata = {}
+        uses_llm = {spec.name: spec.uses_llm for spec in SYNTHESIS_ORDER}
+
+        def on_section(name, content):
+            loop.call_soon_threadsafe(sections.put_nowait, (name, content))
+
+        def run_build():
+            try:
+                return build_urology_note_state(
+                    request.clinical_input, metadata=build_metadata, on_section=on_section
+                )
+            finally:
+                loop.call_soon_threadsafe(sections.put_nowait, None)
+
+        build_future = loop.run_in_executor(None, run_build)
+
+        index = 0
+        time_to_first_section = None
+        while (item := await sections.get()) is not None:
+            name, content = item
+            if time_to_first_section is None:
+                time_to_first_section = time.time() - start_time
+            await websocket.send_json({
+                "type": "section",
+                "section": name,
+                "content": content or "",
+                "uses_llm": uses_llm[name],
+                "index": index,
+                "total": len(SYNTHESIS_ORDER)
+            })
+            index += 1
+
+        build_state = await build_future
+        build_id = get_build_store().put(payload["sub"], build_state)
+
+        response = await _initial_note_response(
+            build_state.final_note,
+            start_time,
+            {
+                'note_type': request.note_type,
+                'llm_provider': request.llm_provider,
+                'build_id': build_id,
+                'extraction_cache': build_metadata.get('extraction_cache'),
+                'profile': build_metadata.get('profile'),
+                'time_to_first_section_seconds': round(time_to_first_section or 0.0, 2)
+            },
+            auto_run_calculators=request.auto_run_calculators
+        )
+        await websocket.send_json({"type": "complete", **response.model_dump()})
+
+        logger.info("WebSocket Stage 1 generation completed")
+
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected")
+
+    except Exception as e:
+        logger.error(f"WebSocket Stage 1 generation failed: {e}", exc_info=True)
+        try:
+            await websocket.send_json({
+                "type": "error",
+                "message": str(e)
+            })
+        except:
+            pass
+
+    finally:
+        try:
+            await websocket.close()
+        except:
+            pass
+
+
 @router.post("/generate-final", response_model=FinalNoteResponse)
 async def generate_final_note(
     request: FinalNoteRequest,
@@ -471,7 +785,7 @@ async def generate_final_note(
                 calc_inputs = {k: entity_dict.get(k) for k in required_inputs if k in entity_dict}
 
                 # Run calculator
-                result = calculator.calculate(calc_inputs)
+                result = calculator.run(calc_inputs)
 
                 # Format inputs for display
                 inputs_display = ", ".join([f"{k}={v}" for k, v in calc_inputs.items()])
@@ -483,7 +797,8 @@ async def generate_final_note(
                     'interpretation': result.interpretation,
                     'recommendations': result.recommendations if hasattr(result, 'recommendations') else [],
                     'inputs': calc_inputs,
-                    'formatted_output': f"{calculator.name}\nInputs: {inputs_display}\nResult: {result.interpretation}"
+                    'formatted_output': f"{calculator.name}\nInputs: {inputs_display}\nResult: {result.interpretation}",
+                    'cache_hit': result.metadata.get('cache_hit', False)
                 }
 
                 calculator_results.append(calc_result)
@@ -547,6 +862,7 @@ async def generate_final_note(
         ambient_transcript = None  # TODO: Add ambient_transcript field to FinalNoteRequest schema
 
         # Build Stage 2 note with user-selected model
+        stage2_metadata = {}
         complete_note = build_stage2_note(
             stage1_note=request.preliminary_note,
             gu_notes=gu_notes,
@@ -556,7 +872,8 @@ async def generate_final_note(
             model=user_model,
             note_type=request.note_type,
             patient_name=request.patient_name,
-            ssn_last4=request.ssn_last4
+            ssn_last4=request.ssn_last4,
+            metadata=stage2_metadata
         )
 
         logger.info("Stage 2 agent-based note generation complete")
@@ -574,7 +891,9 @@ async def generate_final_note(
                 'rag_enabled': request.use_rag,
                 'rag_sources_count': len(rag_sources),
                 'gu_notes_found': len(gu_notes),
-                'workflow': 'stage2_agent_based'
+                'workflow': 'stage2_agent_based',
+                'verification': stage2_metadata.get('verification'),
+                'profile': stage2_metadata.get('profile')
             }
         )
 
@@ -738,7 +1057,7 @@ async def generate_stage2_agent(
                 calc_inputs = {k: entity_dict.get(k) for k in required_inputs if k in entity_dict}
 
                 # Run calculator
-                result = calculator.calculate(calc_inputs)
+                result = calculator.run(calc_inputs)
 
                 # Format inputs for display
                 inputs_display = ", ".join([f"{k}={v}" for k, v in calc_inputs.items()])
@@ -750,7 +1069,8 @@ async def generate_stage2_agent(
                     'interpretation': result.interpretation,
                     'recommendations': result.recommendations if hasattr(result, 'recommendations') else [],
                     'inputs': calc_inputs,
-                    'formatted_output': f"{calculator.name}\nInputs: {inputs_display}\nResult: {result.interpretation}"
+                    'formatted_output': f"{calculator.name}\nInputs: {inputs_display}\nResult: {result.interpretation}",
+                    'cache_hit': result.metadata.get('cache_hit', False)
                 }
 
                 calculator_results.append(calc_result)
@@ -814,6 +1134,7 @@ async def generate_stage2_agent(
         ambient_transcript = None  # TODO: Add ambient_transcript field to FinalNoteRequest schema
 
         # Build Stage 2 note with user-selected model
+        stage2_metadata = {}
         complete_note = build_stage2_note(
             stage1_note=request.preliminary_note,
             gu_notes=gu_notes,
@@ -823,7 +1144,8 @@ async def generate_stage2_agent(
             model=user_model,
             note_type=request.note_type,
             patient_name=request.patient_name,
-            ssn_last4=request.ssn_last4
+            ssn_last4=request.ssn_last4,
+            metadata=stage2_metadata
         )
 
         logger.info("Stage 2 agent-based note generation complete")
@@ -841,7 +1163,9 @@ async def generate_stage2_agent(
                 'rag_enabled': request.use_rag,
                 'rag_sources_count': len(rag_sources),
                 'gu_notes_found': len(gu_notes),
-                'workflow': 'stage2_agent_based'
+                'workflow': 'stage2_agent_based',
+                'verification': stage2_metadata.get('verification'),
+                'profile': stage2_metadata.get('profile')
             }
         )
 
@@ -868,6 +1192,11 @@ async def generate_ambient_augmented_note(
     Takes a Stage 2 note and ambient transcription, performs intelligent
     section-aware merging to update the note with discussion details.
 
+    Pass metadata.merge_id from the previous response to merge a growing
+    transcription incrementally: only sentences completed since that request
+    are parsed and merged (same user and Stage 2 note; the session expires
+    after NOTE_SESSION_TTL_MINUTES).
+
     **Workflow:**
     1. Parse transcription into section-specific segments
     2. Intelligently merge each segment into appropriate section
@@ -879,12 +1208,13 @@ async def generate_ambient_augmented_note(
     {
         "stage2_note": "Complete Stage 2 note text",
         "transcription": "Ambient listening transcription",
-        "speaker_map": {"speaker_0": "Clinician", "speaker_1": "Patient"}
+        "speaker_map": {"speaker_0": "Clinician", "speaker_1": "Patient"},
+        "merge_id": "optional id from the previous response"
     }
     ```
     """
     from app.schemas.notes import FinalNoteResponse
-    from app.services.ambient_merge_service import IntelligentNoteMerger
+    from app.services.ambient_merge_service import AmbientMergeSession, get_ambient_merge_store
 
     try:
         logger.info(f"User {current_user.id if current_user else 'anonymous'} requesting Stage 3 ambient-augmented note")
@@ -905,13 +1235,18 @@ async def generate_ambient_augmented_note(
                 detail="transcription is required"
             )
 
-        # Step 1: Perform intelligent merge
-        merger = IntelligentNoteMerger()
-        merged_note = merger.merge(
-            existing_note=stage2_note,
-            transcription=transcription,
-            speaker_map=speaker_map
-        )
+        # Step 1: Perform intelligent merge, continuing this encounter's
+        # session so only new sentences are parsed
+        store = get_ambient_merge_store()
+        merge_id = request.get('merge_id')
+        session = store.get(current_user.user_id, merge_id) if merge_id else None
+        incremental = session is not None and session.stage2_note == stage2_note
+        if not incremental:
+            session = AmbientMergeSession(stage2_note)
+            merge_id = None
+
+        merged_note = session.update(transcription, speaker_map)
+        merge_id = store.put(current_user.user_id, session, merge_id)
 
         logger.info(f"Stage 3 ambient-augmented note generated: {len(merged_note)} chars")
 
@@ -922,7 +1257,9 @@ async def generate_ambient_augmented_note(
             metadata={
                 'workflow': 'stage3_ambient_augmented',
                 'transcription_length': len(transcription),
-                'segments_merged': 'see logs'
+                'segments_merged': 'see logs',
+                'merge_id': merge_id,
+                'incremental': incremental
             }
         )
 
@@ -126,6 +126,58 @@ class Settings(BaseSettings):
     NOTE_SESSION_TTL_MINUTES: int = 30
     MAX_NOTE_LENGTH: int = 10000
 
+    # Note Extraction Cache (per-note extractor results, encrypted at rest)
+    NOTE_EXTRACTION_CACHE_ENABLED: bool = True
+    NOTE_EXTRACTION_CACHE_PATH: str = "./data/cache/note_extractions.db"
+    NOTE_EXTRACTION_CACHE_KEY: Optional[str] = None  # Fernet key; memory-only cache if unset
+    NOTE_EXTRACTION_CACHE_MAX_ENTRIES: int = 5000
+    NOTE_EXTRACTION_CACHE_MAX_MB: int = 256
+
+    # Streaming Stage 1 upload (chunked clinical_input)
+    NOTE_STREAM_MAX_MB: int = 64
+    NOTE_STREAM_EXTRACTION_WORKERS: int = 4
+
+    # Calculator batch API (/calculators/batch/calculate/stream)
+    CALCULATOR_BATCH_WORKERS: int = 4
+    CALCULATOR_BATCH_USE_PROCESSES: bool = False  # True = process pool (multi-core, higher per-item overhead)
+    CALCULATOR_BATCH_MAX_ITEMS: int = 10000
+    CALCULATOR_BATCH_ITEM_TIMEOUT_SECONDS: float = 5.0
+
+    # Calculator result cache (ClinicalCalculator.run; in-memory LRU, optional shared Redis level)
+    CALCULATOR_RESULT_CACHE_ENABLED: bool = True
+    CALCULATOR_RESULT_CACHE_MAX_ENTRIES: int = 10000
+    CALCULATOR_RESULT_CACHE_USE_REDIS: bool = False  # Share results across workers (network round trip per miss)
+    CALCULATOR_RESULT_CACHE_TTL: int = 3600  # Seconds; Redis entries only
+    CALCULATOR_STATS_FLUSH_SECONDS: int = 60  # How often hit rates are written to calculator_stats
+
+    # Calculator sensitivity analysis (/calculators/{id}/sensitivity)
+    CALCULATOR_SENSITIVITY_MAX_SAMPLES: int = 20000
+
+    # Ambient listening (/ambient/stream; Whisper runs off the event loop)
+    AMBIENT_SPEECH_BACKEND: str = "auto"  # auto (fastest installed), faster-whisper, whisper, stub
+    AMBIENT_MODEL_SIZE: str = "medium.en"  # Stepped down automatically when "auto" cannot keep up
+    AMBIENT_DEVICE: str = "auto"  # auto, cpu, cuda
+    AMBIENT_COMPUTE_TYPE: str = "int8"  # faster-whisper weights on CPU (int8, int8_float32, float32)
+    AMBIENT_CPU_THREADS: int = 0  # faster-whisper threads per worker; 0 = library default
+    AMBIENT_MAX_RTF: float = 1.0  # Real-time factor the selected backend must stay below
+    AMBIENT_PRELOAD_MODEL: bool = False  # Load the backend at startup; enable only on the worker(s) serving ambient sessions
+    AMBIENT_STUB_RTF: float = 0.0  # Simulated inference time of the stub backend (load tests, CI)
+    AMBIENT_TRANSCRIPTION_WORKERS: int = 1  # Each worker runs one inference at a time on the shared model
+    AMBIENT_DIARIZATION_WORKERS: int = 1  # Separate pyannote pool; never takes transcription workers
+    AMBIENT_BATCH_MAX_SIZE: int = 8  # Chunks from different sessions decoded together; 1 disables batching
+    AMBIENT_BATCH_WINDOW_MS: int = 50  # Longest an idle worker waits for a batch to fill
+    AMBIENT_SESSION_QUEUE_CHUNKS: int = 4  # Per-session backlog; the oldest chunk is dropped when full
+    AMBIENT_MAX_LAG_SECONDS: float = 10.0  # Chunks older than this are dropped instead of transcribed
+    AMBIENT_RING_BUFFER_SECONDS: float = 60.0  # Audio held per stream (at least diarization window + max lag + longest utterance)
+    AMBIENT_VAD_PAUSE_MS: int = 500  # Silence that ends an utterance
+    AMBIENT_MAX_UTTERANCE_SECONDS: float = 15.0  # Longer speech is cut here
+    AMBIENT_PARTIAL_SECONDS: float = 1.5  # Partial transcript interval while speaking; 0 disables
+    AMBIENT_SPEAKER_SIMILARITY: float = 0.3  # Cosine similarity to an existing speaker's centroid to reuse its label
+    AMBIENT_MAX_SPEAKERS: int = 4  # Speakers tracked per session
+    AMBIENT_ENTITY_LLM_INTERVAL_SECONDS: float = 30.0  # Minimum time between LLM entity passes per session
+    AMBIENT_ENTITY_DEBOUNCE_SECONDS: float = 3.0  # Pause in speech that triggers the LLM pass
+    AMBIENT_ENTITY_WINDOW_CHARS: int = 4000  # Rolling transcript given to the LLM pass
+
     # Celery Configuration (REQUIRED for async task processing)
     CELERY_BROKER_URL: Optional[str] = None  # Must be set in .env
     CELERY_RESULT_BACKEND: Optional[str] = None  # Must be set in .env
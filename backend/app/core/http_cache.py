@@ -0,0 +1,71 @@
+"""
+HTTP caching utilities for precomputed JSON responses
+Serves immutable payloads from pre-serialized bytes with strong ETags
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from fastapi import Request, Response, status
+
+
+@dataclass(frozen=True)
+class PrecomputedJSON:
+    """A JSON body serialized once, with its ETag."""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "PrecomputedJSON":
+        """Serialize a JSON-compatible payload (Pydantic models are dumped first)."""
+        if hasattr(payload, "model_dump_json"):
+            body = payload.model_dump_json().encode("utf-8")
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return cls(body=body, etag=etag)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header lists the ETag (or '*')."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def precomputed_response(request: Request, payload: PrecomputedJSON) -> Response:
+    """
+    Return the precomputed body, or 304 Not Modified if the client has it.
+
+    Responses are private (the API requires authentication) and must be
+    revalidated, which costs the client one round trip and no body.
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+class PrecomputedJSONCache:
+    """
+    Lazily built, never invalidated cache of JSON responses.
+
+    Only for payloads that are fixed for the life of the process
+    (e.g. the calculator catalog).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, PrecomputedJSON] = {}
+
+    def get(self, key: str, build: Callable[[], Any]) -> PrecomputedJSON:
+        """Get the cached response for key, serializing build() on first use."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = PrecomputedJSON.from_payload(build())
+            self._entries[key] = entry
+        return entry
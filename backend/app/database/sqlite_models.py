@@ -4,7 +4,7 @@ Stores user settings, session metadata, and audit logs (NO PHI)
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, JSON, Index
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -202,8 +202,16 @@ class CalculatorStats(Base):
 
     # Statistics
     usage_count = Column(Integer, nullable=False, default=0)
-    avg_computation_time_ms = Column(Integer, nullable=True)
+    avg_computation_time_ms = Column(Float, nullable=True)  # Calculated (uncached) runs only; sub-millisecond
+    cache_hits = Column(Integer, nullable=False, default=0)
+    cache_misses = Column(Integer, nullable=False, default=0)
 
     __table_args__ = (
         Index('ix_calculator_stats_calc_date', 'calculator_id', 'usage_date', unique=True),
     )
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of runs served from the calculator result cache."""
+        lookups = (self.cache_hits or 0) + (self.cache_misses or 0)
+        return (self.cache_hits or 0) / lookups if lookups else 0.0
@@ -16,12 +16,15 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import logging
 import time
 
 from app.config import settings
 from app.database.sqlite_session import init_db, close_db
-from app.api.v1 import auth, notes, calculators, settings as settings_api, health, rag, llm, documents
+from app.api.v1 import auth, notes, calculators, settings as settings_api, health, rag, llm, documents, ambient
+from app.services.calculator_cache import configure_calculator_cache, run_stats_flusher
+from app.services.ambient import preload_speech_backend, shutdown_transcription_executor
 from database.neo4j_client import Neo4jClient, Neo4jConfig
 import redis
 
@@ -85,6 +88,18 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Redis connection failed: {e} - Caching will be disabled")
         app.state.redis = None
 
+    # Calculator result cache (memory, plus Redis when connected) and hit-rate stats
+    app.state.calculator_stats_flusher = None
+    if configure_calculator_cache(app.state.redis) is not None:
+        app.state.calculator_stats_flusher = asyncio.create_task(run_stats_flusher())
+
+    # Select and load the ambient speech backend in the background instead of
+    # inside the first exam room's connection. Opt-in: each worker process
+    # would otherwise benchmark and load every backend
+    app.state.speech_backend_loader = None
+    if settings.AMBIENT_PRELOAD_MODEL:
+        app.state.speech_backend_loader = asyncio.create_task(preload_speech_backend())
+
     # Verify Ollama availability (optional but recommended)
     try:
         import aiohttp
@@ -117,6 +132,19 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error closing Neo4j connection: {e}")
 
+    # Write pending calculator stats
+    if getattr(app.state, 'calculator_stats_flusher', None) is not None:
+        app.state.calculator_stats_flusher.cancel()
+        try:
+            await app.state.calculator_stats_flusher
+        except asyncio.CancelledError:
+            pass
+
+    # Stop the ambient transcription pool
+    if getattr(app.state, 'speech_backend_loader', None) is not None:
+        app.state.speech_backend_loader.cancel()
+    shutdown_transcription_executor()
+
     # Close Redis connection
     if hasattr(app.state, 'redis'):
         try:
@@ -235,6 +263,15 @@ app.include_router(rag.router, prefix="/api/v1/rag", tags=["RAG"])
 app.include_router(llm.router, prefix="/api/v1/llm", tags=["LLM"])
 app.include_router(settings_api.router, prefix="/api/v1/settings", tags=["Settings"])
 app.include_router(documents.router, prefix="/api/v1", tags=["Documents"])
+app.include_router(ambient.router, prefix="/api/v1/ambient", tags=["Ambient"])
+
+# Prometheus metrics (note pipeline stage histograms, etc.)
+if settings.ENABLE_PROMETHEUS:
+    try:
+        from prometheus_client import make_asgi_app
+        app.mount("/metrics", make_asgi_app())
+    except ImportError:
+        logger.warning("prometheus_client not installed - /metrics disabled")
 
 
 @app.get("/")
@@ -63,6 +63,56 @@ class CalculatorResponse(BaseModel):
         }
 
 
+class SensitivityRequest(BaseModel):
+    """Request schema for calculator sensitivity analysis."""
+    inputs: Dict[str, Any] = Field(..., description="The patient's calculator input values")
+    perturbations: Dict[str, Dict[str, Any]] = Field(
+        ...,
+        description="Input field -> {low, high} | {mean, sd} | {values, weights} | {probability}"
+    )
+    samples: int = Field(default=2000, ge=1, description="Number of Monte Carlo samples")
+    output: Optional[str] = Field(
+        default=None,
+        description="Score to analyze (defaults to the calculator's primary score)"
+    )
+    seed: Optional[int] = Field(default=0, description="Random seed (null for a fresh draw)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "inputs": {"age": 65, "psa": 6.5, "dre_abnormal": False, "african_american": False,
+                           "family_history": True, "prior_negative_biopsy": False},
+                "perturbations": {"psa": {"low": 6.1, "high": 6.5}, "dre_abnormal": {"probability": 0.5}},
+                "samples": 2000
+            }
+        }
+
+
+class SensitivityResponse(BaseModel):
+    """Response schema for calculator sensitivity analysis."""
+    calculator_id: str = Field(..., description="Calculator identifier")
+    output: str = Field(..., description="Score analyzed")
+    baseline: Any = Field(..., description="Score at the unperturbed inputs")
+    samples: int = Field(..., description="Number of perturbed samples scored")
+    distribution: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Mean, sd, min, max, percentiles and histogram of the score"
+    )
+    categories: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="Share of samples per category label"
+    )
+    tornado: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Score at each end of every input's range, largest swing first"
+    )
+    elasticities: Dict[str, Optional[float]] = Field(
+        default_factory=dict,
+        description="Relative change of the score per relative change of each numeric input"
+    )
+    elapsed_ms: float = Field(..., description="Analysis time")
+
+
 class CalculatorInfo(BaseModel):
     """Schema for calculator information."""
     id: str
@@ -135,3 +185,42 @@ class CalculatorListResponse(BaseModel):
                 "total": 44
             }
         }
+
+
+class BatchCalculatorItem(BaseModel):
+    """One calculator request within a batch."""
+    calculator_id: str = Field(..., description="Calculator identifier")
+    inputs: Dict[str, Any] = Field(default_factory=dict, description="Calculator input values")
+
+
+class BatchCalculateRequest(BaseModel):
+    """Request schema for the streaming batch endpoint."""
+    items: List[BatchCalculatorItem] = Field(..., description="Calculator requests")
+    include_formatted_output: bool = Field(
+        default=False,
+        description="Include format_output() text for each result"
+    )
+    include_recommendations: bool = Field(
+        default=True,
+        description="Include clinical recommendations for each result"
+    )
+    item_timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=60,
+        description="Per-item timeout (defaults to server setting)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"calculator_id": "capracalculator", "inputs": {"psa": 8.5, "gleason_primary": 3,
+                                                                    "gleason_secondary": 4, "t_stage": "T1c",
+                                                                    "percent_positive_cores": 25}},
+                    {"calculator_id": "rcricalculator", "inputs": {"risk_factors_count": 2}}
+                ],
+                "include_formatted_output": False,
+                "include_recommendations": True
+            }
+        }
@@ -188,6 +188,10 @@ class InitialNoteRequest(BaseModel):
         default=True,
         description="Enable RAG (Retrieval-Augmented Generation)"
     )
+    auto_run_calculators: bool = Field(
+        default=False,
+        description="Run every calculator whose required inputs were all detected and return the results"
+    )
 
     class Config:
         json_schema_extra = {
@@ -200,6 +204,41 @@ class InitialNoteRequest(BaseModel):
         }
 
 
+class InitialNoteRebuildRequest(BaseModel):
+    """Request schema for Stage 1 incremental rebuild after new data is added."""
+    build_id: str = Field(
+        ...,
+        description="build_id from the metadata of a previous Stage 1 response"
+    )
+    appended_text: Optional[str] = Field(
+        default=None,
+        description="New text pasted after the previous input (e.g. a lab panel)",
+        min_length=1
+    )
+    clinical_input: Optional[str] = Field(
+        default=None,
+        description="Full replacement input, when earlier text was edited rather than appended",
+        min_length=10
+    )
+    note_type: str = Field(
+        default="urology_clinic",
+        description="Type of note to generate",
+        pattern="^(urology_clinic|urology_consult)$"
+    )
+    auto_run_calculators: bool = Field(
+        default=False,
+        description="Run every calculator whose required inputs were all detected and return the results"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "build_id": "3f2b9c0e8d4a4b1f9e6c2a7d5b8e1f04",
+                "appended_text": "LAB RESULTS 01/20/2025\nPSA 9.1 ng/mL\nCreatinine 1.1 mg/dL"
+            }
+        }
+
+
 class InitialNoteResponse(BaseModel):
     """Response schema for Stage 1: Initial note with calculator suggestions."""
     preliminary_note: str = Field(..., description="Organized note WITHOUT assessment/plan")
@@ -211,6 +250,10 @@ class InitialNoteResponse(BaseModel):
         default_factory=list,
         description="Calculators suggested based on detected entities"
     )
+    calculator_results: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Results of auto-selected calculators (only with auto_run_calculators)"
+    )
     metadata: Dict[str, Any] = Field(
         default_factory=dict,
         description="Generation metadata"
@@ -230,16 +273,17 @@ class InitialNoteResponse(BaseModel):
                 ],
                 "suggested_calculators": [
                     {
-                        "calculator_id": "capra_score",
+                        "calculator_id": "capracalculator",
                         "calculator_name": "CAPRA Score",
-                        "category": "prostate",
-                        "confidence": "high",
-                        "auto_selected": True,
-                        "reason": "All required inputs detected",
-                        "required_inputs": ["psa", "age", "gleason_primary", "gleason_secondary", "clinical_stage", "percent_positive_cores"],
-                        "available_inputs": ["psa", "age", "gleason_primary", "gleason_secondary", "percent_positive_cores"],
-                        "missing_inputs": ["clinical_stage"],
-                        "detected_entities": {"psa": 8.5, "age": 72}
+                        "category": "prostate_cancer",
+                        "confidence": "medium",
+                        "auto_selected": False,
+                        "reason": "Missing 1 required input(s)",
+                        "required_inputs": ["psa", "gleason_primary", "gleason_secondary", "t_stage", "percent_positive_cores"],
+                        "available_inputs": ["psa", "gleason_primary", "gleason_secondary", "percent_positive_cores"],
+                        "missing_inputs": ["t_stage"],
+                        "detected_entities": {"psa": 8.5, "gleason_primary": 3, "gleason_secondary": 4,
+                                              "percent_positive_cores": 33.0}
                     }
                 ],
                 "metadata": {
@@ -298,9 +342,9 @@ class FinalNoteRequest(BaseModel):
             "example": {
                 "preliminary_note": "CHIEF COMPLAINT: Elevated PSA...",
                 "clinical_input": "72 yo male with PSA 8.5...",
-                "selected_calculators": ["capra_score", "nccn_risk"],
+                "selected_calculators": ["capracalculator", "nccnriskcalculator"],
                 "additional_inputs": {
-                    "clinical_stage": "T1c",
+                    "t_stage": "T1c",
                     "family_history": False
                 },
                 "use_rag": True,
@@ -331,7 +375,7 @@ class FinalNoteResponse(BaseModel):
                 "final_note": "CLINIC NOTE - Urology\n\n[CC, HPI, Exam...]\n\nASSESSMENT & PLAN:\n1. Prostate Adenocarcinoma...",
                 "calculator_results": [
                     {
-                        "calculator_id": "capra_score",
+                        "calculator_id": "capracalculator",
                         "calculator_name": "CAPRA Score",
                         "result": {"score": 4, "risk_level": "Intermediate"},
                         "interpretation": "CAPRA Score 4/10: Intermediate risk",
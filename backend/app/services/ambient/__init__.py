@@ -0,0 +1,39 @@
+"""
+Ambient listening services: speech models and the transcription executor
+behind the /ambient/stream WebSocket.
+"""
+
+from app.services.ambient.backends import SpeechBackend, get_speech_backend
+from app.services.ambient.entities import AmbientEntityTracker
+from app.services.ambient.diarizer import IncrementalDiarizer, SpeakerTurn
+from app.services.ambient.executor import (
+    AudioChunk,
+    DiarizationExecutor,
+    TranscriptionExecutor,
+    TranscriptionSession,
+    get_diarization_executor,
+    get_transcription_executor,
+    preload_speech_backend,
+    shutdown_transcription_executor,
+)
+from app.services.ambient.ring_buffer import PCMRingBuffer
+from app.services.ambient.segmenter import SpeechSegment, UtteranceSegmenter
+
+__all__ = [
+    "AmbientEntityTracker",
+    "AudioChunk",
+    "DiarizationExecutor",
+    "IncrementalDiarizer",
+    "PCMRingBuffer",
+    "SpeechBackend",
+    "SpeakerTurn",
+    "SpeechSegment",
+    "TranscriptionExecutor",
+    "TranscriptionSession",
+    "UtteranceSegmenter",
+    "get_diarization_executor",
+    "get_speech_backend",
+    "get_transcription_executor",
+    "preload_speech_backend",
+    "shutdown_transcription_executor",
+]
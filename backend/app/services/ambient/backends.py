@@ -0,0 +1,442 @@
+"""
+Speech-to-text backends for ambient listening.
+
+- whisper: openai-whisper (PyTorch); fp16 on GPU, fp32 on CPU
+- faster-whisper: CTranslate2 with int8 weights on CPU (float16 on GPU);
+  several times faster than openai-whisper on CPU-only exam-room boxes
+- stub: no model; fixed text at a configurable real-time factor, for tests
+  and load tests
+
+AMBIENT_SPEECH_BACKEND=auto measures the real-time factor (RTF: seconds of
+compute per second of audio) of every installed backend at the configured
+model size and keeps the fastest; the others are unloaded. If none stays
+under AMBIENT_MAX_RTF the model size is stepped down until one does. The
+selection runs once per process, on first use (or at startup with
+AMBIENT_PRELOAD_MODEL).
+
+All backends take mono float32 audio at 16 kHz and return
+{"text", "confidence", "language", "segments"}. transcribe_batch() decodes
+chunks from several sessions together; faster-whisper runs them through the
+encoder and decoder as one batch, other backends one by one.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Whisper's encoder input
+
+# Model sizes, largest first; English-only (".en") variants exist below large
+MODEL_SIZES = ["large-v3", "large-v2", "medium", "small", "base", "tiny"]
+
+
+class SpeechBackend(ABC):
+    """Abstract speech-to-text backend."""
+
+    name: str = ""
+    package: Optional[str] = None  # Import needed for the backend to be available
+
+    def __init__(self, model_size: Optional[str] = None, device: Optional[str] = None):
+        self.model_size = model_size or settings.AMBIENT_MODEL_SIZE
+        self.device = resolve_device(device or settings.AMBIENT_DEVICE)
+        self.model = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the backend's package is installed."""
+        if cls.package is None:
+            return True
+        try:
+            __import__(cls.package)
+            return True
+        except ImportError:
+            return False
+
+    @abstractmethod
+    def load(self) -> None:
+        """Load model weights (blocking)."""
+        pass
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, prompt: Optional[str] = None) -> dict:
+        """
+        Transcribe float32 16 kHz audio (blocking).
+
+        Args:
+            audio: Mono samples in [-1, 1]
+            prompt: Preceding transcript, for continuity across chunks
+        """
+        pass
+
+    def unload(self) -> None:
+        """Drop the model weights (a backend that lost selection)."""
+        self.model = None
+
+    def transcribe_batch(self, audios: List[np.ndarray], prompts: List[Optional[str]]) -> List[dict]:
+        """
+        Transcribe several independent chunks (blocking).
+
+        The default runs them one after another; backends that can batch
+        inference override this.
+        """
+        return [self.transcribe(audio, prompt=prompt) for audio, prompt in zip(audios, prompts)]
+
+    @property
+    def description(self) -> str:
+        return f"{self.name} {self.model_size} on {self.device}"
+
+
+class WhisperBackend(SpeechBackend):
+    """openai-whisper."""
+
+    name = "whisper"
+    package = "whisper"
+
+    def load(self) -> None:
+        import whisper
+        logger.info(f"Loading Whisper model ({self.model_size}, {self.device})...")
+        self.model = whisper.load_model(self.model_size, device=self.device)
+        logger.info("Whisper model loaded successfully")
+
+    def unload(self) -> None:
+        super().unload()
+        if self.device == "cuda":
+            import torch
+            torch.cuda.empty_cache()  # Return the weights' GPU memory
+
+    def transcribe(self, audio: np.ndarray, prompt: Optional[str] = None) -> dict:
+        result = self.model.transcribe(
+            audio,
+            language='en',
+            task='transcribe',
+            fp16=self.device == "cuda",  # fp32 on CPU
+            word_timestamps=True,
+            temperature=0.0,  # Deterministic
+            initial_prompt=prompt
+        )
+
+        # Calculate confidence from word-level probabilities
+        confidences = [
+            word['probability']
+            for segment in result.get('segments', [])
+            for word in segment.get('words', [])
+            if 'probability' in word
+        ]
+
+        return {
+            'text': result.get('text', ''),
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'language': result.get('language', 'en'),
+            'segments': result.get('segments', [])
+        }
+
+
+class FasterWhisperBackend(SpeechBackend):
+    """faster-whisper (CTranslate2), int8-quantized on CPU."""
+
+    name = "faster-whisper"
+    package = "faster_whisper"
+
+    def load(self) -> None:
+        from faster_whisper import WhisperModel
+
+        compute_type = settings.AMBIENT_COMPUTE_TYPE if self.device == "cpu" else "float16"
+        logger.info(f"Loading faster-whisper model ({self.model_size}, {self.device}, {compute_type})...")
+        self.model = WhisperModel(
+            self.model_size,
+            device=self.device,
+            compute_type=compute_type,
+            cpu_threads=settings.AMBIENT_CPU_THREADS
+        )
+        logger.info("faster-whisper model loaded successfully")
+
+    def transcribe(self, audio: np.ndarray, prompt: Optional[str] = None) -> dict:
+        segments_iter, info = self.model.transcribe(
+            audio,
+            language='en',
+            task='transcribe',
+            beam_size=1,  # Greedy, like temperature 0 in openai-whisper
+            temperature=0.0,
+            word_timestamps=True,
+            initial_prompt=prompt,
+            condition_on_previous_text=False
+        )
+
+        segments = []
+        confidences = []
+        for segment in segments_iter:
+            words = [
+                {'word': word.word, 'start': word.start, 'end': word.end, 'probability': word.probability}
+                for word in (segment.words or [])
+            ]
+            confidences.extend(word['probability'] for word in words)
+            segments.append({'start': segment.start, 'end': segment.end, 'text': segment.text, 'words': words})
+
+        return {
+            'text': "".join(segment['text'] for segment in segments),
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'language': info.language,
+            'segments': segments
+        }
+
+    def transcribe_batch(self, audios: List[np.ndarray], prompts: List[Optional[str]]) -> List[dict]:
+        """
+        One encoder pass and one greedy decode for the whole batch.
+
+        Each chunk is padded to Whisper's 30 s window and keeps its own
+        prompt. Word timestamps are not computed in this path; chunks longer
+        than one window are transcribed on their own.
+        """
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+
+        batch = [index for index, audio in enumerate(audios) if audio.size <= WINDOW_SAMPLES]
+        if len(batch) < 2:
+            return super().transcribe_batch(audios, prompts)
+
+        results: List[Optional[dict]] = [None] * len(audios)
+        for index, audio in enumerate(audios):
+            if audio.size > WINDOW_SAMPLES:
+                results[index] = self.transcribe(audio, prompt=prompts[index])
+
+        tokenizer = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                              task='transcribe', language='en')
+        features = np.stack([pad_or_trim(self.model.feature_extractor(audios[index])) for index in batch])
+        encoder_output = self.model.encode(features)
+        decoder_prompts = [
+            self.model.get_prompt(
+                tokenizer,
+                tokenizer.encode(" " + prompts[index].strip()) if prompts[index] else [],
+                without_timestamps=True
+            )
+            for index in batch
+        ]
+        generated = self.model.model.generate(
+            encoder_output, decoder_prompts, beam_size=1, return_scores=True, max_length=448, suppress_blank=True
+        )
+
+        for index, output in zip(batch, generated):
+            text = tokenizer.decode([token for token in output.sequences_ids[0] if token < tokenizer.eot])
+            results[index] = {
+                'text': text,
+                # Length-normalized log probability -> mean token probability
+                'confidence': float(np.exp(output.scores[0])) if output.scores else 0.0,
+                'language': 'en',
+                'segments': [{'start': 0.0, 'end': audios[index].size / SAMPLE_RATE, 'text': text, 'words': []}]
+            }
+        return results
+
+
+class StubBackend(SpeechBackend):
+    """
+    No model: takes `rtf` seconds per second of audio (AMBIENT_STUB_RTF) and
+    returns `text`, or a placeholder naming the audio length when unset.
+    """
+
+    name = "stub"
+
+    def __init__(self, model_size: Optional[str] = None, device: Optional[str] = None,
+                 rtf: Optional[float] = None, text: Optional[str] = None):
+        super().__init__(model_size or "stub", device or "cpu")
+        self.rtf = rtf if rtf is not None else settings.AMBIENT_STUB_RTF
+        self.text = text
+
+    def load(self) -> None:
+        self.model = self
+
+    def transcribe(self, audio: np.ndarray, prompt: Optional[str] = None) -> dict:
+        if self.rtf:
+            time.sleep(audio.size / SAMPLE_RATE * self.rtf)
+        return self._result(audio)
+
+    def transcribe_batch(self, audios: List[np.ndarray], prompts: List[Optional[str]]) -> List[dict]:
+        # Like a batched model: chunks are padded to the longest and run together
+        if self.rtf and audios:
+            time.sleep(max(audio.size for audio in audios) / SAMPLE_RATE * self.rtf)
+        return [self._result(audio) for audio in audios]
+
+    def _result(self, audio: np.ndarray) -> dict:
+        seconds = audio.size / SAMPLE_RATE
+        text = self.text if self.text is not None else f"[{seconds:.1f} s of speech]"
+        return {
+            'text': text,
+            'confidence': 1.0 if text else 0.0,
+            'language': 'en',
+            'segments': [{'start': 0.0, 'end': seconds, 'text': text, 'words': []}] if text else []
+        }
+
+
+BACKENDS: Dict[str, Type[SpeechBackend]] = {
+    backend.name: backend for backend in (FasterWhisperBackend, WhisperBackend, StubBackend)
+}
+
+
+def resolve_device(device: str) -> str:
+    """Map "auto" to "cuda" when a GPU is visible, else "cpu"."""
+    if device != "auto":
+        return device
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        pass
+    try:
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def create_backend(name: str, model_size: Optional[str] = None, device: Optional[str] = None) -> SpeechBackend:
+    """Instantiate (but do not load) a backend by name."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown speech backend: {name} (choose from {', '.join(BACKENDS)})")
+    return backend_class(model_size, device)
+
+
+def benchmark_audio(seconds: float = 10.0, seed: int = 0) -> np.ndarray:
+    """Speech-like synthetic audio (voiced harmonics in syllable bursts) for RTF runs."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = (np.sin(2 * np.pi * 4 * t) > -0.3).astype(np.float64)
+    audio = 0.1 * voiced * syllables + rng.normal(0, 0.003, t.size)
+    return audio.astype(np.float32)
+
+
+def measure_rtf(backend: SpeechBackend, audio: Optional[np.ndarray] = None, runs: int = 2) -> float:
+    """
+    Real-time factor of a loaded backend (best of `runs` after a warm-up).
+
+    Below 1.0 the backend transcribes faster than audio arrives.
+    """
+    audio = benchmark_audio() if audio is None else audio
+    backend.transcribe(audio[:SAMPLE_RATE])  # Warm-up
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        backend.transcribe(audio)
+        best = min(best, time.perf_counter() - start)
+    return best / (audio.size / SAMPLE_RATE)
+
+
+def smaller_sizes(model_size: str) -> List[str]:
+    """Known model sizes smaller than `model_size` (largest first), keeping ".en" if set."""
+    english = model_size.endswith(".en")
+    base = model_size[:-3] if english else model_size
+    if base not in MODEL_SIZES:
+        return []
+    smaller = [size for size in MODEL_SIZES[MODEL_SIZES.index(base) + 1:] if not size.startswith("large")]
+    return [f"{size}.en" if english else size for size in smaller]
+
+
+def select_backend(
+    candidates: Optional[List[str]] = None,
+    model_size: Optional[str] = None,
+    max_rtf: Optional[float] = None,
+    audio: Optional[np.ndarray] = None
+) -> SpeechBackend:
+    """
+    Load the fastest installed backend that keeps up with real time.
+
+    Every candidate is loaded and timed at `model_size`; the fastest is kept
+    and the others are unloaded as soon as they lose. If even that one has
+    an RTF at or above `max_rtf`, it is retried with smaller model sizes,
+    and the smallest that loads is used as a last resort.
+
+    Raises:
+        ImportError: If no candidate backend is installed
+    """
+    candidates = candidates or [name for name in BACKENDS if name != "stub"]
+    model_size = model_size or settings.AMBIENT_MODEL_SIZE
+    max_rtf = max_rtf if max_rtf is not None else settings.AMBIENT_MAX_RTF
+    installed = [name for name in candidates if BACKENDS[name].available()]
+    if not installed:
+        raise ImportError(
+            f"No speech backend installed (tried {', '.join(candidates)}). "
+            "Install with: pip install faster-whisper"
+        )
+
+    fastest, fastest_rtf = None, float("inf")
+    for name in installed:
+        backend = create_backend(name, model_size)
+        try:
+            backend.load()
+            rtf = measure_rtf(backend, audio)
+        except Exception as e:
+            logger.warning(f"Speech backend {backend.description} unavailable: {e}")
+            backend.unload()
+            continue
+        logger.info(f"Speech backend {backend.description}: RTF {rtf:.2f}")
+        if rtf < fastest_rtf:
+            if fastest is not None:
+                fastest.unload()
+            fastest, fastest_rtf = backend, rtf
+        else:
+            backend.unload()
+
+    if fastest is None:
+        raise ImportError(f"No speech backend could be loaded (tried {', '.join(installed)})")
+
+    for smaller in smaller_sizes(model_size):
+        if fastest_rtf < max_rtf:
+            break
+        backend = create_backend(fastest.name, smaller)
+        try:
+            backend.load()
+            rtf = measure_rtf(backend, audio)
+        except Exception as e:
+            # Keep the model that works; a smaller one may still load
+            logger.warning(f"Speech backend {backend.description} unavailable: {e}")
+            backend.unload()
+            continue
+        logger.warning(
+            f"{fastest.description} cannot keep up with real time (RTF {fastest_rtf:.2f}); "
+            f"{backend.description}: RTF {rtf:.2f}"
+        )
+        fastest.unload()
+        fastest, fastest_rtf = backend, rtf
+
+    if fastest_rtf >= max_rtf:
+        logger.warning(f"No speech backend keeps up with real time; using {fastest.description} (RTF {fastest_rtf:.2f})")
+    logger.info(f"Using speech backend {fastest.description} (RTF {fastest_rtf:.2f})")
+    return fastest
+
+
+# Process-wide backend (loaded on first use or at startup, see preload_speech_backend)
+_speech_backend: Optional[SpeechBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_speech_backend() -> SpeechBackend:
+    """Get or load the backend configured by AMBIENT_SPEECH_BACKEND."""
+    global _speech_backend
+
+    with _backend_lock:
+        if _speech_backend is None:
+            if settings.AMBIENT_SPEECH_BACKEND == "auto":
+                _speech_backend = select_backend()
+            else:
+                backend = create_backend(settings.AMBIENT_SPEECH_BACKEND)
+                try:
+                    backend.load()
+                except ImportError:
+                    logger.error(f"Speech backend {backend.name} not installed")
+                    raise
+                _speech_backend = backend
+
+    return _speech_backend
@@ -0,0 +1,188 @@
+"""
+Incremental speaker diarization for ambient streams.
+
+pyannote diarizes each 30 s window on its own, so its labels (SPEAKER_00,
+SPEAKER_01, ...) are local to the window. The IncrementalDiarizer keeps a
+running centroid embedding per speaker for the session and maps each
+window's speakers onto them:
+
+- The pipeline returns one embedding per local speaker (no extra embedding
+  pass); each is matched to the most similar session centroid by cosine
+  similarity, one-to-one within a window
+- A local speaker below AMBIENT_SPEAKER_SIMILARITY to every centroid becomes
+  a new session speaker, up to AMBIENT_MAX_SPEAKERS
+- Matched centroids are updated as a running mean weighted by speech time
+
+Per-window cost is bounded (window length x at most AMBIENT_MAX_SPEAKERS
+centroids); nothing grows with the length of the encounter.
+
+Transcript words are aligned to speaker turns with a sweep line over both
+time-ordered lists: O(n + m) for the usual non-overlapping turns, instead
+of comparing every word with every turn.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class SpeakerTurn:
+    """One speaker's turn, in seconds from the start of the stream."""
+    speaker: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class IncrementalDiarizer:
+    """Session-wide speaker identities built from per-window diarization."""
+
+    def __init__(self, similarity: Optional[float] = None, max_speakers: Optional[int] = None):
+        """
+        Args:
+            similarity: Cosine similarity needed to reuse a speaker (AMBIENT_SPEAKER_SIMILARITY)
+            max_speakers: Session speaker limit (AMBIENT_MAX_SPEAKERS)
+        """
+        self.similarity = similarity if similarity is not None else settings.AMBIENT_SPEAKER_SIMILARITY
+        self.max_speakers = max_speakers or settings.AMBIENT_MAX_SPEAKERS
+        self.speakers: List[str] = []
+        self._sums: List[np.ndarray] = []  # Duration-weighted sum of unit embeddings
+        self._speech: List[float] = []  # Seconds of speech per speaker
+
+    def _centroids(self) -> np.ndarray:
+        sums = np.stack(self._sums)
+        return sums / np.linalg.norm(sums, axis=1, keepdims=True)
+
+    def _new_speaker(self, embedding: np.ndarray, duration: float) -> str:
+        speaker = f"SPEAKER_{len(self.speakers):02d}"
+        self.speakers.append(speaker)
+        self._sums.append(embedding * duration)
+        self._speech.append(duration)
+        return speaker
+
+    def assign(self, embeddings: Dict[str, np.ndarray], durations: Dict[str, float]) -> Dict[str, str]:
+        """
+        Map one window's local speakers to session speakers.
+
+        Args:
+            embeddings: Local label -> speaker embedding
+            durations: Local label -> seconds of speech in the window
+
+        Returns:
+            Local label -> session speaker; labels without a usable
+            embedding are left out
+        """
+        local: List[Tuple[str, np.ndarray]] = []
+        for label, embedding in embeddings.items():
+            vector = np.asarray(embedding, dtype=np.float64).ravel()
+            norm = np.linalg.norm(vector)
+            if np.isfinite(norm) and norm > 0:
+                local.append((label, vector / norm))
+
+        mapping: Dict[str, str] = {}
+        if self.speakers and local:
+            scores = np.stack([vector for _, vector in local]) @ self._centroids().T
+            # Greedy one-to-one matching, most similar pairs first: two
+            # speakers pyannote separated in one window stay separate
+            for index in np.argsort(scores, axis=None)[::-1]:
+                row, column = np.unravel_index(index, scores.shape)
+                label = local[row][0]
+                speaker = self.speakers[column]
+                if scores[row, column] < self.similarity:
+                    break
+                if label not in mapping and speaker not in mapping.values():
+                    mapping[label] = speaker
+
+        for row, (label, vector) in enumerate(local):
+            duration = max(durations.get(label, 0.0), 1e-3)
+            if label not in mapping:
+                if len(self.speakers) < self.max_speakers:
+                    mapping[label] = self._new_speaker(vector, duration)
+                    continue
+                # Speaker limit reached: closest existing speaker
+                mapping[label] = self.speakers[int(np.argmax(self._centroids() @ vector))]
+            column = self.speakers.index(mapping[label])
+            self._sums[column] = self._sums[column] + vector * duration
+            self._speech[column] += duration
+
+        return mapping
+
+    def update(self, result: dict, offset: float = 0.0) -> List[SpeakerTurn]:
+        """
+        Relabel one window's diarization with session speakers.
+
+        Args:
+            result: diarize_pcm() output ("segments" with local labels and
+                times relative to the window, "embeddings" per local label)
+            offset: Window start, in seconds from the start of the stream
+
+        Returns:
+            Turns sorted by start time, in stream time
+        """
+        durations: Dict[str, float] = {}
+        for segment in result.get('segments', []):
+            durations[segment['speaker']] = durations.get(segment['speaker'], 0.0) + segment['end'] - segment['start']
+
+        embeddings = result.get('embeddings')
+        if embeddings is None:
+            # Pipeline without embeddings: labels are only valid in this window
+            mapping = {label: label for label in durations}
+        else:
+            mapping = self.assign(embeddings, durations)
+
+        turns = [
+            SpeakerTurn(mapping[segment['speaker']], offset + segment['start'], offset + segment['end'])
+            for segment in result.get('segments', [])
+            if segment['speaker'] in mapping
+        ]
+        turns.sort(key=lambda turn: turn.start)
+        return turns
+
+    @property
+    def speech_seconds(self) -> Dict[str, float]:
+        return dict(zip(self.speakers, self._speech))
+
+
+def align_segments(segments: Sequence[dict], turns: Sequence[SpeakerTurn]) -> List[Optional[str]]:
+    """
+    Speaker with the most overlap for each segment (word or utterance).
+
+    Args:
+        segments: Dicts with 'start' and 'end', sorted by start
+        turns: Speaker turns sorted by start (they may overlap)
+
+    Returns:
+        Speaker per segment, None where no turn overlaps
+    """
+    speakers: List[Optional[str]] = []
+    first = 0  # Turns before this index ended before the current segment
+    for segment in segments:
+        start, end = segment['start'], segment['end']
+        while first < len(turns) and turns[first].end <= start:
+            first += 1
+
+        best, best_overlap = None, 0.0
+        index = first
+        while index < len(turns) and turns[index].start < end:
+            overlap = min(end, turns[index].end) - max(start, turns[index].start)
+            if overlap > best_overlap:
+                best, best_overlap = turns[index].speaker, overlap
+            index += 1
+        speakers.append(best)
+    return speakers
+
+
+def utterance_speaker(words: Sequence[dict], turns: Sequence[SpeakerTurn]) -> Optional[str]:
+    """Speaker of an utterance: the one assigned the most word time."""
+    totals: Dict[str, float] = {}
+    for word, speaker in zip(words, align_segments(words, turns)):
+        if speaker is not None:
+            totals[speaker] = totals.get(speaker, 0.0) + word['end'] - word['start']
+    return max(totals, key=totals.get) if totals else None
@@ -0,0 +1,184 @@
+"""
+Entity extraction for ambient transcripts.
+
+Running the full extractor (regex + LLM) on every transcript fragment means
+an LLM request every few seconds per exam room, on text too short to hold
+most entities. The AmbientEntityTracker instead:
+
+- Runs only the compiled regex pass on each fragment, and on the seam with
+  the previous fragment so values split across a cut are still found
+- Keeps a rolling transcript window (AMBIENT_ENTITY_WINDOW_CHARS)
+- Runs the LLM pass over that window in the background, at most every
+  AMBIENT_ENTITY_LLM_INTERVAL_SECONDS, once the speaker pauses for
+  AMBIENT_ENTITY_DEBOUNCE_SECONDS (or after a full interval of continuous
+  speech); the transcript keeps flowing while it runs
+- Emits only deltas: entities that are new or whose value changed
+
+A regex value is not overwritten by a lower-confidence LLM value for the
+same field.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EntitiesCallback = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+SEAM_CHARS = 40  # Text either side of a fragment boundary searched for split matches
+
+
+class AmbientEntityTracker:
+    """Per-session entity state fed by transcript fragments."""
+
+    def __init__(
+        self,
+        extractor,
+        on_entities: EntitiesCallback,
+        interval: Optional[float] = None,
+        debounce: Optional[float] = None,
+        window_chars: Optional[int] = None
+    ):
+        """
+        Args:
+            extractor: ClinicalEntityExtractor (extract_entities(text, use_llm=...))
+            on_entities: Awaited with each non-empty delta
+            interval: Minimum seconds between LLM passes (AMBIENT_ENTITY_LLM_INTERVAL_SECONDS)
+            debounce: Pause before an LLM pass (AMBIENT_ENTITY_DEBOUNCE_SECONDS)
+            window_chars: Transcript given to the LLM (AMBIENT_ENTITY_WINDOW_CHARS)
+        """
+        self.extractor = extractor
+        self.interval = interval if interval is not None else settings.AMBIENT_ENTITY_LLM_INTERVAL_SECONDS
+        self.debounce = debounce if debounce is not None else settings.AMBIENT_ENTITY_DEBOUNCE_SECONDS
+        self.window_chars = window_chars or settings.AMBIENT_ENTITY_WINDOW_CHARS
+        self._on_entities = on_entities
+
+        self.entities: Dict[str, Dict[str, Any]] = {}  # field -> current entity
+        self._fragments: Deque[str] = deque()
+        self._window_length = 0
+        self._previous = ""
+
+        self._pending_since: Optional[float] = None  # First fragment not yet seen by the LLM
+        self._last_text = 0.0
+        self._last_llm = float("-inf")
+        self._llm_task: Optional[asyncio.Task] = None
+        self._llm_running = False
+        self._closed = False
+
+        self.fragments = 0
+        self.llm_passes = 0
+
+    @property
+    def window(self) -> str:
+        """Rolling transcript, most recent AMBIENT_ENTITY_WINDOW_CHARS."""
+        return " ".join(self._fragments)[-self.window_chars:]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"fragments": self.fragments, "llm_passes": self.llm_passes, "entities": len(self.entities)}
+
+    async def add_text(self, text: str) -> None:
+        """Regex pass on a final transcript fragment; schedules the LLM pass."""
+        text = text.strip()
+        if not text or self._closed:
+            return
+
+        self.fragments += 1
+        self._append(text)
+        now = time.monotonic()
+        self._last_text = now
+        if self._pending_since is None:
+            self._pending_since = now
+
+        entities = await self.extractor.extract_entities(text, use_llm=False)
+        if self._previous:
+            seam = f"{self._previous[-SEAM_CHARS:]} {text[:SEAM_CHARS]}"
+            entities += [
+                entity for entity in await self.extractor.extract_entities(seam, use_llm=False)
+                if entity['source_text'] not in self._previous and entity['source_text'] not in text
+            ]
+        self._previous = text
+        await self._emit(entities)
+
+        if self._llm_task is None or self._llm_task.done():
+            self._llm_task = asyncio.create_task(self._llm_when_due())
+
+    def _append(self, text: str) -> None:
+        self._fragments.append(text)
+        self._window_length += len(text) + 1
+        while len(self._fragments) > 1 and self._window_length - len(self._fragments[0]) - 1 >= self.window_chars:
+            self._window_length -= len(self._fragments.popleft()) + 1
+
+    def _llm_due(self) -> float:
+        # After a pause, but at most once per interval; continuous speech
+        # still gets a pass once its first fragment is an interval old
+        settled = min(self._last_text + self.debounce, self._pending_since + self.interval)
+        return max(self._last_llm + self.interval, settled)
+
+    async def _llm_when_due(self) -> None:
+        while self._pending_since is not None and not self._closed:
+            delay = self._llm_due() - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            await self._run_llm()
+
+    async def _run_llm(self) -> None:
+        self._pending_since = None
+        self._last_llm = time.monotonic()
+        self.llm_passes += 1
+        self._llm_running = True
+        try:
+            entities = await self.extractor.extract_entities(self.window)
+        except Exception as e:
+            logger.warning(f"Ambient entity extraction failed: {e}")
+            return
+        finally:
+            self._llm_running = False
+        await self._emit(entities)
+
+    async def _emit(self, entities: List[Dict[str, Any]]) -> None:
+        delta = []
+        for entity in entities:
+            current = self.entities.get(entity['field'])
+            if current is not None:
+                if current['value'] == entity['value']:
+                    continue
+                if entity['confidence'] < current['confidence']:
+                    continue
+            self.entities[entity['field']] = entity
+            delta.append(entity)
+
+        if delta:
+            try:
+                await self._on_entities(delta)
+            except Exception as e:
+                logger.warning(f"Ambient entity handler failed: {e}")
+
+    async def close(self, flush: bool = False) -> None:
+        """
+        Stop the tracker.
+
+        Args:
+            flush: Finish an LLM pass in progress and run one over text it
+                has not seen yet; otherwise pending work is discarded
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._llm_task is not None and not self._llm_task.done():
+            if not (flush and self._llm_running):
+                self._llm_task.cancel()
+            try:
+                await self._llm_task
+            except asyncio.CancelledError:
+                pass
+
+        if flush and self._pending_since is not None:
+            await self._run_llm()
@@ -0,0 +1,437 @@
+"""
+Ambient Transcription Executor
+
+Runs speech-to-text off the event loop so a streaming exam room never blocks
+other requests.
+
+- One worker pool owns the speech backend; it is loaded once, in a worker
+  thread, on the first session or at startup when AMBIENT_PRELOAD_MODEL is
+  set (preload_speech_backend)
+- Each WebSocket gets a TranscriptionSession with a bounded queue: when a
+  session falls behind, the oldest queued chunk is dropped rather than
+  growing the backlog
+- Chunks that waited longer than AMBIENT_MAX_LAG_SECONDS are dropped before
+  inference, so transcripts stay close to real time
+- Chunks from one session are transcribed in order, one at a time; sessions
+  share the pool fairly
+- The tail of the session's transcript is passed to Whisper as the prompt
+  for the next utterance, so context carries across chunk boundaries
+- Partial chunks are skipped when a newer chunk is already queued
+- Chunks in flight from different sessions are micro-batched: an idle
+  worker waits up to AMBIENT_BATCH_WINDOW_MS for up to AMBIENT_BATCH_MAX_SIZE
+  chunks and decodes them in one model call, and chunks that arrive while
+  all workers are busy form the next batch. Throughput grows with the number
+  of sessions instead of each session adding a full inference
+- Speaker diarization (pyannote, seconds per 30 s window) runs in a
+  separate DiarizationExecutor pool, so it never holds a transcription
+  worker
+
+Audio is held in memory only and released once transcribed or dropped.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from app.config import settings
+from app.services.ambient.backends import get_speech_backend
+from app.services.ambient.speech import transcribe_pcm, transcribe_pcm_batch
+
+logger = logging.getLogger(__name__)
+
+# Whisper's prompt holds ~224 tokens; the transcript tail is kept well below that
+PROMPT_CHARS = 400
+
+ResultCallback = Callable[["AudioChunk", Optional[dict]], Awaitable[None]]
+DropCallback = Callable[["AudioChunk", str], Awaitable[None]]
+
+
+@dataclass
+class AudioChunk:
+    """PCM16 audio waiting to be transcribed (bytes or an int16 ring buffer view)."""
+    audio: Union[bytes, np.ndarray]
+    sample_rate: int = 16000
+    received_at: float = field(default_factory=time.monotonic)
+    position: int = 0  # First sample's position in the stream
+    final: bool = True  # False for a partial (still-open) utterance
+
+    @property
+    def duration(self) -> float:
+        """Length of the chunk in seconds."""
+        return memoryview(self.audio).nbytes / (2 * self.sample_rate)
+
+    @property
+    def start_time(self) -> float:
+        """Offset of the chunk in the stream, in seconds."""
+        return self.position / self.sample_rate
+
+    @property
+    def age(self) -> float:
+        """Seconds since the chunk was received."""
+        return time.monotonic() - self.received_at
+
+
+class TranscriptionExecutor:
+    """Worker pool that owns the speech model."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        model_loader: Callable[[], Any] = get_speech_backend,
+        transcribe: Callable[..., Optional[dict]] = transcribe_pcm,
+        transcribe_batch: Optional[Callable[..., List[Optional[dict]]]] = None,
+        max_batch: Optional[int] = None,
+        batch_window: Optional[float] = None
+    ):
+        """
+        Args:
+            workers: Pool size (defaults to AMBIENT_TRANSCRIPTION_WORKERS)
+            model_loader: Returns the loaded model; called once, in a worker
+            transcribe: Blocking (backend, audio, sample_rate, prompt=None) -> result or None
+            transcribe_batch: Blocking (backend, [(audio, sample_rate)], prompts) -> results;
+                defaults to transcribe_pcm_batch with the default `transcribe`,
+                otherwise `transcribe` is called per chunk
+            max_batch: Chunks per model call (AMBIENT_BATCH_MAX_SIZE); 1 disables batching
+            batch_window: Seconds an idle worker waits for a batch to fill
+                (AMBIENT_BATCH_WINDOW_MS / 1000)
+        """
+        self.workers = workers or settings.AMBIENT_TRANSCRIPTION_WORKERS
+        self.max_batch = max_batch or settings.AMBIENT_BATCH_MAX_SIZE
+        self.batch_window = (
+            batch_window if batch_window is not None else settings.AMBIENT_BATCH_WINDOW_MS / 1000
+        )
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ambient-transcribe")
+        self._model_loader = model_loader
+        self._transcribe = transcribe
+        if transcribe_batch is None and transcribe is transcribe_pcm:
+            transcribe_batch = transcribe_pcm_batch
+        self._transcribe_batch = transcribe_batch
+        self._model = None
+        self._model_lock = threading.Lock()
+
+        # Micro-batching state (event loop only)
+        self._batch: List[Tuple[AudioChunk, Optional[str], asyncio.Future]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._running_batches = 0
+        self._open_sessions = 0
+        self.batches = 0
+        self.batched_chunks = 0
+
+    def _get_model(self):
+        with self._model_lock:
+            if self._model is None:
+                self._model = self._model_loader()
+        return self._model
+
+    def _transcribe_chunk(self, chunk: AudioChunk, prompt: Optional[str]) -> Optional[dict]:
+        return self._transcribe(self._get_model(), chunk.audio, chunk.sample_rate, prompt=prompt)
+
+    def _transcribe_chunks(self, chunks: List[AudioChunk], prompts: List[Optional[str]]) -> List[Optional[dict]]:
+        if self._transcribe_batch is None or len(chunks) == 1:
+            return [self._transcribe_chunk(chunk, prompt) for chunk, prompt in zip(chunks, prompts)]
+        model = self._get_model()
+        return self._transcribe_batch(model, [(chunk.audio, chunk.sample_rate) for chunk in chunks], prompts)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args))
+
+    async def load_model(self):
+        """Load the model in a worker (no-op once loaded); raises if unavailable."""
+        return await self.run(self._get_model)
+
+    async def transcribe(self, chunk: AudioChunk, prompt: Optional[str] = None) -> Optional[dict]:
+        """Transcribe one chunk in the pool, optionally primed with prior text."""
+        if self.max_batch <= 1:
+            return await self.run(self._transcribe_chunk, chunk, prompt)
+
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((chunk, prompt, future))
+        self._schedule_batch()
+        return await future
+
+    @property
+    def batch_stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "chunks": self.batched_chunks,
+            "mean_batch_size": self.batched_chunks / self.batches if self.batches else 0.0,
+            "waiting": len(self._batch),
+        }
+
+    def _schedule_batch(self) -> None:
+        if not self._batch or self._running_batches >= self.workers:
+            return  # A finishing batch dispatches whatever has collected
+        # Each session has at most one chunk in flight, so once every open
+        # session is represented there is nothing to wait for
+        if len(self._batch) >= min(self.max_batch, self._open_sessions) or self.batch_window <= 0:
+            self._dispatch_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = asyncio.get_running_loop().call_later(self.batch_window, self._dispatch_batch)
+
+    def _dispatch_batch(self) -> None:
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        # Chunks whose session closed while waiting are not decoded
+        self._batch = [item for item in self._batch if not item[2].done()]
+        items, self._batch = self._batch[:self.max_batch], self._batch[self.max_batch:]
+        if not items:
+            return
+
+        self._running_batches += 1
+        task = asyncio.ensure_future(self._run_batch(items))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, items: List[Tuple[AudioChunk, Optional[str], asyncio.Future]]) -> None:
+        try:
+            results = await self.run(self._transcribe_chunks, [item[0] for item in items], [item[1] for item in items])
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, _, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running_batches -= 1
+            self.batches += 1
+            self.batched_chunks += len(items)
+            logger.debug(f"Transcribed batch of {len(items)} chunks")
+
+        if self._batch:
+            # These waited for a worker already; no batching window
+            self._dispatch_batch()
+
+    def open_session(
+        self,
+        on_result: ResultCallback,
+        on_drop: Optional[DropCallback] = None,
+        max_queue: Optional[int] = None,
+        max_lag: Optional[float] = None
+    ) -> "TranscriptionSession":
+        """Start a per-connection queue; must be called from the event loop."""
+        self._open_sessions += 1
+        return TranscriptionSession(self, on_result, on_drop, max_queue, max_lag)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work; in-flight inference finishes in the background."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class TranscriptionSession:
+    """
+    Ordered, bounded transcription queue for one audio stream.
+
+    on_result(chunk, result) is awaited for each transcribed chunk, in
+    submission order; on_drop(chunk, reason) for each stale chunk.
+    """
+
+    def __init__(
+        self,
+        executor: TranscriptionExecutor,
+        on_result: ResultCallback,
+        on_drop: Optional[DropCallback] = None,
+        max_queue: Optional[int] = None,
+        max_lag: Optional[float] = None
+    ):
+        self.executor = executor
+        self.max_lag = max_lag if max_lag is not None else settings.AMBIENT_MAX_LAG_SECONDS
+        self._on_result = on_result
+        self._on_drop = on_drop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue or settings.AMBIENT_SESSION_QUEUE_CHUNKS)
+        self.context = ""  # Transcript tail used as the next prompt
+        self.submitted = 0
+        self.transcribed = 0
+        self.dropped = 0
+        self.superseded = 0
+        self._closed = False
+        self._task = asyncio.create_task(self._consume())
+
+    def submit(self, chunk: AudioChunk) -> Optional[AudioChunk]:
+        """
+        Queue a chunk without waiting.
+
+        Returns:
+            The chunk evicted to make room (the oldest queued), or None
+        """
+        if self._closed:
+            raise RuntimeError("Transcription session is closed")
+
+        evicted = None
+        if self._queue.full():
+            evicted = self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(chunk)
+        self.submitted += 1
+        return evicted
+
+    @property
+    def pending(self) -> int:
+        """Chunks waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "transcribed": self.transcribed,
+            "dropped": self.dropped,
+            "superseded": self.superseded,
+            "pending": self.pending,
+        }
+
+    async def _consume(self) -> None:
+        while True:
+            chunk = await self._queue.get()
+            if chunk is None:
+                return
+
+            if chunk.age > self.max_lag:
+                self.dropped += 1
+                await self._notify_drop(chunk, "stale")
+                continue
+
+            if not chunk.final and not self._queue.empty():
+                # A newer partial or the final utterance will cover this audio
+                self.superseded += 1
+                continue
+
+            try:
+                result = await self.executor.transcribe(chunk, self.context or None)
+            except Exception as e:
+                logger.error(f"Transcription worker failed: {e}")
+                result = None
+
+            self.transcribed += 1
+            if chunk.final and result and result.get('text', '').strip():
+                self.context = f"{self.context} {result['text'].strip()}".strip()[-PROMPT_CHARS:]
+            try:
+                await self._on_result(chunk, result)
+            except Exception as e:
+                logger.warning(f"Transcription result handler failed: {e}")
+
+    async def _notify_drop(self, chunk: AudioChunk, reason: str) -> None:
+        logger.debug(f"Dropped {chunk.duration:.1f}s audio chunk ({reason}, {chunk.age:.1f}s old)")
+        if self._on_drop:
+            try:
+                await self._on_drop(chunk, reason)
+            except Exception as e:
+                logger.warning(f"Transcription drop handler failed: {e}")
+
+    async def close(self, drain: bool = False) -> None:
+        """
+        Stop the session.
+
+        Args:
+            drain: Transcribe what is already queued first; otherwise queued
+                chunks are discarded and an in-flight result is ignored
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            if drain:
+                # Unbounded wait for space is fine here: the consumer is running
+                await self._queue.put(None)
+                await self._task
+                return
+
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        finally:
+            self.executor._open_sessions -= 1
+
+
+class DiarizationExecutor:
+    """
+    Worker pool for speaker diarization, separate from transcription so a
+    pyannote pass never delays any room's transcripts.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Pool size (defaults to AMBIENT_DIARIZATION_WORKERS)
+        """
+        self.workers = workers or settings.AMBIENT_DIARIZATION_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ambient-diarize")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call (pipeline loading, diarization) in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args))
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool; queued diarization windows are cancelled."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Shared transcription pool
+_transcription_executor: Optional[TranscriptionExecutor] = None
+
+
+def get_transcription_executor() -> TranscriptionExecutor:
+    """Get the process-wide pool used for ambient transcription."""
+    global _transcription_executor
+    if _transcription_executor is None:
+        _transcription_executor = TranscriptionExecutor()
+    return _transcription_executor
+
+
+async def preload_speech_backend() -> None:
+    """
+    Select and load the speech backend at application startup, in the pool.
+
+    With AMBIENT_SPEECH_BACKEND=auto this times every installed backend, so
+    workers serving ambient sessions (AMBIENT_PRELOAD_MODEL) do it before
+    the first exam-room connection. A failure is only
+    logged: ambient listening reports the error when a stream connects.
+    """
+    try:
+        backend = await get_transcription_executor().load_model()
+    except Exception as e:
+        logger.warning(f"Speech backend not loaded at startup: {e} - ambient listening unavailable")
+        return
+    logger.info(f"Speech backend ready: {getattr(backend, 'description', backend)}")
+
+
+# Shared diarization pool
+_diarization_executor: Optional[DiarizationExecutor] = None
+
+
+def get_diarization_executor() -> DiarizationExecutor:
+    """Get the process-wide pool used for speaker diarization."""
+    global _diarization_executor
+    if _diarization_executor is None:
+        _diarization_executor = DiarizationExecutor()
+    return _diarization_executor
+
+
+def shutdown_transcription_executor() -> None:
+    """Release the shared pools (application shutdown)."""
+    global _transcription_executor, _diarization_executor
+    if _transcription_executor is not None:
+        _transcription_executor.shutdown()
+        _transcription_executor = None
+    if _diarization_executor is not None:
+        _diarization_executor.shutdown()
+        _diarization_executor = None
@@ -0,0 +1,96 @@
+"""
+Preallocated PCM16 ring buffer for ambient audio streams.
+
+- Fixed memory per stream; writes never reallocate or shift existing audio
+- Every sample is stored twice (at i and i + capacity), so any window of up
+  to `capacity` samples is a single contiguous slice: transcription and
+  diarization windows are zero-copy NumPy views, even across the wrap point
+- Positions are absolute sample counts since the stream started
+
+A window stays valid until `capacity` newer samples have been written; size
+the buffer to cover the longest window plus the longest a view may wait
+before the model reads it.
+"""
+
+from typing import Union
+
+import numpy as np
+
+PCMBuffer = Union[bytes, bytearray, memoryview]
+
+
+class PCMRingBuffer:
+    """Ring buffer of mono PCM16 samples."""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Samples retained (e.g. seconds * sample_rate)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.int16)
+        self.written = 0  # Samples written since the stream started
+        self._odd_byte = b""  # Half a sample left over from the last frame
+
+    @property
+    def oldest(self) -> int:
+        """Position of the oldest sample still held."""
+        return max(0, self.written - self.capacity)
+
+    def write(self, frame: PCMBuffer) -> int:
+        """
+        Append little-endian PCM16 bytes.
+
+        Returns:
+            Number of whole samples written
+        """
+        if self._odd_byte:
+            frame = self._odd_byte + bytes(frame)
+            self._odd_byte = b""
+        if len(frame) % 2:
+            self._odd_byte = bytes(frame[-1:])
+            frame = memoryview(frame)[:-1]
+
+        samples = np.frombuffer(frame, dtype=np.int16)
+        count = samples.size
+        if count > self.capacity:
+            # Only the newest `capacity` samples can be kept
+            self.written += count - self.capacity
+            samples = samples[-self.capacity:]
+
+        start = self.written % self.capacity
+        first = min(samples.size, self.capacity - start)
+        rest = samples.size - first
+        for offset in (0, self.capacity):
+            self._data[offset + start:offset + start + first] = samples[:first]
+            self._data[offset:offset + rest] = samples[first:]
+
+        self.written += samples.size
+        return count
+
+    def window(self, start: int, length: int) -> np.ndarray:
+        """
+        Read-only view of samples [start, start + length).
+
+        Raises:
+            ValueError: If the window is not fully in the buffer (overwritten
+                or not yet written)
+        """
+        if length > self.capacity:
+            raise ValueError(f"Window of {length} samples exceeds buffer capacity ({self.capacity})")
+        if start < self.oldest or start + length > self.written:
+            raise ValueError(
+                f"Samples {start}-{start + length} not in buffer (holds {self.oldest}-{self.written})"
+            )
+        offset = start % self.capacity
+        view = self._data[offset:offset + length]
+        view.flags.writeable = False
+        return view
+
+    def clear(self) -> None:
+        """Zero the stored audio and reset positions."""
+        self._data.fill(0)
+        self.written = 0
+        self._odd_byte = b""
@@ -0,0 +1,184 @@
+"""
+Voice-activity segmentation for ambient streams.
+
+Cuts the stream at pauses instead of every 2 seconds:
+
+- Audio is classified in 30 ms frames by energy against an adaptive noise
+  floor (NumPy only; no native VAD dependency)
+- Silence is never sent to Whisper; an utterance ends after a pause of
+  AMBIENT_VAD_PAUSE_MS, so words are not split across chunks
+- Long monologues are cut at AMBIENT_MAX_UTTERANCE_SECONDS
+- While an utterance is still open, a partial segment is offered every
+  AMBIENT_PARTIAL_SECONDS of speech for low-latency captions; partials are
+  optional work (skipped when the session has a backlog)
+
+Positions are absolute sample counts, matching PCMRingBuffer.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class SpeechSegment:
+    """Samples [start, end) of one utterance; partial segments are still open."""
+    start: int
+    end: int
+    final: bool = True
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+class UtteranceSegmenter:
+    """Incremental energy VAD that turns PCM16 samples into speech segments."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        pause_ms: Optional[int] = None,
+        max_utterance_seconds: Optional[float] = None,
+        partial_seconds: Optional[float] = None,
+        min_speech_ms: int = 150,
+        padding_ms: int = 200,
+        margin_db: float = 9.0,
+        min_level_db: float = -55.0
+    ):
+        """
+        Args:
+            sample_rate: Stream sample rate
+            frame_ms: VAD frame length
+            pause_ms: Silence that ends an utterance (AMBIENT_VAD_PAUSE_MS)
+            max_utterance_seconds: Forced cut (AMBIENT_MAX_UTTERANCE_SECONDS)
+            partial_seconds: Partial interval, 0 disables (AMBIENT_PARTIAL_SECONDS)
+            min_speech_ms: Shorter bursts (clicks, bumps) are discarded
+            padding_ms: Audio kept before and after speech
+            margin_db: Speech must be this far above the noise floor
+            min_level_db: ...and above this absolute level (dBFS)
+        """
+        pause_ms = pause_ms if pause_ms is not None else settings.AMBIENT_VAD_PAUSE_MS
+        max_utterance_seconds = (
+            max_utterance_seconds if max_utterance_seconds is not None
+            else settings.AMBIENT_MAX_UTTERANCE_SECONDS
+        )
+        partial_seconds = partial_seconds if partial_seconds is not None else settings.AMBIENT_PARTIAL_SECONDS
+
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * frame_ms // 1000
+        self.pause_frames = max(1, pause_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.padding = sample_rate * padding_ms // 1000
+        self.max_utterance = int(max_utterance_seconds * sample_rate)
+        self.partial_interval = int(partial_seconds * sample_rate)
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+
+        self.noise_floor_db = min_level_db
+        self.position = 0  # Samples classified so far
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._start: Optional[int] = None  # First speech sample of the open utterance
+        self._last_speech_end = 0
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._last_partial = 0
+        self._last_cut = 0  # Padding never reaches back before a previous segment
+
+    @property
+    def in_speech(self) -> bool:
+        return self._start is not None
+
+    def _frame_levels(self, samples: np.ndarray) -> np.ndarray:
+        frames = samples.reshape(-1, self.frame)
+        power = np.mean(np.square(frames, dtype=np.float64), axis=1) / (32768.0 ** 2)
+        return 10 * np.log10(power + 1e-12)
+
+    def push(self, samples: np.ndarray) -> List[SpeechSegment]:
+        """
+        Classify new PCM16 samples.
+
+        Returns:
+            Segments completed (final) or offered as partials by these samples
+        """
+        if self._remainder.size:
+            samples = np.concatenate([self._remainder, samples])
+        whole = samples.size // self.frame * self.frame
+        self._remainder = samples[whole:].copy()
+
+        segments: List[SpeechSegment] = []
+        for level in self._frame_levels(samples[:whole]):
+            frame_start = self.position
+            self.position += self.frame
+            is_speech = level > max(self.noise_floor_db + self.margin_db, self.min_level_db)
+
+            # Noise floor follows quiet frames quickly and louder ones slowly,
+            # barely moving during speech, so steady room noise is learned
+            # without speech raising the floor
+            if level < self.noise_floor_db:
+                rate = 0.5
+            else:
+                rate = 0.001 if is_speech else 0.01
+            self.noise_floor_db += rate * (level - self.noise_floor_db)
+
+            if is_speech:
+                if self._start is None:
+                    self._start = frame_start
+                    self._speech_frames = 0
+                    self._last_partial = frame_start
+                self._speech_frames += 1
+                self._silent_frames = 0
+                self._last_speech_end = self.position
+            elif self._start is not None:
+                self._silent_frames += 1
+                if self._silent_frames >= self.pause_frames:
+                    segment = self._close(self._last_speech_end + self.padding)
+                    if segment:
+                        segments.append(segment)
+                    continue
+
+            if self._start is None:
+                continue
+
+            if self.position + self.frame - self._padded_start() > self.max_utterance:
+                segment = self._close(self.position, continues=True)
+                if segment:
+                    segments.append(segment)
+            elif (
+                self.partial_interval
+                and is_speech
+                and self.position - self._last_partial >= self.partial_interval
+            ):
+                self._last_partial = self.position
+                segments.append(SpeechSegment(self._padded_start(), self.position, final=False))
+
+        return segments
+
+    def _padded_start(self) -> int:
+        return max(self._start - self.padding, self._last_cut)
+
+    def _close(self, end: int, continues: bool = False) -> Optional[SpeechSegment]:
+        start = self._padded_start()
+        end = min(end, self.position)
+        long_enough = self._speech_frames >= self.min_speech_frames
+        self._start = None
+        self._silent_frames = 0
+        if not long_enough:
+            return None
+        self._last_cut = end
+        if continues:
+            # Forced cut mid-speech: the next utterance continues from here
+            self._start = end
+            self._speech_frames = 0
+            self._last_partial = end
+        return SpeechSegment(start, end)
+
+    def flush(self) -> Optional[SpeechSegment]:
+        """Close the open utterance at end of stream."""
+        if self._start is None:
+            return None
+        return self._close(self._last_speech_end + self.padding)
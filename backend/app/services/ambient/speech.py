@@ -0,0 +1,195 @@
+"""
+Speech models for ambient listening.
+
+Speech-to-text runs through a SpeechBackend (app.services.ambient.backends).
+Model loading and inference are blocking (seconds of CPU per chunk); call
+them through the TranscriptionExecutor (app.services.ambient.executor),
+never directly from a coroutine.
+
+Audio is handed to the models as in-memory arrays; nothing is written to
+disk (no temporary WAV files holding PHI).
+"""
+
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Global model instances (lazy-loaded)
+_diarization_pipeline = None
+_load_lock = threading.Lock()
+
+# Whisper expects mono float32 at 16 kHz
+WHISPER_SAMPLE_RATE = 16000
+
+PCMBuffer = Union[bytes, bytearray, memoryview]
+
+
+def pcm_to_float32(audio_chunk: PCMBuffer) -> np.ndarray:
+    """
+    Convert PCM16 audio to float32 in [-1, 1].
+
+    The int16 samples are a zero-copy view over the buffer; the float32
+    output is the only allocation.
+    """
+    samples = np.frombuffer(audio_chunk, dtype=np.int16)
+    audio_float = np.empty(samples.shape, dtype=np.float32)
+    np.multiply(samples, np.float32(1 / 32768.0), out=audio_float)
+    return audio_float
+
+
+def resample(audio: np.ndarray, sample_rate: int, target_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Linearly resample mono audio (returns the input when the rates match)."""
+    if sample_rate == target_rate or audio.size == 0:
+        return audio
+    duration = audio.size / sample_rate
+    target_times = np.arange(int(round(duration * target_rate)), dtype=np.float64) / target_rate
+    source_times = np.arange(audio.size, dtype=np.float64) / sample_rate
+    return np.interp(target_times, source_times, audio).astype(np.float32)
+
+
+def get_diarization_pipeline():
+    """Get or initialize pyannote speaker diarization pipeline."""
+    global _diarization_pipeline
+
+    with _load_lock:
+        if _diarization_pipeline is None:
+            try:
+                from pyannote.audio import Pipeline
+
+                # Check for HuggingFace token
+                hf_token = os.getenv('HUGGINGFACE_TOKEN')
+                if not hf_token:
+                    logger.warning(
+                        "HUGGINGFACE_TOKEN not set. Speaker diarization will be disabled. "
+                        "Get token from: https://huggingface.co/settings/tokens"
+                    )
+                    return None
+
+                logger.info("Loading pyannote speaker diarization pipeline...")
+                _diarization_pipeline = Pipeline.from_pretrained(
+                    "pyannote/speaker-diarization-3.1",
+                    use_auth_token=hf_token
+                )
+                logger.info("Pyannote pipeline loaded successfully")
+
+            except ImportError:
+                logger.warning(
+                    "Pyannote not installed. Speaker diarization disabled. "
+                    "Install with: pip install pyannote-audio"
+                )
+                return None
+            except Exception as e:
+                logger.error(f"Failed to load pyannote pipeline: {e}")
+                return None
+
+    return _diarization_pipeline
+
+
+def transcribe_pcm(
+    backend,
+    audio_chunk: PCMBuffer,
+    sample_rate: int = 16000,
+    prompt: Optional[str] = None
+) -> Optional[dict]:
+    """
+    Transcribe a PCM16 audio chunk (blocking).
+
+    Args:
+        backend: Loaded SpeechBackend
+        audio_chunk: Raw audio bytes
+        sample_rate: Audio sample rate
+        prompt: Preceding transcript, for continuity across chunks
+
+    Returns:
+        Dict with transcription result or None
+    """
+    try:
+        # Backends take a float32 array directly; no WAV round trip
+        audio_float = resample(pcm_to_float32(audio_chunk), sample_rate)
+        return backend.transcribe(audio_float, prompt=prompt)
+
+    except Exception as e:
+        logger.error(f"Speech transcription failed: {e}")
+        return None
+
+
+def transcribe_pcm_batch(
+    backend,
+    audio_chunks: Sequence[Tuple[PCMBuffer, int]],
+    prompts: Sequence[Optional[str]]
+) -> List[Optional[dict]]:
+    """
+    Transcribe PCM16 chunks from several streams in one backend call (blocking).
+
+    Args:
+        backend: Loaded SpeechBackend
+        audio_chunks: (raw audio bytes, sample rate) per chunk
+        prompts: Preceding transcript per chunk
+
+    Returns:
+        One result (or None) per chunk, in order
+    """
+    try:
+        audios = [resample(pcm_to_float32(audio_chunk), sample_rate) for audio_chunk, sample_rate in audio_chunks]
+        return backend.transcribe_batch(audios, list(prompts))
+
+    except Exception as e:
+        logger.error(f"Batched speech transcription failed: {e}")
+        return [None] * len(audio_chunks)
+
+
+def diarize_pcm(pipeline, audio_chunk: Union[PCMBuffer, np.ndarray], sample_rate: int = 16000) -> Optional[dict]:
+    """
+    Perform speaker diarization of a PCM16 audio chunk with pyannote (blocking).
+
+    Args:
+        pipeline: Loaded pyannote pipeline
+        audio_chunk: PCM16 bytes or an int16 sample array (e.g. a ring buffer view)
+        sample_rate: Audio sample rate
+
+    Returns:
+        Dict with diarization results (speaker segments, labels local to
+        this chunk, and one embedding per label when the pipeline provides
+        them) or None
+    """
+    try:
+        import torch
+
+        # pyannote accepts an in-memory waveform (channel, time); from_numpy
+        # shares the float32 buffer rather than copying it
+        waveform = torch.from_numpy(pcm_to_float32(audio_chunk)).unsqueeze(0)
+        audio = {"waveform": waveform, "sample_rate": sample_rate}
+
+        # Perform diarization; speaker-diarization-3.x also returns the
+        # centroid embedding of each speaker it found, in labels() order
+        embeddings = None
+        try:
+            diarization, centroids = pipeline(audio, return_embeddings=True)
+            embeddings = dict(zip(diarization.labels(), np.asarray(centroids)))
+        except TypeError:
+            diarization = pipeline(audio)
+
+        # Extract speaker segments
+        segments = []
+        for turn, _, speaker in diarization.itertracks(yield_label=True):
+            segments.append({
+                'speaker': speaker,
+                'start': turn.start,
+                'end': turn.end,
+                'duration': turn.end - turn.start
+            })
+
+        return {
+            'segments': segments,
+            'num_speakers': len(set(seg['speaker'] for seg in segments)),
+            'embeddings': embeddings
+        }
+
+    except Exception as e:
+        logger.error(f"Speaker diarization failed: {e}")
+        return None
@@ -3,13 +3,25 @@ Ambient Listening Intelligent Merge Service
 
 Performs section-aware parsing of clinical transcriptions and intelligently
 merges new information into existing clinical notes.
+
+- Sentences are routed to sections by a precompiled Aho-Corasick automaton
+  over word tokens: every section's keywords are scored in one pass, and a
+  keyword only matches whole words ("mg" in "50mg", not in "omg")
+- Incremental parsing classifies only transcript text that arrived since
+  the previous call, so a long visit is not re-parsed on every merge
+- AmbientMergeSession keeps that state per encounter between Stage-3
+  requests (AmbientMergeStore, expiring after NOTE_SESSION_TTL_MINUTES)
 """
 
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
+from app.config import settings
+from app.services.session_store import OwnerScopedStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +34,70 @@ class TranscriptionSegment:
     speaker: Optional[str] = None
 
 
+class KeywordAutomaton:
+    """Aho-Corasick automaton matching multi-word keywords over word tokens."""
+
+    # Letters and digits are separate tokens so "50mg" yields "mg"
+    TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keywords: Label -> keywords (case-insensitive, may span words)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]  # (label, keyword) ending at each state
+
+        for label, phrases in keywords.items():
+            for phrase in phrases:
+                state = 0
+                for token in self.tokenize(phrase):
+                    if token not in self._goto[state]:
+                        self._goto[state][token] = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    state = self._goto[state][token]
+                if state:
+                    self._output[state].append((label, phrase))
+
+        # Failure links, breadth first so shorter suffixes are ready
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    def find(self, text: str) -> Set[Tuple[str, str]]:
+        """Distinct (label, keyword) pairs found in the text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for token in self.tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            found.update(output[state])
+        return found
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Label -> number of distinct keywords found."""
+        counts: Dict[str, int] = {}
+        for label, _ in self.find(text):
+            counts[label] = counts.get(label, 0) + 1
+        return counts
+
+
 class SectionAwareTranscriptionParser:
     """Parses transcription and identifies which clinical sections it relates to."""
 
@@ -65,6 +141,13 @@ class SectionAwareTranscriptionParser:
         ]
     }
 
+    _SECTION_AUTOMATON = KeywordAutomaton(SECTION_KEYWORDS)
+
+    SENTENCE_END = re.compile(r'[.!?]+')
+
+    def __init__(self):
+        self._parsed = ""  # Transcript prefix already classified (ends at a sentence boundary)
+
     def parse(self, transcription: str, speaker_map: Optional[Dict[str, str]] = None) -> List[TranscriptionSegment]:
         """
         Parse transcription and map segments to clinical sections.
@@ -79,7 +162,7 @@ class SectionAwareTranscriptionParser:
         segments = []
 
         # Split transcription into sentences
-        sentences = re.split(r'[.!?]+', transcription)
+        sentences = self.SENTENCE_END.split(transcription)
 
         for sentence in sentences:
             sentence = sentence.strip()
@@ -98,22 +181,52 @@ class SectionAwareTranscriptionParser:
 
         return segments
 
-    def _identify_section(self, text: str) -> Tuple[Optional[str], float]:
-        """Identify which clinical section a piece of text relates to."""
-        text_lower = text.lower()
+    def parse_incremental(self, transcription: str, final: bool = False,
+                          speaker_map: Optional[Dict[str, str]] = None) -> List[TranscriptionSegment]:
+        """
+        Parse only the part of a growing transcription not seen before.
+
+        Args:
+            transcription: Full transcription so far (earlier calls' text as prefix;
+                anything else starts over)
+            final: Also classify a trailing sentence without end punctuation
+            speaker_map: Optional mapping of speaker IDs to labels
+
+        Returns:
+            Segments for sentences completed since the previous call
+        """
+        if not transcription.startswith(self._parsed):
+            self._parsed = ""
+
+        new_text = transcription[len(self._parsed):]
+        if not final:
+            # Hold back the sentence still being spoken
+            ends = list(self.SENTENCE_END.finditer(new_text))
+            if not ends:
+                return []
+            new_text = new_text[:ends[-1].end()]
+
+        self._parsed += new_text
+        return self.parse(new_text, speaker_map)
 
-        section_scores = {}
+    @property
+    def parsed(self) -> str:
+        """Transcript prefix classified by parse_incremental() so far."""
+        return self._parsed
 
-        for section, keywords in self.SECTION_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                section_scores[section] = score
+    def reset(self) -> None:
+        """Forget incremental parsing state (new transcription)."""
+        self._parsed = ""
+
+    def _identify_section(self, text: str) -> Tuple[Optional[str], float]:
+        """Identify which clinical section a piece of text relates to."""
+        section_scores = self._SECTION_AUTOMATON.scores(text)
 
         if not section_scores:
             return None, 0.0
 
-        # Get section with highest score
-        best_section = max(section_scores, key=section_scores.get)
+        # Get section with highest score (first in SECTION_KEYWORDS on ties)
+        best_section = max(self.SECTION_KEYWORDS, key=lambda section: section_scores.get(section, 0))
         total_keywords = len(self.SECTION_KEYWORDS[best_section])
         confidence = min(section_scores[best_section] / total_keywords, 1.0)
 
@@ -127,7 +240,8 @@ class IntelligentNoteMerger:
         self.parser = SectionAwareTranscriptionParser()
 
     def merge(self, existing_note: str, transcription: str,
-              speaker_map: Optional[Dict[str, str]] = None) -> str:
+              speaker_map: Optional[Dict[str, str]] = None,
+              incremental: bool = False, final: bool = False) -> str:
         """
         Merge transcription into existing note with section-aware intelligence.
 
@@ -135,12 +249,18 @@ class IntelligentNoteMerger:
             existing_note: The current Stage 2 note
             transcription: New transcription from ambient listening
             speaker_map: Optional speaker identification
+            incremental: Merge only sentences completed since the previous
+                incremental merge; existing_note is the note that merge returned
+            final: With incremental, also merge an unterminated last sentence
 
         Returns:
             Updated note with merged information
         """
         # Parse transcription into segments
-        segments = self.parser.parse(transcription, speaker_map)
+        if incremental:
+            segments = self.parser.parse_incremental(transcription, final, speaker_map)
+        else:
+            segments = self.parser.parse(transcription, speaker_map)
 
         if not segments:
             logger.warning("No segments identified in transcription")
@@ -348,3 +468,54 @@ class IntelligentNoteMerger:
                 reconstructed += f"{sections[section]}\n\n"
 
         return reconstructed.strip()
+
+
+class AmbientMergeSession:
+    """Incremental Stage-3 merge state for one encounter."""
+
+    def __init__(self, stage2_note: str):
+        self.stage2_note = stage2_note
+        self.merger = IntelligentNoteMerger()
+        self.note = stage2_note  # Stage 2 note with every complete sentence merged so far
+
+    def update(self, transcription: str, speaker_map: Optional[Dict[str, str]] = None) -> str:
+        """
+        Merge the transcription so far, parsing only what is new.
+
+        Args:
+            transcription: Full transcription so far
+            speaker_map: Optional speaker identification
+
+        Returns:
+            Merged note, including the sentence still being spoken
+        """
+        parser = self.merger.parser
+        if not transcription.startswith(parser.parsed):
+            # Not a continuation (transcript edited): start over
+            parser.reset()
+            self.note = self.stage2_note
+
+        self.note = self.merger.merge(self.note, transcription, speaker_map, incremental=True)
+
+        # The unfinished last sentence is merged into the response only, so
+        # the next request sees it once it is complete
+        tail = transcription[len(parser.parsed):]
+        if not tail.strip():
+            return self.note
+        return self.merger.merge(self.note, tail, speaker_map)
+
+
+class AmbientMergeStore(OwnerScopedStore[AmbientMergeSession]):
+    """merge_id -> AmbientMergeSession, scoped to the user who created it."""
+
+
+# Singleton instance
+_merge_store: Optional[AmbientMergeStore] = None
+
+
+def get_ambient_merge_store() -> AmbientMergeStore:
+    """Get the process-wide Stage-3 merge session store."""
+    global _merge_store
+    if _merge_store is None:
+        _merge_store = AmbientMergeStore(ttl_seconds=settings.NOTE_SESSION_TTL_MINUTES * 60)
+    return _merge_store
@@ -0,0 +1,153 @@
+"""
+Calculator Batch Service
+
+Runs many calculator requests off the event loop and streams results back as
+they finish (NDJSON from /calculators/batch/calculate/stream).
+
+- Items are fanned out to a worker pool (threads by default, processes when
+  CALCULATOR_BATCH_USE_PROCESSES is set)
+- Each item has its own timeout; a timed-out item reports an error line and
+  the rest of the batch carries on
+- Results are yielded in completion order and tagged with the item index, so
+  the full result list is never held in memory
+- Clients can skip format_output() and recommendations they don't need
+
+Only metadata is logged (no patient data).
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def score_item(
+    calculator_id: Optional[str],
+    inputs: Dict[str, Any],
+    include_formatted_output: bool = True,
+    include_recommendations: bool = True
+) -> Dict[str, Any]:
+    """
+    Validate and run one calculator request.
+
+    Runs in a worker thread or process; never raises.
+
+    Returns:
+        Result dict, or {"calculator_id", "error"} on failure; invalid
+        inputs also carry structured "errors" ({"field", "code", "message"})
+    """
+    # Imported here so process-pool workers load the registry themselves
+    from calculators.registry import registry as calculator_registry
+
+    if not calculator_id:
+        return {"calculator_id": None, "error": "Missing calculator_id"}
+
+    calculator = calculator_registry.get(calculator_id)
+    if not calculator:
+        return {"calculator_id": calculator_id, "error": f"Calculator not found: {calculator_id}"}
+
+    try:
+        is_valid, error_message = calculator.validate_inputs(inputs)
+        if not is_valid:
+            return {
+                "calculator_id": calculator_id,
+                "error": f"Invalid inputs: {error_message}",
+                "errors": [error.to_dict() for error in calculator.input_errors(inputs)],
+            }
+
+        result = calculator.run(inputs)
+
+        payload = {
+            "calculator_id": calculator_id,
+            "calculator_name": calculator.name,
+            "result": result.result,
+            "interpretation": result.interpretation,
+        }
+        if include_recommendations:
+            payload["recommendations"] = result.recommendations
+        if include_formatted_output:
+            payload["formatted_output"] = result.format_output()
+        return payload
+
+    except Exception as e:
+        return {"calculator_id": calculator_id, "error": str(e)}
+
+
+async def stream_batch_results(
+    items: List[Dict[str, Any]],
+    include_formatted_output: bool = True,
+    include_recommendations: bool = True,
+    item_timeout: Optional[float] = None,
+    executor: Optional[Executor] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Score items concurrently, yielding each result as soon as it is ready.
+
+    Args:
+        items: [{"calculator_id": ..., "inputs": {...}}, ...]
+        include_formatted_output: Add format_output() text to each result
+        include_recommendations: Add recommendations to each result
+        item_timeout: Per-item timeout in seconds (defaults to the setting)
+        executor: Worker pool (defaults to the shared pool)
+
+    Yields:
+        Result dicts with the item's "index", in completion order
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or get_calculator_executor()
+    timeout = item_timeout if item_timeout is not None else settings.CALCULATOR_BATCH_ITEM_TIMEOUT_SECONDS
+
+    # Submit only as many items as there are workers (plus a small backlog),
+    # so an item's timeout covers its own run rather than time spent queued
+    in_flight = asyncio.Semaphore(settings.CALCULATOR_BATCH_WORKERS * 2)
+
+    async def run_item(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        calculator_id = item.get("calculator_id")
+        async with in_flight:
+            future = loop.run_in_executor(
+                executor,
+                score_item,
+                calculator_id,
+                item.get("inputs") or {},
+                include_formatted_output,
+                include_recommendations,
+            )
+            try:
+                payload = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                # The worker cannot be interrupted; its result is discarded
+                logger.warning(f"Calculator {calculator_id} timed out after {timeout}s (item {index})")
+                payload = {"calculator_id": calculator_id, "error": f"Timed out after {timeout} seconds"}
+        payload["index"] = index
+        return payload
+
+    tasks = [asyncio.ensure_future(run_item(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Client went away or the consumer stopped early
+        for task in tasks:
+            task.cancel()
+
+
+# Shared calculator pool
+_calculator_executor: Optional[Executor] = None
+
+
+def get_calculator_executor() -> Executor:
+    """Get the process-wide pool used for batch calculator requests."""
+    global _calculator_executor
+    if _calculator_executor is None:
+        if settings.CALCULATOR_BATCH_USE_PROCESSES:
+            _calculator_executor = ProcessPoolExecutor(max_workers=settings.CALCULATOR_BATCH_WORKERS)
+        else:
+            _calculator_executor = ThreadPoolExecutor(
+                max_workers=settings.CALCULATOR_BATCH_WORKERS,
+                thread_name_prefix="calculator-batch"
+            )
+    return _calculator_executor
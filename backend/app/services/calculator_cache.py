@@ -0,0 +1,143 @@
+"""
+Calculator Result Cache Service
+
+Installs the process-wide calculator result cache (calculators.result_cache)
+from settings and periodically writes its per-calculator counters to the
+calculator_stats table (one row per calculator per UTC day, NO PHI).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.sqlite_models import CalculatorStats
+from calculators.result_cache import (
+    CalculatorResultCache,
+    ResultCacheStats,
+    get_result_cache,
+    set_result_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def configure_calculator_cache(redis_client: Any = None) -> Optional[CalculatorResultCache]:
+    """
+    Install the calculator result cache described by settings.
+
+    Args:
+        redis_client: Connected Redis client for the shared level (optional)
+
+    Returns:
+        The installed cache, or None when disabled in settings
+    """
+    if not settings.CALCULATOR_RESULT_CACHE_ENABLED:
+        set_result_cache(None)
+        return None
+
+    cache = CalculatorResultCache(
+        max_entries=settings.CALCULATOR_RESULT_CACHE_MAX_ENTRIES,
+        redis_client=redis_client if settings.CALCULATOR_RESULT_CACHE_USE_REDIS else None,
+        ttl_seconds=settings.CALCULATOR_RESULT_CACHE_TTL,
+    )
+    set_result_cache(cache)
+    logger.info(
+        f"Calculator result cache enabled ({cache.max_entries} entries in memory, "
+        f"Redis {'on' if cache.redis is not None else 'off'})"
+    )
+    return cache
+
+
+async def record_calculator_stats(
+    db: AsyncSession,
+    pending: Dict[str, ResultCacheStats],
+    usage_date: Optional[datetime] = None
+) -> int:
+    """
+    Add cache counters to today's calculator_stats rows.
+
+    Args:
+        db: Database session (committed here)
+        pending: Calculator ID -> counters, from CalculatorResultCache.drain_stats()
+        usage_date: Day to record against (default: today, UTC)
+
+    Returns:
+        Number of rows written
+    """
+    if not pending:
+        return 0
+
+    if usage_date is None:
+        usage_date = datetime.now(timezone.utc)
+    usage_date = usage_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    existing = await db.execute(
+        select(CalculatorStats).where(
+            CalculatorStats.calculator_id.in_(list(pending)),
+            CalculatorStats.usage_date == usage_date
+        )
+    )
+    rows = {row.calculator_id: row for row in existing.scalars()}
+
+    for calculator_id, stats in pending.items():
+        row = rows.get(calculator_id)
+        if row is None:
+            row = CalculatorStats(
+                calculator_id=calculator_id,
+                usage_date=usage_date,
+                usage_count=0,
+                cache_hits=0,
+                cache_misses=0
+            )
+            db.add(row)
+
+        # Running average over calculated (uncached) runs
+        previous_misses = row.cache_misses or 0
+        if stats.misses:
+            previous_total = (row.avg_computation_time_ms or 0) * previous_misses
+            row.avg_computation_time_ms = (previous_total + stats.compute_ms) / (previous_misses + stats.misses)
+
+        row.usage_count = (row.usage_count or 0) + stats.lookups
+        row.cache_hits = (row.cache_hits or 0) + stats.hits
+        row.cache_misses = previous_misses + stats.misses
+
+    await db.commit()
+    return len(pending)
+
+
+async def flush_calculator_stats() -> int:
+    """Drain the installed cache's counters into calculator_stats."""
+    cache = get_result_cache()
+    if cache is None:
+        return 0
+
+    pending = cache.drain_stats()
+    if not pending:
+        return 0
+
+    # Deferred: creating the engine is not needed to configure the cache
+    from app.database.sqlite_session import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            return await record_calculator_stats(db, pending)
+    except Exception as e:
+        logger.warning(f"Failed to record calculator stats: {e}")
+        return 0
+
+
+async def run_stats_flusher(interval_seconds: Optional[float] = None) -> None:
+    """Flush calculator stats every interval until cancelled, then once more."""
+    interval = interval_seconds or settings.CALCULATOR_STATS_FLUSH_SECONDS
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await flush_calculator_stats()
+    except asyncio.CancelledError:
+        await flush_calculator_stats()
+        raise
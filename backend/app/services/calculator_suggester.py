@@ -2,160 +2,135 @@
 Calculator Suggestion Engine
 
 Suggests relevant clinical calculators based on extracted entities.
+
+Calculator requirements come from the calculator registry (each calculator's
+compiled input schema), so suggestions use the real calculator IDs and input
+names and cannot drift from the calculators. At startup they are indexed as
+an inverted map from input field to calculators, with one bit per input
+within each calculator:
+
+- A request only touches calculators that use at least one extracted field,
+  so suggestion cost grows with the number of entities, not calculators
+- A calculator is fully satisfied when the bits of its detected inputs cover
+  its required mask
+
+Calculators whose required inputs were all detected can be run in one
+batched pass (run_satisfied) and returned with the Stage 1 note.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from calculators.base import ClinicalCalculator
 from calculators.registry import CalculatorRegistry
 
 logger = logging.getLogger(__name__)
 
+# Extracted entity field -> calculator input fields it supplies, where the
+# entity extractor and the calculators name the same value differently.
+# Fields not listed map to the calculator input of the same name.
+ENTITY_FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'psa': ('psa', 'total_psa'),
+    'clinical_stage': ('t_stage',),
+    'calcium': ('calcium_mg_dL',),
+    'hemoglobin': ('hemoglobin_g_dL',),
+    'tumor_size_cm': ('tumor_size_cm', 'tumor_size', 'tumor_diameter_cm'),
+    'karnofsky_score': ('kps',),
+    'testosterone': ('testosterone', 'total_testosterone'),
+}
+
+CONFIDENCE_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+
+@dataclass(frozen=True)
+class CalculatorRequirements:
+    """
+    Inputs of one calculator, with one bit per input.
+
+    Required inputs take bits 0..n-1, optional inputs the bits after them.
+    """
+    calculator_id: str
+    name: str
+    category: str
+    required: Tuple[str, ...]
+    optional: Tuple[str, ...]
+
+    @property
+    def inputs(self) -> Tuple[str, ...]:
+        return self.required + self.optional
+
+    @property
+    def required_mask(self) -> int:
+        return (1 << len(self.required)) - 1
+
+    @classmethod
+    def from_calculator(cls, calculator: ClinicalCalculator) -> "CalculatorRequirements":
+        """Read a calculator's inputs from its compiled schema."""
+        required = calculator.validator.required
+        optional = [meta.field_name for meta in calculator.validator.schema if meta.field_name not in required]
+        optional += [name for name in calculator.optional_inputs if name not in required and name not in optional]
+        return cls(
+            calculator_id=calculator.calculator_id,
+            name=calculator.name,
+            category=calculator.category.value,
+            required=tuple(required),
+            optional=tuple(optional),
+        )
+
+
+class RequirementIndex:
+    """
+    Inverted index from input field to (calculator, input bit).
+
+    Attributes:
+        calculators: Calculator requirements, by position
+        postings: Input field -> ((calculator position, bit), ...)
+    """
+
+    def __init__(self, calculators: Iterable[CalculatorRequirements]):
+        self.calculators: Tuple[CalculatorRequirements, ...] = tuple(calculators)
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for position, requirements in enumerate(self.calculators):
+            for bit, field in enumerate(requirements.inputs):
+                postings.setdefault(field, []).append((position, 1 << bit))
+        self.postings: Dict[str, Tuple[Tuple[int, int], ...]] = {
+            field: tuple(entries) for field, entries in postings.items()
+        }
+
+    @classmethod
+    def from_registry(cls, registry: CalculatorRegistry) -> "RequirementIndex":
+        """Index every registered calculator."""
+        return cls(CalculatorRequirements.from_calculator(calc) for calc in registry.get_all())
+
+    def coverage(self, fields: Iterable[str]) -> Dict[int, int]:
+        """
+        Input bits covered per calculator.
+
+        Args:
+            fields: Calculator input fields with detected values
+
+        Returns:
+            Calculator position -> bitmask of its detected inputs, for
+            calculators with at least one detected input
+        """
+        covered: Dict[int, int] = {}
+        for field in fields:
+            for position, bit in self.postings.get(field, ()):
+                covered[position] = covered.get(position, 0) | bit
+        return covered
+
 
 class CalculatorSuggester:
     """Suggest calculators based on available clinical data."""
 
-    # Map calculators to their required inputs
-    CALCULATOR_REQUIREMENTS = {
-        # Prostate Cancer Calculators
-        'capra_score': {
-            'category': 'prostate',
-            'name': 'CAPRA Score',
-            'required': ['psa', 'age', 'gleason_primary', 'gleason_secondary', 'clinical_stage', 'percent_positive_cores'],
-            'optional': [],
-            'description': 'Predicts recurrence-free survival after prostatectomy'
-        },
-        'pcptcalculator': {
-            'category': 'prostate',
-            'name': 'PCPT Risk Calculator',
-            'required': ['age', 'psa', 'dre_abnormal', 'african_american', 'family_history', 'prior_negative_biopsy'],
-            'optional': [],
-            'description': 'Estimates risk of prostate cancer on biopsy'
-        },
-        'nccn_risk': {
-            'category': 'prostate',
-            'name': 'NCCN Risk Stratification',
-            'required': ['psa', 'gleason_primary', 'gleason_secondary', 'clinical_stage'],
-            'optional': ['percent_positive_cores'],
-            'description': 'NCCN prostate cancer risk classification'
-        },
-        'psa_kinetics': {
-            'category': 'prostate',
-            'name': 'PSA Kinetics',
-            'required': ['psa_values', 'time_points'],
-            'optional': ['prostate_volume_cc'],
-            'description': 'Calculate PSA velocity, doubling time, and density'
-        },
-        'phi_score': {
-            'category': 'prostate',
-            'name': 'Prostate Health Index (PHI)',
-            'required': ['psa', 'free_psa', 'p2psa'],
-            'optional': [],
-            'description': 'Enhanced prostate cancer risk assessment'
-        },
-        'free_psa': {
-            'category': 'prostate',
-            'name': 'Free PSA Ratio',
-            'required': ['psa', 'free_psa'],
-            'optional': [],
-            'description': 'Assess probability of prostate cancer'
-        },
-
-        # Kidney Cancer Calculators
-        'ssign_score': {
-            'category': 'kidney',
-            'name': 'SSIGN Score',
-            'required': ['tumor_size_cm', 'tnm_stage', 'nuclear_grade', 'tumor_necrosis'],
-            'optional': [],
-            'description': 'Predict cancer-specific survival for RCC'
-        },
-        'imdc_criteria': {
-            'category': 'kidney',
-            'name': 'IMDC Criteria',
-            'required': ['karnofsky_score', 'hemoglobin', 'calcium', 'neutrophils', 'platelets', 'time_from_diagnosis'],
-            'optional': [],
-            'description': 'Prognostic model for metastatic RCC'
-        },
-        'renal_score': {
-            'category': 'kidney',
-            'name': 'RENAL Nephrometry Score',
-            'required': ['tumor_size_cm', 'tumor_location', 'nearness_to_sinus'],
-            'optional': [],
-            'description': 'Assess renal mass complexity for partial nephrectomy'
-        },
-        'leibovich_score': {
-            'category': 'kidney',
-            'name': 'Leibovich Score',
-            'required': ['tumor_size_cm', 'tnm_stage', 'nuclear_grade', 'tumor_necrosis'],
-            'optional': [],
-            'description': 'Predict metastatic progression after nephrectomy'
-        },
-
-        # Bladder Cancer Calculators
-        'eortc_recurrence': {
-            'category': 'bladder',
-            'name': 'EORTC Recurrence Risk',
-            'required': ['num_tumors', 'tumor_size_cm', 'prior_recurrence', 't_category', 'cis_present', 'tumor_grade'],
-            'optional': [],
-            'description': 'Predict bladder cancer recurrence risk'
-        },
-        'eortc_progression': {
-            'category': 'bladder',
-            'name': 'EORTC Progression Risk',
-            'required': ['num_tumors', 'tumor_size_cm', 'prior_recurrence', 't_category', 'cis_present', 'tumor_grade'],
-            'optional': [],
-            'description': 'Predict bladder cancer progression risk'
-        },
-        'cueto_score': {
-            'category': 'bladder',
-            'name': 'Cueto BCG Score',
-            'required': ['age', 'prior_recurrence', 'num_tumors', 'tumor_grade'],
-            'optional': [],
-            'description': 'Predict BCG failure in bladder cancer'
-        },
-
-        # Voiding Dysfunction
-        'iciq': {
-            'category': 'voiding',
-            'name': 'ICIQ Score',
-            'required': ['frequency', 'amount', 'impact'],
-            'optional': [],
-            'description': 'Incontinence impact assessment'
-        },
-
-        # Surgical Risk
-        'rcri': {
-            'category': 'surgical',
-            'name': 'Revised Cardiac Risk Index',
-            'required': ['risk_factors_count'],
-            'optional': [],
-            'description': 'Perioperative cardiac risk assessment'
-        },
-        'clavien_dindo': {
-            'category': 'surgical',
-            'name': 'Clavien-Dindo Classification',
-            'required': ['complication_grade'],
-            'optional': [],
-            'description': 'Surgical complication severity grading'
-        },
-        'cci': {
-            'category': 'surgical',
-            'name': 'Charlson Comorbidity Index',
-            'required': ['age', 'comorbidities'],
-            'optional': [],
-            'description': '10-year mortality prediction'
-        },
-        'lifeexpectancycalculator': {
-            'category': 'surgical',
-            'name': 'Actuarial 10-Year Survival Calculator',
-            'required': ['age', 'gender', 'health_status', 'comorbidities'],
-            'optional': [],
-            'description': 'Estimate life expectancy using actuarial tables'
-        },
-    }
-
-    def __init__(self):
-        """Initialize calculator suggester."""
-        self.registry = CalculatorRegistry()
+    def __init__(self, registry: Optional[CalculatorRegistry] = None):
+        """Initialize calculator suggester and index calculator requirements."""
+        self.registry = registry or CalculatorRegistry()
+        self.index = RequirementIndex.from_registry(self.registry)
+        logger.info(
+            f"Indexed {len(self.index.calculators)} calculators over {len(self.index.postings)} input fields"
+        )
 
     def suggest_calculators(self, extracted_entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -167,72 +142,100 @@ class CalculatorSuggester:
         Returns:
             List of calculator suggestions with confidence and missing inputs
         """
-        # Build entity lookup dict
-        entity_dict = {e['field']: e['value'] for e in extracted_entities}
-        suggestions = []
-
-        for calc_id, requirements in self.CALCULATOR_REQUIREMENTS.items():
-            suggestion = self._evaluate_calculator(calc_id, requirements, entity_dict)
-            if suggestion:
-                suggestions.append(suggestion)
-
-        # Sort by confidence (high -> medium -> low)
-        confidence_order = {'high': 0, 'medium': 1, 'low': 2}
-        suggestions.sort(key=lambda x: confidence_order.get(x['confidence'], 3))
-
-        return suggestions
+        input_values = self._input_values(extracted_entities)
+        covered = self.index.coverage(input_values)
+
+        ranked = []
+        for position, mask in covered.items():
+            suggestion = self._evaluate_calculator(self.index.calculators[position], mask, input_values)
+            ranked.append((CONFIDENCE_ORDER.get(suggestion['confidence'], 3), position, suggestion))
+
+        # Sort by confidence (high -> medium -> low), then registry order
+        ranked.sort(key=lambda entry: entry[:2])
+        return [suggestion for _, _, suggestion in ranked]
+
+    @staticmethod
+    def _input_values(extracted_entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Map extracted entities to calculator input fields."""
+        input_values: Dict[str, Any] = {}
+        for entity in extracted_entities:
+            for field in ENTITY_FIELD_ALIASES.get(entity['field'], (entity['field'],)):
+                input_values.setdefault(field, entity['value'])
+        return input_values
 
     def _evaluate_calculator(
         self,
-        calc_id: str,
-        requirements: Dict[str, Any],
-        entity_dict: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Evaluate if a calculator should be suggested."""
-
-        required_inputs = requirements['required']
-        optional_inputs = requirements.get('optional', [])
-        all_inputs = required_inputs + optional_inputs
-
-        # Check which inputs are available
-        available_inputs = [inp for inp in all_inputs if inp in entity_dict]
-        missing_required = [inp for inp in required_inputs if inp not in entity_dict]
-        missing_optional = [inp for inp in optional_inputs if inp not in entity_dict]
-
-        # Only suggest if at least some inputs are available
-        if not available_inputs:
-            return None
+        requirements: CalculatorRequirements,
+        mask: int,
+        input_values: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the suggestion for a calculator with at least one detected input."""
+        required_mask = requirements.required_mask
+        n_required = len(requirements.required)
+        n_available = bin(mask).count('1')
+        missing_required = n_required - bin(mask & required_mask).count('1')
 
         # Determine confidence level
         if not missing_required:
             confidence = 'high'
             auto_selected = True
             reason = 'All required inputs detected'
-        elif len(available_inputs) >= len(required_inputs) * 0.5:
+        elif n_available >= n_required * 0.5:
             confidence = 'medium'
             auto_selected = False
-            reason = f'Missing {len(missing_required)} required input(s)'
+            reason = f'Missing {missing_required} required input(s)'
         else:
             confidence = 'low'
             auto_selected = False
-            reason = f'Insufficient data detected ({len(available_inputs)}/{len(required_inputs)} required)'
+            reason = f'Insufficient data detected ({n_available}/{n_required} required)'
 
-        # Extract detected entity values
-        detected_entities = {k: entity_dict[k] for k in available_inputs}
+        inputs = requirements.inputs
+        available_inputs = [field for bit, field in enumerate(inputs) if mask >> bit & 1]
+        missing_inputs = [field for bit, field in enumerate(inputs) if not mask >> bit & 1]
 
         return {
-            'calculator_id': calc_id,
-            'calculator_name': requirements['name'],
-            'category': requirements['category'],
+            'calculator_id': requirements.calculator_id,
+            'calculator_name': requirements.name,
+            'category': requirements.category,
             'confidence': confidence,
             'auto_selected': auto_selected,
             'reason': reason,
-            'required_inputs': required_inputs,
+            'required_inputs': list(requirements.required),
             'available_inputs': available_inputs,
-            'missing_inputs': missing_required + missing_optional,
-            'detected_entities': detected_entities
+            'missing_inputs': missing_inputs,
+            'detected_entities': {field: input_values[field] for field in available_inputs}
         }
 
+    async def run_satisfied(
+        self,
+        suggestions: List[Dict[str, Any]],
+        include_formatted_output: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every auto-selected (fully satisfied) calculator in one batched pass.
+
+        Args:
+            suggestions: Output of suggest_calculators()
+            include_formatted_output: Add format_output() text to each result
+
+        Returns:
+            One result per auto-selected calculator, in suggestion order;
+            failures carry "error" (see calculator_batch.score_item)
+        """
+        from app.services.calculator_batch import stream_batch_results
+
+        items = [
+            {'calculator_id': s['calculator_id'], 'inputs': s['detected_entities']}
+            for s in suggestions if s['auto_selected']
+        ]
+        if not items:
+            return []
+
+        results = [None] * len(items)
+        async for result in stream_batch_results(items, include_formatted_output=include_formatted_output):
+            results[result.pop('index')] = result
+        return results
+
 
 # Singleton instance
 _suggester = None
@@ -150,16 +150,24 @@ class ClinicalEntityExtractor:
         ],
     }
 
+    # Compiled once; the ambient stream runs the regex pass on every fragment
+    _COMPILED_PATTERNS = {
+        field: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for field, patterns in ENTITY_PATTERNS.items()
+    }
+
     def __init__(self, llm_manager: Optional[LLMManager] = None):
         """Initialize entity extractor."""
         self.llm_manager = llm_manager or LLMManager()
 
-    async def extract_entities(self, clinical_text: str) -> List[Dict[str, Any]]:
+    async def extract_entities(self, clinical_text: str, use_llm: bool = True) -> List[Dict[str, Any]]:
         """
         Extract clinical entities from text using both regex and LLM.
 
         Args:
             clinical_text: Unstructured clinical text
+            use_llm: Run the LLM pass after the regex pass; False for a
+                cheap regex-only pass (ambient transcript fragments)
 
         Returns:
             List of extracted entities with field, value, confidence, source
@@ -171,11 +179,12 @@ class ClinicalEntityExtractor:
         entities.extend(regex_entities)
 
         # Second pass: LLM-based extraction (catches complex patterns)
-        try:
-            llm_entities = await self._extract_with_llm(clinical_text, regex_entities)
-            entities.extend(llm_entities)
-        except Exception as e:
-            logger.warning(f"LLM extraction failed: {e}")
+        if use_llm:
+            try:
+                llm_entities = await self._extract_with_llm(clinical_text, regex_entities)
+                entities.extend(llm_entities)
+            except Exception as e:
+                logger.warning(f"LLM extraction failed: {e}")
 
         # Deduplicate and prioritize by confidence
         entities = self._deduplicate_entities(entities)
@@ -186,10 +195,9 @@ class ClinicalEntityExtractor:
         """Extract entities using regex patterns."""
         entities = []
 
-        for field, patterns in self.ENTITY_PATTERNS.items():
+        for field, patterns in self._COMPILED_PATTERNS.items():
             for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
+                for match in pattern.finditer(text):
                     try:
                         value = match.group(1)
 
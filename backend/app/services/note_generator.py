@@ -199,7 +199,7 @@ class NoteGenerator:
                     continue
 
                 # Calculate
-                calc_result = calculator.calculate(inputs)
+                calc_result = calculator.run(inputs)
 
                 # Create result object
                 result = CalculatorResult(
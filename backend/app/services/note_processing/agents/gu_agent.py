@@ -4,7 +4,8 @@ GU (Urology) Agent
 Processes all UROLOGY notes and extracts structured data into gu_note dictionaries.
 """
 
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+from ..profiling import run_extractors
 from ..extractors import (
     extract_cc,
     extract_hpi,
@@ -25,7 +26,30 @@ from ..extractors import (
     extract_labs,
     extract_imaging_from_note,
 )
-# Note: Assessment and Plan are NOT extracted in Stage 1 - they are Stage 2 only
+
+# Note: PE, ROS, Assessment, and Plan are NOT extracted in Stage 1
+#       - PE/ROS use static templates filled by provider during visit
+#       - Assessment/Plan are completed after the patient visit (Stage 2)
+GU_EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "CC": extract_cc,
+    "HPI": extract_hpi,
+    "IPSS": extract_ipss,
+    "DHx": extract_diet,
+    "PMH": extract_pmh_from_note,
+    "PSH": extract_psh,
+    "Social": extract_social,
+    "Family": extract_family,
+    "Sexual": extract_sexual,
+    "PSA": extract_psa,
+    "Pathology": extract_pathology_from_note,
+    "Testosterone": extract_testosterone,
+    "Medications": extract_medications_from_note,
+    "Allergies": extract_allergies,
+    "Endocrine": extract_endocrine_labs,
+    "Stone": extract_stone_labs,
+    "Labs": extract_labs,
+    "Imaging": extract_imaging_from_note,
+}
 
 
 def process_gu_notes(gu_notes: List[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -73,33 +97,22 @@ def process_gu_notes(gu_notes: List[Dict[str, str]]) -> List[Dict[str, str]]:
     gu_note_list = []
 
     for note in gu_notes:
-        note_content = note["content"]
-
-        # Extract all sections using extractor functions
-        # Note: PE, ROS, Assessment, and Plan are NOT extracted in Stage 1
-        #       - PE/ROS use static templates filled by provider during visit
-        #       - Assessment/Plan are completed after the patient visit (Stage 2)
-        gu_note = {
-            "CC": extract_cc(note_content),
-            "HPI": extract_hpi(note_content),
-            "IPSS": extract_ipss(note_content),
-            "DHx": extract_diet(note_content),
-            "PMH": extract_pmh_from_note(note_content),
-            "PSH": extract_psh(note_content),
-            "Social": extract_social(note_content),
-            "Family": extract_family(note_content),
-            "Sexual": extract_sexual(note_content),
-            "PSA": extract_psa(note_content),
-            "Pathology": extract_pathology_from_note(note_content),
-            "Testosterone": extract_testosterone(note_content),
-            "Medications": extract_medications_from_note(note_content),
-            "Allergies": extract_allergies(note_content),
-            "Endocrine": extract_endocrine_labs(note_content),
-            "Stone": extract_stone_labs(note_content),
-            "Labs": extract_labs(note_content),
-            "Imaging": extract_imaging_from_note(note_content)
-        }
+        gu_note = extract_gu_note(note["content"])
 
         gu_note_list.append(gu_note)
 
     return gu_note_list
+
+
+def extract_gu_note(note_content: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    """
+    Run every GU extractor over a single note.
+
+    Args:
+        note_content: Raw content of one GU note
+        timings: Optional per-extractor durations (ms), summed across notes
+
+    Returns:
+        gu_note dictionary (see process_gu_notes)
+    """
+    return run_extractors(GU_EXTRACTORS, note_content, timings)
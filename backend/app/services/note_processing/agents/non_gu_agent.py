@@ -4,7 +4,8 @@ Non-GU Agent
 Processes all non-urology notes and extracts structured data into non_gu_note dictionaries.
 """
 
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+from ..profiling import run_extractors
 from ..extractors import (
     extract_cc,
     extract_hpi,
@@ -17,6 +18,19 @@ from ..extractors import (
     extract_plan,
 )
 
+# Clinically relevant sections
+NON_GU_EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "CC": extract_cc,
+    "HPI": extract_hpi,
+    "DHx": extract_diet,
+    "PMH": extract_pmh_from_note,
+    "PSH": extract_psh,
+    "Social": extract_social,
+    "Family": extract_family,
+    "Assessment": extract_assessment,
+    "Plan": extract_plan,
+}
+
 
 def process_non_gu_notes(non_gu_notes: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """
@@ -49,21 +63,22 @@ def process_non_gu_notes(non_gu_notes: List[Dict[str, str]]) -> List[Dict[str, s
     non_gu_note_list = []
 
     for note in non_gu_notes:
-        note_content = note["content"]
-
-        # Extract clinically relevant sections
-        non_gu_note = {
-            "CC": extract_cc(note_content),
-            "HPI": extract_hpi(note_content),
-            "DHx": extract_diet(note_content),
-            "PMH": extract_pmh_from_note(note_content),
-            "PSH": extract_psh(note_content),
-            "Social": extract_social(note_content),
-            "Family": extract_family(note_content),
-            "Assessment": extract_assessment(note_content),
-            "Plan": extract_plan(note_content)
-        }
+        non_gu_note = extract_non_gu_note(note["content"])
 
         non_gu_note_list.append(non_gu_note)
 
     return non_gu_note_list
+
+
+def extract_non_gu_note(note_content: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    """
+    Run the non-GU extractors over a single note.
+
+    Args:
+        note_content: Raw content of one non-GU note
+        timings: Optional per-extractor durations (ms), summed across notes
+
+    Returns:
+        non_gu_note dictionary (see process_non_gu_notes)
+    """
+    return run_extractors(NON_GU_EXTRACTORS, note_content, timings)
@@ -0,0 +1,39 @@
+"""
+Stage-1 Build Store
+
+Short-lived, in-memory store of Stage-1 build states so that a clinician who
+appends data (an extra lab panel, an imaging report) can regenerate the note
+incrementally instead of rebuilding from scratch.
+
+HIPAA: build states contain PHI. They are held in process memory only,
+scoped to the user who created them, and expire after
+NOTE_SESSION_TTL_MINUTES.
+
+Deployment: a build_id only exists in the worker process that built the
+note. With several uvicorn workers, /generate-initial/rebuild returns 404
+when the load balancer routes it elsewhere, so run a single worker or pin
+each user to one worker (sticky sessions).
+"""
+
+from typing import Optional
+
+from app.config import settings
+from app.services.session_store import OwnerScopedStore
+
+from .note_builder import Stage1BuildState
+
+
+class Stage1BuildStore(OwnerScopedStore[Stage1BuildState]):
+    """build_id -> Stage1BuildState, scoped to the user who created it."""
+
+
+# Singleton instance
+_build_store: Optional[Stage1BuildStore] = None
+
+
+def get_build_store() -> Stage1BuildStore:
+    """Get the process-wide Stage-1 build store."""
+    global _build_store
+    if _build_store is None:
+        _build_store = Stage1BuildStore(ttl_seconds=settings.NOTE_SESSION_TTL_MINUTES * 60)
+    return _build_store
@@ -0,0 +1,327 @@
+"""
+Extraction Cache
+
+Persistent, encrypted-at-rest cache of per-note extraction dictionaries
+(the gu_note / non_gu_note dicts produced by the GU and non-GU agents).
+
+The same historical notes are pasted into VAUCDA at every visit, so the
+extractors are re-run on text that has not changed in years. Entries are
+keyed by (note kind, extractor version, SHA-256 of the note content):
+- Changing any extractor changes the extractor version, which invalidates
+  every entry automatically.
+- Entries are evicted least-recently-used once the entry or size limit is hit.
+
+HIPAA: extracted dictionaries contain PHI. They are only written to disk
+when NOTE_EXTRACTION_CACHE_KEY is configured (Fernet encryption). Without a
+key the cache is memory-only and nothing touches the filesystem.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of the extracted dictionaries changes without any
+# extractor source change (e.g. a key is renamed in gu_agent/non_gu_agent).
+EXTRACTION_SCHEMA_VERSION = 1
+
+
+def _compute_extractor_version() -> str:
+    """
+    Fingerprint the extractor code so cached results never outlive it.
+
+    Hashes the source of every extractor module plus the two agents that
+    assemble the per-note dictionaries.
+    """
+    package_dir = Path(__file__).parent
+    sources = sorted((package_dir / "extractors").glob("*.py"))
+    sources += [package_dir / "agents" / "gu_agent.py", package_dir / "agents" / "non_gu_agent.py"]
+
+    digest = hashlib.sha256(str(EXTRACTION_SCHEMA_VERSION).encode())
+    for source in sources:
+        try:
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+        except OSError:
+            continue
+    return digest.hexdigest()[:16]
+
+
+EXTRACTOR_VERSION = _compute_extractor_version()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one note build (or for the cache lifetime)."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert to dictionary for response metadata."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+def _fernet_from_key(raw_key: str):
+    """Build a Fernet instance, deriving a valid key from arbitrary secrets."""
+    from cryptography.fernet import Fernet
+
+    key = raw_key.encode()
+    if len(key) != 44:  # Fernet keys are 32 bytes base64-encoded
+        key = base64.urlsafe_b64encode(hashlib.sha256(key).digest())
+    return Fernet(key)
+
+
+class NoteExtractionCache:
+    """
+    Two-level LRU cache of extracted note dictionaries.
+
+    Level 1 is an in-process OrderedDict. Level 2 is an optional SQLite file
+    whose payloads are Fernet-encrypted; it survives restarts and is shared
+    by all workers on the host.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        encryption_key: Optional[str] = None,
+        max_entries: int = 5000,
+        max_bytes: int = 256 * 1024 * 1024,
+        extractor_version: str = EXTRACTOR_VERSION,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            path: SQLite file for the persistent level (None = memory only)
+            encryption_key: Fernet key or secret; required for the persistent level
+            max_entries: Maximum number of cached notes (per level)
+            max_bytes: Maximum total payload size of the persistent level
+            extractor_version: Version component of every cache key
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.extractor_version = extractor_version
+        self.stats = CacheStats()
+
+        self._memory: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fernet = None
+
+        if path and encryption_key:
+            try:
+                self._fernet = _fernet_from_key(encryption_key)
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS note_extractions ("
+                    "cache_key TEXT PRIMARY KEY, payload BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_note_extractions_access "
+                    "ON note_extractions (last_access)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Persistent extraction cache disabled: {e}")
+                self._conn = None
+                self._fernet = None
+        elif path:
+            logger.warning(
+                "NOTE_EXTRACTION_CACHE_KEY not set - extraction cache is memory-only "
+                "(PHI is never written to disk unencrypted)"
+            )
+
+    @property
+    def persistent(self) -> bool:
+        """Whether the encrypted on-disk level is active."""
+        return self._conn is not None
+
+    def make_key(self, kind: str, content: str) -> str:
+        """Build the cache key for a note of the given kind ('gu' / 'non_gu')."""
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return f"{kind}:{self.extractor_version}:{content_hash}"
+
+    def get(self, kind: str, content: str) -> Optional[Dict[str, str]]:
+        """
+        Look up the extracted dictionary for a note.
+
+        Returns:
+            A copy of the cached dictionary, or None on a miss
+        """
+        key = self.make_key(kind, content)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return dict(cached)
+
+            cached = self._load_persistent(key)
+            if cached is not None:
+                self._remember(key, cached)
+                self.stats.hits += 1
+                return dict(cached)
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, kind: str, content: str, extracted: Dict[str, str]) -> None:
+        """Store the extracted dictionary for a note."""
+        key = self.make_key(kind, content)
+
+        with self._lock:
+            self._remember(key, dict(extracted))
+            self._store_persistent(key, extracted)
+
+    def get_or_extract(
+        self,
+        kind: str,
+        content: str,
+        extract: Callable[[str], Dict[str, str]],
+        stats: Optional[CacheStats] = None,
+    ) -> Dict[str, str]:
+        """
+        Return the cached dictionary for a note, running the extractors on a miss.
+
+        Args:
+            kind: Note kind ('gu' or 'non_gu')
+            content: Raw note content
+            extract: Extraction function applied to the content on a miss
+            stats: Optional per-build counters to update
+
+        Returns:
+            Extracted note dictionary
+        """
+        extracted = self.get(kind, content)
+        if extracted is not None:
+            if stats is not None:
+                stats.hits += 1
+            return extracted
+
+        if stats is not None:
+            stats.misses += 1
+        extracted = extract(content)
+        self.put(kind, content, extracted)
+        return extracted
+
+    def clear(self) -> None:
+        """Remove every entry from both levels."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM note_extractions")
+                self._conn.commit()
+
+    def _remember(self, key: str, extracted: Dict[str, str]) -> None:
+        """Insert into the in-memory level, evicting the LRU entry if full."""
+        self._memory[key] = extracted
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_persistent(self, key: str) -> Optional[Dict[str, str]]:
+        """Read and decrypt an entry from the persistent level."""
+        if self._conn is None:
+            return None
+
+        try:
+            row = self._conn.execute(
+                "SELECT payload FROM note_extractions WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE note_extractions SET last_access = ? WHERE cache_key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+            return json.loads(self._fernet.decrypt(row[0]))
+        except Exception as e:
+            logger.warning(f"Extraction cache read failed: {e}")
+            return None
+
+    def _store_persistent(self, key: str, extracted: Dict[str, str]) -> None:
+        """Encrypt and write an entry, then enforce the LRU limits."""
+        if self._conn is None:
+            return
+
+        try:
+            payload = self._fernet.encrypt(json.dumps(extracted).encode("utf-8"))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO note_extractions (cache_key, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time())
+            )
+            self._evict_persistent()
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+
+    def _evict_persistent(self) -> None:
+        """Delete least-recently-used entries until both limits are satisfied."""
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM note_extractions"
+        ).fetchone()
+
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT cache_key, size FROM note_extractions ORDER BY last_access ASC"
+        ).fetchall()
+
+        evict = []
+        for cache_key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            evict.append((cache_key,))
+            count -= 1
+            total_size -= size
+
+        self._conn.executemany("DELETE FROM note_extractions WHERE cache_key = ?", evict)
+
+
+# Singleton instance
+_extraction_cache: Optional[NoteExtractionCache] = None
+
+
+def get_extraction_cache() -> Optional[NoteExtractionCache]:
+    """Get the process-wide extraction cache (None when disabled in settings)."""
+    global _extraction_cache
+    if not settings.NOTE_EXTRACTION_CACHE_ENABLED:
+        return None
+    if _extraction_cache is None:
+        _extraction_cache = NoteExtractionCache(
+            path=settings.NOTE_EXTRACTION_CACHE_PATH,
+            encryption_key=settings.NOTE_EXTRACTION_CACHE_KEY,
+            max_entries=settings.NOTE_EXTRACTION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.NOTE_EXTRACTION_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _extraction_cache
@@ -7,21 +7,33 @@ Orchestrates the entire note processing pipeline:
 3. Extract document-level data
 4. Synthesize all sections
 5. Assemble final urology clinic note
+
+Sections are described by SECTION_GRAPH (section -> agent -> input sources),
+which lets rebuild_urology_note() re-run only the notes and agents affected
+when the clinician appends data to a previously built document.
 """
 
+import functools
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from .note_identifier import identify_notes
-from .agents.gu_agent import process_gu_notes
-from .agents.non_gu_agent import process_non_gu_notes
+from .extraction_cache import CacheStats, get_extraction_cache
+from .profiling import PipelineProfile, measure_size
+from .agents.gu_agent import extract_gu_note
+from .agents.non_gu_agent import extract_non_gu_note
 from .extractors import extract_pmh, extract_medications, extract_pathology, extract_imaging
 from .extractors.psh_extractor import extract_psh
-from .extractors.consult_request_extractor import extract_consult_request
+from .extractors.consult_request_extractor import extract_consult_request, ConsultRequestExtractor
 from .extractors.psa_extractor import extract_psa
 from .extractors.lab_extractor import extract_labs, extract_stone_labs, extract_calcium_series
 from .extractors.endocrine_extractor import extract_endocrine_labs
 from .extractors.social_extractor import extract_social
 from .extractors.family_extractor import extract_family
-from .document_classifier import DocumentClassifier, extract_document_type
+from .document_classifier import DocumentClassifier
 from .extractors.pcp_note_extractor import PCPNoteExtractor
 
 # Import synthesis agents
@@ -49,6 +61,8 @@ from .agents.ros_agent import synthesize_ros
 from .agents.pe_agent import synthesize_pe
 # Note: Assessment and Plan are Stage 2 only (completed after patient visit)
 
+logger = logging.getLogger(__name__)
+
 
 def get_time_suffix(is_consult: bool = False) -> str:
     """
@@ -115,236 +129,515 @@ documenting the encounter.
 """
 
 
-def build_urology_note(clinical_document: str) -> str:
+# ============================================================================
+# SECTION DEPENDENCY GRAPH
+# ============================================================================
+# Every Stage-1 section is produced by one synthesis agent from a fixed set of
+# named sources (per-note dictionaries and document-level extractions). The
+# graph below records those dependencies so an incremental rebuild can re-run
+# only the agents whose inputs actually changed.
+
+# Per-note extractors by note kind (identify_notes() "gu_notes" / "non_gu_notes")
+NOTE_EXTRACTORS: Dict[str, Callable[..., Dict[str, str]]] = {
+    "gu": extract_gu_note,
+    "non_gu": extract_non_gu_note,
+}
+
+# Document-level extractors, run over the full clinical document
+DOCUMENT_EXTRACTORS: Dict[str, Callable[[str], Any]] = {
+    "document_social": extract_social,
+    "document_family": extract_family,
+    "document_pmh": extract_pmh,
+    "document_psh": extract_psh,
+    "document_medications": extract_medications,
+    "document_pathology": extract_pathology,
+    "document_imaging": extract_imaging,
+    "document_psa": extract_psa,
+    "document_labs": extract_labs,
+    "document_stone_labs": extract_stone_labs,
+    "document_calcium": extract_calcium_series,
+    "document_endocrine": extract_endocrine_labs,
+}
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """A Stage-1 section, the agent that builds it and the sources it reads."""
+    name: str
+    inputs: Tuple[str, ...]
+    build: Callable[[Dict[str, Any]], Any]
+    uses_llm: bool = False
+
+
+def _build_cc(src: Dict[str, Any]) -> str:
+    # Use consult CC if available, otherwise synthesize from notes
+    return src["consult"]["cc"] or synthesize_cc(src["gu_notes"], src["non_gu_notes"])
+
+
+def _build_hpi(src: Dict[str, Any]) -> str:
+    consult = src["consult"]
+    # For consults, synthesize comprehensive HPI from all available data
+    if src["is_consult"] and consult["hpi"]:
+        return synthesize_consult_hpi(
+            consult_reason=consult["hpi"],
+            patient_name=consult["patient_name"],
+            patient_age=consult["patient_age"],
+            pmh=src["document_pmh"],
+            psh=None,  # Will be synthesized later
+            medications=src["document_medications"],
+            imaging=src["document_imaging"],
+            pcp_note_data=src["pcp_data"]
+        )
+    return synthesize_hpi(src["gu_notes"], src["non_gu_notes"])
+
+
+def _build_psh(src: Dict[str, Any]) -> str:
+    # For consults, use document-level PSH if available
+    if src["is_consult"] and src["document_psh"]:
+        return synthesize_psh([{"PSH": src["document_psh"]}], [])
+    return synthesize_psh(src["gu_notes"], src["non_gu_notes"])
+
+
+# For consults, prefer document-level data (labs are in full document, not GU notes)
+def _build_social(src: Dict[str, Any]) -> str:
+    if src["is_consult"] and src["document_social"]:
+        return src["document_social"]
+    return synthesize_social(src["gu_notes"], src["non_gu_notes"])
+
+
+def _build_family(src: Dict[str, Any]) -> str:
+    if src["is_consult"] and src["document_family"]:
+        return src["document_family"]
+    return synthesize_family(src["gu_notes"], src["non_gu_notes"])
+
+
+def _build_psa(src: Dict[str, Any]) -> str:
+    # For consults, always prefer document-level PSA (comes from lab results)
+    # Pass through PSA agent for proper formatting ([r] prefix, spacing)
+    if src["is_consult"] and src["document_psa"]:
+        return synthesize_psa([{"PSA": src["document_psa"]}])
+    return synthesize_psa(src["gu_notes"])
+
+
+def _build_endocrine(src: Dict[str, Any]) -> str:
+    if src["is_consult"] and src["document_endocrine"]:
+        return src["document_endocrine"]
+    return synthesize_endocrine_labs(src["gu_notes"])
+
+
+def _build_labs(src: Dict[str, Any]) -> str:
+    # Calcium series is NOT appended to general labs - it only shows if abnormal
+    # (via filtering) or in STONE LABS section
+    if src["is_consult"] and src["document_labs"]:
+        return src["document_labs"]
+    return synthesize_general_labs(src["gu_notes"])
+
+
+def _build_stone(src: Dict[str, Any]) -> str:
+    # Use stone labs directly from document extraction
+    return src["document_stone_labs"] or synthesize_stone_labs(src["gu_notes"])
+
+
+# Note: Assessment and Plan are NOT generated in Stage 1 - they are completed during/after the visit
+SECTION_GRAPH: Tuple[SectionSpec, ...] = (
+    SectionSpec("cc", ("consult", "gu_notes", "non_gu_notes"), _build_cc, uses_llm=True),
+    SectionSpec(
+        "hpi",
+        ("is_consult", "consult", "document_pmh", "document_medications",
+         "document_imaging", "pcp_data", "gu_notes", "non_gu_notes"),
+        _build_hpi,
+        uses_llm=True
+    ),
+    SectionSpec("ipss", ("gu_notes",), lambda s: synthesize_ipss(s["gu_notes"]), uses_llm=True),
+    SectionSpec("dhx", ("gu_notes",), lambda s: synthesize_diet(s["gu_notes"]), uses_llm=True),
+    SectionSpec(
+        "pmh",
+        ("document_pmh", "gu_notes", "non_gu_notes"),
+        lambda s: synthesize_pmh(s["document_pmh"], s["gu_notes"], s["non_gu_notes"])
+    ),
+    SectionSpec(
+        "psh", ("is_consult", "document_psh", "gu_notes", "non_gu_notes"), _build_psh, uses_llm=True
+    ),
+    SectionSpec(
+        "social", ("is_consult", "document_social", "gu_notes", "non_gu_notes"), _build_social,
+        uses_llm=True
+    ),
+    SectionSpec(
+        "family", ("is_consult", "document_family", "gu_notes", "non_gu_notes"), _build_family,
+        uses_llm=True
+    ),
+    SectionSpec("psa", ("is_consult", "document_psa", "gu_notes"), _build_psa),
+    SectionSpec("endocrine", ("is_consult", "document_endocrine", "gu_notes"), _build_endocrine),
+    SectionSpec("labs", ("is_consult", "document_labs", "gu_notes"), _build_labs),
+    SectionSpec("stone", ("document_stone_labs", "gu_notes"), _build_stone),
+    SectionSpec(
+        "sexual", ("gu_notes", "non_gu_notes"),
+        lambda s: synthesize_sexual(s["gu_notes"], s["non_gu_notes"]), uses_llm=True
+    ),
+    SectionSpec(
+        "pathology", ("document_pathology", "gu_notes"),
+        lambda s: synthesize_pathology(s["document_pathology"], s["gu_notes"]), uses_llm=True
+    ),
+    SectionSpec("testosterone", ("gu_notes",), lambda s: synthesize_testosterone(s["gu_notes"])),
+    SectionSpec(
+        "medications", ("document_medications", "gu_notes"),
+        lambda s: synthesize_medications(s["document_medications"], s["gu_notes"])
+    ),
+    SectionSpec(
+        "allergies", ("gu_notes", "non_gu_notes"),
+        lambda s: synthesize_allergies(s["gu_notes"], s["non_gu_notes"]), uses_llm=True
+    ),
+    SectionSpec(
+        "imaging", ("document_imaging", "gu_notes"),
+        lambda s: synthesize_imaging(s["document_imaging"], s["gu_notes"]), uses_llm=True
+    ),
+    SectionSpec("ros", ("gu_notes", "non_gu_notes"), lambda s: synthesize_ros(s["gu_notes"], s["non_gu_notes"])),
+    SectionSpec("pe", ("gu_notes", "non_gu_notes"), lambda s: synthesize_pe(s["gu_notes"], s["non_gu_notes"])),
+)
+
+
+# Pure regex/template sections first, LLM-synthesized sections last (HPI
+# last of all) so streaming clients see the fast sections immediately.
+# Sections are independent, so the order does not change the note.
+SYNTHESIS_ORDER: Tuple[SectionSpec, ...] = tuple(
+    sorted(SECTION_GRAPH, key=lambda spec: (spec.uses_llm, spec.name == "hpi"))
+)
+
+# Called with (section name, synthesized content) as each section completes
+SectionCallback = Callable[[str, Any], None]
+
+
+@dataclass
+class Stage1BuildState:
     """
-    Build a comprehensive urology clinic note from a clinical document.
+    Everything needed to incrementally rebuild a Stage-1 note.
 
-    This is the main entry point for the new agent-based architecture.
+    Contains PHI - keep in memory only (see build_store.Stage1BuildStore).
+    """
+    clinical_document: str
+    note_extractions: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    sources: Dict[str, Any] = field(default_factory=dict)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    sections: Dict[str, Any] = field(default_factory=dict)
+    section_fingerprints: Dict[str, str] = field(default_factory=dict)
+    final_note: str = ""
+    rebuilt_sections: List[str] = field(default_factory=list)
+
+
+def _fingerprint(value: Any) -> str:
+    """Stable content hash of an extraction result or source value."""
+    serialized = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+
+def note_extraction_key(kind: str, content: str) -> str:
+    """Key of a per-note extraction in Stage1BuildState.note_extractions."""
+    return f"{kind}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+
+
+def _extract_note_dicts(
+    kind: str,
+    notes: List[Dict[str, str]],
+    extract: Callable[[str], Dict[str, str]],
+    previous: Optional[Dict[str, Dict[str, str]]],
+    extractions: Dict[str, Dict[str, str]],
+    cache_stats: CacheStats,
+    timings: Optional[Dict[str, float]] = None,
+) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Extract per-note dictionaries, reusing those already extracted.
 
-    Args:
-        clinical_document: Full clinical document text
+    `extract` must accept a `timings` keyword when `timings` is given; the
+    extractors' durations (ms) over the notes actually extracted are summed
+    into it.
 
     Returns:
-        Formatted urology clinic note
+        (note dictionaries, number of notes reused from `previous`)
     """
-    print("\n" + "="*80)
-    print("BUILDING UROLOGY NOTE - New Agent-Based Architecture")
-    print("="*80)
+    if timings is not None:
+        extract = functools.partial(extract, timings=timings)
+    extraction_cache = get_extraction_cache()
+    note_dicts = []
+    reused = 0
+
+    for note in notes:
+        content = note["content"]
+        key = note_extraction_key(kind, content)
+
+        if previous is not None and key in previous:
+            extracted = dict(previous[key])
+            reused += 1
+        elif extraction_cache is not None:
+            # Unchanged historical notes are served from the extraction cache
+            extracted = extraction_cache.get_or_extract(kind, content, extract, cache_stats)
+        else:
+            extracted = extract(content)
+
+        extractions[key] = dict(extracted)
+        note_dicts.append(extracted)
+
+    return note_dicts, reused
+
+
+def _extract_consult_sources(clinical_document: str, notes_dict: Dict[str, Any], is_consult: bool) -> Dict[str, Any]:
+    """Extract consult header data (CC/HPI, demographics) and PCP note data."""
+    consult = {
+        "is_gu_consult": False,
+        "cc": None,
+        "hpi": None,
+        "patient_name": None,
+        "patient_ssn": None,
+        "patient_age": None,
+    }
+    pcp_data = None
 
-    # Step 1: Identify notes
-    print("\n[1/5] Identifying notes...")
-    notes_dict = identify_notes(clinical_document)
+    if not is_consult:
+        return {"consult": consult, "pcp_data": pcp_data}
+
+    # Use document classifier to extract from PCP notes
+    classifier = DocumentClassifier()
+    classifier.classify_document(clinical_document)
+
+    # Extract PCP note content if present
+    pcp_note_content = classifier.extract_document_segment(clinical_document, "PRIMARY_CARE_NOTE")
+    if pcp_note_content:
+        logger.debug(f"Found PCP note ({len(pcp_note_content)} chars) - extracting data")
+        pcp_extractor = PCPNoteExtractor()
+        pcp_data = pcp_extractor.extract_all(pcp_note_content)
+        # Note: surgical history and dietary will be synthesized later
+
+    # Determine if this is a GU consult or non-GU consult
+    consult_content = notes_dict["consult_requests"][0]["content"]
+    # Check for "To Service:" line containing GU/Urology keywords
+    consult["is_gu_consult"] = any(keyword in consult_content.upper() for keyword in [
+        "SURG GU", "GU OUTPATIENT", "UROLOGY", "URO "
+    ])
+    logger.debug(f"Detected {'GU' if consult['is_gu_consult'] else 'non-GU'} consult")
+
+    # Extract CC and HPI from consult header
+    consult_data = extract_consult_request(consult_content)
+    if consult_data:
+        consult["cc"] = consult_data.get("CC")
+        consult["hpi"] = consult_data.get("HPI")
+
+    # Extract patient demographics from FULL document (patient info may be in PCP notes)
+    extractor = ConsultRequestExtractor()
+    demographics = extractor.extract_patient_demographics(clinical_document)
+    if demographics and demographics.get('patient_name'):
+        consult["patient_name"] = demographics.get('patient_name_formatted')
+        consult["patient_ssn"] = demographics.get('ssn')
+        consult["patient_age"] = demographics.get('age')
+
+    return {"consult": consult, "pcp_data": pcp_data}
+
+
+def _run_build(
+    clinical_document: str,
+    previous: Optional[Stage1BuildState],
+    metadata: Optional[Dict[str, Any]],
+    on_section: Optional[SectionCallback] = None,
+    notes_dict: Optional[Dict[str, List[Dict[str, str]]]] = None,
+    note_extractions: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Stage1BuildState:
+    """Run the Stage-1 pipeline, reusing unchanged work from a previous build."""
+    state = Stage1BuildState(clinical_document=clinical_document)
+    profile = PipelineProfile("stage1")
+
+    # Step 1: Identify notes (skipped when the caller split them while streaming)
+    if notes_dict is None:
+        with profile.span("identify_notes", "identify", input_size=len(clinical_document)) as span:
+            notes_dict = identify_notes(clinical_document)
+            span.set_output(notes_dict)
     gu_count = len(notes_dict["gu_notes"])
     non_gu_count = len(notes_dict["non_gu_notes"])
     consult_count = len(notes_dict.get("consult_requests", []))
-    print(f"      Found {gu_count} GU notes, {non_gu_count} non-GU notes, and {consult_count} consult requests")
+    logger.debug(f"Found {gu_count} GU notes, {non_gu_count} non-GU notes, and {consult_count} consult requests")
 
     # Determine if this is a consult
     is_consult = consult_count > 0
 
     # Step 2: Extract data from notes
-    print("\n[2/5] Extracting data from notes...")
-    gu_notes = process_gu_notes(notes_dict["gu_notes"])
-    non_gu_notes = process_non_gu_notes(notes_dict["non_gu_notes"])
-    print(f"      Processed {len(gu_notes)} GU note dictionaries")
-    print(f"      Processed {len(non_gu_notes)} non-GU note dictionaries")
+    cache_stats = CacheStats()
+    previous_extractions = None
+    if previous is not None or note_extractions:
+        previous_extractions = dict(previous.note_extractions) if previous is not None else {}
+        previous_extractions.update(note_extractions or {})
+
+    with profile.span(
+        "gu_notes", "extract_notes", input_size=measure_size(notes_dict["gu_notes"]), notes=gu_count
+    ) as span:
+        timings: Dict[str, float] = {}
+        gu_notes, gu_reused = _extract_note_dicts(
+            "gu", notes_dict["gu_notes"], NOTE_EXTRACTORS["gu"],
+            previous_extractions, state.note_extractions, cache_stats, timings
+        )
+        span.set_output(gu_notes)
+        span.attributes["extractors_ms"] = {name: round(ms, 2) for name, ms in timings.items()}
+    with profile.span(
+        "non_gu_notes", "extract_notes", input_size=measure_size(notes_dict["non_gu_notes"]), notes=non_gu_count
+    ) as span:
+        timings = {}
+        non_gu_notes, non_gu_reused = _extract_note_dicts(
+            "non_gu", notes_dict["non_gu_notes"], NOTE_EXTRACTORS["non_gu"],
+            previous_extractions, state.note_extractions, cache_stats, timings
+        )
+        span.set_output(non_gu_notes)
+        span.attributes["extractors_ms"] = {name: round(ms, 2) for name, ms in timings.items()}
+    notes_reused = gu_reused + non_gu_reused
 
     # Step 3: Extract document-level data
-    print("\n[3/5] Extracting document-level data...")
+    sources: Dict[str, Any] = {
+        "is_consult": is_consult,
+        "gu_notes": gu_notes,
+        "non_gu_notes": non_gu_notes,
+    }
+    with profile.span("consult_request", "extract_document", input_size=len(clinical_document)) as span:
+        sources.update(_extract_consult_sources(clinical_document, notes_dict, is_consult))
+        span.set_output(sources["consult"])
+    for source_name, extract in DOCUMENT_EXTRACTORS.items():
+        with profile.span(source_name, "extract_document", input_size=len(clinical_document)) as span:
+            sources[source_name] = extract(clinical_document)
+            span.set_output(sources[source_name])
+
+    state.sources = sources
+    state.fingerprints = {name: _fingerprint(value) for name, value in sources.items()}
+
+    # Step 4: Synthesize sections whose inputs changed
+    for spec in SYNTHESIS_ORDER:
+        section_fingerprint = _fingerprint([state.fingerprints[name] for name in spec.inputs])
+        state.section_fingerprints[spec.name] = section_fingerprint
+
+        if previous is not None and previous.section_fingerprints.get(spec.name) == section_fingerprint:
+            state.sections[spec.name] = previous.sections[spec.name]
+        else:
+            with profile.span(spec.name, "synthesize", uses_llm=spec.uses_llm) as span:
+                state.sections[spec.name] = spec.build(sources)
+                span.set_output(state.sections[spec.name])
+            state.rebuilt_sections.append(spec.name)
 
-    # Initialize PCP note variables
-    pcp_note_content = None
-    pcp_data = None
+        if on_section is not None:
+            on_section(spec.name, state.sections[spec.name])
 
-    # NEW: For consult requests, use document classifier to extract from PCP notes
-    if is_consult:
-        print("      Using document classifier for consult request...")
-        classifier = DocumentClassifier()
-        classification = classifier.classify_document(clinical_document)
-
-        # Extract PCP note content if present
-        pcp_note_content = classifier.extract_document_segment(clinical_document, "PRIMARY_CARE_NOTE")
-
-        if pcp_note_content:
-            print(f"      Found PCP note ({len(pcp_note_content)} chars) - extracting data...")
-            pcp_extractor = PCPNoteExtractor()
-            pcp_data = pcp_extractor.extract_all(pcp_note_content)
-            # Note: surgical history and dietary will be synthesized later
-
-        # For consults, always extract social and family from full document
-        # (they're in the consult request body, not PCP note)
-        document_social = extract_social(clinical_document)
-        document_family = extract_family(clinical_document)
-    else:
-        # For regular clinic notes, use standard extraction
-        document_social = extract_social(clinical_document)
-        document_family = extract_family(clinical_document)
-
-    document_pmh = extract_pmh(clinical_document)
-    document_psh = extract_psh(clinical_document)
-    document_medications = extract_medications(clinical_document)
-    document_pathology = extract_pathology(clinical_document)
-    document_imaging = extract_imaging(clinical_document)
-    document_psa = extract_psa(clinical_document)
-    document_labs = extract_labs(clinical_document)
-    document_stone_labs = extract_stone_labs(clinical_document)
-    document_calcium = extract_calcium_series(clinical_document)
-    document_endocrine = extract_endocrine_labs(clinical_document)
-
-    print(f"      PMH: {len(document_pmh.split(chr(10)) if document_pmh else [])} diagnoses")
-    print(f"      Medications: {len(document_medications.split(chr(10)) if document_medications else [])} meds")
-    print(f"      Pathology: {'Found' if document_pathology else 'None'}")
-    print(f"      Imaging: {'Found' if document_imaging else 'None'}")
-    print(f"      PSA: {'Found' if document_psa else 'None'}")
-    print(f"      Labs: {'Found' if document_labs else 'None'}")
-    print(f"      Stone Labs: {'Found' if document_stone_labs else 'None'}")
-    print(f"      Calcium Series: {'Found' if document_calcium else 'None'}")
-    print(f"      Endocrine: {'Found' if document_endocrine else 'None'}")
-    print(f"      Social: {'Found' if document_social else 'None'}")
-    print(f"      Family: {'Found' if document_family else 'None'}")
-
-    # Step 4: Synthesize all sections
-    print("\n[4/5] Synthesizing sections...")
-
-    # Extract CC and HPI from consult if present
-    is_gu_consult = False
-    consult_cc = None
-    consult_hpi = None
-    patient_name = None
-    patient_ssn = None
-    patient_age = None
-
-    if is_consult:
-        # Determine if this is a GU consult or non-GU consult
-        consult_content = notes_dict["consult_requests"][0]["content"]
-        # Check for "To Service:" line containing GU/Urology keywords
-        is_gu_consult = any(keyword in consult_content.upper() for keyword in [
-            "SURG GU", "GU OUTPATIENT", "UROLOGY", "URO "
-        ])
-        print(f"      Detected {'GU' if is_gu_consult else 'non-GU'} consult")
-
-        # Extract CC and HPI from consult header
-        consult_data = extract_consult_request(consult_content)
-        if consult_data:
-            consult_cc = consult_data.get("CC")
-            consult_hpi = consult_data.get("HPI")
-            print(f"      Extracted CC and HPI from consult request")
-
-        # Extract patient demographics from FULL document (patient info may be in PCP notes)
-        from .extractors.consult_request_extractor import ConsultRequestExtractor
-        extractor = ConsultRequestExtractor()
-        demographics = extractor.extract_patient_demographics(clinical_document)
-        if demographics and demographics.get('patient_name'):
-            patient_name = demographics.get('patient_name_formatted')
-            patient_ssn = demographics.get('ssn')
-            patient_age = demographics.get('age')
-            print(f"      Extracted patient demographics from document")
-            print(f"      Patient: {patient_name} (SSN: {patient_ssn}, Age: {patient_age})")
-
-    # Use consult CC/HPI if available, otherwise synthesize from notes
-    cc = consult_cc if consult_cc else synthesize_cc(gu_notes, non_gu_notes)
-    print(f"      CC: {len(cc) if cc else 0} chars")
+    reused_sections = [spec.name for spec in SECTION_GRAPH if spec.name not in state.rebuilt_sections]
 
-    # For consults, synthesize comprehensive HPI from all available data
-    if is_consult and consult_hpi:
-        # Use new consult HPI synthesis that incorporates all data
-        hpi = synthesize_consult_hpi(
-            consult_reason=consult_hpi,
-            patient_name=patient_name,
-            patient_age=patient_age,
-            pmh=document_pmh,
-            psh=None,  # Will be synthesized later
-            medications=document_medications,
-            imaging=document_imaging,
-            pcp_note_data=pcp_data if is_consult and pcp_note_content else None
+    # Step 5: Assemble final note
+    consult = sources["consult"]
+    with profile.span("assemble_note", "assemble") as span:
+        state.final_note = assemble_note(
+            **state.sections,
+            is_consult=is_consult,
+            is_gu_consult=consult["is_gu_consult"],
+            patient_name=consult["patient_name"],
+            patient_ssn=consult["patient_ssn"]
+            # Note: Assessment and Plan are NOT included in Stage 1 preliminary note
         )
-    else:
-        hpi = synthesize_hpi(gu_notes, non_gu_notes)
-    print(f"      HPI: {len(hpi) if hpi else 0} chars")
+        span.set_output(state.final_note)
 
-    ipss = synthesize_ipss(gu_notes)
-    print(f"      IPSS: {len(ipss) if ipss else 0} chars")
+    logger.info(
+        f"Stage 1 note built in {profile.total_ms:.0f} ms: {gu_count} GU / {non_gu_count} non-GU notes "
+        f"(cache {cache_stats.hits} hits / {cache_stats.misses} misses, {notes_reused} reused), "
+        f"{len(state.rebuilt_sections)} sections synthesized, {len(reused_sections)} reused, "
+        f"{len(state.final_note)} chars"
+    )
 
-    dhx = synthesize_diet(gu_notes)
-    pmh = synthesize_pmh(document_pmh, gu_notes, non_gu_notes)
-    # For consults, use document-level PSH if available
-    if is_consult and document_psh:
-        psh = synthesize_psh([{"PSH": document_psh}], [])
-    else:
-        psh = synthesize_psh(gu_notes, non_gu_notes)
-
-    # For consults, prefer document-level data (labs are in full document, not GU notes)
-    if is_consult:
-        social = document_social if document_social else synthesize_social(gu_notes, non_gu_notes)
-        family = document_family if document_family else synthesize_family(gu_notes, non_gu_notes)
-        # For consults, always prefer document-level PSA (comes from lab results)
-        # Pass through PSA agent for proper formatting ([r] prefix, spacing)
-        if document_psa:
-            psa = synthesize_psa([{"PSA": document_psa}])
-        else:
-            psa = synthesize_psa(gu_notes)
-        endocrine = document_endocrine if document_endocrine else synthesize_endocrine_labs(gu_notes)
-        labs = document_labs if document_labs else synthesize_general_labs(gu_notes)
-        # Use stone labs directly from document extraction
-        stone = document_stone_labs if document_stone_labs else synthesize_stone_labs(gu_notes)
-        # Don't append calcium series to general labs - it should only show if abnormal (via filtering) or in STONE LABS section
-    else:
-        social = synthesize_social(gu_notes, non_gu_notes)
-        family = synthesize_family(gu_notes, non_gu_notes)
-        psa = synthesize_psa(gu_notes)
-        endocrine = synthesize_endocrine_labs(gu_notes)
-        labs = synthesize_general_labs(gu_notes)
-        stone = document_stone_labs if document_stone_labs else synthesize_stone_labs(gu_notes)
-        # Don't append calcium series to general labs - it should only show if abnormal (via filtering) or in STONE LABS section
-
-    sexual = synthesize_sexual(gu_notes, non_gu_notes)
-    pathology = synthesize_pathology(document_pathology, gu_notes)
-    testosterone = synthesize_testosterone(gu_notes)
-    medications = synthesize_medications(document_medications, gu_notes)
-    allergies = synthesize_allergies(gu_notes, non_gu_notes)
-    imaging = synthesize_imaging(document_imaging, gu_notes)
-    ros = synthesize_ros(gu_notes, non_gu_notes)
-    pe = synthesize_pe(gu_notes, non_gu_notes)
-    # Note: Assessment and Plan are NOT generated in Stage 1 - they are completed during/after the visit
-
-    print(f"      Synthesized all sections")
+    if metadata is not None:
+        metadata["extraction_cache"] = cache_stats.to_dict()
+        metadata["profile"] = profile.to_dict()
+        if previous is not None:
+            metadata["incremental"] = {
+                "notes_reused": notes_reused,
+                "notes_extracted": len(gu_notes) + len(non_gu_notes) - notes_reused,
+                "sections_rebuilt": list(state.rebuilt_sections),
+                "sections_reused": reused_sections,
+            }
+
+    return state
+
+
+def build_urology_note_state(
+    clinical_document: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    on_section: Optional[SectionCallback] = None,
+    notes_dict: Optional[Dict[str, List[Dict[str, str]]]] = None,
+    note_extractions: Optional[Dict[str, Dict[str, str]]] = None
+) -> Stage1BuildState:
+    """
+    Build a Stage-1 note and keep the intermediate results.
 
-    # Step 5: Assemble final note
-    print("\n[5/5] Assembling final note...")
-    final_note = assemble_note(
-        cc=cc,
-        hpi=hpi,
-        ipss=ipss,
-        dhx=dhx,
-        pmh=pmh,
-        psh=psh,
-        social=social,
-        family=family,
-        sexual=sexual,
-        psa=psa,
-        pathology=pathology,
-        testosterone=testosterone,
-        medications=medications,
-        allergies=allergies,
-        endocrine=endocrine,
-        stone=stone,
-        labs=labs,
-        imaging=imaging,
-        ros=ros,
-        pe=pe,
-        is_consult=is_consult,
-        is_gu_consult=is_gu_consult,
-        patient_name=patient_name,
-        patient_ssn=patient_ssn
-        # Note: Assessment and Plan are NOT included in Stage 1 preliminary note
+    Args:
+        clinical_document: Full clinical document text
+        metadata: Optional dict populated with build metadata
+                  ("extraction_cache" counts, "profile" per-stage spans)
+        on_section: Optional callback invoked with (name, content) as each
+                    section is synthesized, in SYNTHESIS_ORDER
+        notes_dict: Notes already identified (identify_notes() format), e.g. by
+                    IncrementalNoteSplitter during a streaming upload
+        note_extractions: Per-note dictionaries already extracted, keyed by
+                          note_extraction_key()
+
+    Returns:
+        Build state whose final_note is the formatted urology clinic note;
+        pass it to rebuild_urology_note() when the clinician adds data
+    """
+    return _run_build(
+        clinical_document, None, metadata, on_section,
+        notes_dict=notes_dict, note_extractions=note_extractions
     )
 
-    print(f"      Final note: {len(final_note)} characters")
-    print("\n" + "="*80)
-    print("NOTE BUILDING COMPLETE")
-    print("="*80)
 
-    return final_note
+def build_urology_note(clinical_document: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a comprehensive urology clinic note from a clinical document.
+
+    This is the main entry point for the new agent-based architecture.
+
+    Args:
+        clinical_document: Full clinical document text
+        metadata: Optional dict populated with build metadata
+                  (e.g. "extraction_cache": hit/miss counts for this build)
+
+    Returns:
+        Formatted urology clinic note
+    """
+    return build_urology_note_state(clinical_document, metadata).final_note
+
+
+def rebuild_urology_note(
+    previous_state: Stage1BuildState,
+    appended_text: Optional[str] = None,
+    clinical_document: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    on_section: Optional[SectionCallback] = None
+) -> Stage1BuildState:
+    """
+    Incrementally rebuild a Stage-1 note after the clinician adds data.
+
+    Notes whose content is unchanged reuse their extracted dictionaries, and
+    synthesis agents (including the LLM agents) only re-run when one of their
+    inputs in SECTION_GRAPH changed. The result is identical to a full build
+    of the new document.
+
+    Args:
+        previous_state: State returned by build_urology_note_state() or a previous rebuild
+        appended_text: Text pasted after the previous document (e.g. a new lab panel)
+        clinical_document: Full replacement document (when text was edited, not appended)
+        metadata: Optional dict populated with build metadata; "incremental"
+                  lists the rebuilt and reused sections
+        on_section: Optional per-section callback (see build_urology_note_state)
+
+    Returns:
+        Updated build state (final_note holds the updated note)
+
+    Raises:
+        ValueError: If neither or both of appended_text / clinical_document are given
+    """
+    if (appended_text is None) == (clinical_document is None):
+        raise ValueError("Provide exactly one of appended_text or clinical_document")
+
+    if appended_text is not None:
+        clinical_document = f"{previous_state.clinical_document}\n{appended_text}"
+
+    return _run_build(clinical_document, previous_state, metadata, on_section)
 
 
 def assemble_note(**sections) -> str:
@@ -5,7 +5,7 @@ Splits clinical documents into GU and non-GU notes based on STANDARD TITLE marke
 """
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
@@ -46,11 +46,45 @@ def identify_notes(clinical_document: str) -> Dict[str, List[Dict[str, str]]]:
     """
     gu_notes = []
     non_gu_notes = []
+    consult_requests = identify_consult_requests(clinical_document)
+
+    # Split by "STANDARD TITLE:" markers (case-insensitive)
+    # Use lookahead to keep the marker in each section
+    sections = re.split(r'(?=STANDARD TITLE:)', clinical_document, flags=re.IGNORECASE)
+
+    for section in sections:
+        classified = classify_note_section(section)
+        if classified is None:
+            continue
+
+        kind, note = classified
+        if kind == "gu":
+            gu_notes.append(note)
+        else:
+            non_gu_notes.append(note)
+
+    return {
+        "gu_notes": gu_notes,
+        "non_gu_notes": non_gu_notes,
+        "consult_requests": consult_requests
+    }
+
+
+def identify_consult_requests(clinical_document: str) -> List[Dict[str, str]]:
+    """
+    Find VA consult request forms in a clinical document.
+
+    Consult requests are identified by "Provisional Diagnosis:" and either
+    "Reason for Consult Request:" or "Reason For Request:" (invariant VA format).
+
+    Args:
+        clinical_document: Raw clinical document text
+
+    Returns:
+        List of {"title": "CONSULT REQUEST", "date": "...", "content": "..."}
+    """
     consult_requests = []
 
-    # First, check for consult request forms (invariant VA format)
-    # These are identified by "Provisional Diagnosis:" and either
-    # "Reason for Consult Request:" or "Reason For Request:"
     has_provisional = "Provisional Diagnosis:" in clinical_document
     has_reason = ("Reason for Consult Request:" in clinical_document or
                   "Reason For Request:" in clinical_document)
@@ -77,48 +111,137 @@ def identify_notes(clinical_document: str) -> Dict[str, List[Dict[str, str]]]:
                     "content": section.strip()
                 })
 
-    # Split by "STANDARD TITLE:" markers (case-insensitive)
-    # Use lookahead to keep the marker in each section
-    sections = re.split(r'(?=STANDARD TITLE:)', clinical_document, flags=re.IGNORECASE)
+    return consult_requests
 
-    for section in sections:
-        if not section.strip():
-            continue
 
-        # Extract the title after "STANDARD TITLE:"
-        title_match = re.search(r'STANDARD TITLE:\s*([^\n]+)', section, re.IGNORECASE)
-        if not title_match:
-            # This section doesn't have a STANDARD TITLE marker (probably header/footer)
-            continue
+def classify_note_section(section: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Build a note dictionary from one "STANDARD TITLE:" section.
 
-        title = title_match.group(1).strip()
+    Args:
+        section: Text from a STANDARD TITLE marker up to the next marker
 
-        # Extract date if present
-        # Common VA formats: "Date Signed: 10/17/2025", "Date/Time: 10/17/2025 14:30"
-        date = ""
-        date_match = re.search(r'Date(?:\s+Signed|\s*[:/]\s*Time)?:\s*(\d{1,2}/\d{1,2}/\d{4}(?:\s+\d{1,2}:\d{2})?)', section, re.IGNORECASE)
-        if date_match:
-            date = date_match.group(1).strip()
+    Returns:
+        ("gu" | "non_gu", {"title", "date", "content"}), or None when the
+        section has no STANDARD TITLE marker (header/footer text)
+    """
+    if not section.strip():
+        return None
 
-        # Create note object
-        note = {
-            "title": title,
-            "date": date,
-            "content": section.strip()
-        }
+    # Extract the title after "STANDARD TITLE:"
+    title_match = re.search(r'STANDARD TITLE:\s*([^\n]+)', section, re.IGNORECASE)
+    if not title_match:
+        # This section doesn't have a STANDARD TITLE marker (probably header/footer)
+        return None
 
-        # Classify as GU or non-GU
-        if re.search(r'\bUROLOGY\b', title, re.IGNORECASE):
-            gu_notes.append(note)
-        else:
-            non_gu_notes.append(note)
+    title = title_match.group(1).strip()
 
-    return {
-        "gu_notes": gu_notes,
-        "non_gu_notes": non_gu_notes,
-        "consult_requests": consult_requests
+    # Extract date if present
+    # Common VA formats: "Date Signed: 10/17/2025", "Date/Time: 10/17/2025 14:30"
+    date = ""
+    date_match = re.search(r'Date(?:\s+Signed|\s*[:/]\s*Time)?:\s*(\d{1,2}/\d{1,2}/\d{4}(?:\s+\d{1,2}:\d{2})?)', section, re.IGNORECASE)
+    if date_match:
+        date = date_match.group(1).strip()
+
+    # Create note object
+    note = {
+        "title": title,
+        "date": date,
+        "content": section.strip()
     }
 
+    # Classify as GU or non-GU
+    if re.search(r'\bUROLOGY\b', title, re.IGNORECASE):
+        return "gu", note
+    return "non_gu", note
+
+
+class IncrementalNoteSplitter:
+    """
+    Split a clinical document into notes as it arrives in chunks.
+
+    Produces the same GU / non-GU notes as identify_notes() without holding
+    the whole document in one string: only the note currently being read is
+    buffered, and each note is returned as soon as the next STANDARD TITLE
+    marker (or the end of input) is seen.
+
+    With keep_text=True the input is also kept, one piece per finished
+    section, for document() to return. The pieces share each note's content
+    string, so the text costs little more than the notes themselves.
+
+    Usage:
+        splitter = IncrementalNoteSplitter()
+        for chunk in chunks:
+            for kind, note in splitter.feed(chunk):
+                ...
+        for kind, note in splitter.close():
+            ...
+    """
+
+    MARKER = re.compile(r'STANDARD TITLE:', re.IGNORECASE)
+    # A marker split across chunks can hide in this many trailing characters
+    CARRY = len("STANDARD TITLE:") - 1
+
+    def __init__(self, keep_text: bool = False):
+        self._parts: List[str] = []  # Text of the current note (or preamble)
+        self._carry = ""             # Unscanned tail that may start a marker
+        self._text: Optional[List[str]] = [] if keep_text else None  # Finished sections
+
+    def feed(self, text: str) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Consume a chunk of text.
+
+        Returns:
+            Notes completed by this chunk, as (kind, note) tuples
+        """
+        window = self._carry + text
+        completed = []
+        last = 0
+
+        for match in self.MARKER.finditer(window):
+            self._parts.append(window[last:match.start()])
+            completed.extend(self._finish_note())
+            last = match.start()
+
+        safe_end = max(last, len(window) - self.CARRY)
+        self._parts.append(window[last:safe_end])
+        self._carry = window[safe_end:]
+        return completed
+
+    def close(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Flush the final note at end of input."""
+        self._parts.append(self._carry)
+        self._carry = ""
+        return self._finish_note()
+
+    def document(self) -> str:
+        """
+        Full text fed so far, in finished sections (keep_text=True only).
+
+        Releases the kept pieces; call once, after close().
+        """
+        if self._text is None:
+            raise RuntimeError("IncrementalNoteSplitter was created without keep_text")
+        document = "".join(self._text)
+        self._text = []
+        return document
+
+    def _finish_note(self) -> List[Tuple[str, Dict[str, str]]]:
+        section = "".join(self._parts)
+        self._parts = []
+        classified = classify_note_section(section)
+        if self._text is not None:
+            self._keep(section, classified[1]["content"] if classified is not None else None)
+        return [classified] if classified is not None else []
+
+    def _keep(self, section: str, content: Optional[str]) -> None:
+        """Keep a section's text, reusing the note content string for its body."""
+        if not content:
+            self._text.append(section)
+            return
+        start = len(section) - len(section.lstrip())
+        self._text.extend((section[:start], content, section[start + len(content):]))
+
 
 def get_note_summary(notes_dict: Dict[str, List[Dict[str, str]]]) -> str:
     """
@@ -0,0 +1,245 @@
+"""
+Pipeline Profiling
+
+Lightweight per-stage spans for the Stage 1 and Stage 2 note pipelines.
+
+Each span records its duration and the size (characters) of its input and
+output, so a slow note can be attributed to identify_notes, a particular
+extractor, an LLM agent or FactVerifier. The per-note extractors run many
+times per build, so their timings are summed into the note-kind span
+(run_extractors) rather than given a span each. Spans are:
+- Collected in-process and returned in the response metadata (profile.to_dict())
+- Mirrored to OpenTelemetry when opentelemetry-api is installed (no-op
+  without an SDK configured)
+- Observed into Prometheus histograms when prometheus_client is installed
+  and ENABLE_PROMETHEUS is set (scraped from /metrics)
+
+Overhead is two perf_counter() calls and a list append per span, cheap
+enough to leave on in production. Span names and attributes never contain
+note text (PHI) - only sizes and counts.
+"""
+
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Optional OpenTelemetry bridge
+try:
+    from opentelemetry import trace as _otel_trace
+    _tracer = _otel_trace.get_tracer("vaucda.note_processing")
+except ImportError:
+    _tracer = None
+
+# Prometheus histograms, created on first use (False = unavailable)
+_histograms = None
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _get_histograms():
+    """Create the Prometheus histograms once, if prometheus_client is available."""
+    global _histograms
+    if _histograms is None:
+        _histograms = False
+        if settings.ENABLE_PROMETHEUS:
+            try:
+                from prometheus_client import Histogram
+
+                _histograms = (
+                    Histogram(
+                        "vaucda_note_pipeline_span_seconds",
+                        "Duration of note pipeline stages, extractors and agents",
+                        ["pipeline", "stage", "span"],
+                        buckets=DURATION_BUCKETS
+                    ),
+                    Histogram(
+                        "vaucda_note_pipeline_span_output_chars",
+                        "Output size of note pipeline stages, extractors and agents",
+                        ["pipeline", "stage", "span"],
+                        buckets=SIZE_BUCKETS
+                    ),
+                )
+            except ImportError:
+                logger.debug("prometheus_client not installed - pipeline histograms disabled")
+    return _histograms or None
+
+
+def measure_size(value: Any) -> int:
+    """Character size of a pipeline value (text, note dictionaries, lists of notes)."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(measure_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(measure_size(v) for v in value)
+    return len(str(value))
+
+
+def run_extractors(
+    extractors: Dict[str, Callable[[str], Any]],
+    content: str,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Apply each field's extractor to a note.
+
+    Args:
+        extractors: Field name -> extractor function
+        content: Raw note content
+        timings: If given, each extractor's duration (ms) is added to
+                 timings[extractor name], summing across notes
+
+    Returns:
+        Field name -> extracted value
+    """
+    if timings is None:
+        return {key: extract(content) for key, extract in extractors.items()}
+
+    extracted = {}
+    for key, extract in extractors.items():
+        start = time.perf_counter()
+        extracted[key] = extract(content)
+        timings[extract.__name__] = timings.get(extract.__name__, 0.0) + (time.perf_counter() - start) * 1000
+    return extracted
+
+
+@dataclass
+class Span:
+    """Timing and size of one pipeline step."""
+    name: str
+    stage: str
+    duration_ms: float = 0.0
+    input_size: Optional[int] = None
+    output_size: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set_output(self, value: Any) -> None:
+        """Record the output size of the step."""
+        self.output_size = measure_size(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for response metadata."""
+        result = {
+            "name": self.name,
+            "stage": self.stage,
+            "duration_ms": round(self.duration_ms, 2),
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+        }
+        result.update(self.attributes)
+        return result
+
+
+class PipelineProfile:
+    """
+    Span collector for one pipeline run.
+
+    Usage:
+        profile = PipelineProfile("stage1")
+        with profile.span("identify_notes", "identify", input_size=len(doc)) as span:
+            notes = identify_notes(doc)
+            span.set_output(notes)
+        metadata["profile"] = profile.to_dict()
+    """
+
+    def __init__(self, pipeline: str):
+        """
+        Initialize profile.
+
+        Args:
+            pipeline: Pipeline name used as a metric label ('stage1', 'stage2')
+        """
+        self.pipeline = pipeline
+        self.spans: List[Span] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, stage: str, input_size: Optional[int] = None, **attributes) -> Iterator[Span]:
+        """
+        Time a pipeline step.
+
+        Args:
+            name: Step name (extractor, agent or stage)
+            stage: Pipeline stage the step belongs to
+            input_size: Input size in characters
+            **attributes: Extra non-PHI attributes (counts, flags)
+
+        Yields:
+            The Span, so the caller can record its output size
+        """
+        span = Span(name=name, stage=stage, input_size=input_size, attributes=attributes)
+
+        with ExitStack() as stack:
+            otel_span = None
+            if _tracer is not None:
+                otel_span = stack.enter_context(
+                    _tracer.start_as_current_span(f"{self.pipeline}.{stage}.{name}")
+                )
+
+            start = time.perf_counter()
+            try:
+                yield span
+            finally:
+                span.duration_ms = (time.perf_counter() - start) * 1000
+                self.spans.append(span)
+                self._export(span, otel_span)
+
+    @property
+    def total_ms(self) -> float:
+        """Wall time since the profile was created."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Summed span durations (ms) per stage."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.stage] = totals.get(span.stage, 0.0) + span.duration_ms
+        return {stage: round(ms, 2) for stage, ms in totals.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for response metadata."""
+        return {
+            "pipeline": self.pipeline,
+            "total_ms": round(self.total_ms, 2),
+            "stages": self.stage_totals(),
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+    def _export(self, span: Span, otel_span: Any) -> None:
+        """Forward a finished span to OpenTelemetry, Prometheus and the debug log."""
+        if otel_span is not None:
+            otel_span.set_attribute("vaucda.stage", span.stage)
+            if span.input_size is not None:
+                otel_span.set_attribute("vaucda.input_size", span.input_size)
+            if span.output_size is not None:
+                otel_span.set_attribute("vaucda.output_size", span.output_size)
+            for key, value in span.attributes.items():
+                if isinstance(value, (str, bool, int, float)):
+                    otel_span.set_attribute(f"vaucda.{key}", value)
+                elif isinstance(value, dict):
+                    # Per-extractor timings of a note-kind span
+                    for sub_key, sub_value in value.items():
+                        if isinstance(sub_value, (str, bool, int, float)):
+                            otel_span.set_attribute(f"vaucda.{key}.{sub_key}", sub_value)
+
+        histograms = _get_histograms()
+        if histograms is not None:
+            duration_histogram, size_histogram = histograms
+            labels = (self.pipeline, span.stage, span.name)
+            duration_histogram.labels(*labels).observe(span.duration_ms / 1000)
+            if span.output_size is not None:
+                size_histogram.labels(*labels).observe(span.output_size)
+
+        logger.debug(
+            f"[{self.pipeline}] {span.stage}/{span.name}: {span.duration_ms:.1f} ms "
+            f"(in={span.input_size}, out={span.output_size})"
+        )
@@ -13,12 +13,13 @@ Stage 2 leverages:
 - RAG content (evidence-based guidelines from Neo4j)
 """
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import logging
 from .agents.assessment_agent import synthesize_assessment
 from .agents.plan_agent import synthesize_plan
 from .extractors import extract_assessment, extract_plan
 from .fact_verifier import FactVerifier
+from .profiling import PipelineProfile, measure_size
 from .time_template import format_patient_header, get_time_template
 
 logger = logging.getLogger(__name__)
@@ -63,7 +64,8 @@ def build_stage2_note(
     model: Optional[str] = None,
     note_type: str = "clinic_note",
     patient_name: Optional[str] = None,
-    ssn_last4: Optional[str] = None
+    ssn_last4: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Complete the clinical note by adding Assessment and Plan (Stage 2).
@@ -81,92 +83,97 @@ def build_stage2_note(
         note_type: Type of note ('clinic_note', 'consult', etc.)
         patient_name: Patient full name for header
         ssn_last4: Last 4 digits of SSN for header
+        metadata: Optional dict populated with build metadata
+                  ("profile": per-stage spans, "verification" confidence scores)
 
     Returns:
         Complete clinical note with Assessment and Plan sections added
     """
-    print("\n" + "="*80)
-    print("STAGE 2: COMPLETING CLINICAL NOTE (POST-VISIT)")
-    print("="*80)
+    profile = PipelineProfile("stage2")
 
     # Step 1: Extract prior assessments and plans from GU notes
-    print("\n[1/3] Extracting prior assessments and plans from historical GU notes...")
-    prior_assessments, prior_plans = extract_prior_assessments_and_plans(gu_notes)
-    print(f"      Found {len(prior_assessments)} prior assessments")
-    print(f"      Found {len(prior_plans)} prior plans")
+    with profile.span(
+        "prior_assessments_and_plans", "extract", input_size=measure_size(gu_notes), notes=len(gu_notes)
+    ) as span:
+        prior_assessments, prior_plans = extract_prior_assessments_and_plans(gu_notes)
+        span.set_output([prior_assessments, prior_plans])
 
     # Step 2: Synthesize Assessment
-    print("\n[2/5] Synthesizing Assessment (clinical impression)...")
-    assessment = synthesize_assessment(
-        stage1_note=stage1_note,
-        prior_assessments=prior_assessments,
-        ambient_transcript=ambient_transcript,
-        calculator_results=calculator_results,
-        rag_content=rag_content,
-        model=model
-    )
-    print(f"      Assessment: {len(assessment) if assessment else 0} chars")
+    with profile.span("assessment", "synthesize", input_size=len(stage1_note), uses_llm=True) as span:
+        assessment = synthesize_assessment(
+            stage1_note=stage1_note,
+            prior_assessments=prior_assessments,
+            ambient_transcript=ambient_transcript,
+            calculator_results=calculator_results,
+            rag_content=rag_content,
+            model=model
+        )
+        span.set_output(assessment)
 
     # Step 3: Verify Assessment
-    print("\n[3/5] Verifying Assessment against source data...")
-    verifier = FactVerifier()
-    verifier.index_source_document(stage1_note)
+    with profile.span("assessment", "verify", input_size=measure_size(assessment)) as span:
+        verifier = FactVerifier()
+        verifier.index_source_document(stage1_note)
 
-    assessment_verification = verifier.verify_generated_text(
-        generated_text=assessment,
-        source_text=stage1_note
-    )
+        assessment_verification = verifier.verify_generated_text(
+            generated_text=assessment,
+            source_text=stage1_note
+        )
+        span.attributes["errors"] = assessment_verification['total_errors']
 
     if not assessment_verification['verified']:
         logger.warning(f"Assessment verification found {assessment_verification['total_errors']} errors")
         logger.warning(f"Errors: {assessment_verification['error_details']}")
-        print(f"      ⚠ Warning: {assessment_verification['total_errors']} potential errors detected")
-        print(f"      Confidence: {assessment_verification['confidence_score']}%")
-    else:
-        print(f"      ✓ Assessment verified (confidence: {assessment_verification['confidence_score']}%)")
 
     # Step 4: Synthesize Plan
-    print("\n[4/5] Synthesizing Plan (treatment plan)...")
-    plan = synthesize_plan(
-        stage1_note=stage1_note,
-        prior_plans=prior_plans,
-        ambient_transcript=ambient_transcript,
-        calculator_results=calculator_results,
-        rag_content=rag_content,
-        model=model
-    )
-    print(f"      Plan: {len(plan) if plan else 0} chars")
+    with profile.span("plan", "synthesize", input_size=len(stage1_note), uses_llm=True) as span:
+        plan = synthesize_plan(
+            stage1_note=stage1_note,
+            prior_plans=prior_plans,
+            ambient_transcript=ambient_transcript,
+            calculator_results=calculator_results,
+            rag_content=rag_content,
+            model=model
+        )
+        span.set_output(plan)
 
     # Step 5: Verify Plan
-    print("\n[5/5] Verifying Plan against source data...")
-    plan_verification = verifier.verify_generated_text(
-        generated_text=plan,
-        source_text=stage1_note
-    )
+    with profile.span("plan", "verify", input_size=measure_size(plan)) as span:
+        plan_verification = verifier.verify_generated_text(
+            generated_text=plan,
+            source_text=stage1_note
+        )
+        span.attributes["errors"] = plan_verification['total_errors']
 
     if not plan_verification['verified']:
         logger.warning(f"Plan verification found {plan_verification['total_errors']} errors")
         logger.warning(f"Errors: {plan_verification['error_details']}")
-        print(f"      ⚠ Warning: {plan_verification['total_errors']} potential errors detected")
-        print(f"      Confidence: {plan_verification['confidence_score']}%")
-    else:
-        print(f"      ✓ Plan verified (confidence: {plan_verification['confidence_score']}%)")
 
     # Step 6: Assemble complete note
-    print("\n[6/6] Assembling complete clinical note...")
-    complete_note = assemble_complete_note(
-        stage1_note=stage1_note,
-        assessment=assessment,
-        plan=plan,
-        note_type=note_type,
-        patient_name=patient_name,
-        ssn_last4=ssn_last4
+    with profile.span("complete_note", "assemble") as span:
+        complete_note = assemble_complete_note(
+            stage1_note=stage1_note,
+            assessment=assessment,
+            plan=plan,
+            note_type=note_type,
+            patient_name=patient_name,
+            ssn_last4=ssn_last4
+        )
+        span.set_output(complete_note)
+
+    logger.info(
+        f"Stage 2 note built in {profile.total_ms:.0f} ms: "
+        f"{len(prior_assessments)} prior assessments, {len(prior_plans)} prior plans, "
+        f"verification confidence {assessment_verification['confidence_score']}% / "
+        f"{plan_verification['confidence_score']}%, {len(complete_note)} chars"
     )
 
-    print(f"      Complete note: {len(complete_note)} characters")
-    print("\n" + "="*80)
-    print("STAGE 2 COMPLETE - FINAL CLINICAL NOTE READY")
-    print("="*80)
+    if metadata is not None:
+        metadata["profile"] = profile.to_dict()
+        metadata["verification"] = {
+            "assessment_confidence": assessment_verification['confidence_score'],
+            "plan_confidence": plan_verification['confidence_score'],
+        }
 
     return complete_note
 
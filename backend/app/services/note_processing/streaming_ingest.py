@@ -0,0 +1,142 @@
+"""
+Streaming Ingest
+
+Incremental ingestion of very large clinical inputs (multi-megabyte CPRS
+exports) for Stage 1.
+
+Instead of buffering the whole payload into one JSON string and splitting it
+afterwards, text is fed in chunks as it is uploaded:
+1. An incremental UTF-8 decoder turns byte chunks into text
+2. IncrementalNoteSplitter detects STANDARD TITLE boundaries on the fly;
+   chunks are released once split, and the document is kept as the
+   finished sections (sharing the notes' content strings)
+3. Each completed note is dispatched to a worker thread for extraction,
+   so extraction overlaps with the rest of the upload
+4. finish() returns the document, the identified notes and their
+   extractions, ready for build_urology_note_state()
+"""
+
+import codecs
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.config import settings
+
+from .extraction_cache import CacheStats
+from .note_builder import NOTE_EXTRACTORS, _extract_note_dicts, note_extraction_key
+from .note_identifier import IncrementalNoteSplitter, identify_consult_requests
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised when a streamed clinical input exceeds the configured limit."""
+    pass
+
+
+def _extract_note(kind: str, note: Dict[str, str]) -> Dict[str, str]:
+    """Extract one note the way the note builder does (extraction cache included)."""
+    note_dicts, _ = _extract_note_dicts(kind, [note], NOTE_EXTRACTORS[kind], None, {}, CacheStats())
+    return note_dicts[0]
+
+
+class StreamingNoteIngestor:
+    """
+    Accumulate a clinical input chunk by chunk, extracting notes as they complete.
+
+    Not thread-safe: feed() and finish() must be called from one task.
+    """
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None, max_chars: Optional[int] = None):
+        """
+        Initialize ingestor.
+
+        Args:
+            executor: Pool used for note extraction (defaults to the shared pool)
+            max_chars: Maximum accepted input size in characters (None = unlimited)
+        """
+        self.max_chars = max_chars
+        self._executor = executor or get_ingest_executor()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._splitter = IncrementalNoteSplitter(keep_text=True)
+        self._size = 0
+        self._notes: List[Tuple[str, Dict[str, str]]] = []
+        self._futures: Dict[str, Future] = {}
+
+    @property
+    def notes_dispatched(self) -> int:
+        """Number of notes handed to extraction so far."""
+        return len(self._notes)
+
+    def feed(self, chunk: Union[bytes, str]) -> None:
+        """
+        Consume the next chunk of the upload.
+
+        Raises:
+            PayloadTooLargeError: If the input exceeds max_chars
+        """
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if not text:
+            return
+
+        self._size += len(text)
+        if self.max_chars is not None and self._size > self.max_chars:
+            raise PayloadTooLargeError(f"Clinical input exceeds {self.max_chars} characters")
+
+        self._dispatch(self._splitter.feed(text))
+
+    def finish(self) -> Tuple[str, Dict[str, List[Dict[str, str]]], Dict[str, Dict[str, str]]]:
+        """
+        Flush the last note and wait for every extraction.
+
+        Returns:
+            (clinical document, notes dict in identify_notes() format,
+             per-note extractions keyed by note_extraction_key())
+        """
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self._dispatch(self._splitter.feed(tail))
+        self._dispatch(self._splitter.close())
+
+        # Document-level extractors still need the full text; join once
+        clinical_document = self._splitter.document()
+
+        notes_dict = {
+            "gu_notes": [note for kind, note in self._notes if kind == "gu"],
+            "non_gu_notes": [note for kind, note in self._notes if kind == "non_gu"],
+            "consult_requests": identify_consult_requests(clinical_document),
+        }
+
+        note_extractions = {}
+        for key, future in self._futures.items():
+            try:
+                note_extractions[key] = future.result()
+            except Exception as e:
+                # Leave it to the note builder to extract (and surface errors)
+                logger.warning(f"Streaming note extraction failed: {e}")
+
+        return clinical_document, notes_dict, note_extractions
+
+    def _dispatch(self, completed: List[Tuple[str, Dict[str, str]]]) -> None:
+        """Submit completed notes for extraction."""
+        for kind, note in completed:
+            self._notes.append((kind, note))
+            key = note_extraction_key(kind, note["content"])
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(_extract_note, kind, note)
+
+
+# Shared extraction pool
+_ingest_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_ingest_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool used to extract notes during streaming uploads."""
+    global _ingest_executor
+    if _ingest_executor is None:
+        _ingest_executor = ThreadPoolExecutor(
+            max_workers=settings.NOTE_STREAM_EXTRACTION_WORKERS,
+            thread_name_prefix="note-ingest"
+        )
+    return _ingest_executor
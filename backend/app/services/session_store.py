@@ -0,0 +1,80 @@
+"""
+Owner-Scoped Session Store
+
+Short-lived, in-memory map of id -> per-user state, shared by the stores
+that let a clinician continue a note across requests (Stage-1 build states,
+Stage-3 ambient merge sessions).
+
+HIPAA: stored values contain PHI. They are held in process memory only,
+scoped to the user who created them, and expire after the TTL. Ids are
+therefore not shared between worker processes.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class OwnerScopedStore(Generic[T]):
+    """TTL + LRU bounded map of id -> (owner, value)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 200):
+        """
+        Initialize store.
+
+        Args:
+            ttl_seconds: Seconds after the last access before a value expires
+            max_entries: Maximum number of values kept (oldest evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float, T]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, owner: Any, value: T, key: Optional[str] = None) -> str:
+        """
+        Store a value.
+
+        Args:
+            owner: Identifier of the user who owns the value
+            value: Value to store
+            key: Existing id to replace (None = allocate a new id)
+
+        Returns:
+            Id to pass back with the next request
+        """
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            self._purge_expired()
+            self._entries[key] = (owner, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key
+
+    def get(self, owner: Any, key: str) -> Optional[T]:
+        """Return the value for key if it exists, is unexpired and belongs to owner."""
+        with self._lock:
+            self._purge_expired()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != owner:
+                return None
+            self._entries[key] = (owner, time.monotonic(), entry[2])
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def discard(self, key: str) -> None:
+        """Remove a value."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _purge_expired(self) -> None:
+        """Drop values not accessed within the TTL."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [key for key, (_, accessed, _) in self._entries.items() if accessed < cutoff]
+        for key in expired:
+            del self._entries[key]
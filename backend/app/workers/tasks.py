@@ -119,7 +119,7 @@ def generate_note_async(
             try:
                 calculator = registry.get_calculator(module_id)
                 if calculator:
-                    result = calculator.calculate(extracted_data)
+                    result = calculator.run(extracted_data)
                     calculator_results[module_id] = result
                     logger.info(f"Executed calculator {module_id}")
             except Exception as e:
@@ -12,6 +12,9 @@ from calculators.base import (
     ValidationError,
 )
 from calculators.registry import CalculatorRegistry
+from calculators.batch import BatchResult, calculate_batch
+from calculators.validation import CompiledValidator, FieldError
+from calculators.result_cache import CalculatorResultCache, set_result_cache
 
 __all__ = [
     "ClinicalCalculator",
@@ -19,4 +22,10 @@ __all__ = [
     "CalculatorInput",
     "ValidationError",
     "CalculatorRegistry",
+    "BatchResult",
+    "calculate_batch",
+    "CompiledValidator",
+    "FieldError",
+    "CalculatorResultCache",
+    "set_result_cache",
 ]
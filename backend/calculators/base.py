@@ -6,9 +6,14 @@ Defines abstract base class and data models for all VAUCDA calculators.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 from enum import Enum
+import time
+
+if TYPE_CHECKING:
+    from calculators.sensitivity import SensitivityResult
+    from calculators.validation import CompiledValidator, FieldError
 
 
 class CalculatorCategory(Enum):
@@ -195,6 +200,16 @@ class ClinicalCalculator(ABC):
         """
         return []
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        """
+        Whether numeric strings ("2", "4.5") pass validation for NUMERIC and
+        numeric ENUM inputs. Off by default; override to True only when
+        calculate() (and score_batch()) convert every numeric input with
+        float() or int(float()).
+        """
+        return False
+
     def get_input_schema(self) -> List[InputMetadata]:
         """
         Get detailed metadata for all calculator inputs.
@@ -232,11 +247,23 @@ class ClinicalCalculator(ABC):
         """
         return []
 
-    @abstractmethod
+    @property
+    def validator(self) -> "CompiledValidator":
+        """Validator compiled from get_input_schema(), shared by all instances of the class."""
+        validator = self.__dict__.get("_validator")
+        if validator is None:
+            # Deferred: calculators.validation imports this module
+            from calculators.validation import get_validator
+            validator = self._validator = get_validator(self)
+        return validator
+
     def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
         Validate input parameters.
 
+        Defaults to the validator compiled from get_input_schema(). Override
+        only for rules the schema cannot express (e.g. cross-field checks).
+
         Args:
             inputs: Dictionary of input parameters
 
@@ -244,7 +271,34 @@ class ClinicalCalculator(ABC):
             Tuple of (is_valid, error_message)
             error_message is None if valid
         """
-        pass
+        return self.validator.validate(inputs)
+
+    @property
+    def uses_schema_validation(self) -> bool:
+        """Whether validate_inputs() is exactly the compiled schema validator."""
+        return type(self).validate_inputs is ClinicalCalculator.validate_inputs
+
+    def input_errors(self, inputs: Dict[str, Any]) -> List["FieldError"]:
+        """
+        Structured validation errors.
+
+        Args:
+            inputs: Dictionary of input parameters
+
+        Returns:
+            FieldErrors (empty if valid). When validate_inputs() is overridden
+            and rejects the inputs for a reason the schema does not cover, a
+            single error with field None carries its message.
+        """
+        if self.uses_schema_validation:
+            return self.validator.errors(inputs)
+
+        is_valid, message = self.validate_inputs(inputs)
+        if is_valid:
+            return []
+        # Deferred: calculators.validation imports this module
+        from calculators.validation import FieldError
+        return self.validator.errors(inputs) or [FieldError(None, "invalid", message)]
 
     @abstractmethod
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
@@ -266,6 +320,10 @@ class ClinicalCalculator(ABC):
         """
         Validate inputs and run calculation.
 
+        When a result cache is installed (calculators.result_cache), a
+        previous result for the same inputs is returned instead and
+        metadata["cache_hit"] tells which path was taken.
+
         Args:
             inputs: Input parameters
 
@@ -275,19 +333,109 @@ class ClinicalCalculator(ABC):
         Raises:
             ValidationError: If inputs are invalid
         """
+        # Deferred: calculators.result_cache imports this module
+        from calculators.result_cache import get_result_cache
+
+        cache = get_result_cache()
+        if cache is not None:
+            cached = cache.get(self, inputs)
+            if cached is not None:
+                return cached
+
         # Validate inputs
         is_valid, error_msg = self.validate_inputs(inputs)
         if not is_valid:
             raise ValidationError(f"{self.name}: {error_msg}")
 
         # Calculate
+        start = time.perf_counter()
         result = self.calculate(inputs)
 
         # Ensure raw inputs are stored
         result.raw_inputs = inputs
 
+        if cache is not None:
+            cache.put(self, inputs, result, compute_ms=(time.perf_counter() - start) * 1000)
+            result.metadata["cache_hit"] = False
+
         return result
 
+    @property
+    def supports_batch(self) -> bool:
+        """Whether the calculator implements vectorized cohort scoring."""
+        return type(self).score_batch is not ClinicalCalculator.score_batch
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score a whole cohort with array operations.
+
+        Override together with result_from_scores() to make the calculator
+        usable from calculators.batch.calculate_batch(). Inputs are already
+        pre-checked against get_input_schema(), so the schema must be at least
+        as strict as validate_inputs().
+
+        Args:
+            columns: Input field name -> NumPy array (one element per patient)
+
+        Returns:
+            Output name -> NumPy array; every array needed by
+            result_from_scores() must be included
+        """
+        raise NotImplementedError(f"{self.calculator_id} does not support batch scoring")
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """
+        Build the full result (interpretation, recommendations) for one patient.
+
+        Args:
+            inputs: Input parameters for the patient
+            scores: The patient's row of score_batch() outputs
+
+        Returns:
+            CalculatorResult identical to calculate(inputs)
+        """
+        raise NotImplementedError(f"{self.calculator_id} does not support batch scoring")
+
+    @property
+    def primary_score(self) -> Optional[str]:
+        """score_batch() output that sums up the result (None = the first numeric output)."""
+        return None
+
+    def sensitivity(
+        self,
+        inputs: Dict[str, Any],
+        perturbations: Dict[str, Dict[str, Any]],
+        samples: int = 2000,
+        output: Optional[str] = None,
+        seed: Optional[int] = 0,
+    ) -> "SensitivityResult":
+        """
+        Uncertainty and sensitivity analysis over perturbed inputs.
+
+        Scores thousands of perturbed copies of inputs in one score_batch()
+        pass; see calculators.sensitivity for the perturbation specs.
+
+        Args:
+            inputs: The patient's inputs
+            perturbations: Input field -> range or distribution, e.g.
+                           {"psa": {"low": 6.1, "high": 6.5}}
+            samples: Number of Monte Carlo samples
+            output: score_batch() output to analyze (default primary_score)
+            seed: Random seed
+
+        Returns:
+            SensitivityResult with the output distribution, tornado data and
+            elasticities
+
+        Raises:
+            ValidationError: If inputs are invalid
+            ValueError: If the calculator has no score_batch() or a
+                        perturbation is invalid
+        """
+        # Deferred: calculators.sensitivity imports this module
+        from calculators.sensitivity import analyze_sensitivity
+        return analyze_sensitivity(self, inputs, perturbations, samples, output, seed)
+
     def _validate_range(
         self,
         value: Any,
@@ -0,0 +1,356 @@
+"""
+Columnar (cohort) scoring for clinical calculators.
+
+ClinicalCalculator.run() scores one patient at a time. For panel reviews over
+tens of thousands of historical patients, calculate_batch() scores a whole
+table at once:
+1. The table (dict of arrays/lists, list of dicts, pandas DataFrame or
+   pyarrow Table) is converted to one NumPy array per input field
+2. Inputs are checked with array operations by the validator compiled from
+   get_input_schema() (calculators.validation). For schema-validated
+   calculators only rows that fail those checks go through
+   validate_inputs(); calculators with their own validate_inputs() run it
+   on every row. Either way validity and error messages match run()
+3. Calculators implementing score_batch() are scored with whole-array
+   operations; other calculators fall back to calculate() per row
+4. Interpretations, recommendations and the rest of CalculatorResult are only
+   built when a row's result is requested (BatchResult.result(i))
+
+Usage:
+    batch = calculate_batch("pcptcalculator", {"age": ages, "psa": psas, ...})
+    batch.scores["risk_any_percent"]   # NumPy array
+    batch.result(17).interpretation    # built on demand
+
+Missing cells (None / NaN) are treated as absent inputs.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from calculators.base import CalculatorResult, ClinicalCalculator, ValidationError
+from calculators.validation import ColumnValidation, is_missing
+
+logger = logging.getLogger(__name__)
+
+
+def _to_python(value: Any) -> Any:
+    """Convert a NumPy scalar to the equivalent Python value."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def to_columns(table: Any) -> Dict[str, np.ndarray]:
+    """
+    Normalize a table to a dict of equal-length NumPy arrays.
+
+    Args:
+        table: Mapping of field -> array-like, sequence of input dicts,
+               pandas DataFrame or pyarrow Table
+
+    Returns:
+        Field name -> 1-D NumPy array
+
+    Raises:
+        ValueError: If columns have different lengths
+        TypeError: If the table type is not supported
+    """
+    if hasattr(table, "column_names") and hasattr(table, "column"):
+        # pyarrow Table
+        columns = {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+    elif hasattr(table, "columns") and hasattr(table, "to_numpy"):
+        # pandas DataFrame
+        columns = {str(name): table[name].to_numpy() for name in table.columns}
+    elif isinstance(table, Mapping):
+        columns = {name: as_array(values) for name, values in table.items()}
+    elif isinstance(table, Sequence) and not isinstance(table, (str, bytes)):
+        fields: List[str] = []
+        for row in table:
+            fields.extend(name for name in row if name not in fields)
+        columns = {name: as_array([row.get(name) for row in table]) for name in fields}
+    else:
+        raise TypeError(f"Unsupported table type: {type(table).__name__}")
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+
+    return columns
+
+
+def as_array(values: Any) -> np.ndarray:
+    """
+    1-D array from an array-like.
+
+    Python sequences of mixed types (or with missing values) become object
+    arrays, so values reach validate_inputs() unchanged instead of being
+    coerced to a common dtype (e.g. [False, "yes"] -> ["False", "yes"]).
+    """
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+        # Mixed types, or list cells (e.g. comorbidities) of differing lengths
+        if len({type(v) for v in values}) > 1 or any(isinstance(v, (list, tuple)) for v in values):
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+    array = np.asarray(values)
+    if array.ndim != 1:
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+    return array
+
+
+def row_count(columns: Dict[str, np.ndarray]) -> int:
+    """Number of rows in a column dict."""
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def categorize(values: np.ndarray, thresholds: Sequence[float], labels: Sequence[str], right: bool = False) -> np.ndarray:
+    """
+    Map values to category labels by ascending thresholds.
+
+    With right=False a value below thresholds[0] gets labels[0], a value below
+    thresholds[1] gets labels[1] and so on ("< threshold" cut-offs); with
+    right=True the cut-offs are "<= threshold". NaN (invalid rows) gets
+    labels[0].
+
+    Returns:
+        Object array of labels
+    """
+    codes = np.zeros(len(values), dtype=np.intp)
+    for threshold in thresholds:
+        codes += (values > threshold) if right else (values >= threshold)
+    return np.array(labels, dtype=object).take(codes)
+
+
+def value_column(columns: Dict[str, np.ndarray], name: str, n_rows: int) -> np.ndarray:
+    """Categorical field as an array (absent field -> array of None)."""
+    column = columns.get(name)
+    if column is None:
+        return np.full(n_rows, None, dtype=object)
+    return column
+
+
+def bool_column(columns: Dict[str, np.ndarray], name: str, n_rows: int) -> np.ndarray:
+    """Boolean field as a bool array (absent or missing -> False)."""
+    column = columns.get(name)
+    if column is None:
+        return np.zeros(n_rows, dtype=bool)
+    if column.dtype.kind == "b":
+        return column
+    return np.fromiter((bool(v) and not is_missing(v) for v in column), dtype=bool, count=len(column))
+
+
+class BatchResult:
+    """
+    Scores for a cohort, with per-patient results built on demand.
+
+    Attributes:
+        calculator: Calculator that produced the scores
+        columns: Input columns
+        scores: Output name -> NumPy array (empty for calculators without
+                vectorized scoring)
+        valid: Boolean mask of rows that passed validation
+        errors: Row index -> validation error message
+        validation: Per-field error masks from the schema checks
+                    (ColumnValidation), or None
+    """
+
+    def __init__(
+        self,
+        calculator: ClinicalCalculator,
+        columns: Dict[str, np.ndarray],
+        n_rows: int,
+        scores: Dict[str, np.ndarray],
+        valid: np.ndarray,
+        errors: Dict[int, str],
+        row_results: Optional[Dict[int, CalculatorResult]] = None,
+        validation: Optional[ColumnValidation] = None
+    ):
+        self.calculator = calculator
+        self.columns = columns
+        self.scores = scores
+        self.valid = valid
+        self.errors = errors
+        self._n_rows = n_rows
+        self._row_results = row_results or {}
+        self.validation = validation
+
+    @property
+    def calculator_id(self) -> str:
+        return self.calculator.calculator_id
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def inputs(self, index: int) -> Dict[str, Any]:
+        """Input dict for one row (missing cells omitted)."""
+        row = {}
+        for name, column in self.columns.items():
+            value = _to_python(column[index])
+            if not is_missing(value):
+                row[name] = value
+        return row
+
+    def result(self, index: int) -> CalculatorResult:
+        """
+        Full CalculatorResult for one row, identical to calculator.run(inputs).
+
+        Raises:
+            ValidationError: If the row failed validation
+        """
+        if index < 0:
+            index += self._n_rows
+        if not self.valid[index]:
+            raise ValidationError(f"{self.calculator.name}: {self.errors.get(index)}")
+
+        if index in self._row_results:
+            return self._row_results[index]
+
+        inputs = self.inputs(index)
+        row_scores = {name: _to_python(values[index]) for name, values in self.scores.items()}
+        result = self.calculator.result_from_scores(inputs, row_scores)
+        result.raw_inputs = inputs
+        return result
+
+    def results(self) -> Iterator[Optional[CalculatorResult]]:
+        """Iterate results lazily; invalid rows yield None."""
+        for index in range(self._n_rows):
+            yield self.result(index) if self.valid[index] else None
+
+    def to_pandas(self):
+        """Scores, validity and errors as a pandas DataFrame (requires pandas)."""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.scores)
+        frame["valid"] = self.valid
+        frame["error"] = [self.errors.get(i) for i in range(self._n_rows)]
+        return frame
+
+
+def calculate_batch(
+    calculator: Union[str, ClinicalCalculator],
+    table: Any
+) -> BatchResult:
+    """
+    Score a cohort with one calculator.
+
+    Args:
+        calculator: Calculator ID or instance
+        table: Mapping of field -> array-like, sequence of input dicts,
+               pandas DataFrame or pyarrow Table
+
+    Returns:
+        BatchResult
+
+    Raises:
+        ValueError: Unknown calculator ID or ragged columns
+    """
+    if isinstance(calculator, str):
+        # Deferred: calculator modules import this module
+        from calculators.registry import registry
+
+        calculator_id = calculator
+        calculator = registry.get(calculator_id)
+        if calculator is None:
+            raise ValueError(f"Calculator not found: {calculator_id}")
+
+    columns = to_columns(table)
+    n_rows = row_count(columns)
+    validation = calculator.validator.check_columns(columns, n_rows)
+    # For schema-validated calculators the column checks are exact
+    exact = calculator.uses_schema_validation
+
+    if not calculator.supports_batch:
+        return _calculate_rows(calculator, columns, n_rows, validation, exact)
+
+    valid = np.ones(n_rows, dtype=bool)
+    errors: Dict[int, str] = {}
+    row_results: Dict[int, CalculatorResult] = {}
+
+    with np.errstate(all="ignore"):
+        scores = calculator.score_batch(columns)
+
+    probe = BatchResult(calculator, columns, n_rows, scores, valid, errors)
+    if exact:
+        # Only rows flagged by the column checks pay for Python-level validation
+        for index in np.flatnonzero(validation.invalid):
+            index = int(index)
+            valid[index] = False
+            errors[index] = calculator.validate_inputs(probe.inputs(index))[1]
+    else:
+        # The schema checks cannot see the calculator's own rules (integers,
+        # cross-field limits), so every row goes through validate_inputs().
+        # Rows that pass it but not the schema checks (e.g. a numeric string
+        # where the calculator opts out of them) are scored the scalar way.
+        for index in range(n_rows):
+            if validation.invalid[index]:
+                _score_row(calculator, probe.inputs(index), index, valid, errors, row_results)
+            else:
+                _validate_row(calculator, probe.inputs(index), index, valid, errors)
+
+    return BatchResult(calculator, columns, n_rows, scores, valid, errors, row_results, validation)
+
+
+def _calculate_rows(
+    calculator: ClinicalCalculator,
+    columns: Dict[str, np.ndarray],
+    n_rows: int,
+    validation: ColumnValidation,
+    exact: bool
+) -> BatchResult:
+    """Fallback for calculators without score_batch(): calculate() per row."""
+    valid = np.ones(n_rows, dtype=bool)
+    errors: Dict[int, str] = {}
+    row_results: Dict[int, CalculatorResult] = {}
+    probe = BatchResult(calculator, columns, n_rows, {}, valid, errors)
+
+    for index in range(n_rows):
+        # Rows that passed exact column checks skip validate_inputs()
+        validated = exact and not validation.invalid[index]
+        _score_row(calculator, probe.inputs(index), index, valid, errors, row_results, validated)
+
+    return BatchResult(calculator, columns, n_rows, {}, valid, errors, row_results, validation)
+
+
+def _validate_row(
+    calculator: ClinicalCalculator,
+    inputs: Dict[str, Any],
+    index: int,
+    valid: np.ndarray,
+    errors: Dict[int, str]
+) -> None:
+    """Apply validate_inputs() to a row scored with array operations."""
+    try:
+        is_valid, message = calculator.validate_inputs(inputs)
+    except Exception as e:
+        logger.warning(f"{calculator.calculator_id}: row {index} failed: {e}")
+        is_valid, message = False, str(e)
+
+    if not is_valid:
+        valid[index] = False
+        errors[index] = message
+
+
+def _score_row(
+    calculator: ClinicalCalculator,
+    inputs: Dict[str, Any],
+    index: int,
+    valid: np.ndarray,
+    errors: Dict[int, str],
+    row_results: Dict[int, CalculatorResult],
+    validated: bool = False
+) -> None:
+    """Validate and score one row the scalar way; failures are recorded, not raised."""
+    try:
+        is_valid, message = (True, None) if validated else calculator.validate_inputs(inputs)
+        if is_valid:
+            row_results[index] = calculator.calculate(inputs)
+            row_results[index].raw_inputs = inputs
+    except Exception as e:
+        logger.warning(f"{calculator.calculator_id}: row {index} failed: {e}")
+        is_valid, message = False, str(e)
+
+    if not is_valid:
+        valid[index] = False
+        errors[index] = message
@@ -0,0 +1,285 @@
+"""
+Calculator micro-benchmarks.
+
+Runs every registered calculator on the examples from its input schema and
+measures per-call latency and memory, so slow calculators and regressions
+show up before they reach a note. Results are compared against a stored
+baseline (tests/test_calculators/benchmark_baseline.json):
+
+    python scripts/benchmark_calculators.py              # report
+    python scripts/benchmark_calculators.py --update     # rewrite baseline
+    pytest -m performance tests/test_calculators/test_benchmarks.py
+
+Latency is the best of several timed rounds (the least noisy estimate),
+normalized by a fixed pure-Python reference workload timed in alternating
+rounds, so a baseline recorded on one machine can gate another.
+Allocations are the peak traced memory of one call and the number of
+memory blocks still alive after it (the result, plus anything leaked);
+both are deterministic.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from calculators.base import ClinicalCalculator, InputMetadata, InputType
+from calculators.result_cache import get_result_cache, set_result_cache
+
+BASELINE_PATH = Path(__file__).parent.parent / "tests" / "test_calculators" / "benchmark_baseline.json"
+
+# Regression gate: normalized latency or peak memory above baseline x factor
+DEFAULT_THRESHOLD = 1.5
+# Differences below these are noise, whatever the ratio
+LATENCY_FLOOR_US = 3.0
+MEMORY_FLOOR_BYTES = 2048
+
+# Target duration of one timed round
+ROUND_SECONDS = 0.002
+
+
+def example_value(meta: InputMetadata) -> Any:
+    """Typed value for a schema field from its example (or a safe fallback)."""
+    example = meta.example if meta.example is not None else meta.default_value
+
+    if meta.input_type == InputType.ENUM and meta.allowed_values:
+        for value in meta.allowed_values:
+            if str(value) == str(example):
+                return value
+        return meta.allowed_values[0]
+
+    if example is None:
+        if meta.input_type == InputType.NUMERIC:
+            low = meta.min_value if meta.min_value is not None else 0
+            high = meta.max_value if meta.max_value is not None else low + 10
+            return (low + high) / 2
+        if meta.input_type == InputType.BOOLEAN:
+            return False
+        return None
+
+    if not isinstance(example, str):
+        return example
+    if meta.input_type == InputType.NUMERIC:
+        try:
+            return int(example)
+        except ValueError:
+            return float(example)
+    if meta.input_type == InputType.BOOLEAN:
+        return example.strip().lower() in ("true", "yes", "1")
+    # Text examples may be JSON (e.g. a list of PSA values)
+    try:
+        return json.loads(example)
+    except ValueError:
+        return example
+
+
+def example_inputs(calculator: ClinicalCalculator) -> Dict[str, Any]:
+    """Inputs built from every field's schema example."""
+    inputs = {meta.field_name: example_value(meta) for meta in calculator.get_input_schema()}
+    return {name: value for name, value in inputs.items() if value is not None}
+
+
+@dataclass
+class CalculatorBenchmark:
+    """Benchmark of one calculator on its schema examples."""
+    calculator_id: str
+    us_per_call: float = 0.0
+    reference_us: float = 0.0  # Reference workload, timed alongside
+    normalized: float = 0.0  # us_per_call / reference_us
+    peak_bytes: int = 0
+    retained_blocks: int = 0
+    skipped: Optional[str] = None  # Why the calculator could not be run
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for the baseline file."""
+        if self.skipped is not None:
+            return {"skipped": self.skipped}
+        data = asdict(self)
+        del data["calculator_id"]
+        data["us_per_call"] = round(self.us_per_call, 2)
+        data["reference_us"] = round(self.reference_us, 2)
+        data["normalized"] = round(self.normalized, 4)
+        del data["skipped"]
+        return data
+
+
+def _reference_workload() -> float:
+    """Fixed work resembling a calculator: dict lookups, float math, string formatting."""
+    inputs = {"a": 4.5, "b": 3, "c": "T2a"}
+    total = 0.0
+    for i in range(50):
+        total += float(inputs["a"]) * (i % 7) + inputs["b"]
+        if inputs["c"] in ("T1", "T2a", "T3"):
+            total -= 0.5
+    return float(f"{total:.2f}")
+
+
+def _calls_per_round(func) -> int:
+    """Number of calls that makes one round last about ROUND_SECONDS."""
+    calls = 1
+    while calls < 1 << 16:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        if time.perf_counter() - start >= ROUND_SECONDS:
+            break
+        calls *= 2
+    return calls
+
+
+def _round(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def time_against_reference(func, rounds: int = 7) -> Tuple[float, float]:
+    """
+    Best per-call time of func and of the reference workload, in microseconds.
+
+    Rounds of the two alternate, so CPU frequency changes and neighbouring
+    load affect both alike and their ratio stays stable.
+    """
+    # Like timeit: collector pauses are not the calculator's cost
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        calls, reference_calls = _calls_per_round(func), _calls_per_round(_reference_workload)
+        best = reference = float("inf")
+        for _ in range(rounds):
+            best = min(best, _round(func, calls))
+            reference = min(reference, _round(_reference_workload, reference_calls))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best * 1e6, reference * 1e6
+
+
+def measure_allocations(func) -> Dict[str, int]:
+    """Peak traced memory of one call and the blocks still alive after it."""
+    func()  # Warm caches so only per-call allocations are counted
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1] - baseline_bytes
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    # Ignore the snapshots' own bookkeeping
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    after, before = after.filter_traces(ignore), before.filter_traces(ignore)
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return {"peak_bytes": max(peak, 0), "retained_blocks": retained}
+
+
+def benchmark_calculator(
+    calculator: ClinicalCalculator,
+    inputs: Optional[Dict[str, Any]] = None,
+    rounds: int = 7,
+) -> CalculatorBenchmark:
+    """
+    Benchmark calculator.run() on its schema examples.
+
+    Args:
+        calculator: Calculator to benchmark
+        inputs: Inputs to use instead of the schema examples
+        rounds: Timed rounds (the best is kept)
+
+    Returns:
+        CalculatorBenchmark; skipped is set when the inputs do not validate
+    """
+    inputs = example_inputs(calculator) if inputs is None else inputs
+    benchmark = CalculatorBenchmark(calculator.calculator_id)
+
+    # Measure the calculation itself, never cache hits
+    cache = get_result_cache()
+    set_result_cache(None)
+    try:
+        try:
+            calculator.run(inputs)
+        except Exception as e:
+            benchmark.skipped = f"schema examples do not run: {type(e).__name__}: {e}"
+            return benchmark
+
+        def call():
+            return calculator.run(inputs)
+
+        benchmark.us_per_call, benchmark.reference_us = time_against_reference(call, rounds)
+        benchmark.normalized = benchmark.us_per_call / benchmark.reference_us
+        benchmark.__dict__.update(measure_allocations(call))
+    finally:
+        set_result_cache(cache)
+    return benchmark
+
+
+def run_benchmarks(calculator_ids: Optional[List[str]] = None, rounds: int = 7) -> Dict[str, CalculatorBenchmark]:
+    """Benchmark registered calculators (all of them by default), by calculator ID."""
+    from calculators.registry import registry
+
+    return {
+        calculator_id: benchmark_calculator(registry.get(calculator_id), rounds=rounds)
+        for calculator_id in calculator_ids or registry.get_all_ids()
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Read the stored baseline, or None when there is none."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(run: Dict[str, CalculatorBenchmark], path: Path = BASELINE_PATH) -> None:
+    """Write a run_benchmarks() result as the new baseline."""
+    data = {
+        "threshold": DEFAULT_THRESHOLD,
+        "calculators": {
+            calculator_id: benchmark.to_dict()
+            for calculator_id, benchmark in sorted(run.items())
+        },
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def regressions(
+    benchmark: CalculatorBenchmark,
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Compare a benchmark against its baseline entry.
+
+    Args:
+        benchmark: Current measurement
+        baseline: The calculator's entry from the baseline file
+        threshold: Allowed ratio over the baseline
+
+    Returns:
+        Human-readable regressions (empty when within the threshold)
+    """
+    problems = []
+    if "normalized" not in baseline:
+        return problems
+    if benchmark.skipped is not None:
+        return [f"no longer runs on its schema examples ({benchmark.skipped})"]
+
+    # The baseline in this machine's microseconds, so the noise floor applies
+    expected_us = baseline["normalized"] * benchmark.reference_us
+    if benchmark.us_per_call > expected_us * threshold and benchmark.us_per_call - expected_us > LATENCY_FLOOR_US:
+        problems.append(
+            f"latency {benchmark.us_per_call:.1f} µs is {benchmark.us_per_call / expected_us:.2f}x "
+            f"the baseline ({expected_us:.1f} µs on this machine)"
+        )
+
+    peak = baseline.get("peak_bytes", 0)
+    if benchmark.peak_bytes > peak * threshold and benchmark.peak_bytes - peak > MEMORY_FLOOR_BYTES:
+        problems.append(f"peak memory {benchmark.peak_bytes} B per call (baseline {peak} B)")
+    return problems
@@ -1,11 +1,23 @@
 """Bladder Cancer Calculators."""
 
-from calculators.bladder.eortc_recurrence import EORTCRecurrenceCalculator
-from calculators.bladder.eortc_progression import EORTCProgressionCalculator
-from calculators.bladder.cueto_score import CuetoCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "EORTCRecurrenceCalculator": "calculators.bladder.eortc_recurrence",
+    "EORTCProgressionCalculator": "calculators.bladder.eortc_progression",
+    "CuetoCalculator": "calculators.bladder.cueto_score",
+}
 
 __all__ = [
     "EORTCRecurrenceCalculator",
     "EORTCProgressionCalculator",
     "CuetoCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,7 +5,7 @@ Predicts BCG response failure in patients with non-muscle invasive
 bladder cancer receiving BCG immunotherapy.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -50,6 +50,10 @@ class CuetoCalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["t_category", "concurrent_cis", "grade", "age", "gender"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for CUETO BCG Risk Score calculator inputs."""
         return [
@@ -107,57 +111,6 @@ class CuetoCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate CUETO inputs."""
-
-        is_valid, msg = self._validate_required(
-            inputs, ["t_category", "concurrent_cis", "grade", "age", "gender"]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate T category
-        is_valid, msg = self._validate_enum(
-            inputs["t_category"],
-            ["Ta", "T1"],
-            "t_category"
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate CIS
-        is_valid, msg = self._validate_enum(
-            inputs["concurrent_cis"],
-            ["no", "yes"],
-            "concurrent_cis"
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate grade
-        valid_grades = ["G1", "G2", "G3"]
-        is_valid, msg = self._validate_enum(inputs["grade"], valid_grades, "grade")
-        if not is_valid:
-            return False, msg
-
-        # Validate age
-        is_valid, msg = self._validate_range(
-            inputs["age"], min_val=18, max_val=120, param_name="age"
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate gender
-        is_valid, msg = self._validate_enum(
-            inputs["gender"],
-            ["male", "female"],
-            "gender"
-        )
-        if not is_valid:
-            return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate CUETO BCG risk score."""
 
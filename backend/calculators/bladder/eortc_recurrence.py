@@ -6,6 +6,9 @@ bladder cancer based on clinical and pathological factors.
 """
 
 from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -13,6 +16,16 @@ from calculators.base import (
     InputMetadata,
     InputType,
 )
+from calculators.batch import categorize, row_count, value_column
+from calculators.validation import float_column
+
+# Points for the categorical factors
+RECURRENCE_RATE_POINTS = {
+    "primary": 0,
+    "less_than_1_per_year": 2,
+    "more_than_1_per_year": 4,
+}
+GRADE_POINTS = {"G1": 0, "G2": 1, "G3": 2}
 
 
 class EORTCRecurrenceCalculator(ClinicalCalculator):
@@ -199,13 +212,6 @@ class EORTCRecurrenceCalculator(ClinicalCalculator):
 
         number_of_tumors = int(inputs["number_of_tumors"])
         tumor_diameter = float(inputs["tumor_diameter_cm"])
-        prior_recurrence_rate = inputs["prior_recurrence_rate"]
-        t_category = inputs["t_category"]
-        concurrent_cis = inputs["concurrent_cis"]
-        grade = inputs["grade"]
-
-        # Initialize score
-        total_score = 0
 
         # Number of tumors
         if number_of_tumors == 1:
@@ -214,36 +220,69 @@ class EORTCRecurrenceCalculator(ClinicalCalculator):
             tumor_count_score = 3
         else:
             tumor_count_score = 6
-        total_score += tumor_count_score
 
         # Tumor diameter
         if tumor_diameter < 3:
             diameter_score = 0
         else:
             diameter_score = 3
-        total_score += diameter_score
 
         # Prior recurrence rate
-        recurrence_scores = {
-            "primary": 0,
-            "less_than_1_per_year": 2,
-            "more_than_1_per_year": 4,
-        }
-        recurrence_score = recurrence_scores.get(prior_recurrence_rate, 0)
-        total_score += recurrence_score
+        recurrence_score = RECURRENCE_RATE_POINTS.get(inputs["prior_recurrence_rate"], 0)
 
         # T category
-        t_score = 0 if t_category == "Ta" else 1
-        total_score += t_score
+        t_score = 0 if inputs["t_category"] == "Ta" else 1
 
         # Concurrent CIS
-        cis_score = 0 if concurrent_cis == "no" else 1
-        total_score += cis_score
+        cis_score = 0 if inputs["concurrent_cis"] == "no" else 1
 
         # Grade
-        grade_scores = {"G1": 0, "G2": 1, "G3": 2}
-        grade_score = grade_scores.get(grade, 0)
-        total_score += grade_score
+        grade_score = GRADE_POINTS.get(inputs["grade"], 0)
+
+        total_score = (
+            tumor_count_score + diameter_score + recurrence_score + t_score + cis_score + grade_score
+        )
+        return self._build_result(inputs, total_score)
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized EORTC recurrence score over a cohort."""
+        n_rows = row_count(columns)
+        number_of_tumors = np.trunc(float_column(columns, "number_of_tumors", n_rows))
+        tumor_diameter = float_column(columns, "tumor_diameter_cm", n_rows)
+        recurrence_rate = value_column(columns, "prior_recurrence_rate", n_rows)
+        grade = value_column(columns, "grade", n_rows)
+
+        total_score = (
+            np.select([number_of_tumors == 1, number_of_tumors <= 7], [0, 3], 6)
+            + np.where(tumor_diameter < 3, 0, 3)
+            + np.select(
+                [recurrence_rate == rate for rate in RECURRENCE_RATE_POINTS],
+                list(RECURRENCE_RATE_POINTS.values()),
+                0
+            )
+            + np.where(value_column(columns, "t_category", n_rows) == "Ta", 0, 1)
+            + np.where(value_column(columns, "concurrent_cis", n_rows) == "no", 0, 1)
+            + np.select([grade == g for g in GRADE_POINTS], list(GRADE_POINTS.values()), 0)
+        )
+
+        return {
+            "total_score": total_score,
+            "risk_category": categorize(
+                total_score, [2, 5, 9], ["Low Risk", "Low-Intermediate Risk", "Intermediate Risk", "High Risk"], right=True
+            ),
+        }
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        return self._build_result(inputs, scores["total_score"])
+
+    def _build_result(self, inputs: Dict[str, Any], total_score: int) -> CalculatorResult:
+        """Map the score to recurrence probabilities and build the interpretation."""
+
+        number_of_tumors = int(inputs["number_of_tumors"])
+        tumor_diameter = float(inputs["tumor_diameter_cm"])
+        t_category = inputs["t_category"]
+        grade = inputs["grade"]
 
         # Recurrence probability based on score
         if total_score == 0:
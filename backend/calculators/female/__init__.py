@@ -1,12 +1,18 @@
 """Female Urology Calculators."""
 
-from calculators.female.popq import POPQCalculator
-from calculators.female.udi6_iiq7 import UDI6IIQ7Calculator
-from calculators.female.oabq import OABQCalculator
-from calculators.female.sandvik_severity import SandvikCalculator
-from calculators.female.stress_ui_severity import StressUISeverityCalculator
-from calculators.female.mesa import MESACalculator
-from calculators.female.pfdi import PFDICalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "POPQCalculator": "calculators.female.popq",
+    "UDI6IIQ7Calculator": "calculators.female.udi6_iiq7",
+    "OABQCalculator": "calculators.female.oabq",
+    "SandvikCalculator": "calculators.female.sandvik_severity",
+    "StressUISeverityCalculator": "calculators.female.stress_ui_severity",
+    "MESACalculator": "calculators.female.mesa",
+    "PFDICalculator": "calculators.female.pfdi",
+}
 
 __all__ = [
     "POPQCalculator",
@@ -17,3 +23,9 @@ __all__ = [
     "MESACalculator",
     "PFDICalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 """OAB-q Overactive Bladder Questionnaire Calculator."""
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -33,6 +33,10 @@ class OABQCalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["symptom_bother_score", "qol_score"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for OAB-q Short Form calculator inputs."""
         return [
@@ -62,18 +66,6 @@ class OABQCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        required = self.required_inputs
-        for field in required:
-            if field not in inputs:
-                return False, f"{field} is required"
-
-        for param in self.required_inputs:
-            is_valid, msg = self._validate_range(inputs[param], min_val=0, max_val=100, param_name=param)
-            if not is_valid:
-                return False, msg
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate OAB-q scores."""
         symptom = round(float(inputs["symptom_bother_score"]), 1)
@@ -1,6 +1,6 @@
 """UDI-6/IIQ-7 Questionnaire Calculators."""
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -36,6 +36,10 @@ class UDI6IIQ7Calculator(ClinicalCalculator):
             "iiq7_q1", "iiq7_q2", "iiq7_q3", "iiq7_q4", "iiq7_q5", "iiq7_q6", "iiq7_q7",
         ]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for UDI-6 / IIQ-7 Questionnaires calculator inputs."""
         schema = []
@@ -87,29 +91,13 @@ class UDI6IIQ7Calculator(ClinicalCalculator):
 
         return schema
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        is_valid, msg = self._validate_required(inputs, self.required_inputs)
-        if not is_valid:
-            return False, msg
-
-        for q in self.required_inputs:
-            try:
-                score = int(inputs[q])
-                max_val = 3 if "udi6" in q else 3
-                if score < 0 or score > max_val:
-                    return False, f"{q} must be 0-{max_val}"
-            except (ValueError, TypeError):
-                return False, f"{q} must be an integer"
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate UDI-6 and IIQ-7 scores."""
 
-        udi6_sum = sum(int(inputs[f"udi6_q{i}"]) for i in range(1, 7))
+        udi6_sum = sum(int(float(inputs[f"udi6_q{i}"])) for i in range(1, 7))
         udi6_score = (udi6_sum / 18) * 100
 
-        iiq7_sum = sum(int(inputs[f"iiq7_q{i}"]) for i in range(1, 8))
+        iiq7_sum = sum(int(float(inputs[f"iiq7_q{i}"])) for i in range(1, 8))
         iiq7_score = (iiq7_sum / 21) * 100
 
         result = {
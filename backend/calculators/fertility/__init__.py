@@ -1,12 +1,18 @@
 """Male Fertility Calculators."""
 
-from calculators.fertility.semen_analysis import SemenAnalysisCalculator
-from calculators.fertility.sperm_dna import SpermDNACalculator
-from calculators.fertility.varicocele_grade import VaricoceleCalculator
-from calculators.fertility.hormonal_eval import HormonalEvalCalculator
-from calculators.fertility.testicular_volume import TesticularVolumeCalculator
-from calculators.fertility.mao import MAOCalculator
-from calculators.fertility.testosterone_eval import TestosteroneCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "SemenAnalysisCalculator": "calculators.fertility.semen_analysis",
+    "SpermDNACalculator": "calculators.fertility.sperm_dna",
+    "VaricoceleCalculator": "calculators.fertility.varicocele_grade",
+    "HormonalEvalCalculator": "calculators.fertility.hormonal_eval",
+    "TesticularVolumeCalculator": "calculators.fertility.testicular_volume",
+    "MAOCalculator": "calculators.fertility.mao",
+    "TestosteroneCalculator": "calculators.fertility.testosterone_eval",
+}
 
 __all__ = [
     "SemenAnalysisCalculator",
@@ -17,3 +23,9 @@ __all__ = [
     "MAOCalculator",
     "TestosteroneCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
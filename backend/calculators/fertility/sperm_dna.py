@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -24,6 +24,10 @@ class SpermDNACalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["dfi_percent"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for Sperm DNA Fragmentation Index calculator inputs."""
         return [
@@ -41,12 +45,6 @@ class SpermDNACalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        required = self.required_inputs
-        for field in required:
-            if field not in inputs:
-                return False, f"{field} is required"
-        return self._validate_range(inputs["dfi_percent"], 0, 100, "DFI")
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         dfi = float(inputs["dfi_percent"])
         if dfi < 15:
@@ -1,11 +1,23 @@
 """Hypogonadism/Testosterone Calculators."""
 
-from calculators.hypogonadism.adam import ADAMCalculator
-from calculators.hypogonadism.tt_evaluation import TTEvaluationCalculator
-from calculators.hypogonadism.hypogonadism_risk import HypogonadismRiskCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "ADAMCalculator": "calculators.hypogonadism.adam",
+    "TTEvaluationCalculator": "calculators.hypogonadism.tt_evaluation",
+    "HypogonadismRiskCalculator": "calculators.hypogonadism.hypogonadism_risk",
+}
 
 __all__ = [
     "ADAMCalculator",
     "TTEvaluationCalculator",
     "HypogonadismRiskCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
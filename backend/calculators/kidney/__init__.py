@@ -1,9 +1,15 @@
 """Kidney Cancer Calculators."""
 
-from calculators.kidney.ssign_score import SSIGNCalculator
-from calculators.kidney.imdc_criteria import IMDCCalculator
-from calculators.kidney.renal_score import RENALScoreCalculator
-from calculators.kidney.leibovich_score import LeibovichCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "SSIGNCalculator": "calculators.kidney.ssign_score",
+    "IMDCCalculator": "calculators.kidney.imdc_criteria",
+    "RENALScoreCalculator": "calculators.kidney.renal_score",
+    "LeibovichCalculator": "calculators.kidney.leibovich_score",
+}
 
 __all__ = [
     "SSIGNCalculator",
@@ -11,3 +17,9 @@ __all__ = [
     "RENALScoreCalculator",
     "LeibovichCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
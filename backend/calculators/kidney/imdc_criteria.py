@@ -5,7 +5,7 @@ Assesses risk factors in metastatic renal cell carcinoma and predicts
 median overall survival and 2-year survival probability.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -58,6 +58,10 @@ class IMDCCalculator(ClinicalCalculator):
             "platelets_K_uL",
         ]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for IMDC Risk Criteria calculator inputs."""
         return [
@@ -147,92 +151,10 @@ class IMDCCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate IMDC inputs."""
-
-        is_valid, msg = self._validate_required(
-            inputs,
-            [
-                "kps",
-                "time_diagnosis_to_treatment_months",
-                "hemoglobin_g_dL",
-                "calcium_mg_dL",
-                "albumin_g_dL",
-                "neutrophils_K_uL",
-                "platelets_K_uL",
-            ]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate ranges
-        try:
-            kps = int(inputs["kps"])
-            if kps < 0 or kps > 100:
-                return False, "KPS must be between 0 and 100"
-        except (ValueError, TypeError):
-            return False, "KPS must be an integer"
-
-        is_valid, msg = self._validate_range(
-            inputs["time_diagnosis_to_treatment_months"],
-            min_val=0,
-            max_val=120,
-            param_name="time_diagnosis_to_treatment_months"
-        )
-        if not is_valid:
-            return False, msg
-
-        is_valid, msg = self._validate_range(
-            inputs["hemoglobin_g_dL"],
-            min_val=5,
-            max_val=20,
-            param_name="hemoglobin_g_dL"
-        )
-        if not is_valid:
-            return False, msg
-
-        is_valid, msg = self._validate_range(
-            inputs["calcium_mg_dL"],
-            min_val=6,
-            max_val=15,
-            param_name="calcium_mg_dL"
-        )
-        if not is_valid:
-            return False, msg
-
-        is_valid, msg = self._validate_range(
-            inputs["albumin_g_dL"],
-            min_val=1,
-            max_val=6,
-            param_name="albumin_g_dL"
-        )
-        if not is_valid:
-            return False, msg
-
-        is_valid, msg = self._validate_range(
-            inputs["neutrophils_K_uL"],
-            min_val=0.5,
-            max_val=50,
-            param_name="neutrophils_K_uL"
-        )
-        if not is_valid:
-            return False, msg
-
-        is_valid, msg = self._validate_range(
-            inputs["platelets_K_uL"],
-            min_val=20,
-            max_val=1000,
-            param_name="platelets_K_uL"
-        )
-        if not is_valid:
-            return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate IMDC risk score."""
 
-        kps = int(inputs["kps"])
+        kps = int(float(inputs["kps"]))
         time_to_tx = float(inputs["time_diagnosis_to_treatment_months"])
         hemoglobin = float(inputs["hemoglobin_g_dL"])
         calcium_measured = float(inputs["calcium_mg_dL"])
@@ -5,7 +5,7 @@ Predicts cancer-specific survival using Fuhrman grade, tumor stage,
 tumor size, and Eastern Cooperative Oncology Group performance status.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -48,6 +48,10 @@ class LeibovichCalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["fuhrman_grade", "ecog_ps", "stage", "tumor_size_cm"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for Leibovich Prognosis Score calculator inputs."""
         return [
@@ -95,51 +99,11 @@ class LeibovichCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate Leibovich score inputs."""
-
-        is_valid, msg = self._validate_required(
-            inputs, ["fuhrman_grade", "ecog_ps", "stage", "tumor_size_cm"]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate Fuhrman grade
-        try:
-            grade = int(inputs["fuhrman_grade"])
-            if grade < 1 or grade > 4:
-                return False, "Fuhrman grade must be 1-4"
-        except (ValueError, TypeError):
-            return False, "Fuhrman grade must be an integer"
-
-        # Validate ECOG PS
-        try:
-            ecog = int(inputs["ecog_ps"])
-            if ecog < 0 or ecog > 3:
-                return False, "ECOG PS must be 0-3"
-        except (ValueError, TypeError):
-            return False, "ECOG PS must be an integer"
-
-        # Validate stage
-        valid_stages = ["I", "II", "III", "IV"]
-        is_valid, msg = self._validate_enum(inputs["stage"], valid_stages, "stage")
-        if not is_valid:
-            return False, msg
-
-        # Validate tumor size
-        is_valid, msg = self._validate_range(
-            inputs["tumor_size_cm"], min_val=0.1, max_val=30, param_name="tumor_size_cm"
-        )
-        if not is_valid:
-            return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate Leibovich score."""
 
-        fuhrman_grade = int(inputs["fuhrman_grade"])
-        ecog_ps = int(inputs["ecog_ps"])
+        fuhrman_grade = int(float(inputs["fuhrman_grade"]))
+        ecog_ps = int(float(inputs["ecog_ps"]))
         stage = inputs["stage"]
         tumor_size = float(inputs["tumor_size_cm"])
 
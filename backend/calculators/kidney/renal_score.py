@@ -5,7 +5,7 @@ Scores renal masses based on five anatomic characteristics to predict
 surgical complexity and guide management decisions.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -55,6 +55,10 @@ class RENALScoreCalculator(ClinicalCalculator):
     def optional_inputs(self) -> List[str]:
         return ["anterior_posterior", "hilar"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for RENAL Nephrometry Score calculator inputs."""
         return [
@@ -120,59 +124,13 @@ class RENALScoreCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate RENAL score inputs."""
-
-        # Check required fields
-        is_valid, msg = self._validate_required(
-            inputs,
-            ["radius_points", "exophytic_points", "nearness_points", "location_points"]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate point ranges
-        for param, max_points in [
-            ("radius_points", 3),
-            ("exophytic_points", 3),
-            ("nearness_points", 3),
-            ("location_points", 3),
-        ]:
-            try:
-                points = int(inputs[param])
-                if points < 1 or points > max_points:
-                    return False, f"{param} must be between 1 and {max_points}"
-            except (ValueError, TypeError):
-                return False, f"{param} must be an integer"
-
-        # Validate optional enum fields
-        if "anterior_posterior" in inputs:
-            is_valid, msg = self._validate_enum(
-                inputs["anterior_posterior"],
-                ["anterior", "posterior", "indeterminate"],
-                param_name="anterior_posterior"
-            )
-            if not is_valid:
-                return False, msg
-
-        if "hilar" in inputs:
-            is_valid, msg = self._validate_enum(
-                inputs["hilar"],
-                ["no", "yes"],
-                param_name="hilar"
-            )
-            if not is_valid:
-                return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate RENAL Nephrometry Score."""
 
-        radius_points = int(inputs["radius_points"])
-        exophytic_points = int(inputs["exophytic_points"])
-        nearness_points = int(inputs["nearness_points"])
-        location_points = int(inputs["location_points"])
+        radius_points = int(float(inputs["radius_points"]))
+        exophytic_points = int(float(inputs["exophytic_points"]))
+        nearness_points = int(float(inputs["nearness_points"]))
+        location_points = int(float(inputs["location_points"]))
 
         # Total score
         total_score = radius_points + exophytic_points + nearness_points + location_points
@@ -5,7 +5,7 @@ Predicts metastasis-free survival for patients with clear cell renal cancer
 using TNM stage, tumor size, nuclear grade, and necrosis.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -49,6 +49,10 @@ class SSIGNCalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["tnm_stage", "tumor_size", "nuclear_grade", "necrosis"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get detailed metadata for SSIGN Prognostic Score calculator inputs."""
         return [
@@ -96,51 +100,12 @@ class SSIGNCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate SSIGN inputs."""
-
-        is_valid, msg = self._validate_required(
-            inputs, ["tnm_stage", "tumor_size", "nuclear_grade", "necrosis"]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate enums
-        valid_stages = ["T1a", "T1b", "T2", "T3a", "T3b", "T3c", "T4"]
-        is_valid, msg = self._validate_enum(inputs["tnm_stage"], valid_stages, "tnm_stage")
-        if not is_valid:
-            return False, msg
-
-        # Validate size
-        is_valid, msg = self._validate_range(
-            inputs["tumor_size"], min_val=0.1, max_val=30, param_name="tumor_size"
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate grade
-        valid_grades = [1, 2, 3, 4]
-        try:
-            grade = int(inputs["nuclear_grade"])
-            if grade not in valid_grades:
-                return False, "Nuclear grade must be 1, 2, 3, or 4"
-        except (ValueError, TypeError):
-            return False, "Nuclear grade must be an integer"
-
-        # Validate necrosis
-        valid_necrosis = ["absent", "present"]
-        is_valid, msg = self._validate_enum(inputs["necrosis"], valid_necrosis, "necrosis")
-        if not is_valid:
-            return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate SSIGN score."""
 
         tnm_stage = inputs["tnm_stage"]
         tumor_size = float(inputs["tumor_size"])
-        nuclear_grade = int(inputs["nuclear_grade"])
+        nuclear_grade = int(float(inputs["nuclear_grade"]))
         necrosis = inputs["necrosis"]
 
         # Initialize score
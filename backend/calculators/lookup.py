@@ -0,0 +1,203 @@
+"""
+Precomputed lookup tables for calculators.
+
+Actuarial tables, points tables and nomogram coefficients are declared once
+as class attributes, so nothing is rebuilt, sorted or scanned per call:
+
+    class CCICalculator(ClinicalCalculator):
+        AGE_POINTS = StepTable([50, 60, 70, 80], [0, 1, 2, 3, 4])
+
+        def calculate(self, inputs):
+            score = self.AGE_POINTS(inputs["age"])          # one patient
+        def score_batch(self, columns):
+            points = self.AGE_POINTS.take(age_column)       # whole cohort
+
+Every table answers scalars with bisect over tuples (NumPy costs more than
+the lookup for a single value) and arrays with np.searchsorted over arrays
+built at construction. Both paths perform the same floating-point
+operations in the same order, so batch scores equal run() scores exactly.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+def _value_array(values: Sequence[Any]) -> np.ndarray:
+    """1-D array of table values; non-scalar values (e.g. label tuples) become objects."""
+    array = np.asarray(values)
+    if array.ndim != 1:
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+    return array
+
+
+class StepTable:
+    """
+    Piecewise-constant lookup: points (or any value) by interval.
+
+    With edges [e0, e1, ...] and values [v0, v1, ..., vn]:
+    - right=False: x < e0 -> v0, e0 <= x < e1 -> v1, ... ("< edge" cut-offs)
+    - right=True: x <= e0 -> v0, e0 < x <= e1 -> v1, ... ("<= edge" cut-offs)
+    """
+
+    def __init__(self, edges: Sequence[float], values: Sequence[Any], right: bool = False):
+        if len(values) != len(edges) + 1:
+            raise ValueError("A step table needs exactly one more value than edges")
+        if list(edges) != sorted(edges):
+            raise ValueError("Step table edges must be ascending")
+        self.edges: Tuple[float, ...] = tuple(edges)
+        self.values: Tuple[Any, ...] = tuple(values)
+        self.right = right
+        self._bisect = bisect_left if right else bisect_right
+        self._side = "left" if right else "right"
+        self._edge_array = np.asarray(self.edges, dtype=np.float64)
+        self._value_array = _value_array(self.values)
+
+    def __call__(self, x: float) -> Any:
+        """Value for one input."""
+        return self.values[self._bisect(self.edges, x)]
+
+    def index(self, x: Any) -> np.ndarray:
+        """Interval index per element of an array."""
+        return np.searchsorted(self._edge_array, np.asarray(x, dtype=np.float64), side=self._side)
+
+    def take(self, x: Any) -> np.ndarray:
+        """Value per element of an array."""
+        return self._value_array.take(self.index(x))
+
+
+class InterpolationTable:
+    """
+    Linear interpolation between tabulated points (e.g. life tables).
+
+    Inputs outside the table are clamped to its first/last value.
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]):
+        if len(xs) != len(ys) or len(xs) < 2:
+            raise ValueError("An interpolation table needs at least two (x, y) points")
+        order = sorted(range(len(xs)), key=lambda i: xs[i])
+        self.xs: Tuple[float, ...] = tuple(xs[i] for i in order)
+        self.ys: Tuple[float, ...] = tuple(ys[i] for i in order)
+        self._x_array = np.asarray(self.xs, dtype=np.float64)
+        self._y_array = np.asarray(self.ys, dtype=np.float64)
+
+    @classmethod
+    def from_mapping(cls, table: Mapping[float, float]) -> "InterpolationTable":
+        """Build from an {x: y} mapping (any key order)."""
+        return cls(list(table.keys()), list(table.values()))
+
+    def __call__(self, x: float) -> float:
+        """Interpolated value for one input."""
+        xs, ys = self.xs, self.ys
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[-1]:
+            return ys[-1]
+        upper = bisect_left(xs, x)
+        if xs[upper] == x:
+            return ys[upper]
+        lower = upper - 1
+        proportion = (x - xs[lower]) / (xs[upper] - xs[lower])
+        return ys[lower] + (ys[upper] - ys[lower]) * proportion
+
+    def take(self, x: Any) -> np.ndarray:
+        """
+        Interpolated value per element of an array.
+
+        Same formula as __call__ rather than np.interp, whose different
+        operation order can change the last bit (and a rounded result).
+        """
+        x = np.clip(np.asarray(x, dtype=np.float64), self._x_array[0], self._x_array[-1])
+        upper = np.clip(np.searchsorted(self._x_array, x, side="left"), 1, len(self.xs) - 1)
+        lower = upper - 1
+        x_low, x_high = self._x_array[lower], self._x_array[upper]
+        y_low, y_high = self._y_array[lower], self._y_array[upper]
+        proportion = (x - x_low) / (x_high - x_low)
+        values = y_low + (y_high - y_low) * proportion
+        # Tabulated points (and clamped ends) return the table value itself
+        values = np.where(x == x_high, y_high, values)
+        return np.where(x == x_low, y_low, values)
+
+
+class CategoryTable:
+    """Value by category (e.g. points per comorbidity), with a default for unknown keys."""
+
+    def __init__(self, mapping: Mapping[Any, Any], default: Any = 0):
+        self.mapping: Dict[Any, Any] = dict(mapping)
+        self.default = default
+        values = list(self.mapping.values()) + [default]
+        self._dtype = np.int64 if all(isinstance(v, int) and not isinstance(v, bool) for v in values) else object
+
+    def __call__(self, key: Any) -> Any:
+        """Value for one key."""
+        return self.mapping.get(key, self.default)
+
+    def total(self, keys: Iterable[Any]) -> Any:
+        """Sum of the values of several keys (e.g. a patient's comorbidities)."""
+        mapping, default = self.mapping, self.default
+        return sum(mapping.get(key, default) for key in keys)
+
+    def take(self, keys: Any) -> np.ndarray:
+        """Value per element of an array."""
+        mapping, default = self.mapping, self.default
+        return np.fromiter((mapping.get(key, default) for key in keys), dtype=self._dtype, count=len(keys))
+
+    def take_totals(self, key_lists: Any) -> np.ndarray:
+        """total() per element of an array of key lists."""
+        return np.fromiter((self.total(keys) for keys in key_lists), dtype=self._dtype, count=len(key_lists))
+
+
+class CoefficientTable:
+    """
+    Linear predictors of a nomogram / regression model.
+
+    One row of coefficients per outcome over shared features:
+
+        LOGITS = CoefficientTable(
+            ["age", "log_psa"],
+            {"any": (-3.35, [0.0187, 0.7173]), "high": (-5.54, [0.0354, 0.8677])},
+        )
+        logit_any, logit_high = LOGITS.predict(age, log_psa)
+
+    Attributes:
+        features: Feature names, in coefficient order
+        outcomes: Outcome names, in row order
+        weights: Array of shape (outcomes, 1 + features); column 0 is the intercept
+    """
+
+    def __init__(self, features: Sequence[str], models: Mapping[str, Tuple[float, Sequence[float]]]):
+        self.features: Tuple[str, ...] = tuple(features)
+        self.outcomes: Tuple[str, ...] = tuple(models)
+        self._rows: Tuple[Tuple[float, Tuple[float, ...]], ...] = tuple(
+            (float(intercept), tuple(float(c) for c in coefficients))
+            for intercept, coefficients in models.values()
+        )
+        for outcome, (_, coefficients) in zip(self.outcomes, self._rows):
+            if len(coefficients) != len(self.features):
+                raise ValueError(f"{outcome}: expected {len(self.features)} coefficients, got {len(coefficients)}")
+        self.weights = np.array([(intercept,) + coefficients for intercept, coefficients in self._rows])
+
+    def predict(self, *values: Any) -> Tuple[Any, ...]:
+        """
+        Linear predictor per outcome, for scalars or NumPy arrays.
+
+        Accumulates intercept + c1*x1 + c2*x2 + ... left to right, so arrays
+        give exactly the scalar result element by element.
+        """
+        if len(values) != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} feature values, got {len(values)}")
+        predictions = []
+        for intercept, coefficients in self._rows:
+            total = intercept
+            for coefficient, value in zip(coefficients, values):
+                total = total + coefficient * value
+            predictions.append(total)
+        return tuple(predictions)
+
+    def coefficient(self, outcome: str, feature: str) -> float:
+        """Coefficient of one feature in one outcome's model."""
+        return self._rows[self.outcomes.index(outcome)][1][self.features.index(feature)]
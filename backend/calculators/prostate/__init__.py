@@ -1,9 +1,15 @@
 """Prostate Cancer Calculators (7 total)."""
 
-from calculators.prostate.psa_kinetics import PSAKineticsCalculator
-from calculators.prostate.pcpt_risk import PCPTCalculator
-from calculators.prostate.capra import CAPRACalculator
-from calculators.prostate.nccn_risk import NCCNRiskCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "PSAKineticsCalculator": "calculators.prostate.psa_kinetics",
+    "PCPTCalculator": "calculators.prostate.pcpt_risk",
+    "CAPRACalculator": "calculators.prostate.capra",
+    "NCCNRiskCalculator": "calculators.prostate.nccn_risk",
+}
 
 __all__ = [
     "PSAKineticsCalculator",
@@ -11,3 +17,9 @@ __all__ = [
     "CAPRACalculator",
     "NCCNRiskCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,9 @@ CAPRA Score Calculator (Cancer of the Prostate Risk Assessment).
 Predicts biochemical recurrence-free survival following radical prostatectomy.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
+
+import numpy as np
 
 from calculators.base import (
     ClinicalCalculator,
@@ -13,6 +15,8 @@ from calculators.base import (
     InputMetadata,
     InputType,
 )
+from calculators.batch import categorize, row_count, value_column
+from calculators.validation import float_column
 
 
 class CAPRACalculator(ClinicalCalculator):
@@ -111,61 +115,9 @@ class CAPRACalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate CAPRA inputs."""
-
-        # Check required fields
-        valid, msg = self._validate_required(inputs, self.required_inputs)
-        if not valid:
-            return False, msg
-
-        # Validate PSA
-        valid, msg = self._validate_range(
-            inputs["psa"],
-            min_val=0,
-            max_val=500,
-            param_name="psa"
-        )
-        if not valid:
-            return False, msg
-
-        # Validate Gleason scores
-        for score_type in ["gleason_primary", "gleason_secondary"]:
-            valid, msg = self._validate_enum(
-                inputs[score_type],
-                [1, 2, 3, 4, 5],
-                param_name=score_type
-            )
-            if not valid:
-                return False, msg
-
-        # Validate T stage
-        valid, msg = self._validate_enum(
-            inputs["t_stage"],
-            ["T1a", "T1b", "T1c", "T2a", "T2b", "T2c", "T3a", "T3b"],
-            param_name="t_stage"
-        )
-        if not valid:
-            return False, msg
-
-        # Validate percent positive cores
-        valid, msg = self._validate_range(
-            inputs["percent_positive_cores"],
-            min_val=0,
-            max_val=100,
-            param_name="percent_positive_cores"
-        )
-        if not valid:
-            return False, msg
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate CAPRA score."""
 
-        total_score = 0
-        breakdown = {}
-
         # 1. PSA at diagnosis (ng/mL)
         # Per Cooperberg et al. 2005: <6=0, 6-10=1, 10.1-20=2, >20=3
         psa = inputs["psa"]
@@ -178,9 +130,6 @@ class CAPRACalculator(ClinicalCalculator):
         else:  # >20
             psa_points = 3
 
-        total_score += psa_points
-        breakdown["PSA"] = {"value": psa, "points": psa_points}
-
         # 2. Gleason pattern
         # Per Cooperberg et al. 2005: 3+3=0, 3+4=1, 4+3=2, 4+4/4+5/5+4/5+5=3
         primary = inputs["gleason_primary"]
@@ -197,13 +146,6 @@ class CAPRACalculator(ClinicalCalculator):
         else:
             gleason_points = 0  # Default for unusual patterns
 
-        total_score += gleason_points
-        breakdown["Gleason"] = {
-            "primary": primary,
-            "secondary": secondary,
-            "points": gleason_points
-        }
-
         # 3. Clinical T stage
         t_stage = inputs["t_stage"]
         if t_stage in ["T1a", "T1b", "T1c", "T2a"]:
@@ -213,9 +155,6 @@ class CAPRACalculator(ClinicalCalculator):
         else:  # T3a, T3b
             t_points = 2
 
-        total_score += t_points
-        breakdown["T_stage"] = {"value": t_stage, "points": t_points}
-
         # 4. Percent positive biopsy cores
         percent_positive = inputs["percent_positive_cores"]
         if percent_positive < 34:
@@ -223,8 +162,74 @@ class CAPRACalculator(ClinicalCalculator):
         else:
             cores_points = 1
 
-        total_score += cores_points
-        breakdown["Positive_cores"] = {"value": f"{percent_positive}%", "points": cores_points}
+        return self._build_result(inputs, psa_points, gleason_points, t_points, cores_points)
+
+    @property
+    def primary_score(self) -> str:
+        return "total_score"
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized CAPRA points over a cohort."""
+        n_rows = row_count(columns)
+        psa = float_column(columns, "psa", n_rows)
+        primary = float_column(columns, "gleason_primary", n_rows)
+        secondary = float_column(columns, "gleason_secondary", n_rows)
+        t_stage = value_column(columns, "t_stage", n_rows)
+        percent_positive = float_column(columns, "percent_positive_cores", n_rows)
+
+        psa_points = np.select([psa < 6, psa <= 10, psa <= 20], [0, 1, 2], 3)
+        gleason_points = np.select(
+            [
+                (primary == 3) & (secondary == 3),
+                (primary == 3) & (secondary >= 4),
+                (primary >= 4) & (secondary == 3),
+                (primary >= 4) & (secondary >= 4),
+            ],
+            [0, 1, 2, 3],
+            0
+        )
+        t_points = np.select(
+            [np.isin(t_stage, ["T1a", "T1b", "T1c", "T2a"]), np.isin(t_stage, ["T2b", "T2c"])], [0, 1], 2
+        )
+        cores_points = np.where(percent_positive < 34, 0, 1)
+        total_score = psa_points + gleason_points + t_points + cores_points
+
+        return {
+            "psa_points": psa_points,
+            "gleason_points": gleason_points,
+            "t_points": t_points,
+            "cores_points": cores_points,
+            "total_score": total_score,
+            "category": categorize(total_score, [2, 5], ["Low Risk", "Intermediate Risk", "High Risk"], right=True),
+        }
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        return self._build_result(
+            inputs, scores["psa_points"], scores["gleason_points"], scores["t_points"], scores["cores_points"]
+        )
+
+    def _build_result(
+        self,
+        inputs: Dict[str, Any],
+        psa_points: int,
+        gleason_points: int,
+        t_points: int,
+        cores_points: int
+    ) -> CalculatorResult:
+        """Total the points and build prognosis, interpretation and recommendations."""
+
+        total_score = psa_points + gleason_points + t_points + cores_points
+        breakdown = {
+            "PSA": {"value": inputs["psa"], "points": psa_points},
+            "Gleason": {
+                "primary": inputs["gleason_primary"],
+                "secondary": inputs["gleason_secondary"],
+                "points": gleason_points
+            },
+            "T_stage": {"value": inputs["t_stage"], "points": t_points},
+            "Positive_cores": {"value": f"{inputs['percent_positive_cores']}%", "points": cores_points},
+        }
 
         # Determine risk category and prognosis
         if total_score <= 2:
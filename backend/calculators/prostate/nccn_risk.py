@@ -6,6 +6,8 @@ Classifies patients into risk categories based on PSA, Gleason Grade Group, and
 
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -13,6 +15,8 @@ from calculators.base import (
     InputMetadata,
     InputType,
 )
+from calculators.batch import row_count, value_column
+from calculators.validation import float_column
 
 
 class NCCNRiskCalculator(ClinicalCalculator):
@@ -199,6 +203,77 @@ class NCCNRiskCalculator(ClinicalCalculator):
             psa, grade_group, t_stage, percent_positive_cores, psad, primary_gleason
         )
 
+        return self._build_result(inputs, percent_positive_cores, risk_category)
+
+    @property
+    def primary_score(self) -> str:
+        return "risk_category"
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized NCCN risk group over a cohort (mirrors _determine_risk_category)."""
+        n_rows = row_count(columns)
+        psa = float_column(columns, "psa", n_rows)
+        grade_group = float_column(columns, "grade_group", n_rows)
+        t_stage = value_column(columns, "t_stage", n_rows)
+        num_positive_cores = float_column(columns, "num_positive_cores", n_rows)
+        total_cores = float_column(columns, "total_cores", n_rows)
+        psad = float_column(columns, "psad", n_rows)
+        primary_gleason = float_column(columns, "primary_gleason_pattern", n_rows)
+
+        has_cores = ~np.isnan(num_positive_cores) & (total_cores > 0)
+        percent_positive = np.where(has_cores, (num_positive_cores / total_cores) * 100, np.nan)
+        no_cores = np.isnan(percent_positive)
+
+        very_low = (
+            (t_stage == "T1c") & (grade_group == 1) & (psa < 10)
+            & (no_cores | (percent_positive <= 30))
+            & (np.isnan(psad) | (psad < 0.15))
+        )
+        low = np.isin(t_stage, ["T1a", "T1b", "T1c", "T2a"]) & (grade_group == 1) & (psa < 10)
+        very_high = (
+            np.isin(t_stage, ["T3b", "T4"])
+            | (primary_gleason == 5)
+            | ((grade_group >= 4) & ~no_cores & (percent_positive > 50))
+        )
+        high = (t_stage == "T3a") | np.isin(grade_group, [4, 5]) | (psa > 20)
+        intermediate = np.isin(t_stage, ["T2b", "T2c"]) | np.isin(grade_group, [2, 3]) | ((psa >= 10) & (psa <= 20))
+        unfavorable = (grade_group >= 3) | (~no_cores & (percent_positive >= 50))
+
+        risk_category = np.select(
+            [very_low, low, very_high, high, intermediate & unfavorable, intermediate],
+            [
+                "Very Low Risk",
+                "Low Risk",
+                "Very High Risk",
+                "High Risk",
+                "Intermediate Unfavorable",
+                "Intermediate Favorable",
+            ],
+            "Low Risk"
+        )
+
+        return {"percent_positive_cores": percent_positive, "risk_category": risk_category}
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        percent_positive = scores["percent_positive_cores"]
+        return self._build_result(
+            inputs, None if np.isnan(percent_positive) else percent_positive, scores["risk_category"]
+        )
+
+    def _build_result(
+        self,
+        inputs: Dict[str, Any],
+        percent_positive_cores: Optional[float],
+        risk_category: str
+    ) -> CalculatorResult:
+        """Build recommendations, surveillance and interpretation for a risk category."""
+
+        psa = inputs["psa"]
+        grade_group = inputs["grade_group"]
+        t_stage = inputs["t_stage"]
+        psad = inputs.get("psad")
+
         # Get treatment recommendations
         recommendations = self._get_recommendations(risk_category)
 
@@ -5,7 +5,9 @@ Predicts risk of prostate cancer on biopsy using logistic regression.
 """
 
 import math
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
+
+import numpy as np
 
 from calculators.base import (
     ClinicalCalculator,
@@ -14,6 +16,24 @@ from calculators.base import (
     InputMetadata,
     InputType,
 )
+from calculators.batch import bool_column, categorize, row_count
+from calculators.validation import float_column
+from calculators.lookup import CoefficientTable
+
+RISK_LABELS = ["Low Risk", "Moderate Risk", "High Risk"]
+
+# PCPT 2.0 logistic regression (Ankerst DP, et al. Eur Urol 2012). The model
+# uses a log(PSA) transformation for better calibration:
+# logit(P) = intercept + sum(coefficient x variable)
+LOGITS = CoefficientTable(
+    ["age", "african_american", "family_history", "prior_negative_biopsy", "log_psa", "dre_abnormal"],
+    {
+        # Any prostate cancer
+        "any": (-3.35, [0.0187, 0.4467, 0.2893, -0.1465, 0.7173, 0.3746]),
+        # High-grade cancer (Gleason >= 7)
+        "high": (-5.54, [0.0354, 0.5038, 0.2885, -0.1886, 0.8677, 0.6691]),
+    },
+)
 
 
 class PCPTCalculator(ClinicalCalculator):
@@ -113,41 +133,6 @@ class PCPTCalculator(ClinicalCalculator):
             )
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate PCPT inputs."""
-
-        # Check required fields
-        valid, msg = self._validate_required(inputs, self.required_inputs)
-        if not valid:
-            return False, msg
-
-        # Validate age
-        valid, msg = self._validate_range(
-            inputs["age"],
-            min_val=40,
-            max_val=100,
-            param_name="age"
-        )
-        if not valid:
-            return False, msg
-
-        # Validate PSA
-        valid, msg = self._validate_range(
-            inputs["psa"],
-            min_val=0,
-            max_val=50,
-            param_name="psa"
-        )
-        if not valid:
-            return False, msg
-
-        # Validate boolean fields
-        for field in ["dre_abnormal", "african_american", "family_history", "prior_negative_biopsy"]:
-            if not isinstance(inputs[field], bool):
-                return False, f"{field} must be boolean (True/False)"
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate PCPT risk scores."""
 
@@ -161,40 +146,62 @@ class PCPTCalculator(ClinicalCalculator):
         # Calculate log(PSA) for regression (PCPT 2.0 uses log transformation)
         log_psa = math.log(psa) if psa > 0 else 0
 
-        # Logistic regression coefficients for ANY prostate cancer
-        # Reference: Ankerst DP, et al. Eur Urol 2012 (PCPT 2.0)
-        # Model uses log(PSA) transformation for better calibration
-        # logit(P) = intercept + Σ(coefficient × variable)
-        logit_any = (
-            -3.35 +  # Calibrated intercept for log(PSA) model
-            0.0187 * age +
-            0.4467 * african_american +
-            0.2893 * family_history -
-            0.1465 * prior_negative_biopsy +
-            0.7173 * log_psa +  # Coefficient for log(PSA), not linear PSA
-            0.3746 * dre_abnormal
+        logit_any, logit_high = LOGITS.predict(
+            age, african_american, family_history, prior_negative_biopsy, log_psa, dre_abnormal
         )
 
-        # Convert logit to probability
-        prob_any = math.exp(logit_any) / (1 + math.exp(logit_any))
-        prob_any_percent = prob_any * 100
-
-        # Logistic regression coefficients for HIGH-GRADE cancer (Gleason >= 7)
-        # Reference: Ankerst DP, et al. Eur Urol 2012 (PCPT 2.0)
-        # Model uses log(PSA) transformation
-        logit_high = (
-            -5.54 +  # Calibrated intercept for log(PSA) model
-            0.0354 * age +
-            0.5038 * african_american +
-            0.2885 * family_history -
-            0.1886 * prior_negative_biopsy +
-            0.8677 * log_psa +  # Coefficient for log(PSA), not linear PSA
-            0.6691 * dre_abnormal
-        )
+        # Convert logits to probabilities
+        prob_any_percent = math.exp(logit_any) / (1 + math.exp(logit_any)) * 100
+        prob_high_percent = math.exp(logit_high) / (1 + math.exp(logit_high)) * 100
+
+        return self._build_result(inputs, prob_any_percent, prob_high_percent)
+
+    @property
+    def primary_score(self) -> str:
+        return "risk_any_percent"
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized PCPT risk over a cohort."""
+        n_rows = row_count(columns)
+        age = float_column(columns, "age", n_rows)
+        psa = float_column(columns, "psa", n_rows)
+        flags = [
+            bool_column(columns, name, n_rows).astype(np.float64)
+            for name in ("african_american", "family_history", "prior_negative_biopsy")
+        ]
+        dre_abnormal = bool_column(columns, "dre_abnormal", n_rows).astype(np.float64)
+
+        log_psa = np.where(psa > 0, np.log(psa), 0.0)
+        logit_any, logit_high = LOGITS.predict(age, *flags, log_psa, dre_abnormal)
+
+        prob_any_percent = np.exp(logit_any) / (1 + np.exp(logit_any)) * 100
+        prob_high_percent = np.exp(logit_high) / (1 + np.exp(logit_high)) * 100
+
+        return {
+            "risk_any_percent": prob_any_percent,
+            "risk_high_percent": prob_high_percent,
+            "any_cancer_category": categorize(prob_any_percent, [10, 25], RISK_LABELS),
+            "high_grade_category": categorize(prob_high_percent, [5, 15], RISK_LABELS),
+        }
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        return self._build_result(inputs, scores["risk_any_percent"], scores["risk_high_percent"])
+
+    def _build_result(
+        self,
+        inputs: Dict[str, Any],
+        prob_any_percent: float,
+        prob_high_percent: float
+    ) -> CalculatorResult:
+        """Categorize risks and build interpretation and recommendations."""
 
-        # Convert logit to probability
-        prob_high = math.exp(logit_high) / (1 + math.exp(logit_high))
-        prob_high_percent = prob_high * 100
+        age = inputs["age"]
+        psa = inputs["psa"]
+        dre_abnormal = 1 if inputs["dre_abnormal"] else 0
+        african_american = 1 if inputs["african_american"] else 0
+        family_history = 1 if inputs["family_history"] else 0
+        prior_negative_biopsy = 1 if inputs["prior_negative_biopsy"] else 0
 
         # Determine risk categories
         if prob_any_percent < 10:
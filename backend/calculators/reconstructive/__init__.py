@@ -1,9 +1,15 @@
 """Reconstructive Urology Calculators."""
 
-from calculators.reconstructive.clavien_dindo import ClavienDindoCalculator
-from calculators.reconstructive.stricture_complexity import StrictureComplexityCalculator
-from calculators.reconstructive.pfui_classification import PFUICalculator
-from calculators.reconstructive.peyronie_severity import PeyronieCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "ClavienDindoCalculator": "calculators.reconstructive.clavien_dindo",
+    "StrictureComplexityCalculator": "calculators.reconstructive.stricture_complexity",
+    "PFUICalculator": "calculators.reconstructive.pfui_classification",
+    "PeyronieCalculator": "calculators.reconstructive.peyronie_severity",
+}
 
 __all__ = [
     "ClavienDindoCalculator",
@@ -11,3 +17,9 @@ __all__ = [
     "PFUICalculator",
     "PeyronieCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,182 @@
 """
 Calculator Registry for auto-discovery and management of all calculators.
+
+The registry starts from calculators/manifest.json (calculator ID -> module,
+class, name, category) and imports a calculator's module only when that
+calculator is first used, so processes that never run calculators do not pay
+for importing ~50 modules. Regenerate the manifest after adding, renaming or
+moving a calculator:
+
+    python scripts/generate_calculator_manifest.py
+
+A missing or stale manifest (the set of calculator modules on disk differs)
+falls back to scanning every module, as before.
 """
 
+import json
 import logging
 import importlib
 import inspect
-from typing import Dict, List, Optional, Type
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from pathlib import Path
 
 from calculators.base import ClinicalCalculator, CalculatorCategory
 
 logger = logging.getLogger(__name__)
 
+CALCULATORS_DIR = Path(__file__).parent
+MANIFEST_PATH = CALCULATORS_DIR / "manifest.json"
+
+# Category packages to scan
+CATEGORY_PACKAGES = (
+    "prostate",
+    "kidney",
+    "bladder",
+    "voiding",
+    "female",
+    "reconstructive",
+    "fertility",
+    "hypogonadism",
+    "stones",
+    "surgical",
+)
+
+
+def calculator_modules() -> List[str]:
+    """List calculator module names on disk (no imports)."""
+    modules = []
+    for category in CATEGORY_PACKAGES:
+        category_dir = CALCULATORS_DIR / category
+        if not category_dir.exists():
+            continue
+        for py_file in sorted(category_dir.glob("*.py")):
+            if not py_file.name.startswith("_"):
+                modules.append(f"calculators.{category}.{py_file.stem}")
+    return modules
+
+
+def scan_calculators() -> Dict[str, Any]:
+    """
+    Import every calculator module and describe the calculators found.
+
+    Returns:
+        Manifest dict: {"modules": [...], "calculators": [{"id", "module",
+        "class", "name", "category"}, ...]}
+    """
+    modules = calculator_modules()
+    entries: Dict[str, Dict[str, str]] = {}
+
+    for module_name in modules:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            logger.error(f"Failed to import {module_name}: {str(e)}")
+            continue
+
+        # Find calculator classes
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, ClinicalCalculator)
+                and obj is not ClinicalCalculator
+                and not inspect.isabstract(obj)
+            ):
+                try:
+                    calc_instance = obj()
+                except Exception as e:
+                    logger.error(f"Failed to instantiate {module_name}.{name}: {str(e)}")
+                    continue
+                entries[calc_instance.calculator_id] = {
+                    "id": calc_instance.calculator_id,
+                    "module": obj.__module__,
+                    "class": obj.__name__,
+                    "name": calc_instance.name,
+                    "category": calc_instance.category.value,
+                }
+
+    return {"modules": modules, "calculators": list(entries.values())}
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[List[Dict[str, str]]]:
+    """
+    Load calculator entries from the manifest.
+
+    Returns:
+        Manifest entries, or None if the manifest is missing, unreadable, or
+        does not list the calculator modules currently on disk
+    """
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Calculator manifest unavailable ({path}): {str(e)}")
+        return None
+
+    if manifest.get("modules") != calculator_modules():
+        logger.warning("Calculator manifest is stale; regenerate it with scripts/generate_calculator_manifest.py")
+        return None
+
+    return manifest.get("calculators")
+
+
+@dataclass(frozen=True)
+class CalculatorCatalog:
+    """
+    Immutable calculator metadata, computed once on first use.
+
+    Attributes:
+        info: Calculator ID -> info (id, name, category, description,
+              required/optional inputs, references)
+        schemas: Calculator ID -> input schema as dicts (InputMetadata.to_dict())
+        by_category: Category value -> calculator IDs, for every category
+    """
+    info: Mapping[str, Mapping[str, Any]]
+    schemas: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    by_category: Mapping[str, Tuple[str, ...]]
+
+    @classmethod
+    def build(cls, calculators: Dict[str, ClinicalCalculator]) -> "CalculatorCatalog":
+        """Build the catalog from calculator instances."""
+        info = {}
+        schemas = {}
+        by_category: Dict[str, List[str]] = {category.value: [] for category in CalculatorCategory}
+
+        for calc_id, calc in calculators.items():
+            info[calc_id] = MappingProxyType({
+                "id": calc.calculator_id,
+                "name": calc.name,
+                "category": calc.category.value,
+                "description": calc.description,
+                "required_inputs": tuple(calc.required_inputs),
+                "optional_inputs": tuple(calc.optional_inputs),
+                "references": tuple(calc.references),
+            })
+            schemas[calc_id] = tuple(
+                MappingProxyType(metadata.to_dict()) for metadata in calc.get_input_schema()
+            )
+            by_category[calc.category.value].append(calc_id)
+
+        return cls(
+            info=MappingProxyType(info),
+            schemas=MappingProxyType(schemas),
+            by_category=MappingProxyType({k: tuple(v) for k, v in by_category.items()}),
+        )
+
 
 class CalculatorRegistry:
     """
     Registry for all clinical calculators with auto-discovery.
     Provides lookup by ID, category, and name.
+
+    Discovery reads the manifest only; a calculator's module is imported and
+    the calculator instantiated on first use. Calculators are stateless, so
+    that one instance is shared by every caller.
     """
 
     _instance = None
-    _calculators: Dict[str, Type[ClinicalCalculator]] = {}
+    _manifest: Dict[str, Dict[str, str]] = {}
+    _instances: Dict[str, ClinicalCalculator] = {}
+    _catalog: Optional[CalculatorCatalog] = None
     _initialized = False
 
     def __new__(cls):
@@ -36,58 +192,46 @@ class CalculatorRegistry:
             self._initialized = True
 
     def _discover_calculators(self):
-        """Auto-discover all calculator classes."""
-        logger.info("Discovering calculators...")
-
-        # Get calculators directory
-        calculators_dir = Path(__file__).parent
-
-        # Categories to scan
-        categories = [
-            "prostate",
-            "kidney",
-            "bladder",
-            "voiding",
-            "female",
-            "reconstructive",
-            "fertility",
-            "hypogonadism",
-            "stones",
-            "surgical",
-        ]
-
-        for category in categories:
-            category_dir = calculators_dir / category
-            if not category_dir.exists():
-                continue
-
-            # Scan Python files in category
-            for py_file in category_dir.glob("*.py"):
-                if py_file.name.startswith("_"):
-                    continue
+        """Register calculators from the manifest, scanning modules if it is unusable."""
+        entries = load_manifest()
+        if entries is None:
+            logger.info("Discovering calculators by scanning modules...")
+            entries = scan_calculators()["calculators"]
 
-                # Import module
-                module_name = f"calculators.{category}.{py_file.stem}"
-                try:
-                    module = importlib.import_module(module_name)
-
-                    # Find calculator classes
-                    for name, obj in inspect.getmembers(module, inspect.isclass):
-                        if (
-                            issubclass(obj, ClinicalCalculator)
-                            and obj is not ClinicalCalculator
-                            and not inspect.isabstract(obj)
-                        ):
-                            # Register calculator
-                            calc_instance = obj()
-                            calc_id = calc_instance.calculator_id
-                            self._calculators[calc_id] = obj
-                            logger.info(f"Registered calculator: {calc_id} ({calc_instance.name})")
+        for entry in entries:
+            self._manifest[entry["id"]] = entry
 
-                except Exception as e:
-                    logger.error(f"Failed to import {module_name}: {str(e)}")
+        logger.info(f"Total calculators registered: {len(self._manifest)}")
 
-        logger.info(f"Total calculators registered: {len(self._calculators)}")
+    def _load(self, calculator_id: str) -> Optional[ClinicalCalculator]:
+        """Import and instantiate a calculator on first use."""
+        calc_instance = self._instances.get(calculator_id)
+        if calc_instance is not None:
+            return calc_instance
+
+        entry = self._manifest.get(calculator_id)
+        if entry is None:
+            return None
+
+        try:
+            module = importlib.import_module(entry["module"])
+            calc_instance = getattr(module, entry["class"])()
+        except Exception as e:
+            logger.error(f"Failed to load calculator {calculator_id} from {entry['module']}: {str(e)}")
+            return None
+
+        logger.debug(f"Loaded calculator: {calculator_id} ({calc_instance.name})")
+        # Concurrent first uses keep whichever instance was stored first
+        return self._instances.setdefault(calculator_id, calc_instance)
+
+    @property
+    def catalog(self) -> CalculatorCatalog:
+        """Precomputed, immutable calculator metadata (loads every calculator once)."""
+        if self._catalog is None:
+            CalculatorRegistry._catalog = CalculatorCatalog.build(
+                {calc.calculator_id: calc for calc in self.get_all()}
+            )
+        return self._catalog
 
     def get(self, calculator_id: str) -> Optional[ClinicalCalculator]:
         """
@@ -97,12 +241,9 @@ class CalculatorRegistry:
             calculator_id: Calculator identifier
 
         Returns:
-            Calculator instance or None if not found
+            Shared calculator instance or None if not found
         """
-        calc_class = self._calculators.get(calculator_id)
-        if calc_class:
-            return calc_class()
-        return None
+        return self._load(calculator_id)
 
     def get_by_category(self, category: CalculatorCategory) -> List[ClinicalCalculator]:
         """
@@ -114,12 +255,12 @@ class CalculatorRegistry:
         Returns:
             List of calculator instances
         """
-        calculators = []
-        for calc_class in self._calculators.values():
-            calc = calc_class()
-            if calc.category == category:
-                calculators.append(calc)
-        return calculators
+        calculators = (
+            self._load(calc_id)
+            for calc_id, entry in self._manifest.items()
+            if entry["category"] == category.value
+        )
+        return [calc for calc in calculators if calc is not None]
 
     def get_all(self) -> List[ClinicalCalculator]:
         """
@@ -128,7 +269,8 @@ class CalculatorRegistry:
         Returns:
             List of all calculator instances
         """
-        return [calc_class() for calc_class in self._calculators.values()]
+        calculators = (self._load(calc_id) for calc_id in self._manifest)
+        return [calc for calc in calculators if calc is not None]
 
     def get_all_ids(self) -> List[str]:
         """
@@ -137,7 +279,7 @@ class CalculatorRegistry:
         Returns:
             List of calculator IDs
         """
-        return list(self._calculators.keys())
+        return list(self._manifest.keys())
 
     def get_calculator_info(self, calculator_id: str) -> Optional[Dict]:
         """
@@ -149,19 +291,26 @@ class CalculatorRegistry:
         Returns:
             Dict with calculator info or None if not found
         """
-        calc = self.get(calculator_id)
-        if not calc:
+        info = self.catalog.info.get(calculator_id)
+        if info is None:
             return None
 
-        return {
-            "id": calc.calculator_id,
-            "name": calc.name,
-            "category": calc.category.value,
-            "description": calc.description,
-            "required_inputs": calc.required_inputs,
-            "optional_inputs": calc.optional_inputs,
-            "references": calc.references,
-        }
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in info.items()}
+
+    def get_input_schema(self, calculator_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a calculator's input schema as dicts (InputMetadata.to_dict()).
+
+        Args:
+            calculator_id: Calculator identifier
+
+        Returns:
+            List of field dicts or None if not found
+        """
+        schema = self.catalog.schemas.get(calculator_id)
+        if schema is None:
+            return None
+        return [dict(field) for field in schema]
 
     def list_by_category(self) -> Dict[str, List[Dict]]:
         """
@@ -170,20 +319,18 @@ class CalculatorRegistry:
         Returns:
             Dict mapping category names to lists of calculator info
         """
-        by_category = {}
-
-        for category in CalculatorCategory:
-            calculators = self.get_by_category(category)
-            by_category[category.value] = [
+        catalog = self.catalog
+        return {
+            category: [
                 {
-                    "id": calc.calculator_id,
-                    "name": calc.name,
-                    "description": calc.description,
+                    "id": calc_id,
+                    "name": catalog.info[calc_id]["name"],
+                    "description": catalog.info[calc_id]["description"],
                 }
-                for calc in calculators
+                for calc_id in calc_ids
             ]
-
-        return by_category
+            for category, calc_ids in catalog.by_category.items()
+        }
 
 
 # Global registry instance
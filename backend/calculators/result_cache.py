@@ -0,0 +1,311 @@
+"""
+Calculator result cache.
+
+Stage 2, note regeneration and the calculator API routinely run the same
+calculator on the same inputs. ClinicalCalculator.run() consults the cache
+installed with set_result_cache() before validating and calculating.
+
+Entries are keyed by (calculator ID, calculator version, canonicalized
+inputs):
+- In memory the inputs are a sorted tuple of (name, type, value), so key
+  order does not matter while 1, 1.0 and True stay distinct. In Redis they
+  are the SHA-256 of the inputs as sorted-key JSON.
+- The calculator version fingerprints the calculator's module plus the
+  shared calculator modules (base, validation, ...), so editing a
+  calculator invalidates its entries automatically.
+
+Level 1 is an in-process LRU of pickled results; unpickling hands every
+caller its own copy. Level 2 is an optional Redis client shared by every
+worker; only results that survive a JSON round trip unchanged are written
+to it. Calculators are cheap (single-digit to ~20 µs), so a Redis round trip
+only pays off across processes. raw_inputs are never stored - a hit
+carries the caller's inputs - so entries hold no identifiers.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from calculators.base import CalculatorResult, ClinicalCalculator
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached entry format changes
+RESULT_CACHE_SCHEMA_VERSION = 1
+
+REDIS_KEY_PREFIX = "vaucda:calc"
+
+
+def _compute_shared_version() -> str:
+    """Fingerprint the modules every calculator depends on."""
+    digest = hashlib.sha256(str(RESULT_CACHE_SCHEMA_VERSION).encode())
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+SHARED_VERSION = _compute_shared_version()
+
+_versions: Dict[type, str] = {}
+
+
+def calculator_version(calculator: ClinicalCalculator) -> str:
+    """Fingerprint of a calculator's source; computed once per class."""
+    cls = type(calculator)
+    version = _versions.get(cls)
+    if version is None:
+        digest = hashlib.sha256(SHARED_VERSION.encode())
+        try:
+            digest.update(Path(inspect.getfile(cls)).read_bytes())
+        except (OSError, TypeError):
+            digest.update(cls.__qualname__.encode())
+        version = _versions.setdefault(cls, digest.hexdigest()[:16])
+    return version
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars and dates; reject everything else."""
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot canonicalize {type(value).__name__}")
+
+
+def inputs_hash(inputs: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON form of calculator inputs."""
+    canonical = json.dumps(
+        inputs, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _memory_key(calculator: ClinicalCalculator, inputs: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    In-memory key: the canonical inputs as a hashable tuple.
+
+    Each value is tagged with its type so 1, 1.0 and True stay distinct.
+    Inputs with unhashable values fall back to the canonical JSON digest.
+    """
+    try:
+        canonical = tuple(sorted((name, value.__class__, value) for name, value in inputs.items()))
+        hash(canonical)
+    except TypeError:
+        try:
+            canonical = inputs_hash(inputs)
+        except (TypeError, ValueError):
+            return None
+    return (calculator.calculator_id, calculator_version(calculator), canonical)
+
+
+@dataclass
+class ResultCacheStats:
+    """Hit/miss counters for one calculator (or all of them)."""
+    hits: int = 0
+    misses: int = 0
+    compute_ms: float = 0.0  # Total calculation time of the misses
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert to dictionary for response metadata."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(CalculatorResult) if f.name not in ("raw_inputs", "timestamp"))
+
+
+def _to_payload(result: CalculatorResult) -> Dict[str, Any]:
+    """Result fields worth caching (no raw_inputs, no timestamp)."""
+    payload = {name: getattr(result, name) for name in _RESULT_FIELDS}
+    payload["metadata"] = {k: v for k, v in payload["metadata"].items() if k != "cache_hit"}
+    return payload
+
+
+class CalculatorResultCache:
+    """
+    Two-level LRU cache of calculator results.
+
+    Level 1 is an in-process OrderedDict. Level 2 is an optional Redis
+    client whose entries expire after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        redis_client: Any = None,
+        ttl_seconds: int = 3600,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            redis_client: Optional redis.Redis shared by all workers
+            ttl_seconds: Expiry of Redis entries
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.stats = ResultCacheStats()
+
+        self._memory: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._pending: Dict[str, ResultCacheStats] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, calculator: ClinicalCalculator, inputs: Dict[str, Any]) -> Optional[str]:
+        """Build the Redis key, or None when the inputs cannot be canonicalized."""
+        try:
+            digest = inputs_hash(inputs)
+        except (TypeError, ValueError):
+            return None
+        return f"{REDIS_KEY_PREFIX}:{calculator.calculator_id}:{calculator_version(calculator)}:{digest}"
+
+    def get(self, calculator: ClinicalCalculator, inputs: Dict[str, Any]) -> Optional[CalculatorResult]:
+        """
+        Look up the result of a calculator for the given inputs.
+
+        Returns:
+            A fresh CalculatorResult with metadata["cache_hit"] = True and
+            raw_inputs set to inputs, or None on a miss
+        """
+        key = _memory_key(calculator, inputs)
+        if key is None:
+            return None
+
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+
+        if blob is None:
+            payload = self._load_redis(calculator, inputs)
+            if payload is None:
+                return None
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._remember(key, blob)
+
+        self._count(calculator.calculator_id, hit=True)
+        # Unpickling gives every caller its own copy (~4x faster than deepcopy)
+        result = CalculatorResult(**pickle.loads(blob))
+        result.raw_inputs = inputs
+        result.metadata["cache_hit"] = True
+        return result
+
+    def put(
+        self,
+        calculator: ClinicalCalculator,
+        inputs: Dict[str, Any],
+        result: CalculatorResult,
+        compute_ms: float = 0.0,
+    ) -> None:
+        """Store a freshly calculated result and count the miss."""
+        self._count(calculator.calculator_id, hit=False, compute_ms=compute_ms)
+
+        key = _memory_key(calculator, inputs)
+        if key is None:
+            return
+
+        payload = _to_payload(result)
+        try:
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        with self._lock:
+            self._remember(key, blob)
+        self._store_redis(calculator, inputs, payload)
+
+    def drain_stats(self) -> Dict[str, ResultCacheStats]:
+        """Return per-calculator counters accumulated since the last drain, and reset them."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def clear(self) -> None:
+        """Remove every in-memory entry (Redis entries expire on their own)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _count(self, calculator_id: str, hit: bool, compute_ms: float = 0.0) -> None:
+        with self._lock:
+            pending = self._pending.get(calculator_id)
+            if pending is None:
+                pending = self._pending[calculator_id] = ResultCacheStats()
+            for stats in (self.stats, pending):
+                if hit:
+                    stats.hits += 1
+                else:
+                    stats.misses += 1
+                    stats.compute_ms += compute_ms
+
+    def _remember(self, key: Tuple, blob: bytes) -> None:
+        """Insert into the in-memory level, evicting the LRU entry if full."""
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_redis(self, calculator: ClinicalCalculator, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return None
+        key = self.make_key(calculator, inputs)
+        if key is None:
+            return None
+        try:
+            raw = self.redis.get(key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"Calculator result cache read failed: {e}")
+            return None
+
+    def _store_redis(self, calculator: ClinicalCalculator, inputs: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        if self.redis is None:
+            return
+        key = self.make_key(calculator, inputs)
+        if key is None:
+            return
+        try:
+            serialized = json.dumps(payload)
+            # Tuples, NumPy values etc. would come back as something else
+            if json.loads(serialized) != payload:
+                return
+            self.redis.setex(key, self.ttl_seconds, serialized)
+        except (TypeError, ValueError):
+            return
+        except Exception as e:
+            logger.warning(f"Calculator result cache write failed: {e}")
+
+
+# Process-wide cache used by ClinicalCalculator.run() (None = disabled)
+_result_cache: Optional[CalculatorResultCache] = None
+
+
+def get_result_cache() -> Optional[CalculatorResultCache]:
+    """Get the installed result cache, or None when caching is disabled."""
+    return _result_cache
+
+
+def set_result_cache(cache: Optional[CalculatorResultCache]) -> None:
+    """Install (or with None, remove) the process-wide result cache."""
+    global _result_cache
+    _result_cache = cache
@@ -0,0 +1,424 @@
+"""
+Uncertainty and sensitivity analysis for vectorized calculators.
+
+Answers "how much does this result change if PSA is 6.1 instead of 6.5, or
+if the DRE is uncertain?" in one score_batch() pass over thousands of
+perturbed copies of the patient's inputs:
+
+    analysis = PCPTCalculator().sensitivity(
+        inputs,
+        {"psa": {"low": 6.1, "high": 6.5}, "dre_abnormal": {"probability": 0.5}},
+    )
+    analysis.distribution    # mean, sd, percentiles, histogram of the score
+    analysis.tornado         # swing of the score per input, largest first
+    analysis.elasticities    # % change of the score per % change of an input
+
+Perturbation specs (per input field):
+- {"low": a, "high": b}: uniform between a and b
+- {"mean": m, "sd": s}: normal (mean defaults to the input's value)
+- {"values": [...], "weights": [...]}: discrete (weights optional)
+- {"probability": p}: boolean input true with probability p
+
+Numeric samples are clipped to the schema's min/max so every perturbed row
+stays valid. Only calculators implementing score_batch() are supported.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from calculators.base import ClinicalCalculator, InputMetadata, InputType, ValidationError
+from calculators.batch import as_array
+
+DEFAULT_SAMPLES = 2000
+PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 20
+# Normal inputs: tornado ends at the central 95% interval
+NORMAL_TORNADO_Z = 1.96
+# Elasticities: central difference with a step of this fraction of the value
+ELASTICITY_STEP = 0.01
+
+
+def _number(field_name: str, key: str, value: Any) -> float:
+    """A spec parameter as a float; ValueError (not TypeError) when it is not one."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field_name}: {key} must be a number, got {value!r}")
+
+
+class Perturbation(ABC):
+    """Distribution of one input field."""
+
+    numeric = True
+
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+
+    @abstractmethod
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """`n` draws of the field's value."""
+        pass
+
+    @abstractmethod
+    def ends(self) -> List[Any]:
+        """Values the tornado evaluates the score at."""
+        pass
+
+
+class UniformPerturbation(Perturbation):
+    def __init__(self, field_name: str, low: float, high: float):
+        super().__init__(field_name)
+        low, high = _number(field_name, "low", low), _number(field_name, "high", high)
+        if low > high:
+            raise ValueError(f"{field_name}: low must not exceed high")
+        self.low, self.high = low, high
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.uniform(self.low, self.high, n)
+
+    def ends(self) -> List[Any]:
+        return [self.low, self.high]
+
+
+class NormalPerturbation(Perturbation):
+    def __init__(self, field_name: str, mean: float, sd: float):
+        super().__init__(field_name)
+        mean, sd = _number(field_name, "mean", mean), _number(field_name, "sd", sd)
+        if sd < 0:
+            raise ValueError(f"{field_name}: sd must not be negative")
+        self.mean, self.sd = mean, sd
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.normal(self.mean, self.sd, n)
+
+    def ends(self) -> List[Any]:
+        return [self.mean - NORMAL_TORNADO_Z * self.sd, self.mean + NORMAL_TORNADO_Z * self.sd]
+
+
+class ChoicePerturbation(Perturbation):
+    numeric = False
+
+    def __init__(self, field_name: str, values: Sequence[Any], weights: Optional[Sequence[float]] = None):
+        super().__init__(field_name)
+        if not isinstance(values, (list, tuple)):
+            raise ValueError(f"{field_name}: values must be a list, got {type(values).__name__}")
+        if not values:
+            raise ValueError(f"{field_name}: values must not be empty")
+        if weights is not None:
+            if not isinstance(weights, (list, tuple)):
+                raise ValueError(f"{field_name}: weights must be a list, got {type(weights).__name__}")
+            weights = [_number(field_name, "weights", weight) for weight in weights]
+            if len(weights) != len(values) or min(weights) < 0 or sum(weights) <= 0:
+                raise ValueError(f"{field_name}: weights must be non-negative, one per value")
+            weights = np.asarray(weights, dtype=np.float64) / sum(weights)
+        self.values = list(values)
+        self.weights = weights
+        self._array = as_array(self.values)
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return self._array.take(rng.choice(len(self.values), n, p=self.weights))
+
+    def ends(self) -> List[Any]:
+        return list(self.values)
+
+
+def parse_perturbation(meta: InputMetadata, spec: Mapping[str, Any], value: Any) -> Perturbation:
+    """
+    Build a Perturbation from a spec (see module docstring).
+
+    Args:
+        meta: Schema of the perturbed input
+        spec: Perturbation spec
+        value: The patient's value of the input (None if absent)
+
+    Raises:
+        ValueError: Unknown spec or values the schema does not allow
+    """
+    name = meta.field_name
+    if "values" in spec:
+        perturbation = ChoicePerturbation(name, spec["values"], spec.get("weights"))
+    elif "probability" in spec:
+        if meta.input_type != InputType.BOOLEAN:
+            raise ValueError(f"{name}: probability applies to boolean inputs only")
+        probability = _number(name, "probability", spec["probability"])
+        if not 0 <= probability <= 1:
+            raise ValueError(f"{name}: probability must be between 0 and 1")
+        perturbation = ChoicePerturbation(name, [True, False], [probability, 1 - probability])
+    elif "low" in spec and "high" in spec:
+        perturbation = UniformPerturbation(name, spec["low"], spec["high"])
+    elif "sd" in spec:
+        mean = spec.get("mean", value)
+        if mean is None:
+            raise ValueError(f"{name}: mean is required when the input has no value")
+        perturbation = NormalPerturbation(name, mean, spec["sd"])
+    else:
+        raise ValueError(f"{name}: expected low/high, mean/sd, values or probability")
+
+    if perturbation.numeric and meta.input_type != InputType.NUMERIC:
+        raise ValueError(f"{name}: ranges and distributions apply to numeric inputs only")
+    if meta.input_type == InputType.ENUM and meta.allowed_values is not None:
+        unknown = [v for v in perturbation.ends() if v not in meta.allowed_values]
+        if unknown:
+            raise ValueError(f"{name}: {unknown} not in {meta.allowed_values}")
+    return perturbation
+
+
+@dataclass
+class SensitivityResult:
+    """
+    Result of a sensitivity analysis.
+
+    Attributes:
+        calculator_id: Calculator analyzed
+        output: score_batch() output analyzed
+        baseline: Output at the unperturbed inputs
+        samples: Number of perturbed samples scored
+        distribution: Output distribution over the samples (numeric outputs:
+                      mean, sd, min, max, percentiles, histogram; categorical
+                      outputs: share per category)
+        categories: Share per label of every categorical output (e.g. the
+                    risk category) over the samples
+        tornado: Per input: the output at each end of its range, largest
+                 swing first
+        elasticities: Per numeric input: relative change of the output per
+                      relative change of the input, at the patient's value
+                      (None when undefined)
+        elapsed_ms: Wall time of the analysis
+    """
+    calculator_id: str
+    output: str
+    baseline: Any
+    samples: int
+    distribution: Dict[str, Any] = field(default_factory=dict)
+    categories: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    tornado: List[Dict[str, Any]] = field(default_factory=list)
+    elasticities: Dict[str, Optional[float]] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "calculator_id": self.calculator_id,
+            "output": self.output,
+            "baseline": self.baseline,
+            "samples": self.samples,
+            "distribution": self.distribution,
+            "categories": self.categories,
+            "tornado": self.tornado,
+            "elasticities": self.elasticities,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+def analyze_sensitivity(
+    calculator: ClinicalCalculator,
+    inputs: Dict[str, Any],
+    perturbations: Mapping[str, Mapping[str, Any]],
+    samples: int = DEFAULT_SAMPLES,
+    output: Optional[str] = None,
+    seed: Optional[int] = 0,
+) -> SensitivityResult:
+    """
+    Score perturbed copies of inputs in one vectorized pass.
+
+    Args:
+        calculator: Calculator implementing score_batch()
+        inputs: The patient's inputs
+        perturbations: Input field -> perturbation spec
+        samples: Number of Monte Carlo samples
+        output: score_batch() output to analyze (defaults to the
+                calculator's primary_score, else its first numeric output)
+        seed: Random seed (fixed by default so a result is reproducible)
+
+    Returns:
+        SensitivityResult
+
+    Raises:
+        ValidationError: If the inputs are invalid
+        ValueError: Unsupported calculator, unknown output or bad specs
+    """
+    start = time.perf_counter()
+    if not calculator.supports_batch:
+        raise ValueError(f"{calculator.calculator_id} does not support sensitivity analysis")
+    is_valid, message = calculator.validate_inputs(inputs)
+    if is_valid:
+        # Perturbed rows are checked against the schema only
+        is_valid, message = calculator.validator.validate(inputs)
+    if not is_valid:
+        raise ValidationError(f"{calculator.name}: {message}")
+    if samples < 1:
+        raise ValueError("samples must be positive")
+
+    schema = {meta.field_name: meta for meta in calculator.get_input_schema()}
+    unknown = [name for name in perturbations if name not in schema]
+    if unknown:
+        raise ValueError(f"Unknown inputs for {calculator.calculator_id}: {unknown}")
+    parsed = [parse_perturbation(schema[name], spec, inputs.get(name)) for name, spec in perturbations.items()]
+
+    # Row layout: baseline | samples | tornado ends | elasticity steps
+    rng = np.random.default_rng(seed)
+    overrides: Dict[str, List[tuple]] = {p.field_name: [] for p in parsed}
+    n_rows = 1
+    for perturbation in parsed:
+        overrides[perturbation.field_name].append((n_rows, perturbation.sample(rng, samples)))
+    n_rows += samples
+
+    tornado_rows = []
+    for perturbation in parsed:
+        ends = perturbation.ends()
+        overrides[perturbation.field_name].append((n_rows, ends))
+        tornado_rows.append((perturbation, n_rows, ends))
+        n_rows += len(ends)
+
+    elasticity_rows = []
+    for perturbation in parsed:
+        value = inputs.get(perturbation.field_name)
+        if perturbation.numeric and isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+            step = abs(value) * ELASTICITY_STEP
+            overrides[perturbation.field_name].append((n_rows, [value - step, value + step]))
+            elasticity_rows.append((perturbation, n_rows, value))
+            n_rows += 2
+
+    columns = _build_columns(inputs, schema, parsed, overrides, n_rows)
+    with np.errstate(all="ignore"):
+        scores = calculator.score_batch(columns)
+    valid = calculator.validator.check_columns(columns, n_rows).valid
+
+    output = output or calculator.primary_score or _first_numeric(scores)
+    if output not in scores:
+        raise ValueError(f"Unknown output '{output}' for {calculator.calculator_id}: {sorted(scores)}")
+    values = scores[output]
+    numeric = values.dtype.kind in "biuf"
+
+    sample_slice = slice(1, 1 + samples)
+    sample_values = values[sample_slice][valid[sample_slice]]
+    result = SensitivityResult(
+        calculator_id=calculator.calculator_id,
+        output=output,
+        baseline=_to_python(values[0]),
+        samples=len(sample_values),
+    )
+    result.distribution = _numeric_summary(sample_values) if numeric else {"categories": _shares(sample_values)}
+    result.categories = {
+        name: _shares(column[sample_slice][valid[sample_slice]])
+        for name, column in scores.items()
+        if column.dtype.kind not in "biuf"
+    }
+
+    for perturbation, row, ends in tornado_rows:
+        # Clipped ends are reported as scored
+        column = columns[perturbation.field_name]
+        entries = [(column[row + i], _to_python(values[row + i])) for i in range(len(ends)) if valid[row + i]]
+        if entries:
+            result.tornado.append(_tornado_entry(perturbation, entries, result.baseline, numeric))
+    result.tornado.sort(key=lambda entry: entry["swing"], reverse=True)
+
+    if numeric:
+        for perturbation, row, value in elasticity_rows:
+            result.elasticities[perturbation.field_name] = _elasticity(
+                columns[perturbation.field_name], values, valid, row, value, result.baseline
+            )
+
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+def _build_columns(
+    inputs: Dict[str, Any],
+    schema: Dict[str, InputMetadata],
+    parsed: List[Perturbation],
+    overrides: Dict[str, List[tuple]],
+    n_rows: int,
+) -> Dict[str, np.ndarray]:
+    """Input columns: the patient's values, with perturbed rows overridden."""
+    # Typed (not object) columns wherever possible keep score_batch() and
+    # the schema checks free of Python-level loops
+    columns = {name: as_array([value]).repeat(n_rows) for name, value in inputs.items()}
+    for perturbation in parsed:
+        name = perturbation.field_name
+        value = inputs.get(name)
+        if perturbation.numeric:
+            column = np.full(n_rows, np.nan if value is None else float(value))
+        else:
+            # One dtype for the patient's value and every alternative
+            column = as_array([value] + perturbation.values)[:1].repeat(n_rows)
+        for row, block in overrides[name]:
+            column[row:row + len(block)] = block
+        meta = schema[name]
+        if perturbation.numeric and (meta.min_value is not None or meta.max_value is not None):
+            column = np.clip(column, meta.min_value, meta.max_value)
+        columns[name] = column
+    return columns
+
+
+def _first_numeric(scores: Dict[str, np.ndarray]) -> Optional[str]:
+    for name, column in scores.items():
+        if column.dtype.kind in "biuf":
+            return name
+    return next(iter(scores), None)
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _numeric_summary(values: np.ndarray) -> Dict[str, Any]:
+    values = values.astype(np.float64)
+    if not len(values):
+        return {}
+    counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+    return {
+        "mean": float(values.mean()),
+        "sd": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "percentiles": {str(p): float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+
+
+def _shares(values: np.ndarray) -> Dict[str, float]:
+    if not len(values):
+        return {}
+    labels, counts = np.unique(values.astype(str), return_counts=True)
+    return {str(label): count / len(values) for label, count in zip(labels, counts.tolist())}
+
+
+def _tornado_entry(perturbation: Perturbation, entries: List[tuple], baseline: Any, numeric: bool) -> Dict[str, Any]:
+    """Input values giving the lowest and highest output."""
+    if numeric:
+        low_input, low_output = min(entries, key=lambda entry: entry[1])
+        high_input, high_output = max(entries, key=lambda entry: entry[1])
+        swing = high_output - low_output
+    else:
+        (low_input, low_output), (high_input, high_output) = entries[0], entries[-1]
+        # Categorical outputs: the fraction of the input's values that change the category
+        swing = sum(output != baseline for _, output in entries) / len(entries)
+    return {
+        "input": perturbation.field_name,
+        "low": _to_python(low_input),
+        "high": _to_python(high_input),
+        "output_low": low_output,
+        "output_high": high_output,
+        "swing": swing,
+    }
+
+
+def _elasticity(
+    column: np.ndarray,
+    values: np.ndarray,
+    valid: np.ndarray,
+    row: int,
+    value: float,
+    baseline: float,
+) -> Optional[float]:
+    """(dY / Y) / (dX / X) by central difference (steps clipped at the schema limits)."""
+    dx = float(column[row + 1]) - float(column[row])
+    if not (valid[row] and valid[row + 1]) or not baseline or not dx:
+        return None
+    derivative = (float(values[row + 1]) - float(values[row])) / dx
+    return derivative * value / baseline
@@ -1,9 +1,15 @@
 """Urolithiasis (Stone Disease) Calculators."""
 
-from calculators.stones.stone_score import StoneScoreCalculator
-from calculators.stones.stone_size import StoneSizeCalculator
-from calculators.stones.guy_score import GuyScoreCalculator
-from calculators.stones.urine_24hr import Urine24HrCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "StoneScoreCalculator": "calculators.stones.stone_score",
+    "StoneSizeCalculator": "calculators.stones.stone_size",
+    "GuyScoreCalculator": "calculators.stones.guy_score",
+    "Urine24HrCalculator": "calculators.stones.urine_24hr",
+}
 
 __all__ = [
     "StoneScoreCalculator",
@@ -11,3 +17,9 @@ __all__ = [
     "GuyScoreCalculator",
     "Urine24HrCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
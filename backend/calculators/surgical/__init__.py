@@ -1,10 +1,16 @@
 """Surgical Risk Assessment Calculators."""
 
-from calculators.surgical.rcri import RCRICalculator
-from calculators.surgical.nsqip import NSQIPCalculator
-from calculators.surgical.cfs import CFSCalculator
-from calculators.surgical.cci import CCICalculator
-from calculators.surgical.life_expectancy_ssa import SSALifeExpectancyCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "RCRICalculator": "calculators.surgical.rcri",
+    "NSQIPCalculator": "calculators.surgical.nsqip",
+    "CFSCalculator": "calculators.surgical.cfs",
+    "CCICalculator": "calculators.surgical.cci",
+    "SSALifeExpectancyCalculator": "calculators.surgical.life_expectancy_ssa",
+}
 
 # Deprecated - unreliable for ages outside 65/75/85
 # from calculators.surgical.life_expectancy import LifeExpectancyCalculator
@@ -16,3 +22,9 @@ __all__ = [
     "CCICalculator",
     "SSALifeExpectancyCalculator",  # Replaced LifeExpectancyCalculator
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,10 @@
 """Charlson Comorbidity Index (CCI) Calculator."""
 
+import math
 from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -8,11 +12,29 @@ from calculators.base import (
     InputMetadata,
     InputType,
 )
+from calculators.batch import row_count, value_column
+from calculators.validation import float_column
+from calculators.lookup import CategoryTable, StepTable
 
 
 class CCICalculator(ClinicalCalculator):
     """Charlson Comorbidity Index for mortality prediction."""
 
+    # Age points: <50, 50-59, 60-69, 70-79, >=80
+    AGE_POINTS = StepTable([50, 60, 70, 80], [0, 1, 2, 3, 4])
+
+    COMORBIDITY_POINTS = CategoryTable({
+        "MI": 1, "CHF": 1, "PVD": 1, "CVA": 1, "dementia": 1,
+        "COPD": 1, "CTD": 1, "PUD": 1, "liver_mild": 1, "diabetes": 1,
+        "hemiplegia": 2, "CKD": 2, "diabetes_complications": 2,
+        "cancer": 2, "liver_severe": 3, "metastatic_cancer": 6, "AIDS": 6
+    })
+
+    # 10-year survival (%) for scores 0-5; 6 and above
+    TEN_YEAR_SURVIVAL = StepTable([1, 2, 3, 4, 5, 6], [99, 96, 90, 77, 53, 21, 2])
+
+    RISK_LEVELS = StepTable([1, 3], ["Low", "Moderate", "High"], right=True)
+
     @property
     def name(self) -> str:
         return "Charlson Comorbidity Index"
@@ -68,66 +90,53 @@ class CCICalculator(ClinicalCalculator):
             return False, "Age must be a positive number"
         if "comorbidities" not in inputs:
             return False, "Comorbidities list is required"
+        if not isinstance(inputs["comorbidities"], (list, tuple)):
+            return False, "Comorbidities must be a list of condition codes"
         return True, None
 
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
-        age = inputs["age"]
-        comorbidities = inputs.get("comorbidities", [])
-
-        # Age score
-        if age < 50:
-            score = 0
-        elif age < 60:
-            score = 1
-        elif age < 70:
-            score = 2
-        elif age < 80:
-            score = 3
-        else:
-            score = 4
-
-        # Comorbidity scores
-        comorbidity_scores = {
-            "MI": 1, "CHF": 1, "PVD": 1, "CVA": 1, "dementia": 1,
-            "COPD": 1, "CTD": 1, "PUD": 1, "liver_mild": 1, "diabetes": 1,
-            "hemiplegia": 2, "CKD": 2, "diabetes_complications": 2,
-            "cancer": 2, "liver_severe": 3, "metastatic_cancer": 6, "AIDS": 6
+        score = self.AGE_POINTS(inputs["age"])
+        score += self.COMORBIDITY_POINTS.total(inputs.get("comorbidities", []))
+        return self._build_result(score)
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized CCI over a cohort."""
+        n_rows = row_count(columns)
+        age_points = self.AGE_POINTS.take(float_column(columns, "age", n_rows))
+        comorbidity_points = np.fromiter(
+            (self._comorbidity_points(conditions) for conditions in value_column(columns, "comorbidities", n_rows)),
+            dtype=np.float64,
+            count=n_rows,
+        )
+        score = age_points + comorbidity_points
+        return {
+            "cci_score": score,
+            "ten_year_survival": self.TEN_YEAR_SURVIVAL.take(score),
         }
 
-        for condition in comorbidities:
-            score += comorbidity_scores.get(condition, 0)
-
-        # 10-year survival estimates
-        if score == 0:
-            survival = 99
-        elif score == 1:
-            survival = 96
-        elif score == 2:
-            survival = 90
-        elif score == 3:
-            survival = 77
-        elif score == 4:
-            survival = 53
-        elif score == 5:
-            survival = 21
-        else:
-            survival = 2
-
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        if math.isnan(scores["cci_score"]):
+            # Comorbidities that calculate() cannot read either: fail the same way
+            return self.calculate(inputs)
+        return self._build_result(int(scores["cci_score"]))
+
+    def _comorbidity_points(self, conditions: Any) -> float:
+        try:
+            return self.COMORBIDITY_POINTS.total(conditions)
+        except TypeError:
+            return math.nan
+
+    def _build_result(self, score: int) -> CalculatorResult:
+        """Look up survival and risk level for a CCI score."""
+        survival = self.TEN_YEAR_SURVIVAL(score)
         interpretation = f"CCI Score: {score}. Estimated 10-year survival: {survival}%"
 
-        # Determine risk level based on score
-        if score <= 1:
-            risk_level = "Low"
-        elif score <= 3:
-            risk_level = "Moderate"
-        else:
-            risk_level = "High"
-
         return CalculatorResult(
             calculator_id=self.calculator_id,
             calculator_name=self.name,
             result={"cci_score": score, "ten_year_survival": survival},
             interpretation=interpretation,
-            risk_level=risk_level,
+            risk_level=self.RISK_LEVELS(score),
             references=self.references
         )
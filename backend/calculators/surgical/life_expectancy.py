@@ -3,8 +3,23 @@ from calculators.base import (
     ClinicalCalculator, CalculatorCategory, CalculatorResult,
     InputMetadata, InputType,
 )
+from calculators.lookup import CategoryTable, StepTable
 
 class LifeExpectancyCalculator(ClinicalCalculator):
+    # Base life expectancy by age band and gender (from SSA tables); 10 below 65
+    BASE_LE = {
+        "male": StepTable([65, 75, 85], [10, 17.5, 9.5, 4.5]),
+        "female": StepTable([65, 75, 85], [10, 20.3, 11.5, 5.5]),
+    }
+
+    # Adjust for health status
+    HEALTH_ADJUSTMENT = CategoryTable({
+        "excellent": 0.9,  # 10% better than average
+        "good": 0.95,       # 5% better
+        "fair": 1.05,       # 5% worse
+        "poor": 1.2,        # 20% worse
+    }, default=1.0)
+
     @property
     def name(self) -> str:
         return "Life Expectancy Calculator"
@@ -61,31 +76,11 @@ class LifeExpectancyCalculator(ClinicalCalculator):
         health_status = inputs.get("health_status", "").lower()
         comorbidities = int(inputs.get("comorbidities", 0))
 
-        # Base life expectancy by age and gender (from SSA tables)
-        base_le_table = {
-            (65, "male"): 17.5,
-            (65, "female"): 20.3,
-            (75, "male"): 9.5,
-            (75, "female"): 11.5,
-            (85, "male"): 4.5,
-            (85, "female"): 5.5,
-        }
-
         # Find base life expectancy
-        base_le = 10  # default
-        for (age_threshold, gender_key), le in sorted(base_le_table.items(), reverse=True):
-            if age >= age_threshold and gender == gender_key:
-                base_le = le
-                break
-
-        # Adjust for health status
-        health_adjustment = {
-            "excellent": 0.9,  # 10% better than average
-            "good": 0.95,       # 5% better
-            "fair": 1.05,       # 5% worse
-            "poor": 1.2,        # 20% worse
-        }
-        health_factor = health_adjustment.get(health_status, 1.0)
+        base_le_table = self.BASE_LE.get(gender)
+        base_le = base_le_table(age) if base_le_table else 10  # default
+
+        health_factor = self.HEALTH_ADJUSTMENT(health_status)
 
         # Adjust for comorbidities (roughly 0.5 years per condition)
         comorbidity_adjustment = comorbidities * 0.5
@@ -14,10 +14,16 @@ References:
 """
 
 from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from calculators.base import (
     ClinicalCalculator, CalculatorCategory, CalculatorResult,
     InputMetadata, InputType,
 )
+from calculators.batch import row_count, value_column
+from calculators.validation import float_column
+from calculators.lookup import CategoryTable, InterpolationTable, StepTable
 
 
 class SSALifeExpectancyCalculator(ClinicalCalculator):
@@ -40,6 +46,28 @@ class SSALifeExpectancyCalculator(ClinicalCalculator):
         50: 32.0, 60: 23.0, 70: 14.9, 80: 8.6, 90: 4.2, 100: 2.2
     }
 
+    # Linear interpolation between the tabulated ages
+    LIFE_TABLES = {
+        "male": InterpolationTable.from_mapping(LIFE_TABLE_MALE),
+        "female": InterpolationTable.from_mapping(LIFE_TABLE_FEMALE),
+    }
+
+    # Health status adjustment (evidence-based modifiers)
+    HEALTH_MULTIPLIERS = CategoryTable({
+        "excellent": 1.10,  # +10% (excellent health, no chronic disease)
+        "good": 1.05,       # +5% (minor conditions, well-controlled)
+        "fair": 0.95,       # -5% (multiple conditions, moderately controlled)
+        "poor": 0.85,       # -15% (significant functional impairment)
+    }, default=1.0)
+
+    # Prognostic category by adjusted life expectancy (years)
+    PROGNOSIS = StepTable([5, 10, 20], [
+        ("Limited prognosis", "high"),
+        ("Moderate prognosis", "moderate"),
+        ("Good prognosis", "low"),
+        ("Excellent prognosis", "low"),
+    ])
+
     @property
     def name(self) -> str:
         return "SSA Life Expectancy Calculator"
@@ -137,75 +165,83 @@ class SSALifeExpectancyCalculator(ClinicalCalculator):
 
         Uses linear interpolation between known data points for ages 0-100.
         """
-        table = self.LIFE_TABLE_MALE if gender == "male" else self.LIFE_TABLE_FEMALE
-
-        # Get sorted age keys
-        ages = sorted(table.keys())
-
-        # Exact match
-        if age in table:
-            return table[age]
-
-        # Find surrounding ages for interpolation
-        lower_age = max([a for a in ages if a <= age], default=ages[0])
-        upper_age = min([a for a in ages if a >= age], default=ages[-1])
-
-        if lower_age == upper_age:
-            return table[lower_age]
-
-        # Linear interpolation
-        lower_le = table[lower_age]
-        upper_le = table[upper_age]
-
-        proportion = (age - lower_age) / (upper_age - lower_age)
-        interpolated_le = lower_le + (upper_le - lower_le) * proportion
-
-        return interpolated_le
+        table = self.LIFE_TABLES["male" if gender == "male" else "female"]
+        return table(age)
 
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate life expectancy using SSA actuarial tables."""
 
         age = int(float(inputs.get("age", 40)))
         gender = str(inputs.get("gender", "male")).lower()
-        health_status = str(inputs.get("health_status", "good")).lower() if inputs.get("health_status") else "good"
-
-        # Handle comorbidities as either count or list
-        comorbidities_input = inputs.get("comorbidities", 0)
-        if isinstance(comorbidities_input, list):
-            comorbidity_count = len(comorbidities_input)
-        else:
-            comorbidity_count = int(float(comorbidities_input)) if comorbidities_input else 0
 
         # Get base life expectancy from SSA tables
         base_le = self._interpolate_life_expectancy(age, gender)
-
-        # Health status adjustment (evidence-based modifiers)
-        health_multipliers = {
-            "excellent": 1.10,  # +10% (excellent health, no chronic disease)
-            "good": 1.05,       # +5% (minor conditions, well-controlled)
-            "fair": 0.95,       # -5% (multiple conditions, moderately controlled)
-            "poor": 0.85,       # -15% (significant functional impairment)
-        }
-        health_multiplier = health_multipliers.get(health_status, 1.0)
+        health_multiplier = self.HEALTH_MULTIPLIERS(self._health_status(inputs))
         adjusted_le = base_le * health_multiplier
 
         # Comorbidity adjustment (Charlson-based estimate: ~1.5 years per condition)
-        comorbidity_reduction = comorbidity_count * 1.5
+        comorbidity_reduction = self._comorbidity_count(inputs) * 1.5
         final_le = max(0.5, adjusted_le - comorbidity_reduction)
 
+        return self._build_result(inputs, base_le, final_le)
+
+    @property
+    def primary_score(self) -> str:
+        return "adjusted_life_expectancy_years"
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """Vectorized life expectancy over a cohort."""
+        n_rows = row_count(columns)
+        age = np.trunc(float_column(columns, "age", n_rows))
+        gender = value_column(columns, "gender", n_rows)
+        health = value_column(columns, "health_status", n_rows)
+        comorbidities = np.trunc(np.nan_to_num(float_column(columns, "comorbidities", n_rows)))
+
+        base_le = np.where(
+            gender == "male",
+            self.LIFE_TABLES["male"].take(age),
+            self.LIFE_TABLES["female"].take(age),
+        )
+        # Absent health status counts as good, as in calculate()
+        health = [status if isinstance(status, str) else "good" for status in health]
+        adjusted_le = base_le * self.HEALTH_MULTIPLIERS.take(health).astype(np.float64)
+        final_le = np.maximum(0.5, adjusted_le - comorbidities * 1.5)
+
+        return {
+            "base_life_expectancy_years": base_le,
+            "adjusted_life_expectancy_years": final_le,
+            "prognosis": np.array([label for label, _ in self.PROGNOSIS.take(final_le)], dtype=object),
+        }
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        """Build the result for one patient from score_batch() outputs."""
+        return self._build_result(
+            inputs, scores["base_life_expectancy_years"], scores["adjusted_life_expectancy_years"]
+        )
+
+    @staticmethod
+    def _health_status(inputs: Dict[str, Any]) -> str:
+        return str(inputs.get("health_status", "good")).lower() if inputs.get("health_status") else "good"
+
+    @staticmethod
+    def _comorbidity_count(inputs: Dict[str, Any]) -> int:
+        """Comorbidities given as either a count or a list."""
+        comorbidities_input = inputs.get("comorbidities", 0)
+        if isinstance(comorbidities_input, list):
+            return len(comorbidities_input)
+        return int(float(comorbidities_input)) if comorbidities_input else 0
+
+    def _build_result(self, inputs: Dict[str, Any], base_le: float, final_le: float) -> CalculatorResult:
+        """Categorize the prognosis and build interpretation and recommendations."""
+        age = int(float(inputs.get("age", 40)))
+        gender = str(inputs.get("gender", "male")).lower()
+        health_status = self._health_status(inputs)
+        health_multiplier = self.HEALTH_MULTIPLIERS(health_status)
+        comorbidity_count = self._comorbidity_count(inputs)
+        comorbidity_reduction = comorbidity_count * 1.5
+
         # Determine prognostic category
-        if final_le >= 20:
-            prognosis = "Excellent prognosis"
-            risk_level = "low"
-        elif final_le >= 10:
-            prognosis = "Good prognosis"
-            risk_level = "low"
-        elif final_le >= 5:
-            prognosis = "Moderate prognosis"
-            risk_level = "moderate"
-        else:
-            prognosis = "Limited prognosis"
-            risk_level = "high"
+        prognosis, risk_level = self.PROGNOSIS(final_le)
 
         # Build interpretation
         interpretation_parts = [
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator, CalculatorCategory, CalculatorResult,
     InputMetadata, InputType,
@@ -35,12 +35,6 @@ class NSQIPCalculator(ClinicalCalculator):
             ),
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        required = self.required_inputs
-        for field in required:
-            if field not in inputs:
-                return False, f"{field} is required"
-        return True, None
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         cpt = inputs.get("procedure_cpt", "Unknown")
         interpretation = f"For detailed perioperative risk assessment using CPT {cpt}, visit https://riskcalculator.facs.org/ (ACS NSQIP Risk Calculator)"
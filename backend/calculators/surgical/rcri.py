@@ -1,8 +1,13 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
+
+import numpy as np
+
 from calculators.base import (
     ClinicalCalculator, CalculatorCategory, CalculatorResult,
     InputMetadata, InputType,
 )
+from calculators.batch import categorize, row_count
+from calculators.validation import float_column
 
 class RCRICalculator(ClinicalCalculator):
     @property
@@ -21,20 +26,30 @@ class RCRICalculator(ClinicalCalculator):
     def required_inputs(self) -> List[str]:
         return ["risk_factors_count"]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get input schema for Revised Cardiac Risk Index."""
         return [
             InputMetadata("risk_factors_count", "Number of RCRI Risk Factors", InputType.NUMERIC, True, "Count of positive risk factors", unit="factors", min_value=0, max_value=6, example="2", help_text="Risk factors: high-risk surgery, CAD history, CHF, cerebrovascular disease, insulin-dependent DM, Cr >2. Higher count = higher MACE risk."),
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        try:
-            count = int(inputs["risk_factors_count"])
-            if count < 0 or count > 6: return False, "0-6 factors"
-        except: return False, "Invalid"
-        return True, None
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
-        count = int(inputs["risk_factors_count"])
+        return self._build_result(int(float(inputs["risk_factors_count"])))
+
+    def score_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        count = np.trunc(float_column(columns, "risk_factors_count", row_count(columns)))
+        return {
+            "rcri_score": count,
+            "risk_level": categorize(count, [0, 1], ["Low", "Moderate", "High"], right=True),
+        }
+
+    def result_from_scores(self, inputs: Dict[str, Any], scores: Dict[str, Any]) -> CalculatorResult:
+        return self._build_result(int(scores["rcri_score"]))
+
+    def _build_result(self, count: int) -> CalculatorResult:
         mace_risk = {0: "0.4%", 1: "0.9%", 2: "6.6%", 3: "11%"}
         risk = mace_risk.get(min(count, 3), ">11%")
 
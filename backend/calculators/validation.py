@@ -0,0 +1,484 @@
+"""
+Input validation compiled from calculator input schemas.
+
+Each calculator publishes its inputs through get_input_schema(). A
+CompiledValidator turns that schema into a fixed list of per-field checks
+once per calculator class, so validating a request is a single pass over
+the fields with no schema lookups, and the rules cannot drift from the
+published schema.
+
+- CompiledValidator.errors(inputs): structured FieldErrors for one patient
+- CompiledValidator.validate(inputs): (is_valid, error_message), the
+  validate_inputs() contract
+- CompiledValidator.check_columns(columns, n_rows): the same rules as array
+  operations over a cohort (see calculators.batch)
+
+Rules per input type:
+- Required fields must be present and not None/NaN
+- NUMERIC: a real number (not NaN) within min_value/max_value; numeric
+  strings are accepted as float() reads them only for calculators whose
+  calculate() converts them (accepts_numeric_strings)
+- ENUM: one of allowed_values; under the same rule a numeric string matches
+  a numeric allowed value ("2" for 2)
+- BOOLEAN: true or false
+- TEXT / DATE: presence only
+
+Calculators with rules the schema cannot express (cross-field constraints,
+conditional requirements) keep their own validate_inputs().
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from calculators.base import ClinicalCalculator, InputMetadata, InputType
+
+# Error codes
+MISSING = "missing"
+NOT_A_NUMBER = "not_a_number"
+BELOW_MIN = "below_min"
+ABOVE_MAX = "above_max"
+NOT_ALLOWED = "not_allowed"
+NOT_BOOLEAN = "not_boolean"
+
+
+@dataclass(frozen=True)
+class FieldError:
+    """A validation failure for one input field (field is None for cross-field rules)."""
+    field: Optional[str]
+    code: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """Convert to dictionary for JSON serialization."""
+        return {"field": self.field, "code": self.code, "message": self.message}
+
+
+# ---------------------------------------------------------------------------
+# Array helpers (shared with calculators.batch)
+# ---------------------------------------------------------------------------
+
+def is_missing(value: Any) -> bool:
+    """True for None and NaN cells."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def missing_mask(column: np.ndarray) -> np.ndarray:
+    """Boolean mask of missing (None / NaN) cells."""
+    if column.dtype.kind == "f":
+        return np.isnan(column)
+    if column.dtype.kind == "O":
+        return np.fromiter((is_missing(v) for v in column), dtype=bool, count=len(column))
+    return np.zeros(len(column), dtype=bool)
+
+
+def float_column(columns: Dict[str, np.ndarray], name: str, n_rows: int) -> np.ndarray:
+    """
+    Field as a float64 array; absent, missing or non-numeric cells are NaN.
+
+    Numeric columns are converted without a Python-level loop.
+    """
+    column = columns.get(name)
+    if column is None:
+        return np.full(n_rows, np.nan)
+    if column.dtype.kind in "biuf":
+        return column.astype(np.float64, copy=False)
+
+    def convert(value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return math.nan
+
+    return np.fromiter((convert(v) for v in column), dtype=np.float64, count=len(column))
+
+
+def to_number(value: Any) -> Optional[float]:
+    """A numeric string as float() reads it; None if it is not one."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _numeric_values(allowed: Sequence[Any]) -> List[Any]:
+    """Allowed values a numeric string can match."""
+    return [value for value in allowed
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))]
+
+
+def _string_mask(column: np.ndarray) -> np.ndarray:
+    """Boolean mask of str cells."""
+    if column.dtype.kind == "U":
+        return np.ones(len(column), dtype=bool)
+    if column.dtype.kind == "O":
+        return np.fromiter((isinstance(v, str) for v in column), dtype=bool, count=len(column))
+    return np.zeros(len(column), dtype=bool)
+
+
+def _in_allowed(column: np.ndarray, allowed: List[Any]) -> np.ndarray:
+    """Elementwise membership test with Python `in` semantics."""
+    # NumPy would coerce mixed allowed values (e.g. [0, "Grade I"]) to strings
+    if len({type(value) for value in allowed}) == 1:
+        try:
+            return np.isin(column, np.asarray(allowed))
+        except TypeError:
+            pass
+
+    def contains(value: Any) -> bool:
+        try:
+            return value in allowed
+        except TypeError:
+            return False
+
+    return np.fromiter((contains(v) for v in column), dtype=bool, count=len(column))
+
+
+# ---------------------------------------------------------------------------
+# Compiled checks
+# ---------------------------------------------------------------------------
+
+def _error_for(meta: InputMetadata, code: str) -> FieldError:
+    """The FieldError a compiled check reports for a field and code."""
+    name = meta.field_name
+    messages = {
+        NOT_A_NUMBER: f"{name} must be a number",
+        BELOW_MIN: f"{name} must be >= {meta.min_value}",
+        ABOVE_MAX: f"{name} must be <= {meta.max_value}",
+        NOT_ALLOWED: f"{name} must be one of: {meta.allowed_values}",
+        NOT_BOOLEAN: f"{name} must be true or false",
+    }
+    return FieldError(name, code, messages[code])
+
+
+# A field check takes a present value and returns an error or None
+FieldCheck = Callable[[Any], Optional[FieldError]]
+
+
+def _numeric_check(meta: InputMetadata, numeric_strings: bool) -> FieldCheck:
+    min_value, max_value = meta.min_value, meta.max_value
+    not_a_number = _error_for(meta, NOT_A_NUMBER)
+    below_min = _error_for(meta, BELOW_MIN)
+    above_max = _error_for(meta, ABOVE_MAX)
+
+    def check(value: Any) -> Optional[FieldError]:
+        if numeric_strings and isinstance(value, str):
+            value = to_number(value)
+        if not isinstance(value, (int, float, np.number)) or value != value:
+            return not_a_number
+        if min_value is not None and value < min_value:
+            return below_min
+        if max_value is not None and value > max_value:
+            return above_max
+        return None
+
+    return check
+
+
+def _enum_check(meta: InputMetadata, numeric_strings: bool) -> FieldCheck:
+    not_allowed = _error_for(meta, NOT_ALLOWED)
+    try:
+        allowed = frozenset(meta.allowed_values)
+    except TypeError:
+        allowed = list(meta.allowed_values)
+    numbers = frozenset(_numeric_values(meta.allowed_values)) if numeric_strings else frozenset()
+
+    def check(value: Any) -> Optional[FieldError]:
+        try:
+            if value in allowed:
+                return None
+        except TypeError:
+            pass
+        if numbers and isinstance(value, str) and to_number(value) in numbers:
+            return None
+        return not_allowed
+
+    return check
+
+
+def _boolean_check(meta: InputMetadata) -> FieldCheck:
+    not_boolean = _error_for(meta, NOT_BOOLEAN)
+
+    def check(value: Any) -> Optional[FieldError]:
+        return None if isinstance(value, (bool, np.bool_)) else not_boolean
+
+    return check
+
+
+def _compile_check(meta: InputMetadata, numeric_strings: bool = False) -> Optional[FieldCheck]:
+    """Build the check for one field, or None if only presence is checked."""
+    if meta.input_type == InputType.NUMERIC:
+        return _numeric_check(meta, numeric_strings)
+    if meta.input_type == InputType.ENUM and meta.allowed_values is not None:
+        return _enum_check(meta, numeric_strings)
+    if meta.input_type == InputType.BOOLEAN:
+        return _boolean_check(meta)
+    return None
+
+
+class CompiledValidator:
+    """
+    Validator for one calculator, compiled from its input schema.
+
+    Attributes:
+        schema: Input metadata the validator was compiled from
+        required: Required field names (schema-required plus required_inputs)
+        numeric_strings: Whether numeric strings pass NUMERIC and ENUM checks
+    """
+
+    def __init__(
+        self,
+        schema: Sequence[InputMetadata],
+        required_inputs: Sequence[str] = (),
+        numeric_strings: bool = False
+    ):
+        self.schema = tuple(schema)
+        required = [meta.field_name for meta in self.schema if meta.required]
+        required += [name for name in required_inputs if name not in required]
+        self.required = tuple(required)
+        self.numeric_strings = numeric_strings
+        self._checks: Tuple[Tuple[str, FieldCheck], ...] = tuple(
+            (meta.field_name, check)
+            for meta in self.schema
+            if (check := _compile_check(meta, numeric_strings)) is not None
+        )
+        self._validate = _generate_validate(self)
+
+    @classmethod
+    def for_calculator(cls, calculator: ClinicalCalculator) -> "CompiledValidator":
+        """Compile a calculator's get_input_schema()."""
+        return cls(calculator.get_input_schema(), calculator.required_inputs, calculator.accepts_numeric_strings)
+
+    def _missing(self, inputs: Dict[str, Any]) -> List[str]:
+        return [name for name in self.required if is_missing(inputs.get(name))]
+
+    def errors(self, inputs: Dict[str, Any]) -> List[FieldError]:
+        """
+        Check every field.
+
+        Args:
+            inputs: Dictionary of input parameters
+
+        Returns:
+            FieldErrors in schema order (missing fields first); empty if valid
+        """
+        errors = [
+            FieldError(name, MISSING, f"{name} is required") for name in self._missing(inputs)
+        ]
+        for name, check in self._checks:
+            value = inputs.get(name)
+            if not is_missing(value):
+                error = check(value)
+                if error is not None:
+                    errors.append(error)
+        return errors
+
+    def validate(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """
+        Validate input parameters, stopping at the first failure.
+
+        Returns:
+            Tuple of (is_valid, error_message)
+            error_message is None if valid
+        """
+        return self._validate(inputs)
+
+    def _fail(self, inputs: Dict[str, Any], message: str) -> Tuple[bool, str]:
+        """Failure result; missing required inputs are reported before other errors."""
+        missing = self._missing(inputs)
+        if missing:
+            return False, f"Missing required inputs: {', '.join(missing)}"
+        return False, message
+
+    def check_columns(self, columns: Dict[str, np.ndarray], n_rows: int) -> "ColumnValidation":
+        """
+        Apply the same rules to a cohort with array operations.
+
+        Args:
+            columns: Field name -> 1-D NumPy array (see calculators.batch.to_columns)
+            n_rows: Number of rows
+
+        Returns:
+            ColumnValidation with one boolean mask per (field, error code)
+        """
+        masks: Dict[Tuple[str, str], np.ndarray] = {}
+
+        for name in self.required:
+            column = columns.get(name)
+            masks[(name, MISSING)] = (
+                np.ones(n_rows, dtype=bool) if column is None else missing_mask(column)
+            )
+
+        for meta in self.schema:
+            column = columns.get(meta.field_name)
+            if column is None:
+                continue
+            present = ~missing_mask(column)
+            name = meta.field_name
+
+            if meta.input_type == InputType.NUMERIC:
+                values = float_column(columns, name, n_rows)
+                not_a_number = np.isnan(values)
+                if column.dtype.kind not in "biuf":
+                    number_types = (int, float, np.number, str) if self.numeric_strings else (int, float, np.number)
+                    not_a_number |= np.fromiter(
+                        (not isinstance(v, number_types) for v in column),
+                        dtype=bool, count=len(column)
+                    )
+                masks[(name, NOT_A_NUMBER)] = present & not_a_number
+                number = present & ~not_a_number
+                if meta.min_value is not None:
+                    masks[(name, BELOW_MIN)] = number & (values < meta.min_value)
+                if meta.max_value is not None:
+                    masks[(name, ABOVE_MAX)] = number & (values > meta.max_value)
+            elif meta.input_type == InputType.ENUM and meta.allowed_values is not None:
+                allowed = _in_allowed(column, meta.allowed_values)
+                numbers = _numeric_values(meta.allowed_values) if self.numeric_strings else []
+                if numbers:
+                    retry = ~allowed & _string_mask(column)
+                    if retry.any():
+                        values = float_column(columns, name, n_rows)
+                        allowed[retry] = np.isin(values[retry], np.asarray(numbers, dtype=np.float64))
+                masks[(name, NOT_ALLOWED)] = present & ~allowed
+            elif meta.input_type == InputType.BOOLEAN and column.dtype.kind != "b":
+                is_bool = np.fromiter(
+                    (isinstance(v, (bool, np.bool_)) for v in column), dtype=bool, count=len(column)
+                )
+                masks[(name, NOT_BOOLEAN)] = present & ~is_bool
+
+        return ColumnValidation(self, n_rows, masks)
+
+
+def _generate_validate(validator: CompiledValidator) -> Callable[[Dict[str, Any]], Tuple[bool, Optional[str]]]:
+    """
+    Generate a straight-line validate(inputs) function for one schema.
+
+    Each field becomes a few inlined comparisons against constants, so the
+    valid path makes no function calls besides dict.get(). Failures defer to
+    CompiledValidator._fail() to build the same message as errors().
+    """
+    namespace: Dict[str, Any] = {
+        "_fail": validator._fail, "_number": (int, float, np.number), "_np_bool": np.bool_, "_to_number": to_number
+    }
+    lines = ["def validate(inputs):", "    get = inputs.get"]
+    metadata = {meta.field_name: meta for meta in validator.schema}
+
+    def constant(value: Any) -> str:
+        key = f"_c{len(namespace)}"
+        namespace[key] = value
+        return key
+
+    fields = [meta.field_name for meta in validator.schema]
+    fields += [name for name in validator.required if name not in metadata]
+
+    for name in fields:
+        meta = metadata.get(name)
+        check_lines = []
+        if meta is not None and _compile_check(meta) is not None:
+            if meta.input_type == InputType.NUMERIC:
+                if validator.numeric_strings:
+                    check_lines.append("if v.__class__ is str: v = _to_number(v)")
+                check_lines.append(
+                    f"if not isinstance(v, _number) or v != v: return _fail(inputs, {constant(_error_for(meta, NOT_A_NUMBER).message)})"
+                )
+                if meta.min_value is not None:
+                    check_lines.append(
+                        f"if v < {constant(meta.min_value)}: return _fail(inputs, {constant(_error_for(meta, BELOW_MIN).message)})"
+                    )
+                if meta.max_value is not None:
+                    check_lines.append(
+                        f"if v > {constant(meta.max_value)}: return _fail(inputs, {constant(_error_for(meta, ABOVE_MAX).message)})"
+                    )
+            elif meta.input_type == InputType.ENUM:
+                try:
+                    allowed = frozenset(meta.allowed_values)
+                except TypeError:
+                    allowed = tuple(meta.allowed_values)
+                check_lines += [
+                    "try:",
+                    f"    allowed = v in {constant(allowed)}",
+                    "except TypeError:",
+                    "    allowed = False",
+                ]
+                numbers = _numeric_values(meta.allowed_values) if validator.numeric_strings else []
+                if numbers:
+                    check_lines.append(
+                        f"if not allowed and v.__class__ is str: allowed = _to_number(v) in {constant(frozenset(numbers))}"
+                    )
+                check_lines.append(
+                    f"if not allowed: return _fail(inputs, {constant(_error_for(meta, NOT_ALLOWED).message)})"
+                )
+            elif meta.input_type == InputType.BOOLEAN:
+                check_lines.append(
+                    f"if v.__class__ is not bool and not isinstance(v, _np_bool): return _fail(inputs, {constant(_error_for(meta, NOT_BOOLEAN).message)})"
+                )
+
+        required = name in validator.required
+        if not required and not check_lines:
+            continue
+        lines.append(f"    v = get({constant(name)})")
+        lines.append("    if v is None or (v.__class__ is float and v != v):")
+        lines.append("        return _fail(inputs, None)" if required else "        pass")
+        if check_lines:
+            lines.append("    else:")
+            lines.extend(f"        {line}" for line in check_lines)
+
+    lines.append("    return True, None")
+    exec("\n".join(lines), namespace)
+    return namespace["validate"]
+
+
+class ColumnValidation:
+    """
+    Result of CompiledValidator.check_columns().
+
+    Attributes:
+        masks: (field, error code) -> boolean mask of failing rows
+        invalid: Boolean mask of rows with any error
+    """
+
+    def __init__(self, validator: CompiledValidator, n_rows: int, masks: Dict[Tuple[str, str], np.ndarray]):
+        self._validator = validator
+        self.masks = {key: mask for key, mask in masks.items() if mask.any()}
+        self.invalid = np.zeros(n_rows, dtype=bool)
+        for mask in self.masks.values():
+            self.invalid |= mask
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean mask of rows that passed every check."""
+        return ~self.invalid
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Field -> error code -> number of failing rows."""
+        counts: Dict[str, Dict[str, int]] = {}
+        for (name, code), mask in self.masks.items():
+            counts.setdefault(name, {})[code] = int(mask.sum())
+        return counts
+
+    def row_errors(self, index: int) -> List[FieldError]:
+        """FieldErrors for one row, in the order CompiledValidator.errors() reports them."""
+        failing = {key for key, mask in self.masks.items() if mask[index]}
+        errors = [
+            FieldError(name, MISSING, f"{name} is required")
+            for name in self._validator.required if (name, MISSING) in failing
+        ]
+        for meta in self._validator.schema:
+            for code in (NOT_A_NUMBER, BELOW_MIN, ABOVE_MAX, NOT_ALLOWED, NOT_BOOLEAN):
+                if (meta.field_name, code) in failing:
+                    errors.append(_error_for(meta, code))
+        return errors
+
+
+# One validator per calculator class
+_validators: Dict[Type[ClinicalCalculator], CompiledValidator] = {}
+
+
+def get_validator(calculator: ClinicalCalculator) -> CompiledValidator:
+    """Get the compiled validator for a calculator, compiling it on first use."""
+    validator = _validators.get(type(calculator))
+    if validator is None:
+        validator = _validators.setdefault(type(calculator), CompiledValidator.for_calculator(calculator))
+    return validator
@@ -1,11 +1,17 @@
 """Male Voiding Dysfunction Calculators."""
 
-from calculators.voiding.ipss import IPSSCalculator
-from calculators.voiding.uroflow import UroflowCalculator
-from calculators.voiding.pvrua import PVRUACalculator
-from calculators.voiding.booi_bci import BOOIBCICalculator
-from calculators.voiding.cfs import BladderDiaryCalculator
-from calculators.voiding.iciq import ICIQCalculator
+import importlib
+
+# Calculator modules are imported on first attribute access, so importing the
+# package does not load every calculator (see calculators.registry)
+_MODULES = {
+    "IPSSCalculator": "calculators.voiding.ipss",
+    "UroflowCalculator": "calculators.voiding.uroflow",
+    "PVRUACalculator": "calculators.voiding.pvrua",
+    "BOOIBCICalculator": "calculators.voiding.booi_bci",
+    "BladderDiaryCalculator": "calculators.voiding.cfs",
+    "ICIQCalculator": "calculators.voiding.iciq",
+}
 
 __all__ = [
     "IPSSCalculator",
@@ -15,3 +21,9 @@ __all__ = [
     "BladderDiaryCalculator",
     "ICIQCalculator",
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
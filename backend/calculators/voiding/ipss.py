@@ -5,7 +5,7 @@ Comprehensive assessment of lower urinary tract symptoms with seven questions
 scored 0-5, plus quality of life assessment.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 from calculators.base import (
     ClinicalCalculator,
     CalculatorCategory,
@@ -57,6 +57,10 @@ class IPSSCalculator(ClinicalCalculator):
             "qol",
         ]
 
+    @property
+    def accepts_numeric_strings(self) -> bool:
+        return True
+
     def get_input_schema(self) -> List[InputMetadata]:
         """Get input schema for IPSS calculator."""
         return [
@@ -70,74 +74,21 @@ class IPSSCalculator(ClinicalCalculator):
             InputMetadata("qol", "Quality of Life Impact", InputType.NUMERIC, True, "QoL score 0-6", unit="points", min_value=0, max_value=6, example="3", help_text="0: Delighted, 6: Terrible. Overall impact on daily life."),
         ]
 
-    def validate_inputs(self, inputs: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Validate IPSS inputs."""
-
-        is_valid, msg = self._validate_required(
-            inputs,
-            [
-                "incomplete_emptying",
-                "frequency",
-                "intermittency",
-                "urgency",
-                "weak_stream",
-                "straining",
-                "nocturia",
-                "qol",
-            ]
-        )
-        if not is_valid:
-            return False, msg
-
-        # Validate each score is 0-5
-        for question in [
-            "incomplete_emptying",
-            "frequency",
-            "intermittency",
-            "urgency",
-            "weak_stream",
-            "straining",
-        ]:
-            try:
-                score = int(inputs[question])
-                if score < 0 or score > 5:
-                    return False, f"{question} must be 0-5"
-            except (ValueError, TypeError):
-                return False, f"{question} must be an integer 0-5"
-
-        # Validate nocturia is 0-5
-        try:
-            nocturia = int(inputs["nocturia"])
-            if nocturia < 0 or nocturia > 5:
-                return False, "Nocturia must be 0-5"
-        except (ValueError, TypeError):
-            return False, "Nocturia must be an integer"
-
-        # Validate QoL is 0-6
-        try:
-            qol = int(inputs["qol"])
-            if qol < 0 or qol > 6:
-                return False, "QoL must be 0-6"
-        except (ValueError, TypeError):
-            return False, "QoL must be an integer"
-
-        return True, None
-
     def calculate(self, inputs: Dict[str, Any]) -> CalculatorResult:
         """Calculate IPSS score."""
 
         # Get all scores
         scores = {
-            "incomplete_emptying": int(inputs["incomplete_emptying"]),
-            "frequency": int(inputs["frequency"]),
-            "intermittency": int(inputs["intermittency"]),
-            "urgency": int(inputs["urgency"]),
-            "weak_stream": int(inputs["weak_stream"]),
-            "straining": int(inputs["straining"]),
-            "nocturia": int(inputs["nocturia"]),
+            "incomplete_emptying": int(float(inputs["incomplete_emptying"])),
+            "frequency": int(float(inputs["frequency"])),
+            "intermittency": int(float(inputs["intermittency"])),
+            "urgency": int(float(inputs["urgency"])),
+            "weak_stream": int(float(inputs["weak_stream"])),
+            "straining": int(float(inputs["straining"])),
+            "nocturia": int(float(inputs["nocturia"])),
         }
 
-        qol = int(inputs["qol"])
+        qol = int(float(inputs["qol"]))
 
         # Calculate total IPSS
         total_ipss = sum(scores.values())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-chunk audio preparation for ambient transcription
+Usage: python scripts/benchmark_ambient_audio.py [--chunks N] [--seconds S] [--frame-ms MS]
+
+Compares the old path (slice copy of the receive buffer, float conversion,
+WAV written to a temporary file and decoded back, as Whisper/pyannote did on
+load) with the in-memory path (one copy out of the buffer, zero-copy
+np.frombuffer view, a single float32 allocation). Model inference itself is
+not timed; it is identical for both paths.
+
+Also compares stream ingest per minute of audio: base64-in-JSON frames
+buffered in bytearrays vs binary PCM16 frames written to the ring buffer
+(wire bytes and server CPU to cut transcription/diarization windows).
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.ambient.ring_buffer import PCMRingBuffer  # noqa: E402
+from app.services.ambient.speech import pcm_to_float32  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def prepare_with_tempfile(buffer: bytearray, size: int) -> np.ndarray:
+    """Previous path: bytes(buffer[:n]), WAV round trip through disk."""
+    audio_chunk = bytes(buffer[:size])
+    audio_float = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
+
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=True) as temp_file:
+        # soundfile's default WAV subtype is PCM_16
+        with wave.open(temp_file.name, "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(SAMPLE_RATE)
+            writer.writeframes((audio_float * 32768.0).astype(np.int16).tobytes())
+        # The model decodes the file back to float32
+        with wave.open(temp_file.name, "rb") as reader:
+            frames = reader.readframes(reader.getnframes())
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def prepare_in_memory(buffer: bytearray, size: int) -> np.ndarray:
+    """Current path: one copy out of the buffer, then a float32 array."""
+    with memoryview(buffer) as view:
+        audio_chunk = bytes(view[:size])
+    return pcm_to_float32(audio_chunk)
+
+
+def measure(prepare, buffer: bytearray, size: int, chunks: int) -> dict:
+    """Median latency and peak traced allocation per chunk."""
+    prepare(buffer, size)  # warm up
+
+    latencies = []
+    for _ in range(chunks):
+        start = time.perf_counter()
+        prepare(buffer, size)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    peaks = []
+    for _ in range(min(chunks, 20)):
+        tracemalloc.start()
+        prepare(buffer, size)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {"median_ms": statistics.median(latencies), "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+            "peak_kib": max(peaks) / 1024}
+
+
+CHUNK_SAMPLES = 2 * SAMPLE_RATE
+DIARIZATION_SAMPLES = 30 * SAMPLE_RATE
+
+
+def ingest_json(frames) -> int:
+    """Previous protocol: JSON + base64 per frame, bytearray slicing."""
+    audio_buffer = bytearray()
+    accumulated_audio = bytearray()
+    windows = 0
+    for frame in frames:
+        message = json.loads(frame)
+        audio_data = base64.b64decode(message.get('data', ''))
+        audio_buffer.extend(audio_data)
+        accumulated_audio.extend(audio_data)
+        if len(audio_buffer) >= CHUNK_SAMPLES * 2:
+            audio_chunk = bytes(audio_buffer[:CHUNK_SAMPLES * 2])
+            audio_buffer = audio_buffer[CHUNK_SAMPLES * 2:]
+            windows += len(audio_chunk) > 0
+        if len(accumulated_audio) >= DIARIZATION_SAMPLES * 2:
+            diarization_chunk = bytes(accumulated_audio[:DIARIZATION_SAMPLES * 2])
+            accumulated_audio = accumulated_audio[DIARIZATION_SAMPLES * 2:]
+            windows += len(diarization_chunk) > 0
+    return windows
+
+
+def ingest_binary(frames) -> int:
+    """Binary PCM16 frames into the ring buffer, windows as views."""
+    ring = PCMRingBuffer(60 * SAMPLE_RATE)
+    transcribe_position = diarize_position = 0
+    windows = 0
+    for frame in frames:
+        ring.write(frame)
+        while ring.written - transcribe_position >= CHUNK_SAMPLES:
+            windows += ring.window(transcribe_position, CHUNK_SAMPLES).size > 0
+            transcribe_position += CHUNK_SAMPLES
+        while ring.written - diarize_position >= DIARIZATION_SAMPLES:
+            windows += ring.window(diarize_position, DIARIZATION_SAMPLES).size > 0
+            diarize_position += DIARIZATION_SAMPLES
+    return windows
+
+
+def compare_ingest(frame_ms: int, minutes: float = 1.0) -> None:
+    rng = np.random.default_rng(1)
+    frame_samples = SAMPLE_RATE * frame_ms // 1000
+    frame_count = int(minutes * 60 * 1000 / frame_ms)
+    pcm_frames = [rng.integers(-2000, 2000, frame_samples, dtype=np.int16).tobytes() for _ in range(frame_count)]
+    json_frames = [
+        json.dumps({"type": "audio", "data": base64.b64encode(frame).decode(), "format": "pcm16", "sample_rate": SAMPLE_RATE})
+        for frame in pcm_frames
+    ]
+
+    print(f"\nIngest per minute of audio ({frame_ms} ms frames, {frame_count} frames)")
+    print(f"{'protocol':<10} {'wire KiB':>9} {'cpu ms':>8} {'windows':>8}")
+    for label, ingest, frames in (("json", ingest_json, json_frames), ("binary", ingest_binary, pcm_frames)):
+        wire = sum(len(frame) for frame in frames) / 1024
+        runs = []
+        for _ in range(5):
+            start = time.process_time()
+            windows = ingest(frames)
+            runs.append((time.process_time() - start) * 1000 / minutes)
+        print(f"{label:<10} {wire / minutes:>9.0f} {min(runs):>8.2f} {windows:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ambient audio preparation per chunk")
+    parser.add_argument("--chunks", type=int, default=200, help="Chunks timed per path")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Chunk length (2 s for transcription, 30 s for diarization)")
+    parser.add_argument("--frame-ms", type=int, default=100, help="Client frame length for the ingest comparison")
+    args = parser.parse_args()
+
+    size = int(args.seconds * SAMPLE_RATE) * 2
+    rng = np.random.default_rng(0)
+    buffer = bytearray(rng.integers(-2000, 2000, size * 2, dtype=np.int16).tobytes())
+
+    before = prepare_with_tempfile(buffer, size)
+    after = prepare_in_memory(buffer, size)
+    if not np.array_equal(before, after):
+        print("In-memory audio differs from the temp-file round trip")
+        return 1
+
+    print(f"{args.seconds:g} s chunks ({size // 1024} KiB PCM16), {args.chunks} runs")
+    print(f"{'path':<10} {'median ms':>10} {'p95 ms':>8} {'peak KiB':>9}")
+    for label, prepare in (("tempfile", prepare_with_tempfile), ("in-memory", prepare_in_memory)):
+        result = measure(prepare, buffer, size, args.chunks)
+        print(f"{label:<10} {result['median_ms']:>10.3f} {result['p95_ms']:>8.3f} {result['peak_kib']:>9.0f}")
+
+    compare_ingest(args.frame_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark every calculator on its schema examples
+Usage: python scripts/benchmark_calculators.py [--update] [--calculator ID] [--rounds N]
+
+Prints per-call latency and memory next to the stored baseline
+(tests/test_calculators/benchmark_baseline.json) and exits non-zero when a
+calculator regressed beyond the baseline threshold. --update rewrites the
+baseline after an intentional change.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from calculators.benchmark import (  # noqa: E402
+    BASELINE_PATH,
+    DEFAULT_THRESHOLD,
+    load_baseline,
+    regressions,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark calculator latency and allocations")
+    parser.add_argument("--update", action="store_true", help="Rewrite the baseline with this run")
+    parser.add_argument("--calculator", action="append", help="Benchmark only this calculator (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per calculator (best is kept)")
+    args = parser.parse_args()
+
+    run = run_benchmarks(args.calculator, rounds=args.rounds)
+    baseline = load_baseline() or {"calculators": {}}
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+
+    print(f"{'calculator':<32} {'µs/call':>9} {'baseline':>9} {'ratio':>6} {'peak B':>8} {'blocks':>7}")
+    failed = []
+    for calculator_id, benchmark in sorted(run.items(), key=lambda item: -item[1].us_per_call):
+        entry = baseline["calculators"].get(calculator_id, {})
+        if benchmark.skipped:
+            print(f"{calculator_id:<32} skipped: {benchmark.skipped}")
+        else:
+            # The baseline in this machine's microseconds
+            expected = entry.get("normalized", 0) * benchmark.reference_us
+            ratio = f"{benchmark.us_per_call / expected:.2f}" if expected else "new"
+            print(
+                f"{calculator_id:<32} {benchmark.us_per_call:>9.1f} {expected:>9.1f} {ratio:>6} "
+                f"{benchmark.peak_bytes:>8} {benchmark.retained_blocks:>7}"
+            )
+        problems = regressions(benchmark, entry, threshold)
+        if problems:
+            failed.append((calculator_id, problems))
+
+    if args.update:
+        if args.calculator:
+            print("--update needs a full run (omit --calculator)")
+            return 2
+        save_baseline(run)
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    if failed:
+        print(f"\nRegressions (threshold {threshold}x):")
+        for calculator_id, problems in failed:
+            for problem in problems:
+                print(f"  {calculator_id}: {problem}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark import time of the API app and the Celery worker
+Usage: python scripts/benchmark_import_time.py [--runs N]
+
+Each import is timed in a fresh interpreter. "lazy" is what a process pays at
+startup; "eager" additionally loads every calculator, which is what startup
+cost before calculator discovery became lazy.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+TARGETS = {
+    "api": "app.main",
+    "celery worker": "app.workers.tasks",
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+if {eager}:
+    from calculators.registry import registry
+    registry.get_all()
+elapsed = time.perf_counter() - start
+loaded = [name for name in sys.modules if name.count(".") == 2 and name.startswith("calculators.")]
+print(json.dumps({{"seconds": elapsed, "calculator_modules": len(loaded)}}))
+"""
+
+
+def time_import(module: str, eager: bool) -> dict:
+    """Import a module in a fresh interpreter and report time and calculators loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, eager=eager)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API and worker import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--module", action="append", help="Benchmark this module instead (repeatable)")
+    args = parser.parse_args()
+    targets = {module: module for module in args.module} if args.module else TARGETS
+
+    print(f"{'target':<15} {'mode':<6} {'median ms':>10} {'calculator modules':>19}")
+    failed = False
+    for label, module in targets.items():
+        for eager in (False, True):
+            try:
+                samples = [time_import(module, eager) for _ in range(args.runs)]
+            except subprocess.CalledProcessError as e:
+                print(f"{label:<15} failed to import {module}:\n{e.stderr}")
+                failed = True
+                break
+            median_ms = statistics.median(sample["seconds"] for sample in samples) * 1000
+            mode = "eager" if eager else "lazy"
+            print(f"{label:<15} {mode:<6} {median_ms:>10.1f} {samples[-1]['calculator_modules']:>19}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
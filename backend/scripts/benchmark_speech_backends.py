@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark speech backends for ambient transcription
+Usage: python scripts/benchmark_speech_backends.py [--backend NAME ...] [--size SIZE ...] [--seconds S] [--wav FILE]
+
+Loads every installed backend (faster-whisper, whisper) at each model size
+and reports its real-time factor (RTF: seconds of compute per second of
+audio). An RTF below 1.0 keeps up with a live exam-room stream; run this on
+the target machine to pick AMBIENT_SPEECH_BACKEND / AMBIENT_MODEL_SIZE, or
+leave them on auto. Ends with the backend AMBIENT_SPEECH_BACKEND=auto would
+choose.
+"""
+import argparse
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings  # noqa: E402
+from app.services.ambient.backends import (  # noqa: E402
+    BACKENDS,
+    benchmark_audio,
+    create_backend,
+    measure_rtf,
+    select_backend,
+)
+from app.services.ambient.speech import pcm_to_float32, resample  # noqa: E402
+
+
+def load_wav(path: str) -> np.ndarray:
+    """Mono PCM16 WAV as float32 at 16 kHz."""
+    with wave.open(path, "rb") as reader:
+        if reader.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        frames = reader.readframes(reader.getnframes())
+        audio = pcm_to_float32(frames)
+        if reader.getnchannels() > 1:
+            audio = audio.reshape(-1, reader.getnchannels()).mean(axis=1)
+        return resample(audio, reader.getframerate())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark speech backend real-time factor")
+    parser.add_argument("--backend", nargs="+", default=None,
+                        help=f"Backends to time (default: all installed; choices: {', '.join(BACKENDS)})")
+    parser.add_argument("--size", nargs="+", default=None, help="Model sizes (default: AMBIENT_MODEL_SIZE)")
+    parser.add_argument("--device", default=None, help="cpu, cuda or auto (default: AMBIENT_DEVICE)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of synthetic audio")
+    parser.add_argument("--wav", default=None, help="Time a recording instead of synthetic audio")
+    args = parser.parse_args()
+
+    names = args.backend or [name for name in BACKENDS if name != "stub"]
+    sizes = args.size or [settings.AMBIENT_MODEL_SIZE]
+    audio = load_wav(args.wav) if args.wav else benchmark_audio(args.seconds)
+
+    print(f"{audio.size / 16000:.1f} s of audio, compute type {settings.AMBIENT_COMPUTE_TYPE} on CPU")
+    print(f"{'backend':<16} {'size':<10} {'device':<6} {'load s':>7} {'RTF':>6}")
+    timed = 0
+    for name in names:
+        if not BACKENDS[name].available():
+            print(f"{name:<16} not installed")
+            continue
+        for size in sizes:
+            backend = create_backend(name, size, args.device)
+            try:
+                start = time.perf_counter()
+                backend.load()
+                load_seconds = time.perf_counter() - start
+                rtf = measure_rtf(backend, audio)
+            except Exception as e:
+                print(f"{name:<16} {size:<10} failed: {e}")
+                continue
+            finally:
+                backend.unload()
+            timed += 1
+            marker = "" if rtf < settings.AMBIENT_MAX_RTF else "  (slower than real time)"
+            print(f"{name:<16} {size:<10} {backend.device:<6} {load_seconds:>7.1f} {rtf:>6.2f}{marker}")
+
+    if not timed:
+        print("No speech backend could be timed. Install with: pip install faster-whisper")
+        return 1
+
+    chosen = select_backend(names, model_size=sizes[0], audio=audio)
+    print(f"\nAMBIENT_SPEECH_BACKEND=auto would use {chosen.description}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Generate calculators/manifest.json for lazy calculator discovery
+Usage: python scripts/generate_calculator_manifest.py [--check]
+
+--check exits with status 1 if the committed manifest is out of date.
+"""
+import argparse
+import json
+import sys
+import os
+
+# Add parent directory to path to import calculators
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from calculators.registry import MANIFEST_PATH, scan_calculators
+
+
+def render_manifest() -> str:
+    """Scan the calculator modules and render the manifest JSON."""
+    return json.dumps(scan_calculators(), indent=2) + "\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate the calculator manifest")
+    parser.add_argument("--check", action="store_true", help="Fail if the manifest is out of date")
+    args = parser.parse_args()
+
+    manifest = render_manifest()
+    current = MANIFEST_PATH.read_text() if MANIFEST_PATH.exists() else None
+
+    if args.check:
+        if manifest != current:
+            print(f"{MANIFEST_PATH} is out of date; run scripts/generate_calculator_manifest.py")
+            return 1
+        print(f"{MANIFEST_PATH} is up to date")
+        return 0
+
+    MANIFEST_PATH.write_text(manifest)
+    print(f"Wrote {len(json.loads(manifest)['calculators'])} calculators to {MANIFEST_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Ambient listening replay and load test
+
+Streams recorded or synthetic conversations through the /ambient/stream
+WebSocket protocol, for N concurrent exam rooms, at real-time or accelerated
+speed, and reports:
+
+- End-to-end latency per transcript: from the moment the last audio of an
+  utterance was sent to the moment its transcript arrived (includes the VAD
+  pause that ends the utterance)
+- Real-time factor per session: wall time / audio duration (1/speed when the
+  server keeps up)
+- Dropped and superseded chunks
+- Server CPU and memory (psutil if installed, else /proc), client CPU
+
+Usage:
+    # Against a running server (start it with AMBIENT_SPEECH_BACKEND=stub to
+    # measure the pipeline without a speech model); the stream requires an
+    # access token
+    python tests/load_tests/ambient_replay.py --token "$TOKEN" --sessions 8 --speed 4
+
+    # Recorded encounters (16-bit WAV, any rate), cycled across sessions
+    python tests/load_tests/ambient_replay.py --wav visit1.wav visit2.wav --sessions 4
+
+    # CI: no server and no model download; the ambient router runs in this
+    # process with the stub speech backend
+    python tests/load_tests/ambient_replay.py --in-process --sessions 4 --speed 10 --max-p95 5
+
+Exits non-zero if a session fails or --max-p95 is exceeded.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+SAMPLE_RATE = 16000
+DEFAULT_URL = "ws://localhost:8000/api/v1/ambient/stream"
+
+
+# ---------------------------------------------------------------------------
+# Audio
+# ---------------------------------------------------------------------------
+
+def synthetic_conversation(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Alternating speech turns (1.5-5 s of voiced, syllabic audio) and pauses
+    (0.7-1.5 s of room noise), as PCM16.
+    """
+    from app.services.ambient.backends import benchmark_audio
+
+    rng = np.random.default_rng(seed)
+    parts = []
+    total = 0.0
+    while total < seconds:
+        turn = float(rng.uniform(1.5, 5.0))
+        pause = float(rng.uniform(0.7, 1.5))
+        parts.append(benchmark_audio(turn, seed=int(rng.integers(1 << 16))))
+        parts.append(rng.normal(0, 0.002, int(pause * SAMPLE_RATE)).astype(np.float32))
+        total += turn + pause
+    audio = np.concatenate(parts)[:int(seconds * SAMPLE_RATE)]
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def load_wav(path: str) -> np.ndarray:
+    """16-bit WAV as mono PCM16 at 16 kHz."""
+    from app.services.ambient.speech import pcm_to_float32, resample
+
+    with wave.open(path, "rb") as reader:
+        if reader.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        audio = pcm_to_float32(reader.readframes(reader.getnframes()))
+        if reader.getnchannels() > 1:
+            audio = audio.reshape(-1, reader.getnchannels()).mean(axis=1)
+        audio = resample(audio, reader.getframerate())
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+
+class WebSocketConnection:
+    """Client connection to a running server (websockets package)."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._socket = None
+
+    async def open(self):
+        import websockets
+
+        self._socket = await websockets.connect(self.url, max_size=None)
+
+    async def send_bytes(self, data: bytes):
+        await self._socket.send(data)
+
+    async def send_json(self, message: dict):
+        await self._socket.send(json.dumps(message))
+
+    async def receive_json(self) -> Optional[dict]:
+        import websockets
+
+        try:
+            return json.loads(await self._socket.recv())
+        except websockets.ConnectionClosed:
+            return None
+
+    async def close(self):
+        await self._socket.close()
+
+
+class InProcessConnection:
+    """
+    Connection to the ambient router running in this process (Starlette
+    TestClient); blocking calls run on a dedicated thread pool.
+    """
+
+    def __init__(self, client, pool: ThreadPoolExecutor, token: str):
+        self._client = client
+        self._pool = pool
+        self._token = token
+        self._context = None
+        self._socket = None
+
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def open(self):
+        self._context = self._client.websocket_connect(f"/api/v1/ambient/stream?token={self._token}")
+        self._socket = await self._call(self._context.__enter__)
+
+    async def send_bytes(self, data: bytes):
+        await self._call(self._socket.send_bytes, data)
+
+    async def send_json(self, message: dict):
+        await self._call(self._socket.send_json, message)
+
+    async def receive_json(self) -> Optional[dict]:
+        from starlette.websockets import WebSocketDisconnect
+
+        try:
+            return await self._call(self._socket.receive_json)
+        except WebSocketDisconnect:
+            return None
+
+    async def close(self):
+        try:
+            await self._call(self._context.__exit__, None, None, None)
+        except Exception:
+            pass
+
+
+def in_process_client(stub_rtf: float):
+    """
+    TestClient for an app with only the ambient router, on the stub backend,
+    and an access token for it.
+    """
+    os.environ.setdefault("AMBIENT_SPEECH_BACKEND", "stub")
+    os.environ.setdefault("AMBIENT_STUB_RTF", str(stub_rtf))
+    os.environ.setdefault("SQLITE_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+    from fastapi import FastAPI
+    from starlette.testclient import TestClient
+
+    from app.api.v1 import ambient
+    from app.core.security import create_access_token
+
+    app = FastAPI()
+    app.include_router(ambient.router, prefix="/api/v1/ambient")
+    return TestClient(app), create_access_token({"sub": "ambient-replay"})
+
+
+# ---------------------------------------------------------------------------
+# Resource sampling
+# ---------------------------------------------------------------------------
+
+class ProcessSampler:
+    """CPU % and RSS of a process, sampled in the background."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.cpu: List[float] = []
+        self.rss_mb: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+        try:
+            import psutil
+            self._process = psutil.Process(pid)
+        except ImportError:
+            self._process = None
+
+    def _cpu_seconds(self) -> float:
+        if self._process is not None:
+            times = self._process.cpu_times()
+            return times.user + times.system
+        with open(f"/proc/{self.pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _rss_mb(self) -> float:
+        if self._process is not None:
+            return self._process.memory_info().rss / 1e6
+        with open(f"/proc/{self.pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1e3
+        return 0.0
+
+    async def _run(self):
+        previous, previous_at = self._cpu_seconds(), time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            cpu, now = self._cpu_seconds(), time.perf_counter()
+            self.cpu.append(100 * (cpu - previous) / (now - previous_at))
+            self.rss_mb.append(self._rss_mb())
+            previous, previous_at = cpu, now
+
+    def start(self):
+        try:
+            self._cpu_seconds()
+        except (OSError, IndexError):
+            print(f"Cannot sample process {self.pid}; install psutil on this platform")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SessionResult:
+    index: int
+    audio_seconds: float
+    wall_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    partial_latencies: List[float] = field(default_factory=list)
+    dropped_messages: int = 0
+    server_stats: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rtf(self) -> float:
+        return self.wall_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+async def replay_session(
+    index: int,
+    connection,
+    audio: np.ndarray,
+    frame_ms: int,
+    speed: float,
+    use_json: bool,
+    timeout: float
+) -> SessionResult:
+    """Stream one conversation and collect what the server sends back."""
+    result = SessionResult(index, audio.size / SAMPLE_RATE)
+    frame = SAMPLE_RATE * frame_ms // 1000
+    frames = [audio[start:start + frame].tobytes() for start in range(0, audio.size, frame)]
+    sent_at: List[float] = []  # Wall time each frame was sent
+
+    def audio_sent_at(stream_time: float) -> Optional[float]:
+        # When the frame holding this stream time had been sent
+        frame_index = min(int(np.ceil(stream_time * SAMPLE_RATE / frame)) - 1, len(frames) - 1)
+        return sent_at[max(frame_index, 0)] if frame_index < len(sent_at) else None
+
+    await connection.open()
+    stopped = asyncio.Event()
+
+    async def receive():
+        while True:
+            message = await connection.receive_json()
+            now = time.perf_counter()
+            if message is None:
+                return
+            kind = message.get("type")
+            if kind in ("transcription", "transcription_partial"):
+                sent = audio_sent_at(message.get("end_time", 0.0))
+                if sent is not None:
+                    target = result.latencies if kind == "transcription" else result.partial_latencies
+                    target.append(now - sent)
+            elif kind == "audio_dropped":
+                result.dropped_messages += 1
+            elif kind == "error":
+                result.errors.append(message.get("message", ""))
+            elif kind == "stopped":
+                result.server_stats = message.get("stats", {})
+                stopped.set()
+                return
+
+    receiver = asyncio.create_task(receive())
+    start = time.perf_counter()
+    try:
+        for position, data in enumerate(frames):
+            if speed > 0:
+                delay = start + position * frame_ms / 1000 / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if use_json:
+                await connection.send_json({
+                    "type": "audio", "data": base64.b64encode(data).decode(), "sample_rate": SAMPLE_RATE
+                })
+            else:
+                await connection.send_bytes(data)
+            sent_at.append(time.perf_counter())
+
+        await connection.send_json({"type": "stop"})
+        await asyncio.wait_for(stopped.wait(), timeout)
+    except asyncio.TimeoutError:
+        result.errors.append(f"no 'stopped' within {timeout:.0f} s")
+    except Exception as e:
+        result.errors.append(str(e))
+    finally:
+        result.wall_seconds = time.perf_counter() - start
+        receiver.cancel()
+        await connection.close()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def summarize(results: List[SessionResult], wall: float, server: Optional[ProcessSampler]) -> dict:
+    latencies = [latency for result in results for latency in result.latencies]
+    partials = [latency for result in results for latency in result.partial_latencies]
+    audio = sum(result.audio_seconds for result in results)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    summary = {
+        "sessions": len(results),
+        "failed_sessions": sum(1 for result in results if result.errors),
+        "audio_seconds": audio,
+        "wall_seconds": wall,
+        "throughput_x_realtime": audio / wall if wall else 0.0,
+        "rtf_mean": statistics.mean(result.rtf for result in results) if results else 0.0,
+        "rtf_max": max((result.rtf for result in results), default=0.0),
+        "transcripts": len(latencies),
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_max": max(latencies, default=float("nan")),
+        "partials": len(partials),
+        "partial_latency_p50": percentile(partials, 50),
+        "dropped": sum(result.server_stats.get("dropped", 0) for result in results),
+        "dropped_messages": sum(result.dropped_messages for result in results),
+        "superseded": sum(result.server_stats.get("superseded", 0) for result in results),
+        "client_cpu_seconds": usage.ru_utime + usage.ru_stime,
+    }
+    if server is not None and server.cpu:
+        summary.update({
+            "server_cpu_mean": statistics.mean(server.cpu),
+            "server_cpu_peak": max(server.cpu),
+            "server_rss_peak_mb": max(server.rss_mb),
+        })
+    return summary
+
+
+def print_report(results: List[SessionResult], summary: dict) -> None:
+    print(f"\n{'session':>7} {'audio s':>8} {'RTF':>6} {'finals':>7} {'p50 s':>6} {'p95 s':>6} "
+          f"{'dropped':>8} {'superseded':>10}  errors")
+    for result in results:
+        print(f"{result.index:>7} {result.audio_seconds:>8.1f} {result.rtf:>6.2f} {len(result.latencies):>7} "
+              f"{percentile(result.latencies, 50):>6.2f} {percentile(result.latencies, 95):>6.2f} "
+              f"{result.server_stats.get('dropped', 0):>8} {result.server_stats.get('superseded', 0):>10}  "
+              f"{'; '.join(result.errors)}")
+
+    print(f"\n{summary['sessions']} sessions, {summary['audio_seconds']:.0f} s of audio in "
+          f"{summary['wall_seconds']:.1f} s ({summary['throughput_x_realtime']:.1f}x real time)")
+    print(f"RTF (wall / audio): mean {summary['rtf_mean']:.2f}, max {summary['rtf_max']:.2f}")
+    print(f"Transcript latency: p50 {summary['latency_p50']:.2f} s, p95 {summary['latency_p95']:.2f} s, "
+          f"max {summary['latency_max']:.2f} s ({summary['transcripts']} transcripts)")
+    print(f"Partial latency: p50 {summary['partial_latency_p50']:.2f} s ({summary['partials']} partials)")
+    print(f"Dropped chunks: {summary['dropped']}, superseded partials: {summary['superseded']}")
+    if "server_cpu_mean" in summary:
+        print(f"Server CPU: mean {summary['server_cpu_mean']:.0f}%, peak {summary['server_cpu_peak']:.0f}%; "
+              f"RSS peak {summary['server_rss_peak_mb']:.0f} MB")
+    print(f"Client CPU: {summary['client_cpu_seconds']:.1f} s")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+async def run(args) -> int:
+    recordings = [load_wav(path) for path in args.wav] if args.wav else None
+    pool = None
+    server_pid = args.server_pid
+
+    if args.in_process:
+        pool = ThreadPoolExecutor(max_workers=2 * args.sessions + 2, thread_name_prefix="replay-client")
+        client, token = in_process_client(args.stub_rtf)
+        client.__enter__()
+        server_pid = os.getpid()
+
+        def connect():
+            return InProcessConnection(client, pool, token)
+    else:
+        def connect():
+            return WebSocketConnection(f"{args.url}?token={args.token}")
+
+    server = ProcessSampler(server_pid) if server_pid else None
+    if server is not None:
+        server.start()
+
+    sessions = []
+    for index in range(args.sessions):
+        audio = recordings[index % len(recordings)] if recordings else synthetic_conversation(args.seconds, seed=index)
+        sessions.append(replay_session(
+            index, connect(), audio, args.frame_ms, args.speed, args.json_frames, args.timeout
+        ))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*sessions)
+    wall = time.perf_counter() - start
+
+    if server is not None:
+        await server.stop()
+    if args.in_process:
+        client.__exit__(None, None, None)
+        pool.shutdown(wait=False)
+
+    summary = summarize(results, wall, server)
+    print_report(results, summary)
+    if args.report:
+        with open(args.report, "w") as report:
+            json.dump({"summary": summary, "sessions": [vars(result) for result in results]}, report, indent=2)
+
+    if summary["failed_sessions"]:
+        return 1
+    if args.max_p95 is not None and not summary["latency_p95"] <= args.max_p95:
+        print(f"p95 latency above {args.max_p95:.2f} s")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay conversations through the ambient WebSocket")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Ambient stream URL of a running server")
+    parser.add_argument("--token", default=os.environ.get("VAUCDA_TOKEN", ""),
+                        help="Access JWT for a running server (default: $VAUCDA_TOKEN)")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run the ambient router in this process on the stub speech backend (no server)")
+    parser.add_argument("--stub-rtf", type=float, default=0.05,
+                        help="Simulated inference time per second of audio for --in-process")
+    parser.add_argument("--server-pid", type=int, default=None, help="Sample CPU/memory of this server process")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent exam rooms")
+    parser.add_argument("--wav", nargs="+", default=None, help="Recordings to replay (default: synthetic)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of synthetic conversations")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed (1 = real time, 0 = unpaced)")
+    parser.add_argument("--frame-ms", type=int, default=100, help="Client frame length")
+    parser.add_argument("--json-frames", action="store_true", help="Send base64 JSON frames instead of binary")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Wait for 'stopped' after the last frame")
+    parser.add_argument("--max-p95", type=float, default=None, help="Fail if p95 transcript latency exceeds this")
+    parser.add_argument("--report", default=None, help="Write the summary and per-session results as JSON")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
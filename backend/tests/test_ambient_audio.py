@@ -0,0 +1,113 @@
+"""
+Tests for the in-memory ambient audio path.
+
+Validates:
+- PCM16 from bytes or buffer views is scaled exactly as before
+- Whisper receives a float32 array at 16 kHz; nothing touches disk
+- Resampling keeps duration
+"""
+
+import tempfile
+
+import numpy as np
+import pytest
+
+from app.services.ambient import speech
+from app.services.ambient.backends import WhisperBackend
+from app.services.ambient.speech import pcm_to_float32, resample, transcribe_pcm
+
+
+class RecordingModel:
+    def __init__(self):
+        self.audio = None
+
+    def transcribe(self, audio, **options):
+        self.audio = audio
+        self.options = options
+        return {"text": " PSA is 8.5", "segments": [{"words": [{"probability": 0.8}, {"probability": 1.0}]}]}
+
+
+def whisper_backend(model) -> WhisperBackend:
+    backend = WhisperBackend("medium.en", device="cpu")
+    backend.model = model
+    return backend
+
+
+@pytest.fixture
+def no_temp_files(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("audio written to a temporary file")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", fail)
+    monkeypatch.setattr(tempfile, "mkstemp", fail)
+
+
+@pytest.mark.unit
+class TestPCMConversion:
+    """Test PCM16 to float32 conversion."""
+
+    def test_matches_previous_scaling(self):
+        samples = np.array([-32768, -1, 0, 1, 16384, 32767], dtype=np.int16)
+
+        audio = pcm_to_float32(samples.tobytes())
+
+        assert audio.dtype == np.float32
+        assert np.array_equal(audio, samples.astype(np.float32) / 32768.0)
+
+    def test_accepts_buffer_views(self):
+        buffer = bytearray(np.arange(8, dtype=np.int16).tobytes())
+
+        assert pcm_to_float32(memoryview(buffer)[4:]).tolist() == [n / 32768 for n in range(2, 8)]
+
+    def test_resample(self):
+        audio = np.sin(np.linspace(0, 20, 8000, dtype=np.float32))
+
+        assert resample(audio, 16000) is audio
+        assert resample(audio, 8000).shape == (16000,)
+        assert resample(audio, 8000).dtype == np.float32
+
+
+@pytest.mark.unit
+class TestInMemoryTranscription:
+    """Test that models are fed arrays, not files."""
+
+    def test_whisper_gets_float_array(self, no_temp_files):
+        model = RecordingModel()
+        pcm = np.full(32000, 1000, dtype=np.int16).tobytes()
+
+        result = transcribe_pcm(whisper_backend(model), pcm, 16000, prompt="Patient reports")
+
+        assert isinstance(model.audio, np.ndarray)
+        assert model.audio.dtype == np.float32 and model.audio.shape == (32000,)
+        assert model.options["initial_prompt"] == "Patient reports"
+        assert model.options["fp16"] is False
+        assert result["text"] == " PSA is 8.5"
+        assert result["confidence"] == pytest.approx(0.9)
+
+    def test_other_rates_resampled_to_16k(self, no_temp_files):
+        model = RecordingModel()
+
+        transcribe_pcm(whisper_backend(model), np.zeros(8000, dtype=np.int16).tobytes(), 8000)
+
+        assert model.audio.shape == (16000,)
+
+    def test_diarization_gets_waveform(self, no_temp_files):
+        torch = pytest.importorskip("torch")
+        received = {}
+
+        class Pipeline:
+            def __call__(self, audio):
+                received.update(audio)
+
+                class Annotation:
+                    def itertracks(self, yield_label=False):
+                        return iter(())
+
+                return Annotation()
+
+        result = speech.diarize_pcm(Pipeline(), np.zeros(16000, dtype=np.int16).tobytes(), 16000)
+
+        assert isinstance(received["waveform"], torch.Tensor)
+        assert tuple(received["waveform"].shape) == (1, 16000)
+        assert received["sample_rate"] == 16000
+        assert result == {"segments": [], "num_speakers": 0}
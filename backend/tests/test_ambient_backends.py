@@ -0,0 +1,212 @@
+"""
+Tests for ambient speech backends.
+
+Validates:
+- Backends are created by name; unknown names are rejected
+- faster-whisper results are mapped to the common result format
+- RTF measurement and automatic selection of the fastest backend
+- Model size steps down when no backend keeps up with real time
+- A smaller model that fails to load keeps the one already loaded
+- Backends that lose the selection are unloaded
+- Batched transcription returns one result per chunk, in order
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.ambient import backends
+from app.services.ambient.speech import transcribe_pcm_batch
+from app.services.ambient.backends import (
+    BACKENDS,
+    FasterWhisperBackend,
+    SpeechBackend,
+    StubBackend,
+    benchmark_audio,
+    create_backend,
+    measure_rtf,
+    select_backend,
+    smaller_sizes,
+)
+
+
+class TimedBackend(StubBackend):
+    """Stub whose RTF depends on model size, standing in for a real model."""
+
+    name = "timed"
+    speeds = {}
+
+    def __init__(self, model_size=None, device=None):
+        super().__init__(model_size, device, rtf=self.speeds.get(model_size, 0.002))
+        self.loaded = False
+
+    def load(self):
+        super().load()
+        self.loaded = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Register fake backends: 'slow' and 'fast' with per-size RTFs."""
+    slow = type("SlowBackend", (TimedBackend,), {"name": "slow", "speeds": {"medium.en": 0.03, "small.en": 0.02}})
+    fast = type("FastBackend", (TimedBackend,), {"name": "fast", "speeds": {"medium.en": 0.01, "small.en": 0.005}})
+    monkeypatch.setattr(backends, "BACKENDS", {"slow": slow, "fast": fast, "stub": StubBackend})
+    return slow, fast
+
+
+@pytest.mark.unit
+class TestBackends:
+    """Test backend construction and result mapping."""
+
+    def test_create_by_name(self):
+        backend = create_backend("stub", "tiny.en", "cpu")
+
+        assert isinstance(backend, StubBackend)
+        assert backend.description == "stub tiny.en on cpu"
+        assert set(BACKENDS) == {"faster-whisper", "whisper", "stub"}
+        with pytest.raises(ValueError):
+            create_backend("kaldi")
+
+    def test_stub_transcribes(self):
+        backend = StubBackend(text="PSA is 8.5")
+        backend.load()
+
+        assert backend.transcribe(np.zeros(16000, dtype=np.float32))["text"] == "PSA is 8.5"
+
+    def test_stub_placeholder_text(self):
+        backend = StubBackend()
+        backend.load()
+
+        result = backend.transcribe(np.zeros(24000, dtype=np.float32))
+
+        assert result["text"] == "[1.5 s of speech]"
+        assert result["segments"][0]["end"] == 1.5
+
+    def test_faster_whisper_result_mapping(self):
+        words = [SimpleNamespace(word=" PSA", start=0.0, end=0.4, probability=0.8),
+                 SimpleNamespace(word=" 8.5", start=0.5, end=0.9, probability=1.0)]
+        segment = SimpleNamespace(start=0.0, end=1.0, text=" PSA 8.5", words=words)
+        calls = {}
+
+        class Model:
+            def transcribe(self, audio, **options):
+                calls.update(options)
+                return iter([segment]), SimpleNamespace(language="en")
+
+        backend = FasterWhisperBackend("small.en", "cpu")
+        backend.model = Model()
+        result = backend.transcribe(np.zeros(16000, dtype=np.float32), prompt="Patient reports")
+
+        assert result["text"] == " PSA 8.5"
+        assert result["confidence"] == pytest.approx(0.9)
+        assert result["segments"][0]["words"][1]["word"] == " 8.5"
+        assert calls["initial_prompt"] == "Patient reports"
+
+    def test_batch_defaults_to_one_by_one(self):
+        class EchoBackend(SpeechBackend):
+            def load(self):
+                pass
+
+            def transcribe(self, audio, prompt=None):
+                return {"text": f"{audio.size}:{prompt}"}
+
+        results = EchoBackend("tiny.en", "cpu").transcribe_batch([np.zeros(10), np.zeros(20)], [None, "PSA"])
+
+        assert [result["text"] for result in results] == ["10:None", "20:PSA"]
+
+    def test_stub_batch_costs_longest_chunk(self):
+        import time
+
+        backend = StubBackend(rtf=0.05, text="ok")
+        audios = [benchmark_audio(seconds) for seconds in (1.0, 0.5, 0.5, 0.25)]
+
+        start = time.perf_counter()
+        results = backend.transcribe_batch(audios, [None] * 4)
+        elapsed = time.perf_counter() - start
+
+        assert [result["text"] for result in results] == ["ok"] * 4
+        assert 0.05 <= elapsed < 0.1
+
+    def test_pcm_batch(self):
+        pcm = np.zeros(8000, dtype=np.int16).tobytes()
+
+        results = transcribe_pcm_batch(StubBackend(text="ok"), [(pcm, 8000), (pcm, 16000)], [None, "PSA"])
+
+        assert [result["text"] for result in results] == ["ok", "ok"]
+        assert transcribe_pcm_batch(object(), [(pcm, 16000), (pcm, 16000)], [None, None]) == [None, None]
+
+    def test_smaller_sizes(self):
+        assert smaller_sizes("medium.en") == ["small.en", "base.en", "tiny.en"]
+        assert smaller_sizes("large-v3") == ["medium", "small", "base", "tiny"]
+        assert smaller_sizes("distil-custom") == []
+
+
+@pytest.mark.unit
+class TestBackendSelection:
+    """Test RTF-based selection."""
+
+    def test_measure_rtf(self):
+        backend = StubBackend(rtf=0.02)
+
+        rtf = measure_rtf(backend, benchmark_audio(seconds=1.0), runs=1)
+
+        assert 0.02 <= rtf < 0.2
+
+    def test_picks_fastest(self, registry):
+        chosen = select_backend(["slow", "fast"], "medium.en", max_rtf=1.0, audio=benchmark_audio(1.0))
+
+        assert (chosen.name, chosen.model_size, chosen.loaded) == ("fast", "medium.en", True)
+
+    def test_steps_down_model_size(self, registry):
+        chosen = select_backend(["slow", "fast"], "medium.en", max_rtf=0.008, audio=benchmark_audio(1.0))
+
+        assert (chosen.name, chosen.model_size) == ("fast", "small.en")
+
+    def test_uses_smallest_when_nothing_keeps_up(self, registry):
+        chosen = select_backend(["slow"], "small.en", max_rtf=0.001, audio=benchmark_audio(1.0))
+
+        assert chosen.model_size == "tiny.en"
+
+    def test_losers_unloaded(self, registry, monkeypatch):
+        created = []
+
+        def create(name, model_size=None, device=None):
+            created.append(create_backend(name, model_size, device))
+            return created[-1]
+
+        monkeypatch.setattr(backends, "create_backend", create)
+        chosen = select_backend(["fast", "slow"], "medium.en", max_rtf=0.008, audio=benchmark_audio(1.0))
+
+        assert [(backend.name, backend.model_size) for backend in created] \
+            == [("fast", "medium.en"), ("slow", "medium.en"), ("fast", "small.en")]
+        assert chosen is created[-1] and chosen.model is not None
+        assert all(backend.model is None for backend in created[:-1])
+
+    def test_smaller_model_load_failure_keeps_current(self, registry, monkeypatch):
+        created = []
+
+        class MediumOnlyBackend(TimedBackend):
+            name = "medium-only"
+            speeds = {"medium.en": 0.01}
+
+            def load(self):
+                created.append(self)
+                if self.model_size != "medium.en":
+                    raise OSError(f"{self.model_size} weights not downloaded")
+                super().load()
+
+        monkeypatch.setitem(backends.BACKENDS, "medium-only", MediumOnlyBackend)
+
+        chosen = select_backend(["medium-only"], "medium.en", max_rtf=0.008, audio=benchmark_audio(1.0))
+
+        assert (chosen.model_size, chosen.loaded) == ("medium.en", True)
+        assert chosen.model is not None
+        assert [backend.model_size for backend in created] == ["medium.en", "small.en", "base.en", "tiny.en"]
+
+    def test_nothing_installed(self, monkeypatch):
+        monkeypatch.setattr(FasterWhisperBackend, "available", classmethod(lambda cls: False))
+        monkeypatch.setattr(backends.WhisperBackend, "available", classmethod(lambda cls: False))
+
+        with pytest.raises(ImportError):
+            select_backend(["faster-whisper", "whisper"])
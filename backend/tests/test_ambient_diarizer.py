@@ -0,0 +1,159 @@
+"""
+Tests for incremental speaker diarization.
+
+Validates:
+- Speaker IDs stay stable across windows whose local labels differ
+- Speakers separated within one window are never merged
+- New speakers are started below the similarity threshold, up to the limit
+- Local labels without a usable embedding are left out
+- Sweep-line alignment matches the exhaustive overlap scan
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.services.ambient import IncrementalDiarizer, SpeakerTurn
+from app.services.ambient.diarizer import align_segments, utterance_speaker
+
+DIM = 192  # pyannote 3.1 (WeSpeaker ResNet34) embedding size
+
+
+@pytest.fixture
+def voices():
+    rng = np.random.default_rng(7)
+    return rng.normal(size=(5, DIM))
+
+
+def window(voices, labels, order, noise=0.3, seed=0):
+    """One window's diarize_pcm() output: local label -> voice index, alternating turns."""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for turn, label in enumerate(order):
+        segments.append({'speaker': label, 'start': turn * 3.0, 'end': turn * 3.0 + 2.5})
+    embeddings = {label: voices[voice] + rng.normal(scale=noise * np.linalg.norm(voices[voice]) / np.sqrt(DIM), size=DIM)
+                  for label, voice in labels.items()}
+    return {'segments': segments, 'embeddings': embeddings}
+
+
+def brute_force(segments, turns):
+    speakers = []
+    for segment in segments:
+        best, best_overlap = None, 0.0
+        for turn in turns:
+            overlap = min(segment['end'], turn.end) - max(segment['start'], turn.start)
+            if overlap > best_overlap:
+                best, best_overlap = turn.speaker, overlap
+        speakers.append(best)
+    return speakers
+
+
+@pytest.mark.unit
+class TestIncrementalDiarizer:
+    """Test session speaker assignment."""
+
+    def test_labels_stable_across_windows(self, voices):
+        diarizer = IncrementalDiarizer(similarity=0.3, max_speakers=4)
+
+        first = diarizer.update(window(voices, {"SPEAKER_00": 0, "SPEAKER_01": 1}, ["SPEAKER_00", "SPEAKER_01"]))
+        # pyannote numbers speakers by first appearance, so labels swap here
+        second = diarizer.update(
+            window(voices, {"SPEAKER_00": 1, "SPEAKER_01": 0}, ["SPEAKER_00", "SPEAKER_01"], seed=1),
+            offset=30.0
+        )
+
+        assert [turn.speaker for turn in first] == ["SPEAKER_00", "SPEAKER_01"]
+        assert [turn.speaker for turn in second] == ["SPEAKER_01", "SPEAKER_00"]
+        assert second[0] == SpeakerTurn("SPEAKER_01", 30.0, 32.5)
+        assert diarizer.speakers == ["SPEAKER_00", "SPEAKER_01"]
+
+    def test_new_speaker_joins(self, voices):
+        diarizer = IncrementalDiarizer(similarity=0.3, max_speakers=4)
+        diarizer.update(window(voices, {"SPEAKER_00": 0, "SPEAKER_01": 1}, ["SPEAKER_00", "SPEAKER_01"]))
+
+        turns = diarizer.update(
+            window(voices, {"SPEAKER_00": 1, "SPEAKER_01": 2}, ["SPEAKER_00", "SPEAKER_01"], seed=2),
+            offset=30.0
+        )
+
+        assert [turn.speaker for turn in turns] == ["SPEAKER_01", "SPEAKER_02"]
+        assert diarizer.speech_seconds == {"SPEAKER_00": 2.5, "SPEAKER_01": 5.0, "SPEAKER_02": 2.5}
+
+    def test_one_to_one_within_window(self, voices):
+        diarizer = IncrementalDiarizer(similarity=0.3, max_speakers=4)
+        diarizer.update(window(voices, {"SPEAKER_00": 0}, ["SPEAKER_00"]))
+
+        # Both local speakers resemble speaker 0 (A: ~0.85); only the closer one gets it
+        mapping = diarizer.assign({"A": voices[0] + 0.6 * voices[3], "B": voices[0]}, {"A": 1.0, "B": 1.0})
+
+        assert mapping == {"B": "SPEAKER_00", "A": "SPEAKER_01"}
+
+    def test_speaker_limit(self, voices):
+        diarizer = IncrementalDiarizer(similarity=0.3, max_speakers=2)
+        diarizer.update(window(voices, {"SPEAKER_00": 0, "SPEAKER_01": 1}, ["SPEAKER_00", "SPEAKER_01"]))
+
+        mapping = diarizer.assign({"SPEAKER_00": voices[2]}, {"SPEAKER_00": 2.0})
+
+        assert mapping["SPEAKER_00"] in {"SPEAKER_00", "SPEAKER_01"}
+        assert len(diarizer.speakers) == 2
+
+    def test_unusable_embedding_dropped(self, voices):
+        diarizer = IncrementalDiarizer()
+        result = window(voices, {"SPEAKER_00": 0, "SPEAKER_01": 1}, ["SPEAKER_00", "SPEAKER_01"])
+        result['embeddings']["SPEAKER_01"] = np.full(DIM, np.nan)
+
+        turns = diarizer.update(result)
+
+        assert [turn.speaker for turn in turns] == ["SPEAKER_00"]
+
+    def test_without_embeddings_keeps_local_labels(self):
+        result = {'segments': [{'speaker': "SPEAKER_03", 'start': 1.0, 'end': 2.0}], 'embeddings': None}
+
+        turns = IncrementalDiarizer().update(result, offset=60.0)
+
+        assert turns == [SpeakerTurn("SPEAKER_03", 61.0, 62.0)]
+
+
+@pytest.mark.unit
+class TestAlignment:
+    """Test word/turn alignment."""
+
+    def test_matches_exhaustive_scan(self):
+        rng = np.random.default_rng(3)
+        starts = np.sort(rng.uniform(0, 300, 400))
+        turns = [SpeakerTurn(f"S{rng.integers(3)}", start, start + rng.uniform(0.2, 6)) for start in starts]
+        word_starts = np.sort(rng.uniform(0, 300, 1000))
+        words = [{'start': start, 'end': start + rng.uniform(0.05, 0.8)} for start in word_starts]
+
+        assert align_segments(words, turns) == brute_force(words, turns)
+
+    def test_gaps_and_empty(self):
+        turns = [SpeakerTurn("A", 0.0, 1.0), SpeakerTurn("B", 2.0, 3.0)]
+        words = [{'start': 0.2, 'end': 0.4}, {'start': 1.2, 'end': 1.8}, {'start': 2.9, 'end': 3.5}]
+
+        assert align_segments(words, turns) == ["A", None, "B"]
+        assert align_segments(words, []) == [None, None, None]
+
+    def test_utterance_speaker_by_word_time(self):
+        turns = [SpeakerTurn("A", 0.0, 1.0), SpeakerTurn("B", 1.0, 4.0)]
+        words = [{'start': 0.1, 'end': 0.9}, {'start': 1.1, 'end': 1.5}, {'start': 1.6, 'end': 2.4}]
+
+        assert utterance_speaker(words, turns) == "B"
+        assert utterance_speaker(words, []) is None
+
+
+@pytest.mark.performance
+class TestAlignmentScaling:
+    """Alignment cost grows with words + turns, not words x turns."""
+
+    def test_long_encounter(self):
+        turns = [SpeakerTurn("AB"[index % 2], index * 2.0, index * 2.0 + 1.9) for index in range(5000)]
+        words = [{'start': index * 0.25, 'end': index * 0.25 + 0.2} for index in range(40000)]
+
+        start = time.perf_counter()
+        speakers = align_segments(words, turns)
+        elapsed = time.perf_counter() - start
+
+        assert speakers[:8] == ["A"] * 8 and speakers[8] == "B"
+        assert elapsed < 1.0
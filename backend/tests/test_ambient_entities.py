@@ -0,0 +1,163 @@
+"""
+Tests for ambient entity extraction.
+
+Validates:
+- Each fragment gets a regex pass only; values split across fragments are found
+- Only new or changed entities are emitted
+- The LLM pass runs after a pause, at most once per interval, over the rolling window
+- LLM requests drop by an order of magnitude for a streaming session
+- Closing flushes or discards the pending LLM pass
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ambient import AmbientEntityTracker
+from app.services.entity_extractor import ClinicalEntityExtractor
+
+
+class FakeLLM:
+    """LLMManager stand-in that records prompts."""
+
+    def __init__(self, response: str = '{"age": 72}', delay: float = 0.0):
+        self.response = response
+        self.delay = delay
+        self.prompts = []
+
+    async def generate(self, prompt, **options):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content=self.response)
+
+
+def make_tracker(llm: FakeLLM, interval: float = 60.0, debounce: float = 60.0, window_chars: int = 4000):
+    deltas = []
+
+    async def on_entities(entities):
+        deltas.append({entity['field']: entity['value'] for entity in entities})
+
+    tracker = AmbientEntityTracker(
+        ClinicalEntityExtractor(llm), on_entities,
+        interval=interval, debounce=debounce, window_chars=window_chars
+    )
+    return tracker, deltas
+
+
+@pytest.mark.unit
+class TestRegexPass:
+    """Test per-fragment extraction."""
+
+    def test_patterns_compiled_once(self):
+        assert set(ClinicalEntityExtractor._COMPILED_PATTERNS) == set(ClinicalEntityExtractor.ENTITY_PATTERNS)
+
+    def test_fragment_uses_regex_only(self):
+        llm = FakeLLM()
+        tracker, deltas = make_tracker(llm)
+
+        async def run():
+            await tracker.add_text("His PSA level 8.5 today.")
+            await tracker.close()
+
+        asyncio.run(run())
+
+        assert deltas == [{"psa": 8.5}]
+        assert llm.prompts == []
+
+    def test_only_changes_emitted(self):
+        tracker, deltas = make_tracker(FakeLLM())
+
+        async def run():
+            await tracker.add_text("PSA level 8.5")
+            await tracker.add_text("so the PSA level 8.5 again")
+            await tracker.add_text("heart rate HR: 76")
+            await tracker.add_text("repeat PSA level 9.1")
+            await tracker.close()
+
+        asyncio.run(run())
+
+        assert deltas == [{"psa": 8.5}, {"heart_rate": 76}, {"psa": 9.1}]
+
+    def test_value_split_across_fragments(self):
+        tracker, deltas = make_tracker(FakeLLM())
+
+        async def run():
+            await tracker.add_text("and the PSA level")
+            await tracker.add_text("8.5 nanograms")
+            await tracker.close()
+
+        asyncio.run(run())
+
+        assert deltas == [{"psa": 8.5}]
+
+
+@pytest.mark.unit
+class TestLLMPass:
+    """Test LLM scheduling."""
+
+    def test_runs_after_pause_over_window(self):
+        llm = FakeLLM('{"age": 72, "health_status": "good"}')
+        tracker, deltas = make_tracker(llm, interval=0.2, debounce=0.05, window_chars=30)
+
+        async def run():
+            for text in ["seventy two year old", "here for follow up", "feeling well overall"]:
+                await tracker.add_text(text)
+            await asyncio.sleep(0.15)
+            await tracker.close()
+
+        asyncio.run(run())
+
+        assert len(llm.prompts) == 1
+        assert "feeling well overall" in llm.prompts[0] and "seventy" not in llm.prompts[0]
+        assert deltas == [{"age": 72, "health_status": "good"}]
+
+    def test_close_flushes_pending_text(self):
+        llm = FakeLLM()
+        tracker, deltas = make_tracker(llm)
+
+        async def run():
+            await tracker.add_text("the patient is seventy two")
+            await tracker.close(flush=True)
+
+        asyncio.run(run())
+
+        assert len(llm.prompts) == 1
+        assert deltas == [{"age": 72}]
+        assert tracker.stats == {"fragments": 1, "llm_passes": 1, "entities": 1}
+
+    def test_close_discards_pending_text(self):
+        llm = FakeLLM()
+        tracker, _ = make_tracker(llm, interval=0.0, debounce=0.2)
+
+        async def run():
+            await tracker.add_text("the patient is seventy two")
+            await tracker.close()
+            await tracker.add_text("ignored after close")
+
+        asyncio.run(run())
+
+        assert llm.prompts == []
+        assert tracker.fragments == 1
+
+
+@pytest.mark.performance
+class TestLLMLoad:
+    """One exam room should not mean an LLM request per fragment."""
+
+    def test_llm_rate_drops_tenfold(self):
+        llm = FakeLLM()
+        tracker, _ = make_tracker(llm, interval=0.3, debounce=0.05)
+
+        async def run():
+            # Continuous speech: a fragment every 10 ms for 1.5 s
+            for index in range(150):
+                await tracker.add_text(f"fragment {index}")
+                await asyncio.sleep(0.01)
+            await tracker.close(flush=True)
+
+        asyncio.run(run())
+
+        assert tracker.fragments == 150
+        assert 2 <= tracker.llm_passes <= 15
+        assert len(llm.prompts) == tracker.llm_passes
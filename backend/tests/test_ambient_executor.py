@@ -0,0 +1,448 @@
+"""
+Tests for the ambient transcription executor.
+
+Validates:
+- Inference runs in the pool; the event loop stays responsive
+- The model is loaded once, in a worker
+- Chunks from one session are transcribed in order
+- Overflowing and stale chunks are dropped, not transcribed late
+- Closing a session discards or drains its queue
+- The transcript so far is passed as the prompt; stale partials are skipped
+- Chunks from concurrent sessions are decoded in shared batches
+- Diarization runs in its own pool and never delays transcription
+- The speech backend is preloaded at startup; failures are only logged
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.ambient import AudioChunk, DiarizationExecutor, TranscriptionExecutor, preload_speech_backend
+from app.services.ambient import executor as executor_module
+
+SAMPLE_RATE = 16000
+
+
+def chunk(label: str, seconds: float = 2.0, age: float = 0.0, final: bool = True) -> AudioChunk:
+    audio = label.encode().ljust(int(seconds * SAMPLE_RATE * 2), b"\0")
+    return AudioChunk(audio, SAMPLE_RATE, received_at=time.monotonic() - age, final=final)
+
+
+class StubModel:
+    """Blocking stand-in for Whisper: sleeps, then echoes the chunk label."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.loads = 0
+        self.threads = set()
+        self.prompts = []
+
+    def load(self):
+        self.loads += 1
+        return self
+
+    def transcribe(self, model, audio: bytes, sample_rate: int, prompt=None):
+        self.threads.add(threading.current_thread().name)
+        self.prompts.append(prompt)
+        time.sleep(self.delay)
+        return {"text": audio.rstrip(b"\0").decode(), "confidence": 0.9}
+
+
+class BatchModel(StubModel):
+    """Batched stand-in: one call costs `delay` whatever the batch size."""
+
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        super().__init__(delay)
+        self.batch_sizes = []
+        self.fail = fail
+
+    def transcribe_batch(self, model, audio_chunks, prompts):
+        self.batch_sizes.append(len(audio_chunks))
+        self.prompts.extend(prompts)
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("decoder out of memory")
+        return [{"text": audio.rstrip(b"\0").decode(), "confidence": 0.9} for audio, _ in audio_chunks]
+
+
+def make_executor(model: StubModel, workers: int = 1) -> TranscriptionExecutor:
+    return TranscriptionExecutor(workers=workers, model_loader=model.load, transcribe=model.transcribe)
+
+
+def make_batch_executor(model: BatchModel, max_batch: int = 8, window: float = 0.02) -> TranscriptionExecutor:
+    return TranscriptionExecutor(
+        workers=1, model_loader=model.load, transcribe=model.transcribe,
+        transcribe_batch=model.transcribe_batch, max_batch=max_batch, batch_window=window
+    )
+
+
+def stream_rooms(executor: TranscriptionExecutor, rooms: int, chunks: int):
+    """Each room submits `chunks` chunks; returns texts per room and the wall time."""
+    recorders = [Recorder() for _ in range(rooms)]
+
+    async def run():
+        sessions = [executor.open_session(r.on_result, max_queue=chunks, max_lag=60) for r in recorders]
+        start = time.perf_counter()
+        for index in range(chunks):
+            for room, session in enumerate(sessions):
+                session.submit(chunk(f"room{room}-{index}"))
+        for session in sessions:
+            await session.close(drain=True)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    executor.shutdown(wait=True)
+    return [r.texts for r in recorders], elapsed
+
+
+class Recorder:
+    def __init__(self):
+        self.texts = []
+        self.drops = []
+
+    async def on_result(self, chunk, result):
+        self.texts.append(result["text"] if result else None)
+
+    async def on_drop(self, chunk, reason):
+        self.drops.append((chunk.audio.rstrip(b"\0").decode(), reason))
+
+
+@pytest.mark.unit
+class TestTranscriptionExecutor:
+    """Test the shared worker pool."""
+
+    def test_model_loaded_once_in_worker(self):
+        model = StubModel()
+        executor = make_executor(model, workers=2)
+
+        async def run():
+            await asyncio.gather(executor.load_model(), executor.load_model(), executor.transcribe(chunk("a")))
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert model.loads == 1
+        assert all(name.startswith("ambient-transcribe") for name in model.threads)
+
+    def test_chunk_duration(self):
+        assert chunk("a", seconds=2.0).duration == 2.0
+
+    def test_model_errors_propagate(self):
+        def missing():
+            raise ImportError("whisper")
+
+        executor = TranscriptionExecutor(workers=1, model_loader=missing)
+
+        with pytest.raises(ImportError):
+            asyncio.run(executor.load_model())
+        executor.shutdown()
+
+    def test_diarization_does_not_hold_transcription_worker(self):
+        model = StubModel(delay=0.01)
+        executor = make_executor(model, workers=1)
+        diarizer = DiarizationExecutor(workers=1)
+
+        async def run():
+            diarization = asyncio.ensure_future(diarizer.run(time.sleep, 0.5))
+            start = time.perf_counter()
+            result = await executor.transcribe(chunk("a"))
+            elapsed = time.perf_counter() - start
+            await diarization
+            return result, elapsed
+
+        result, elapsed = asyncio.run(run())
+        executor.shutdown(wait=True)
+        diarizer.shutdown(wait=True)
+
+        assert result["text"] == "a"
+        assert elapsed < 0.3
+
+    def test_preload_at_startup(self, monkeypatch):
+        model = StubModel()
+        executor = make_executor(model)
+        monkeypatch.setattr(executor_module, "_transcription_executor", executor)
+
+        async def run():
+            await preload_speech_backend()
+            await executor.load_model()  # First connection
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert model.loads == 1
+
+    def test_preload_failure_logged(self, monkeypatch):
+        def missing():
+            raise ImportError("whisper")
+
+        executor = TranscriptionExecutor(workers=1, model_loader=missing)
+        monkeypatch.setattr(executor_module, "_transcription_executor", executor)
+
+        asyncio.run(preload_speech_backend())
+        executor.shutdown()
+
+
+@pytest.mark.unit
+class TestTranscriptionSession:
+    """Test per-session queueing."""
+
+    def test_results_in_submission_order(self):
+        model = StubModel(delay=0.01)
+        executor = make_executor(model, workers=3)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=10, max_lag=60)
+            for label in "abcde":
+                session.submit(chunk(label))
+            await session.close(drain=True)
+            return session.stats
+
+        stats = asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert recorder.texts == list("abcde")
+        assert stats == {"submitted": 5, "transcribed": 5, "dropped": 0, "superseded": 0, "pending": 0}
+
+    def test_full_queue_evicts_oldest(self):
+        model = StubModel(delay=0.2)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=2, max_lag=60)
+            session.submit(chunk("a"))
+            await asyncio.sleep(0.05)  # "a" is now in flight
+            evicted = [session.submit(chunk(label)) for label in "bcd"]
+            await session.close(drain=True)
+            return evicted, session.stats
+
+        evicted, stats = asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert [c.audio.rstrip(b"\0").decode() if c else None for c in evicted] == [None, None, "b"]
+        assert recorder.texts == ["a", "c", "d"]
+        assert stats["dropped"] == 1
+
+    def test_stale_chunks_dropped(self):
+        model = StubModel(delay=0.01)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, recorder.on_drop, max_queue=4, max_lag=5)
+            session.submit(chunk("old", age=6))
+            session.submit(chunk("new"))
+            await session.close(drain=True)
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert recorder.texts == ["new"]
+        assert recorder.drops == [("old", "stale")]
+
+    def test_close_discards_queue(self):
+        model = StubModel(delay=0.1)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=4, max_lag=60)
+            for label in "abc":
+                session.submit(chunk(label))
+            await asyncio.sleep(0.02)
+            await session.close()
+            with pytest.raises(RuntimeError):
+                session.submit(chunk("d"))
+            return session.pending
+
+        pending = asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert pending == 0
+        assert recorder.texts == []
+
+    def test_handler_errors_do_not_stop_session(self):
+        model = StubModel(delay=0.01)
+        executor = make_executor(model)
+        texts = []
+
+        async def on_result(chunk, result):
+            texts.append(result["text"])
+            if result["text"] == "a":
+                raise RuntimeError("client went away")
+
+        async def run():
+            session = executor.open_session(on_result, max_queue=4, max_lag=60)
+            session.submit(chunk("a"))
+            session.submit(chunk("b"))
+            await session.close(drain=True)
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert texts == ["a", "b"]
+
+    def test_prompt_carries_final_text(self):
+        model = StubModel(delay=0.01)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=10, max_lag=60)
+            session.submit(chunk("PSA is"))
+            await asyncio.sleep(0.1)
+            session.submit(chunk("eight", final=False))
+            await asyncio.sleep(0.1)
+            session.submit(chunk("eight point five"))
+            await session.close(drain=True)
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        # Partials are decoded with the prompt but do not extend it
+        assert model.prompts == [None, "PSA is", "PSA is"]
+        assert recorder.texts == ["PSA is", "eight", "eight point five"]
+
+    def test_prompt_keeps_recent_text(self):
+        model = StubModel(delay=0)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=200, max_lag=60)
+            for index in range(120):
+                session.submit(chunk(f"word{index}", seconds=0.01))
+            await session.close(drain=True)
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert len(model.prompts[-1]) <= 400
+        assert model.prompts[-1].endswith("word118")
+
+    def test_partial_superseded_by_queued_chunk(self):
+        model = StubModel(delay=0.1)
+        executor = make_executor(model)
+        recorder = Recorder()
+
+        async def run():
+            session = executor.open_session(recorder.on_result, max_queue=4, max_lag=60)
+            session.submit(chunk("a"))
+            await asyncio.sleep(0.02)
+            session.submit(chunk("a b", final=False))
+            session.submit(chunk("a b c"))
+            await session.close(drain=True)
+            return session.stats
+
+        stats = asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert recorder.texts == ["a", "a b c"]
+        assert stats["superseded"] == 1
+
+
+@pytest.mark.unit
+class TestMicroBatching:
+    """Test cross-session batching."""
+
+    def test_sessions_share_batches(self):
+        model = BatchModel(delay=0.02)
+
+        texts, _ = stream_rooms(make_batch_executor(model), rooms=6, chunks=3)
+
+        assert texts == [[f"room{room}-{index}" for index in range(3)] for room in range(6)]
+        assert max(model.batch_sizes) == 6
+        assert sum(model.batch_sizes) == 18 and len(model.batch_sizes) <= 4
+
+    def test_max_batch_size(self):
+        model = BatchModel(delay=0.02)
+
+        texts, _ = stream_rooms(make_batch_executor(model, max_batch=2), rooms=5, chunks=2)
+
+        assert all(len(room_texts) == 2 for room_texts in texts)
+        assert max(model.batch_sizes) == 2
+
+    def test_prompts_stay_per_session(self):
+        model = BatchModel(delay=0.01)
+        executor = make_batch_executor(model)
+        recorders = [Recorder(), Recorder()]
+
+        async def run():
+            sessions = [executor.open_session(r.on_result, max_queue=4, max_lag=60) for r in recorders]
+            sessions[0].submit(chunk("left"))
+            sessions[1].submit(chunk("right"))
+            sessions[0].submit(chunk("left again"))
+            sessions[1].submit(chunk("right again"))
+            for session in sessions:
+                await session.close(drain=True)
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert model.batch_sizes == [2, 2]
+        assert model.prompts == [None, None, "left", "right"]
+
+    def test_lone_session_not_delayed(self):
+        model = BatchModel(delay=0)
+        executor = make_batch_executor(model, window=1.0)
+
+        texts, elapsed = stream_rooms(executor, rooms=1, chunks=3)
+
+        assert texts == [["room0-0", "room0-1", "room0-2"]]
+        assert elapsed < 0.5
+
+    def test_batch_failure_reported_per_chunk(self):
+        model = BatchModel(delay=0.01, fail=True)
+
+        texts, _ = stream_rooms(make_batch_executor(model), rooms=3, chunks=1)
+
+        assert texts == [[None], [None], [None]]
+
+
+@pytest.mark.performance
+class TestBatchThroughput:
+    """More exam rooms should not mean proportionally slower transcripts."""
+
+    def test_throughput_scales_with_sessions(self):
+        rooms, chunks = 8, 3
+        _, batched = stream_rooms(make_batch_executor(BatchModel(delay=0.05)), rooms, chunks)
+        _, unbatched = stream_rooms(make_batch_executor(BatchModel(delay=0.05), max_batch=1), rooms, chunks)
+
+        # Unbatched, every chunk is a full model call (24 x 50 ms)
+        assert unbatched >= rooms * chunks * 0.05
+        assert batched < unbatched / 3
+
+
+@pytest.mark.performance
+class TestEventLoopResponsiveness:
+    """Several exam rooms streaming must not stall other requests."""
+
+    def test_loop_not_blocked_during_inference(self):
+        model = StubModel(delay=0.2)
+        executor = make_executor(model, workers=2)
+        recorder = Recorder()
+
+        async def run():
+            sessions = [executor.open_session(recorder.on_result, max_queue=4, max_lag=60) for _ in range(3)]
+            for session in sessions:
+                session.submit(chunk("room"))
+
+            # Measure how late a stream of short timers fires while inference runs
+            worst = 0.0
+            for _ in range(20):
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                worst = max(worst, time.perf_counter() - start - 0.01)
+
+            for session in sessions:
+                await session.close(drain=True)
+            return worst
+
+        worst_delay = asyncio.run(run())
+        executor.shutdown(wait=True)
+
+        assert worst_delay < 0.05
+        assert recorder.texts == ["room"] * 3
@@ -0,0 +1,99 @@
+"""
+Tests for the ambient PCM16 ring buffer.
+
+Validates:
+- Windows return the samples written, including across the wrap point
+- Windows are zero-copy, read-only views of the preallocated storage
+- Overwritten or unwritten windows are rejected
+- Odd-length frames and frames larger than the buffer
+"""
+
+import numpy as np
+import pytest
+
+from app.services.ambient import PCMRingBuffer
+from app.services.ambient.speech import pcm_to_float32
+
+
+def pcm(values) -> bytes:
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+@pytest.mark.unit
+class TestPCMRingBuffer:
+    """Test writes and windows."""
+
+    def test_window_across_wrap(self):
+        ring = PCMRingBuffer(10)
+        ring.write(pcm(range(8)))
+        ring.write(pcm(range(8, 15)))
+
+        assert ring.written == 15
+        assert ring.oldest == 5
+        assert ring.window(5, 10).tolist() == list(range(5, 15))
+        assert ring.window(7, 4).tolist() == [7, 8, 9, 10]
+
+    def test_windows_are_views(self):
+        ring = PCMRingBuffer(10)
+        ring.write(pcm(range(14)))
+
+        window = ring.window(6, 8)
+
+        assert np.shares_memory(window, ring._data)
+        assert window.flags.c_contiguous
+        with pytest.raises(ValueError):
+            window[0] = 1
+
+    def test_storage_is_preallocated(self):
+        ring = PCMRingBuffer(100)
+        storage = ring._data
+
+        for start in range(0, 1000, 7):
+            ring.write(pcm(range(start, start + 7)))
+
+        assert ring._data is storage
+        assert ring.window(ring.written - 50, 50).tolist() == list(range(ring.written - 50, ring.written))
+
+    def test_window_feeds_models(self):
+        ring = PCMRingBuffer(4)
+        ring.write(pcm([0, 16384, -16384, 8192, 4096]))
+
+        assert pcm_to_float32(ring.window(2, 3)).tolist() == [-0.5, 0.25, 0.125]
+
+    def test_rejects_missing_samples(self):
+        ring = PCMRingBuffer(10)
+        ring.write(pcm(range(15)))
+
+        with pytest.raises(ValueError):
+            ring.window(4, 3)  # Overwritten
+        with pytest.raises(ValueError):
+            ring.window(12, 5)  # Not written yet
+        with pytest.raises(ValueError):
+            ring.window(0, 11)  # Longer than the buffer
+
+    def test_odd_length_frames(self):
+        ring = PCMRingBuffer(10)
+        data = pcm([1, -2, 300])
+
+        assert ring.write(data[:3]) == 1
+        assert ring.write(data[3:]) == 2
+        assert ring.window(0, 3).tolist() == [1, -2, 300]
+
+    def test_frame_larger_than_buffer(self):
+        ring = PCMRingBuffer(4)
+        ring.write(pcm(range(10)))
+
+        assert ring.written == 10
+        assert ring.window(6, 4).tolist() == [6, 7, 8, 9]
+
+    def test_clear(self):
+        ring = PCMRingBuffer(4)
+        ring.write(pcm([5, 6, 7]))
+        ring.clear()
+
+        assert ring.written == 0
+        assert not ring._data.any()
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            PCMRingBuffer(0)
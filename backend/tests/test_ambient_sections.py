@@ -0,0 +1,215 @@
+"""
+Tests for ambient transcript section routing.
+
+Validates:
+- Keywords match whole words only, across word and digit boundaries
+- Overlapping and multi-word keywords are all found in one pass
+- The automaton agrees with a per-keyword word-boundary scan
+- Incremental parsing classifies each sentence once and matches a full parse
+- Incremental merges apply only new sentences
+- Merge sessions continue across Stage-3 requests, per user, until they expire
+"""
+
+import re
+import time
+
+import numpy as np
+import pytest
+
+from app.services.ambient_merge_service import (
+    AmbientMergeSession,
+    AmbientMergeStore,
+    IntelligentNoteMerger,
+    KeywordAutomaton,
+    SectionAwareTranscriptionParser,
+)
+
+SENTENCES = [
+    "He has been getting up three times a night with urgency and a weak stream.",
+    "He tried sildenafil 50mg for his ED.",
+    "On exam the prostate is smooth and enlarged without a nodule.",
+    "His PSA was 4.1 and creatinine is normal.",
+    "We will schedule a follow-up in three months!",
+    "Nothing much else to add?",
+]
+
+
+def brute_force(keywords, text):
+    words = " ".join(KeywordAutomaton.tokenize(text))
+    return {
+        (label, phrase)
+        for label, phrases in keywords.items()
+        for phrase in phrases
+        if re.search(rf"\b{' '.join(KeywordAutomaton.tokenize(phrase))}\b", words)
+    }
+
+
+@pytest.mark.unit
+class TestKeywordAutomaton:
+    """Test multi-pattern matching."""
+
+    def test_whole_words_only(self):
+        automaton = KeywordAutomaton({"MEDICATIONS": ["mg"], "PLAN": ["plan"]})
+
+        assert automaton.find("omg, the planning") == set()
+        assert automaton.find("sildenafil 50mg") == {("MEDICATIONS", "mg")}
+        assert automaton.find("The PLAN.") == {("PLAN", "plan")}
+
+    def test_overlapping_and_multi_word(self):
+        automaton = KeywordAutomaton({
+            "HPI": ["started", "noticed"],
+            "MEDICATIONS": ["started on", "twice daily"],
+            "PLAN": ["follow up", "start"],
+        })
+
+        found = automaton.find("He started on it twice  daily, follow-up soon")
+
+        assert found == {("HPI", "started"), ("MEDICATIONS", "started on"),
+                         ("MEDICATIONS", "twice daily"), ("PLAN", "follow up")}
+
+    def test_failure_links(self):
+        automaton = KeywordAutomaton({"A": ["weak stream", "stream of urine"], "B": ["weak"]})
+
+        assert automaton.find("a weak stream of urine") == {
+            ("A", "weak stream"), ("A", "stream of urine"), ("B", "weak")
+        }
+        assert automaton.scores("weak weak stream") == {"A": 1, "B": 1}
+
+    def test_matches_word_boundary_scan(self):
+        keywords = SectionAwareTranscriptionParser.SECTION_KEYWORDS
+        vocabulary = sorted({token for phrases in keywords.values() for phrase in phrases
+                             for token in KeywordAutomaton.tokenize(phrase)} | {"the", "on", "2", "mg5"})
+        rng = np.random.default_rng(5)
+        automaton = KeywordAutomaton(keywords)
+
+        for _ in range(300):
+            text = " ".join(rng.choice(vocabulary, size=rng.integers(1, 25)))
+            assert automaton.find(text) == brute_force(keywords, text)
+
+
+@pytest.mark.unit
+class TestSectionParser:
+    """Test sentence classification."""
+
+    def test_identify_section(self):
+        parser = SectionAwareTranscriptionParser()
+
+        assert parser._identify_section("He tried sildenafil for his ED")[0] == "SEXUAL_HISTORY"
+        assert parser._identify_section("His PSA is up")[0] == "LABS"
+        assert parser._identify_section("Nothing much else to add") == (None, 0.0)
+
+    def test_incremental_matches_full_parse(self):
+        transcript = " ".join(SENTENCES)
+        parser = SectionAwareTranscriptionParser()
+
+        segments = []
+        for end in range(0, len(transcript) + 1, 17):
+            segments += parser.parse_incremental(transcript[:end])
+        segments += parser.parse_incremental(transcript, final=True)
+
+        assert segments == SectionAwareTranscriptionParser().parse(transcript)
+
+    def test_unterminated_sentence_held_back(self):
+        parser = SectionAwareTranscriptionParser()
+
+        assert parser.parse_incremental("His PSA was") == []
+        assert [segment.section for segment in parser.parse_incremental("His PSA was 4.1. We will")] == ["LABS"]
+        assert parser.parse_incremental("His PSA was 4.1. We will") == []
+        assert [segment.content for segment in parser.parse_incremental("His PSA was 4.1. We will", final=True)] \
+            == ["We will"]
+
+    def test_new_transcription_starts_over(self):
+        parser = SectionAwareTranscriptionParser()
+        parser.parse_incremental("His PSA was 4.1.")
+
+        segments = parser.parse_incremental("We will schedule a biopsy.")
+
+        assert [segment.section for segment in segments] == ["PLAN"]
+
+
+@pytest.mark.unit
+class TestIncrementalMerge:
+    """Test merging a growing transcription."""
+
+    NOTE = "HPI: Follow-up visit.\n\nPLAN:\n- Repeat PSA"
+
+    def test_only_new_sentences_merged(self):
+        merger = IntelligentNoteMerger()
+
+        note = merger.merge(self.NOTE, "We will schedule an MRI.", incremental=True)
+        note = merger.merge(note, "We will schedule an MRI. We will order a biopsy.", incremental=True)
+
+        assert note.count("schedule an MRI") == 1
+        assert "order a biopsy" in note
+
+    def test_nothing_new_returns_note(self):
+        merger = IntelligentNoteMerger()
+        note = merger.merge(self.NOTE, "We will schedule an MRI.", incremental=True)
+
+        assert merger.merge(note, "We will schedule an MRI.", incremental=True) == note
+
+
+@pytest.mark.unit
+class TestMergeSession:
+    """Test Stage-3 merge sessions."""
+
+    NOTE = "HPI: Follow-up visit.\n\nPLAN:\n- Repeat PSA"
+
+    def test_growing_transcription(self):
+        session = AmbientMergeSession(self.NOTE)
+
+        first = session.update("We will schedule an MRI. We will order")
+        second = session.update("We will schedule an MRI. We will order a biopsy.")
+
+        # The unfinished sentence is shown but only merged for good once complete
+        assert "We will order" in first
+        assert session.note.count("We will order") == 1
+        assert second.count("schedule an MRI") == 1
+        assert second.count("order a biopsy") == 1
+        assert session.merger.parser.parsed.endswith("a biopsy.")
+
+    def test_edited_transcription_starts_over(self):
+        session = AmbientMergeSession(self.NOTE)
+        session.update("We will schedule an MRI.")
+
+        note = session.update("We will order a biopsy.")
+
+        assert "schedule an MRI" not in note
+        assert "order a biopsy" in note
+
+    def test_store_scoped_to_owner(self):
+        store = AmbientMergeStore(ttl_seconds=60)
+        session = AmbientMergeSession(self.NOTE)
+        merge_id = store.put("user-1", session)
+
+        assert store.get("user-1", merge_id) is session
+        assert store.get("user-2", merge_id) is None
+        assert store.put("user-1", session, merge_id) == merge_id
+
+    def test_store_expiry_and_bound(self):
+        store = AmbientMergeStore(ttl_seconds=0.05, max_entries=2)
+        ids = [store.put("user-1", AmbientMergeSession(self.NOTE)) for _ in range(3)]
+
+        assert store.get("user-1", ids[0]) is None
+        assert store.get("user-1", ids[2]) is not None
+        time.sleep(0.1)
+        assert store.get("user-1", ids[2]) is None
+
+
+@pytest.mark.performance
+class TestIncrementalCost:
+    """Merging a long visit repeatedly should not re-parse it each time."""
+
+    def test_long_visit(self):
+        transcript = ""
+        parser = SectionAwareTranscriptionParser()
+        classified = 0
+
+        start = time.perf_counter()
+        for index in range(2000):
+            transcript += SENTENCES[index % len(SENTENCES)] + " "
+            classified += len(parser.parse_incremental(transcript))
+        elapsed = time.perf_counter() - start
+
+        assert classified == len(SectionAwareTranscriptionParser().parse(transcript))
+        assert elapsed < 2.0
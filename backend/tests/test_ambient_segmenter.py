@@ -0,0 +1,171 @@
+"""
+Tests for voice-activity segmentation of ambient audio.
+
+Validates (synthetic WAV fixtures, no model):
+- Utterances end at pauses; no word is split between segments
+- Silence and short clicks are never sent for transcription
+- Steady room noise is learned as the noise floor
+- Long speech is cut at the maximum utterance length
+- Partials are offered while speaking; results do not depend on frame size
+- Model calls per minute of audio drop sharply versus fixed 2 s chunks
+"""
+
+import wave
+
+import numpy as np
+import pytest
+
+from app.services.ambient import UtteranceSegmenter
+
+SAMPLE_RATE = 16000
+
+
+def word(rng, seconds: float, level: float = 0.2) -> np.ndarray:
+    """Voiced, amplitude-modulated harmonics standing in for a spoken word."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = rng.uniform(110, 220)
+    voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+    envelope = np.sin(np.pi * t / seconds) ** 0.5
+    return level * envelope * voiced / 2
+
+
+def conversation(rng, utterances, noise_level: float = 0.0005):
+    """
+    Build audio from [(words, pause_after_seconds), ...].
+
+    Returns:
+        (float audio, [(word_start, word_end), ...] in samples)
+    """
+    parts = [np.zeros(SAMPLE_RATE)]  # Leading second of silence
+    words = []
+    position = SAMPLE_RATE
+    for word_count, pause in utterances:
+        for index in range(word_count):
+            audio = word(rng, rng.uniform(0.2, 0.45))
+            words.append((position, position + audio.size))
+            gap = np.zeros(int(rng.uniform(0.05, 0.15) * SAMPLE_RATE)) if index < word_count - 1 else np.zeros(0)
+            parts.extend([audio, gap])
+            position += audio.size + gap.size
+        parts.append(np.zeros(int(pause * SAMPLE_RATE)))
+        position += int(pause * SAMPLE_RATE)
+    audio = np.concatenate(parts)
+    return audio + rng.normal(0, noise_level, audio.size), words
+
+
+@pytest.fixture
+def wav_fixture(tmp_path):
+    """Write audio as a 16 kHz PCM16 WAV file and read it back as samples."""
+    def write_and_read(audio: np.ndarray) -> np.ndarray:
+        path = tmp_path / "encounter.wav"
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(SAMPLE_RATE)
+            writer.writeframes(np.clip(audio * 32767, -32768, 32767).astype(np.int16).tobytes())
+        with wave.open(str(path), "rb") as reader:
+            return np.frombuffer(reader.readframes(reader.getnframes()), dtype=np.int16)
+    return write_and_read
+
+
+def segment(samples: np.ndarray, frame: int = 1600, **options):
+    segmenter = UtteranceSegmenter(SAMPLE_RATE, **{"partial_seconds": 0, **options})
+    segments = []
+    for start in range(0, samples.size, frame):
+        segments.extend(segmenter.push(samples[start:start + frame]))
+    last = segmenter.flush()
+    if last:
+        segments.append(last)
+    return segments
+
+
+UTTERANCES = [(6, 1.5), (3, 2.0), (9, 1.0), (2, 3.0), (7, 1.2), (4, 2.5), (8, 1.0), (5, 2.0)]
+
+
+@pytest.mark.unit
+class TestUtteranceSegmenter:
+    """Test segmentation of synthetic encounters."""
+
+    def test_one_segment_per_utterance(self, wav_fixture):
+        audio, words = conversation(np.random.default_rng(0), UTTERANCES)
+
+        finals = [s for s in segment(wav_fixture(audio)) if s.final]
+
+        assert len(finals) == len(UTTERANCES)
+        for start, end in words:
+            # Every word lies wholly inside one segment
+            assert sum(s.start <= start and end <= s.end for s in finals) == 1
+
+    def test_segments_do_not_overlap(self, wav_fixture):
+        audio, _ = conversation(np.random.default_rng(1), UTTERANCES)
+
+        finals = segment(wav_fixture(audio))
+
+        assert all(a.end <= b.start for a, b in zip(finals, finals[1:]))
+
+    def test_silence_and_clicks_skipped(self, wav_fixture):
+        rng = np.random.default_rng(2)
+        audio = rng.normal(0, 0.0005, 10 * SAMPLE_RATE)
+        audio[5 * SAMPLE_RATE:5 * SAMPLE_RATE + 800] += 0.5  # 50 ms bump
+
+        assert segment(wav_fixture(audio)) == []
+
+    def test_learns_room_noise(self, wav_fixture):
+        rng = np.random.default_rng(3)
+        noise = rng.normal(0, 0.01, 10 * SAMPLE_RATE)  # About -40 dBFS fan hum
+        speech, words = conversation(rng, [(5, 1.5), (4, 1.5)], noise_level=0.01)
+
+        samples = wav_fixture(np.concatenate([noise, speech]))
+        segmenter = UtteranceSegmenter(SAMPLE_RATE, partial_seconds=0)
+        segmenter.push(samples[:noise.size])
+        finals = segmenter.push(samples[noise.size:]) + [segmenter.flush()]
+
+        assert len([s for s in finals if s]) == 2
+
+    def test_long_speech_cut(self, wav_fixture):
+        audio, _ = conversation(np.random.default_rng(4), [(40, 1.0)])
+
+        finals = segment(wav_fixture(audio), max_utterance_seconds=5)
+
+        assert len(finals) >= 3
+        assert all(s.length <= 5 * SAMPLE_RATE for s in finals)
+        assert all(a.end == b.start for a, b in zip(finals, finals[1:]))
+
+    def test_partials_while_speaking(self, wav_fixture):
+        audio, _ = conversation(np.random.default_rng(5), [(12, 1.0)])
+
+        segments = segment(wav_fixture(audio), partial_seconds=1.0)
+        partials = [s for s in segments if not s.final]
+        final = [s for s in segments if s.final]
+
+        assert len(final) == 1
+        assert len(partials) >= 2
+        assert all(p.start == final[0].start and p.end < final[0].end for p in partials)
+
+    @pytest.mark.parametrize("frame", [160, 1001, 32000])
+    def test_independent_of_frame_size(self, wav_fixture, frame):
+        audio, _ = conversation(np.random.default_rng(6), UTTERANCES[:4])
+        samples = wav_fixture(audio)
+
+        assert segment(samples, frame=frame) == segment(samples, frame=samples.size)
+
+
+@pytest.mark.performance
+class TestTranscriptionCompute:
+    """Whisper pads every call to 30 s, so compute scales with call count."""
+
+    def test_calls_per_minute_drop(self, wav_fixture):
+        audio, _ = conversation(np.random.default_rng(7), UTTERANCES * 2)
+        samples = wav_fixture(audio)
+
+        fixed_calls = samples.size // (2 * SAMPLE_RATE)
+        segments = segment(samples, partial_seconds=1.5)
+        finals = [s for s in segments if s.final]
+        partials = [s for s in segments if not s.final]
+        speech_seconds = sum(s.length for s in finals) / SAMPLE_RATE
+
+        # Required calls: one per utterance instead of one per 2 s of audio
+        assert len(finals) <= 0.5 * fixed_calls
+        # Silence is not transcribed
+        assert speech_seconds < 0.8 * samples.size / SAMPLE_RATE
+        # Partials (skipped under load) are bounded by speech time
+        assert len(partials) <= speech_seconds / 1.5
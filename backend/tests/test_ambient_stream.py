@@ -0,0 +1,74 @@
+"""
+Tests for the ambient listening WebSocket.
+
+Validates:
+- Connections without a valid access token are closed with 1008
+- Nothing is loaded for a rejected connection
+- A valid access token reaches model loading
+"""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1 import ambient
+from app.core.security import create_access_token, create_refresh_token
+
+
+class UnavailableExecutor:
+    """Transcription pool whose model never loads; records the attempts."""
+
+    def __init__(self):
+        self.loads = 0
+
+    async def load_model(self):
+        self.loads += 1
+        raise RuntimeError("no model in tests")
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = UnavailableExecutor()
+    monkeypatch.setattr(ambient, "get_transcription_executor", lambda: executor)
+    return executor
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ambient.router, prefix="/api/v1/ambient")
+    return TestClient(app)
+
+
+@pytest.mark.unit
+class TestStreamAuthentication:
+    """Test the token check on connect."""
+
+    @pytest.mark.parametrize("query", [
+        "",
+        "?token=",
+        "?token=not-a-jwt",
+        "?token=" + create_refresh_token({"sub": "1"}),
+        "?token=" + create_access_token({"role": "user"}),
+        "?token=" + create_access_token({"sub": "1"}, expires_delta=timedelta(minutes=-1)),
+    ])
+    def test_rejected(self, client, executor, query):
+        with client.websocket_connect("/api/v1/ambient/stream" + query) as websocket:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+
+        assert closed.value.code == 1008
+        assert executor.loads == 0
+
+    def test_access_token_accepted(self, client, executor):
+        token = create_access_token({"sub": "1"})
+
+        with client.websocket_connect(f"/api/v1/ambient/stream?token={token}") as websocket:
+            message = websocket.receive_json()
+
+        assert message["type"] == "error"
+        assert "Speech model not available" in message["message"]
+        assert executor.loads == 1
@@ -0,0 +1,109 @@
+"""
+Tests for the concurrent calculator batch service.
+
+Validates:
+- Every item produces exactly one result tagged with its index
+- Formatted output / recommendations opt-outs
+- Per-item timeouts do not fail the rest of the batch
+- Unknown calculators and invalid inputs are reported per item
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import calculator_batch
+from app.services.calculator_batch import score_item, stream_batch_results
+
+
+def collect(items, **kwargs):
+    async def run():
+        return [result async for result in stream_batch_results(items, **kwargs)]
+    return asyncio.run(run())
+
+
+RCRI_ITEM = {"calculator_id": "rcricalculator", "inputs": {"risk_factors_count": 2}}
+
+
+@pytest.mark.unit
+class TestScoreItem:
+    """Test single-item scoring."""
+
+    def test_success(self):
+        result = score_item("rcricalculator", {"risk_factors_count": 2})
+
+        assert result["result"] == {"rcri_score": 2, "mace_risk": "6.6%"}
+        assert "formatted_output" in result
+        assert "recommendations" in result
+
+    def test_opt_outs(self):
+        result = score_item(
+            "rcricalculator", {"risk_factors_count": 2},
+            include_formatted_output=False, include_recommendations=False
+        )
+
+        assert "formatted_output" not in result
+        assert "recommendations" not in result
+
+    def test_errors(self):
+        assert score_item(None, {})["error"] == "Missing calculator_id"
+        assert score_item("nonexistent", {})["error"] == "Calculator not found: nonexistent"
+        invalid = score_item("rcricalculator", {"risk_factors_count": 9})
+        assert invalid["error"].startswith("Invalid inputs")
+        assert invalid["errors"] == [{
+            "field": "risk_factors_count", "code": "above_max", "message": "risk_factors_count must be <= 6"
+        }]
+
+
+@pytest.mark.unit
+class TestStreamBatchResults:
+    """Test concurrent streaming of batch results."""
+
+    def test_every_item_returned_once(self):
+        items = [
+            {"calculator_id": "rcricalculator", "inputs": {"risk_factors_count": i % 7}}
+            for i in range(200)
+        ]
+        items.append({"calculator_id": "nonexistent", "inputs": {}})
+
+        results = collect(items, include_formatted_output=False)
+
+        assert sorted(r["index"] for r in results) == list(range(len(items)))
+        by_index = {r["index"]: r for r in results}
+        assert by_index[7]["result"]["rcri_score"] == 0
+        assert "formatted_output" not in by_index[7]
+        assert "error" in by_index[200]
+
+    def test_timeout_is_per_item(self, monkeypatch):
+        """A slow item times out without failing the other items."""
+        def slow_or_fast(calculator_id, inputs, *args):
+            if inputs.get("slow"):
+                time.sleep(0.5)
+            return {"calculator_id": calculator_id}
+
+        monkeypatch.setattr(calculator_batch, "score_item", slow_or_fast)
+        items = [{"calculator_id": "a", "inputs": {"slow": True}}] + [RCRI_ITEM] * 5
+
+        results = collect(items, item_timeout=0.05, executor=ThreadPoolExecutor(max_workers=2))
+
+        by_index = {r["index"]: r for r in results}
+        assert by_index[0]["error"].startswith("Timed out")
+        assert all("error" not in by_index[i] for i in range(1, 6))
+
+    def test_results_stream_in_completion_order(self, monkeypatch):
+        """A fast item is yielded before an earlier slow item finishes."""
+        def delayed(calculator_id, inputs, *args):
+            time.sleep(inputs["delay"])
+            return {"calculator_id": calculator_id}
+
+        monkeypatch.setattr(calculator_batch, "score_item", delayed)
+        items = [
+            {"calculator_id": "slow", "inputs": {"delay": 0.3}},
+            {"calculator_id": "fast", "inputs": {"delay": 0.0}},
+        ]
+
+        results = collect(items, executor=ThreadPoolExecutor(max_workers=2))
+
+        assert [r["index"] for r in results] == [1, 0]
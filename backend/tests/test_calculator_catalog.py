@@ -0,0 +1,130 @@
+"""
+Tests for the precomputed calculator catalog.
+
+Validates:
+- Calculators are shared singletons
+- The discovery manifest is current and calculators load on first use
+- Catalog metadata matches the calculators and is immutable
+- Pre-serialized responses carry ETags and honor If-None-Match
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from starlette.requests import Request
+
+from app.core.http_cache import PrecomputedJSON, PrecomputedJSONCache, precomputed_response
+from calculators.base import CalculatorCategory
+from calculators.registry import MANIFEST_PATH, load_manifest, registry, scan_calculators
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.unit
+class TestCalculatorCatalog:
+    """Test registry singletons and catalog contents."""
+
+    def test_get_returns_shared_instance(self):
+        assert registry.get("capracalculator") is registry.get("capracalculator")
+        assert registry.get("nonexistent") is None
+
+    def test_catalog_matches_calculators(self):
+        catalog = registry.catalog
+
+        assert set(catalog.info) == set(registry.get_all_ids())
+        for calc in registry.get_all():
+            info = catalog.info[calc.calculator_id]
+            assert info["name"] == calc.name
+            assert list(info["required_inputs"]) == calc.required_inputs
+            assert [dict(f) for f in catalog.schemas[calc.calculator_id]] == \
+                [m.to_dict() for m in calc.get_input_schema()]
+
+    def test_category_index(self):
+        prostate = registry.get_by_category(CalculatorCategory.PROSTATE_CANCER)
+
+        assert prostate
+        assert all(calc.category == CalculatorCategory.PROSTATE_CANCER for calc in prostate)
+        assert set(registry.catalog.by_category) == {c.value for c in CalculatorCategory}
+
+    def test_catalog_is_immutable(self):
+        with pytest.raises(TypeError):
+            registry.catalog.info["capracalculator"]["name"] = "changed"
+
+        # Callers get copies they may modify
+        info = registry.get_calculator_info("capracalculator")
+        info["required_inputs"].append("x")
+        assert "x" not in registry.catalog.info["capracalculator"]["required_inputs"]
+
+
+@pytest.mark.unit
+class TestLazyDiscovery:
+    """Test manifest-based discovery."""
+
+    def test_manifest_is_current(self):
+        """Fails when a calculator is added or changed without regenerating the manifest."""
+        assert json.loads(MANIFEST_PATH.read_text()) == scan_calculators(), \
+            "Run scripts/generate_calculator_manifest.py"
+        assert registry.get_all_ids() == [entry["id"] for entry in load_manifest()]
+
+    def test_stale_manifest_is_ignored(self, tmp_path):
+        manifest = json.loads(MANIFEST_PATH.read_text())
+        manifest["modules"] = manifest["modules"][1:]
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(manifest))
+
+        assert load_manifest(path) is None
+        assert load_manifest(tmp_path / "missing.json") is None
+
+    def test_modules_import_on_first_use(self):
+        """A fresh process imports only the calculators it uses."""
+        probe = (
+            "import sys\n"
+            "from calculators.registry import registry\n"
+            "loaded = lambda: sorted(m for m in sys.modules if m.count('.') == 2 and m.startswith('calculators.'))\n"
+            "assert len(registry.get_all_ids()) > 40, registry.get_all_ids()\n"
+            "assert loaded() == [], loaded()\n"
+            "assert registry.get('capracalculator').name\n"
+            "assert loaded() == ['calculators.prostate.capra'], loaded()\n"
+        )
+
+        subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, check=True)
+
+
+@pytest.mark.unit
+class TestPrecomputedResponses:
+    """Test pre-serialized JSON with ETags."""
+
+    def test_body_and_etag(self):
+        payload = PrecomputedJSON.from_payload({"total": 1})
+
+        response = precomputed_response(make_request(), payload)
+
+        assert response.status_code == 200
+        assert json.loads(response.body) == {"total": 1}
+        assert response.headers["etag"] == payload.etag
+
+    def test_not_modified(self):
+        payload = PrecomputedJSON.from_payload({"total": 1})
+
+        assert precomputed_response(make_request(payload.etag), payload).status_code == 304
+        assert precomputed_response(make_request(f'"other", W/{payload.etag}'), payload).status_code == 304
+        assert precomputed_response(make_request('"other"'), payload).status_code == 200
+
+    def test_cache_serializes_once(self):
+        cache = PrecomputedJSONCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"a": 1}
+
+        assert cache.get("k", build) is cache.get("k", build)
+        assert calls == [1]
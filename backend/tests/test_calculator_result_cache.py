@@ -0,0 +1,224 @@
+"""
+Tests for the calculator result cache.
+
+Validates:
+- Hits for repeated inputs, with the cache_hit flag in metadata
+- Canonical keys (key order ignored, value types significant)
+- Cached results are identical to calculated ones and isolated per caller
+- LRU eviction, calculator version invalidation and the Redis level
+- Hit rates recorded in calculator_stats
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.sqlite_models import Base, CalculatorStats
+from app.services.calculator_cache import record_calculator_stats
+from calculators.base import ValidationError
+from calculators.prostate.capra import CAPRACalculator
+from calculators.result_cache import (
+    CalculatorResultCache,
+    ResultCacheStats,
+    _versions,
+    inputs_hash,
+    set_result_cache,
+)
+
+CAPRA_INPUTS = {
+    "age": 65,
+    "psa": 8.5,
+    "gleason_primary": 3,
+    "gleason_secondary": 4,
+    "t_stage": "T2a",
+    "percent_positive_cores": 33.0,
+}
+
+
+class DictRedis:
+    """In-process stand-in for the two Redis commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+@pytest.fixture
+def cache():
+    cache = CalculatorResultCache(max_entries=100)
+    set_result_cache(cache)
+    yield cache
+    set_result_cache(None)
+
+
+@pytest.mark.unit
+class TestCalculatorResultCache:
+    """Test lookups through ClinicalCalculator.run()."""
+
+    def test_miss_then_hit(self, cache):
+        calc = CAPRACalculator()
+
+        first = calc.run(CAPRA_INPUTS)
+        second = calc.run(dict(CAPRA_INPUTS))
+
+        assert first.metadata["cache_hit"] is False
+        assert second.metadata["cache_hit"] is True
+        assert second.result == first.result
+        assert second.format_output() == first.format_output()
+        assert second.raw_inputs == CAPRA_INPUTS
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_no_cache_installed(self):
+        result = CAPRACalculator().run(CAPRA_INPUTS)
+
+        assert "cache_hit" not in result.metadata
+
+    def test_canonical_inputs(self, cache):
+        calc = CAPRACalculator()
+        calc.run(CAPRA_INPUTS)
+
+        reordered = dict(reversed(list(CAPRA_INPUTS.items())))
+        assert calc.run(reordered).metadata["cache_hit"] is True
+
+        as_float = {**CAPRA_INPUTS, "age": 65.0}
+        assert calc.run(as_float).metadata["cache_hit"] is False
+        assert inputs_hash(CAPRA_INPUTS) == inputs_hash(reordered)
+        assert inputs_hash(CAPRA_INPUTS) != inputs_hash(as_float)
+
+    def test_hits_are_isolated(self, cache):
+        """Mutating a returned result does not change the cached entry."""
+        calc = CAPRACalculator()
+        calc.run(CAPRA_INPUTS)
+
+        hit = calc.run(CAPRA_INPUTS)
+        hit.result["total_score"] = -1
+        hit.recommendations.append("changed")
+
+        again = calc.run(CAPRA_INPUTS)
+        assert again.result["total_score"] != -1
+        assert "changed" not in again.recommendations
+
+    def test_invalid_inputs_still_raise(self, cache):
+        with pytest.raises(ValidationError):
+            CAPRACalculator().run({**CAPRA_INPUTS, "psa": -1})
+        assert cache.stats.lookups == 0
+
+    def test_lru_eviction(self):
+        cache = CalculatorResultCache(max_entries=2)
+        set_result_cache(cache)
+        try:
+            calc = CAPRACalculator()
+            for psa in (4.0, 5.0, 6.0):
+                calc.run({**CAPRA_INPUTS, "psa": psa})
+
+            assert calc.run({**CAPRA_INPUTS, "psa": 6.0}).metadata["cache_hit"] is True
+            assert calc.run({**CAPRA_INPUTS, "psa": 4.0}).metadata["cache_hit"] is False
+        finally:
+            set_result_cache(None)
+
+    def test_version_invalidation(self, cache):
+        calc = CAPRACalculator()
+        calc.run(CAPRA_INPUTS)
+
+        previous = _versions[CAPRACalculator]
+        _versions[CAPRACalculator] = "edited"
+        try:
+            assert calc.run(CAPRA_INPUTS).metadata["cache_hit"] is False
+        finally:
+            _versions[CAPRACalculator] = previous
+
+    def test_redis_level_shared_across_caches(self):
+        redis = DictRedis()
+        calc = CAPRACalculator()
+
+        set_result_cache(CalculatorResultCache(redis_client=redis))
+        try:
+            expected = calc.run(CAPRA_INPUTS)
+            assert len(redis.data) == 1
+
+            # A second worker with an empty memory level
+            set_result_cache(CalculatorResultCache(redis_client=redis))
+            shared = calc.run(CAPRA_INPUTS)
+        finally:
+            set_result_cache(None)
+
+        assert shared.metadata["cache_hit"] is True
+        assert shared.result == expected.result
+        assert shared.interpretation == expected.interpretation
+
+    def test_drain_stats(self, cache):
+        calc = CAPRACalculator()
+        calc.run(CAPRA_INPUTS)
+        calc.run(CAPRA_INPUTS)
+
+        pending = cache.drain_stats()
+
+        assert pending["capracalculator"].to_dict() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert cache.drain_stats() == {}
+
+
+@pytest.mark.unit
+class TestRecordCalculatorStats:
+    """Test hit rates written to calculator_stats."""
+
+    def test_sub_millisecond_average(self):
+        """Calculators run in microseconds; the average must not round to zero."""
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            day = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+            async with session_factory() as db:
+                for compute_ms in (0.012, 0.018, 0.03):
+                    await record_calculator_stats(
+                        db, {"capracalculator": ResultCacheStats(misses=1, compute_ms=compute_ms)}, day
+                    )
+
+            async with session_factory() as db:
+                row = (await db.execute(select(CalculatorStats))).scalar_one()
+            await engine.dispose()
+            return row
+
+        row = asyncio.run(scenario())
+
+        assert row.cache_misses == 3
+        assert row.avg_computation_time_ms == pytest.approx(0.02)
+
+    def test_accumulates_per_day(self):
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            day = datetime(2024, 1, 15, 14, 30, tzinfo=timezone.utc)
+
+            async with session_factory() as db:
+                await record_calculator_stats(
+                    db, {"capracalculator": ResultCacheStats(hits=3, misses=1, compute_ms=10.0)}, day
+                )
+                await record_calculator_stats(
+                    db, {"capracalculator": ResultCacheStats(hits=0, misses=1, compute_ms=20.0)}, day
+                )
+
+            async with session_factory() as db:
+                rows = (await db.execute(select(CalculatorStats))).scalars().all()
+            await engine.dispose()
+            return rows
+
+        rows = asyncio.run(scenario())
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert (row.usage_count, row.cache_hits, row.cache_misses) == (5, 3, 2)
+        assert row.avg_computation_time_ms == 15
+        assert row.cache_hit_rate == pytest.approx(0.6)
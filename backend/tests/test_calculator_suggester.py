@@ -0,0 +1,107 @@
+"""
+Tests for registry-driven calculator suggestions.
+
+Validates:
+- Requirements are read from the registry (real calculator IDs and inputs)
+- Bitmask coverage decides confidence and auto-selection
+- Entity field aliases map extractor names to calculator inputs
+- Fully satisfied calculators are run in one batched pass
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.calculator_suggester import (
+    CalculatorRequirements,
+    CalculatorSuggester,
+    RequirementIndex,
+)
+from calculators.registry import registry
+
+
+def entities(**values):
+    return [{"field": field, "value": value} for field, value in values.items()]
+
+
+CAPRA_ENTITIES = entities(
+    psa=8.5,
+    gleason_primary=3,
+    gleason_secondary=4,
+    clinical_stage="T2a",
+    percent_positive_cores=33.0,
+)
+
+
+@pytest.fixture(scope="module")
+def suggester():
+    return CalculatorSuggester()
+
+
+@pytest.mark.unit
+class TestRequirementIndex:
+    """Test the inverted index and bitmask coverage."""
+
+    def test_built_from_registry(self, suggester):
+        ids = [requirements.calculator_id for requirements in suggester.index.calculators]
+
+        assert ids == registry.get_all_ids()
+        capra = suggester.index.calculators[ids.index("capracalculator")]
+        assert set(capra.required) == set(registry.get("capracalculator").required_inputs)
+
+    def test_coverage(self):
+        index = RequirementIndex([
+            CalculatorRequirements("a", "A", "x", required=("psa", "age"), optional=("volume",)),
+            CalculatorRequirements("b", "B", "x", required=("age",), optional=()),
+        ])
+
+        assert index.coverage(["psa", "volume"]) == {0: 0b101}
+        assert index.coverage(["age", "unknown"]) == {0: 0b010, 1: 0b1}
+        assert index.calculators[0].required_mask == 0b11
+
+
+@pytest.mark.unit
+class TestSuggestCalculators:
+    """Test suggestions computed from the index."""
+
+    def test_fully_satisfied_calculator(self, suggester):
+        suggestions = {s["calculator_id"]: s for s in suggester.suggest_calculators(CAPRA_ENTITIES)}
+
+        capra = suggestions["capracalculator"]
+        assert capra["confidence"] == "high"
+        assert capra["auto_selected"] is True
+        assert capra["missing_inputs"] == []
+        # clinical_stage is supplied as the calculator's t_stage input
+        assert capra["detected_entities"]["t_stage"] == "T2a"
+
+    def test_partial_and_sorted(self, suggester):
+        suggestions = suggester.suggest_calculators(entities(psa=8.5, gleason_primary=3))
+
+        by_id = {s["calculator_id"]: s for s in suggestions}
+        assert by_id["capracalculator"]["confidence"] == "low"
+        assert by_id["capracalculator"]["missing_inputs"] == ["gleason_secondary", "t_stage", "percent_positive_cores"]
+        order = {"high": 0, "medium": 1, "low": 2}
+        assert [order[s["confidence"]] for s in suggestions] == sorted(order[s["confidence"]] for s in suggestions)
+
+    def test_only_touched_calculators(self, suggester):
+        assert suggester.suggest_calculators([]) == []
+        assert suggester.suggest_calculators(entities(heart_rate=72)) == []
+
+
+@pytest.mark.unit
+class TestRunSatisfied:
+    """Test the batched auto-run of fully satisfied calculators."""
+
+    def test_runs_auto_selected_only(self, suggester):
+        suggestions = suggester.suggest_calculators(CAPRA_ENTITIES)
+
+        results = asyncio.run(suggester.run_satisfied(suggestions, include_formatted_output=False))
+
+        auto_selected = [s for s in suggestions if s["auto_selected"]]
+        assert [r["calculator_id"] for r in results] == [s["calculator_id"] for s in auto_selected]
+        position = [s["calculator_id"] for s in auto_selected].index("capracalculator")
+        expected = registry.get("capracalculator").run(auto_selected[position]["detected_entities"])
+        assert results[position]["result"]["total_score"] == expected.result["total_score"]
+
+    def test_nothing_to_run(self, suggester):
+        assert asyncio.run(suggester.run_satisfied([])) == []
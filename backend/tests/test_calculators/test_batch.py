@@ -0,0 +1,300 @@
+"""
+Tests for columnar (cohort) calculator scoring.
+
+Validates:
+- Parity with ClinicalCalculator.run() for every vectorized calculator
+- Invalid rows report the same errors as validate_inputs()
+- Parity on messy rows (numeric strings, wrong types, missing cells)
+- Table formats (dict of arrays, list of dicts)
+- Fallback for calculators without vectorized scoring
+- Throughput against the per-dict loop
+"""
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from calculators.base import ValidationError
+from calculators.batch import calculate_batch, to_columns
+from calculators.bladder.eortc_recurrence import EORTCRecurrenceCalculator
+from calculators.prostate.capra import CAPRACalculator
+from calculators.prostate.nccn_risk import NCCNRiskCalculator
+from calculators.prostate.pcpt_risk import PCPTCalculator
+from calculators.surgical.cci import CCICalculator
+from calculators.surgical.life_expectancy_ssa import SSALifeExpectancyCalculator
+from calculators.surgical.rcri import RCRICalculator
+from calculators.voiding.ipss import IPSSCalculator
+
+T_STAGES = ["T1a", "T1b", "T1c", "T2a", "T2b", "T2c", "T3a", "T3b"]
+
+
+def pcpt_row(rng):
+    return {
+        "age": rng.randint(40, 100),
+        "psa": round(rng.uniform(0, 50), 2),
+        "dre_abnormal": rng.random() < 0.3,
+        "african_american": rng.random() < 0.2,
+        "family_history": rng.random() < 0.2,
+        "prior_negative_biopsy": rng.random() < 0.2,
+    }
+
+
+def capra_row(rng):
+    return {
+        "psa": round(rng.uniform(0, 40), 1),
+        "gleason_primary": rng.randint(3, 5),
+        "gleason_secondary": rng.randint(3, 5),
+        "t_stage": rng.choice(T_STAGES),
+        "percent_positive_cores": rng.choice([10.0, 33.9, 34.0, 80.0]),
+    }
+
+
+def nccn_row(rng):
+    row = {
+        "psa": rng.choice([4.0, 9.9, 10.0, 15.0, 20.0, 25.0]),
+        "grade_group": rng.randint(1, 5),
+        "t_stage": rng.choice(T_STAGES + ["T4"]),
+    }
+    if rng.random() < 0.5:
+        row["num_positive_cores"] = rng.randint(0, 12)
+        row["total_cores"] = 12
+    if rng.random() < 0.5:
+        row["psad"] = rng.choice([0.1, 0.2])
+    if rng.random() < 0.2:
+        row["primary_gleason_pattern"] = rng.randint(3, 5)
+    return row
+
+
+def eortc_row(rng):
+    return {
+        "number_of_tumors": rng.choice([1, 2, 7, 8, 12]),
+        "tumor_diameter_cm": rng.choice([1.0, 2.9, 3.0, 5.5]),
+        "prior_recurrence_rate": rng.choice(["primary", "less_than_1_per_year", "more_than_1_per_year"]),
+        "t_category": rng.choice(["Ta", "T1"]),
+        "concurrent_cis": rng.choice(["no", "yes"]),
+        "grade": rng.choice(["G1", "G2", "G3"]),
+    }
+
+
+def rcri_row(rng):
+    return {"risk_factors_count": rng.randint(0, 6)}
+
+
+def ssa_row(rng):
+    row = {"age": rng.choice([0, 37, 40, 64.5, 85, 100]), "gender": rng.choice(["male", "female"])}
+    if rng.random() < 0.7:
+        row["health_status"] = rng.choice(["excellent", "good", "fair", "poor"])
+    if rng.random() < 0.7:
+        row["comorbidities"] = rng.choice([0, 1, 2.5, 4, 20])
+    return row
+
+
+CCI_CONDITIONS = ["MI", "CHF", "diabetes", "CKD", "liver_severe", "metastatic_cancer", "unlisted"]
+
+
+def cci_row(rng):
+    return {
+        "age": rng.choice([18, 49, 50, 65.5, 79, 80, 120]),
+        "comorbidities": rng.sample(CCI_CONDITIONS, rng.randint(0, 4)),
+    }
+
+
+CASES = [
+    (PCPTCalculator, pcpt_row),
+    (CAPRACalculator, capra_row),
+    (NCCNRiskCalculator, nccn_row),
+    (EORTCRecurrenceCalculator, eortc_row),
+    (RCRICalculator, rcri_row),
+    (SSALifeExpectancyCalculator, ssa_row),
+    (CCICalculator, cci_row),
+]
+
+
+def messy_row(row, rng):
+    """Corrupt some cells of a valid row the way hand-built cohort tables do."""
+    row = dict(row)
+    for name in list(row):
+        value, roll = row[name], rng.random()
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if roll < 0.08:
+            row[name] = str(value)
+        elif roll < 0.12 and is_number:
+            row[name] = value + 0.5
+        elif roll < 0.15 and is_number:
+            row[name] = str(value + 0.5)
+        elif roll < 0.17:
+            row[name] = "x"
+        elif roll < 0.19:
+            row[name] = None
+        elif roll < 0.21:
+            row[name] = True
+        elif roll < 0.23:
+            del row[name]
+    return row
+
+
+def as_result_tuple(result):
+    return (
+        result.result,
+        result.interpretation,
+        result.category,
+        result.risk_level,
+        result.recommendations,
+        result.raw_inputs,
+    )
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestBatchParity:
+    """Batch results must be identical to the per-patient API."""
+
+    @pytest.mark.parametrize("calculator_class,make_row", CASES)
+    def test_matches_run(self, calculator_class, make_row):
+        """Every row's lazily built result equals calculator.run(row)."""
+        rng = random.Random(42)
+        rows = [make_row(rng) for _ in range(500)]
+        calc = calculator_class()
+
+        batch = calculate_batch(calc, rows)
+
+        assert calc.supports_batch
+        assert batch.valid.all()
+        for index, row in enumerate(rows):
+            assert as_result_tuple(batch.result(index)) == as_result_tuple(calc.run(row)), row
+
+    @pytest.mark.parametrize("calculator_class,make_row", CASES)
+    def test_messy_rows_match_run(self, calculator_class, make_row):
+        """Mixed, invalid and string inputs are accepted or rejected exactly as run() does."""
+        rng = random.Random(7)
+        rows = [messy_row(make_row(rng), rng) for _ in range(1000)]
+        calc = calculator_class()
+
+        batch = calculate_batch(calc, rows)
+
+        assert not batch.valid.all()
+        for index in range(len(rows)):
+            # Missing cells (None) are absent inputs in a table
+            inputs = batch.inputs(index)
+            try:
+                expected = as_result_tuple(calc.run(inputs))
+            except ValidationError:
+                assert not batch.valid[index], rows[index]
+                assert batch.errors[index] == calc.validate_inputs(inputs)[1], rows[index]
+            except Exception as e:
+                assert not batch.valid[index], rows[index]
+                assert batch.errors[index] == str(e), rows[index]
+            else:
+                assert batch.valid[index], rows[index]
+                assert as_result_tuple(batch.result(index)) == expected, rows[index]
+
+    def test_invalid_rows_report_validate_inputs_errors(self):
+        """Rows rejected by validate_inputs() are invalid with the same message."""
+        calc = PCPTCalculator()
+        rows = [
+            {"age": 65, "psa": 4.5, "dre_abnormal": False, "african_american": False,
+             "family_history": False, "prior_negative_biopsy": False},
+            {"age": 30, "psa": 4.5, "dre_abnormal": False, "african_american": False,
+             "family_history": False, "prior_negative_biopsy": False},
+            {"age": 65, "psa": 4.5, "dre_abnormal": "yes", "african_american": False,
+             "family_history": False, "prior_negative_biopsy": False},
+            {"age": 65, "dre_abnormal": False, "african_american": False,
+             "family_history": False, "prior_negative_biopsy": False},
+        ]
+
+        batch = calculate_batch(calc, rows)
+
+        assert batch.valid.tolist() == [True, False, False, False]
+        for index in (1, 2, 3):
+            assert batch.errors[index] == calc.validate_inputs(rows[index])[1]
+            assert list(batch.results())[index] is None
+        with pytest.raises(ValidationError):
+            batch.result(1)
+
+    def test_scores_are_arrays(self):
+        """Scores are exposed as NumPy arrays for cohort analysis."""
+        rng = random.Random(1)
+        rows = [capra_row(rng) for _ in range(50)]
+        columns = {name: [row[name] for row in rows] for name in rows[0]}
+
+        batch = calculate_batch("capracalculator", columns)
+
+        assert isinstance(batch.scores["total_score"], np.ndarray)
+        assert batch.scores["total_score"].tolist() == [
+            CAPRACalculator().run(row).result["total_score"] for row in rows
+        ]
+        assert set(batch.scores["category"]) <= {"Low Risk", "Intermediate Risk", "High Risk"}
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestBatchTables:
+    """Test table normalization and the per-row fallback."""
+
+    def test_ragged_columns_rejected(self):
+        with pytest.raises(ValueError):
+            to_columns({"age": [65, 70], "psa": [4.5]})
+
+    def test_list_cells(self):
+        """List-valued cells of different lengths stay one list per row."""
+        columns = to_columns([{"comorbidities": ["MI", "CHF"]}, {"comorbidities": ["AIDS"]}])
+
+        assert columns["comorbidities"].tolist() == [["MI", "CHF"], ["AIDS"]]
+
+    def test_unknown_calculator(self):
+        with pytest.raises(ValueError):
+            calculate_batch("nonexistent", {"age": [65]})
+
+    def test_fallback_for_scalar_calculators(self):
+        """Calculators without score_batch() are scored with run() per row."""
+        inputs = {
+            "incomplete_emptying": 2,
+            "frequency": 3,
+            "intermittency": 1,
+            "urgency": 2,
+            "weak_stream": 4,
+            "straining": 0,
+            "nocturia": 2,
+            "qol": 3,
+        }
+
+        batch = calculate_batch(IPSSCalculator(), [inputs, {"frequency": 3}])
+
+        assert batch.scores == {}
+        assert batch.valid.tolist() == [True, False]
+        assert batch.result(0).result == IPSSCalculator().run(inputs).result
+
+
+@pytest.mark.calculator
+@pytest.mark.performance
+class TestBatchThroughput:
+    """Vectorized scoring must be far faster than the per-dict loop."""
+
+    def test_pcpt_throughput(self):
+        rng = np.random.default_rng(0)
+        n_rows = 20_000
+        columns = {
+            "age": rng.integers(40, 101, n_rows),
+            "psa": rng.uniform(0, 50, n_rows),
+            "dre_abnormal": rng.random(n_rows) < 0.3,
+            "african_american": rng.random(n_rows) < 0.2,
+            "family_history": rng.random(n_rows) < 0.2,
+            "prior_negative_biopsy": rng.random(n_rows) < 0.2,
+        }
+        calc = PCPTCalculator()
+        rows = [{name: values[i].item() for name, values in columns.items()} for i in range(n_rows)]
+
+        start = time.perf_counter()
+        for row in rows:
+            calc.run(row)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = calculate_batch(calc, columns)
+        batch_seconds = time.perf_counter() - start
+
+        assert batch.valid.all()
+        # Typically >100x; keep headroom for noisy CI machines
+        assert loop_seconds / batch_seconds > 20
@@ -0,0 +1,78 @@
+"""
+Calculator latency and allocation benchmarks with regression gating.
+
+Every registered calculator is run on its schema examples and compared with
+tests/test_calculators/benchmark_baseline.json. After an intentional change,
+refresh the baseline with:
+
+    python scripts/benchmark_calculators.py --update
+"""
+
+import pytest
+
+from calculators.benchmark import (
+    DEFAULT_THRESHOLD,
+    CalculatorBenchmark,
+    benchmark_calculator,
+    example_inputs,
+    load_baseline,
+    regressions,
+)
+from calculators.registry import registry
+
+BASELINE = load_baseline()
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestBenchmarkHelpers:
+    """Test example inputs and regression detection."""
+
+    def test_example_inputs_are_typed(self):
+        inputs = example_inputs(registry.get("psakineticscalculator"))
+
+        assert inputs["psa_values"] == [4.5, 5.2, 6.1, 7.3]
+        assert isinstance(example_inputs(registry.get("capracalculator"))["psa"], (int, float))
+
+    def test_regressions(self):
+        entry = {"normalized": 1.0, "peak_bytes": 1000}
+
+        def measured(us_per_call, peak_bytes=1000, reference_us=10.0):
+            return CalculatorBenchmark("x", us_per_call, reference_us, us_per_call / reference_us, peak_bytes)
+
+        assert regressions(measured(11.0, peak_bytes=1200), entry) == []
+        assert "latency" in regressions(measured(20.0), entry)[0]
+        assert "peak memory" in regressions(measured(10.0, peak_bytes=10000), entry)[0]
+        assert "no longer runs" in regressions(CalculatorBenchmark("x", skipped="KeyError"), entry)[0]
+        # A slower machine is not a regression
+        assert regressions(measured(20.0, reference_us=20.0), entry) == []
+        # Sub-floor differences are noise whatever the ratio
+        assert regressions(measured(2.0, reference_us=1.0), entry) == []
+
+
+@pytest.mark.calculator
+@pytest.mark.performance
+class TestCalculatorBenchmarks:
+    """Calculators must not regress against the stored baseline."""
+
+    def test_baseline_covers_registry(self):
+        assert BASELINE is not None, "Run: python scripts/benchmark_calculators.py --update"
+        missing = set(registry.get_all_ids()) - set(BASELINE["calculators"])
+        assert not missing, f"Not in benchmark baseline (run --update): {sorted(missing)}"
+
+    @pytest.mark.parametrize("calculator_id", registry.get_all_ids())
+    def test_no_regression(self, calculator_id):
+        entry = (BASELINE or {}).get("calculators", {}).get(calculator_id)
+        if entry is None:
+            pytest.skip("No baseline entry")
+        if "skipped" in entry:
+            pytest.skip(f"Not benchmarked: {entry['skipped']}")
+
+        threshold = BASELINE.get("threshold", DEFAULT_THRESHOLD)
+        calculator = registry.get(calculator_id)
+        problems = regressions(benchmark_calculator(calculator), entry, threshold)
+        if problems:
+            # Re-measure once with more rounds before failing on timer noise
+            problems = regressions(benchmark_calculator(calculator, rounds=21), entry, threshold)
+
+        assert not problems, f"{calculator_id}: " + "; ".join(problems)
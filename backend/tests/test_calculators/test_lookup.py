@@ -0,0 +1,126 @@
+"""
+Tests for precomputed calculator lookup tables.
+
+Validates:
+- Step, interpolation, category and coefficient tables
+- Scalar lookups and array lookups agree exactly
+- Tables are built once per calculator class
+"""
+
+import numpy as np
+import pytest
+
+from calculators.lookup import CategoryTable, CoefficientTable, InterpolationTable, StepTable
+from calculators.prostate.pcpt_risk import LOGITS
+from calculators.surgical.cci import CCICalculator
+from calculators.surgical.life_expectancy_ssa import SSALifeExpectancyCalculator
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestStepTable:
+    """Test interval lookups."""
+
+    def test_cut_offs(self):
+        below = StepTable([50, 60], [0, 1, 2])
+        at_most = StepTable([50, 60], [0, 1, 2], right=True)
+
+        assert [below(x) for x in (49.9, 50, 59, 60, 99)] == [0, 1, 1, 2, 2]
+        assert [at_most(x) for x in (50, 50.1, 60, 60.1)] == [0, 1, 1, 2]
+
+    def test_array_matches_scalar(self):
+        for table in (StepTable([50, 60], [0, 1, 2]), StepTable([50, 60], [0, 1, 2], right=True)):
+            xs = np.array([0, 49.9, 50, 50.1, 60, 61, 200])
+            assert table.take(xs).tolist() == [table(x) for x in xs]
+
+    def test_non_scalar_values(self):
+        table = StepTable([5], [("Limited", "high"), ("Good", "low")])
+
+        assert table(7) == ("Good", "low")
+        assert table.take([1, 7]).tolist() == [("Limited", "high"), ("Good", "low")]
+
+    def test_invalid_tables(self):
+        with pytest.raises(ValueError):
+            StepTable([50, 60], [0, 1])
+        with pytest.raises(ValueError):
+            StepTable([60, 50], [0, 1, 2])
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestInterpolationTable:
+    """Test linear interpolation."""
+
+    TABLE = InterpolationTable.from_mapping({10: 65.3, 0: 74.8, 20: 55.6})
+
+    def test_interpolates_and_clamps(self):
+        assert self.TABLE(10) == 65.3
+        assert self.TABLE(5) == pytest.approx(70.05)
+        assert self.TABLE(-3) == 74.8
+        assert self.TABLE(25) == 55.6
+
+    def test_array_matches_scalar_exactly(self):
+        xs = np.concatenate([np.linspace(-5, 25, 301), [0, 10, 20]])
+
+        assert self.TABLE.take(xs).tolist() == [self.TABLE(x) for x in xs.tolist()]
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestCategoryTable:
+    """Test points by category."""
+
+    TABLE = CategoryTable({"MI": 1, "CKD": 2}, default=0)
+
+    def test_lookup_and_total(self):
+        assert self.TABLE("CKD") == 2
+        assert self.TABLE("unlisted") == 0
+        assert self.TABLE.total(["MI", "CKD", "unlisted"]) == 3
+
+    def test_arrays(self):
+        assert self.TABLE.take(["MI", "x", "CKD"]).tolist() == [1, 0, 2]
+        assert self.TABLE.take_totals([["MI", "CKD"], [], ["CKD"]]).tolist() == [3, 0, 2]
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestCoefficientTable:
+    """Test linear predictors."""
+
+    def test_predict(self):
+        table = CoefficientTable(["a", "b"], {"y": (1.0, [2.0, -0.5]), "z": (0.0, [1.0, 1.0])})
+
+        assert table.predict(3, 4) == (5.0, 7.0)
+        assert table.coefficient("y", "b") == -0.5
+        assert table.weights.tolist() == [[1.0, 2.0, -0.5], [0.0, 1.0, 1.0]]
+
+    def test_array_matches_scalar_exactly(self):
+        rng = np.random.default_rng(0)
+        features = [rng.uniform(0, 100, 200)] + [rng.integers(0, 2, 200).astype(float) for _ in range(5)]
+
+        batch = LOGITS.predict(*features)
+        for row in range(200):
+            assert LOGITS.predict(*(float(column[row]) for column in features)) == (batch[0][row], batch[1][row])
+
+    def test_wrong_arity(self):
+        with pytest.raises(ValueError):
+            CoefficientTable(["a"], {"y": (0.0, [1.0, 2.0])})
+        with pytest.raises(ValueError):
+            LOGITS.predict(1.0)
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestCalculatorTables:
+    """Calculator tables are class attributes shared by every instance."""
+
+    def test_built_once_per_class(self):
+        assert CCICalculator().AGE_POINTS is CCICalculator().AGE_POINTS
+        assert SSALifeExpectancyCalculator().LIFE_TABLES is SSALifeExpectancyCalculator.LIFE_TABLES
+
+    def test_ssa_table_matches_source_data(self):
+        tables = SSALifeExpectancyCalculator.LIFE_TABLES
+
+        for age, expected in SSALifeExpectancyCalculator.LIFE_TABLE_FEMALE.items():
+            assert tables["female"](age) == expected
+        assert tables["male"](45) == pytest.approx((36.8 + 27.8) / 2)
@@ -0,0 +1,187 @@
+"""
+Tests for calculator sensitivity analysis.
+
+Validates:
+- The baseline equals run() and samples stay within the input ranges
+- Tornado data, elasticities and category shares
+- Perturbation specs are checked against the input schema
+- Malformed specs raise ValueError (a 400 from the API), never TypeError
+- Analysis of thousands of samples runs in milliseconds
+"""
+
+import time
+
+import pytest
+
+from calculators.base import ValidationError
+from calculators.prostate.capra import CAPRACalculator
+from calculators.prostate.nccn_risk import NCCNRiskCalculator
+from calculators.prostate.pcpt_risk import PCPTCalculator
+from calculators.sensitivity import Perturbation
+from calculators.voiding.ipss import IPSSCalculator
+
+PCPT_INPUTS = {
+    "age": 65,
+    "psa": 6.5,
+    "dre_abnormal": False,
+    "african_american": False,
+    "family_history": True,
+    "prior_negative_biopsy": False,
+}
+
+CAPRA_INPUTS = {
+    "psa": 8.5,
+    "gleason_primary": 3,
+    "gleason_secondary": 4,
+    "t_stage": "T1c",
+    "percent_positive_cores": 25,
+}
+
+
+def pcpt_risk(**changes):
+    result = PCPTCalculator().run({**PCPT_INPUTS, **changes})
+    return float(result.result["risk_any_cancer"].rstrip("%"))
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestSensitivity:
+    """Test distributions, tornado data and elasticities."""
+
+    def test_psa_range(self):
+        analysis = PCPTCalculator().sensitivity(PCPT_INPUTS, {"psa": {"low": 6.1, "high": 6.5}})
+
+        assert analysis.output == "risk_any_percent"
+        assert analysis.samples == 2000
+        assert round(analysis.baseline, 1) == pcpt_risk()
+        psa = analysis.tornado[0]
+        assert (psa["input"], psa["low"], psa["high"]) == ("psa", 6.1, 6.5)
+        assert round(psa["output_low"], 1) == pcpt_risk(psa=6.1)
+        assert psa["output_low"] <= analysis.distribution["percentiles"]["50"] <= psa["output_high"]
+        assert sum(analysis.distribution["histogram"]["counts"]) == 2000
+
+    def test_uncertain_dre(self):
+        analysis = PCPTCalculator().sensitivity(
+            PCPT_INPUTS, {"psa": {"low": 6.1, "high": 6.5}, "dre_abnormal": {"probability": 0.5}}
+        )
+
+        # An abnormal DRE moves the risk far more than 0.4 ng/mL of PSA
+        assert [entry["input"] for entry in analysis.tornado] == ["dre_abnormal", "psa"]
+        dre = analysis.tornado[0]
+        assert (dre["low"], dre["high"]) == (False, True)
+        assert round(dre["output_high"], 1) == pcpt_risk(dre_abnormal=True)
+        assert sum(analysis.categories["any_cancer_category"].values()) == pytest.approx(1.0)
+
+    def test_elasticities(self):
+        analysis = PCPTCalculator().sensitivity(
+            PCPT_INPUTS, {"psa": {"mean": 6.5, "sd": 0.5}, "age": {"sd": 3}}
+        )
+
+        assert 0 < analysis.elasticities["psa"] < 1
+        assert analysis.elasticities["age"] > 0
+        assert set(analysis.elasticities) == {"psa", "age"}
+
+    def test_reproducible_with_seed(self):
+        calc = PCPTCalculator()
+        spec = {"psa": {"mean": 6.5, "sd": 1.0}}
+
+        assert calc.sensitivity(PCPT_INPUTS, spec).distribution == calc.sensitivity(PCPT_INPUTS, spec).distribution
+        assert calc.sensitivity(PCPT_INPUTS, spec, seed=1).distribution != calc.sensitivity(PCPT_INPUTS, spec).distribution
+
+    def test_points_score_and_enum_input(self):
+        analysis = CAPRACalculator().sensitivity(
+            CAPRA_INPUTS, {"t_stage": {"values": ["T1c", "T2b", "T3a"]}}
+        )
+
+        t_stage = analysis.tornado[0]
+        assert analysis.output == "total_score"
+        assert analysis.baseline == CAPRACalculator().run(CAPRA_INPUTS).result["total_score"]
+        assert (t_stage["low"], t_stage["high"]) == ("T1c", "T3a")
+        assert t_stage["swing"] == 2
+        assert set(analysis.categories["category"]) <= {"Low Risk", "Intermediate Risk", "High Risk"}
+
+    def test_samples_clipped_to_schema(self):
+        analysis = PCPTCalculator().sensitivity(PCPT_INPUTS, {"psa": {"mean": 0.5, "sd": 5}})
+
+        assert analysis.samples == 2000
+        assert analysis.tornado[0]["low"] == 0
+
+    def test_categorical_output(self):
+        inputs = {"psa": 8.0, "grade_group": 1, "t_stage": "T1c"}
+
+        analysis = NCCNRiskCalculator().sensitivity(inputs, {"psa": {"low": 5, "high": 15}})
+
+        assert analysis.output == "risk_category"
+        assert set(analysis.distribution["categories"]) > {analysis.baseline}
+        assert analysis.elasticities == {}
+
+    def test_to_dict(self):
+        data = PCPTCalculator().sensitivity(PCPT_INPUTS, {"psa": {"low": 6.1, "high": 6.5}}, samples=100).to_dict()
+
+        assert set(data) == {
+            "calculator_id", "output", "baseline", "samples", "distribution",
+            "categories", "tornado", "elasticities", "elapsed_ms",
+        }
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestSensitivityErrors:
+    """Test rejected analyses."""
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValidationError):
+            PCPTCalculator().sensitivity({**PCPT_INPUTS, "psa": -1}, {"psa": {"low": 1, "high": 2}})
+
+    @pytest.mark.parametrize("spec", [
+        {"age": {"probability": 0.5}},
+        {"dre_abnormal": {"low": 0, "high": 1}},
+        {"psa": {"low": 7, "high": 6}},
+        {"psa": {"median": 6}},
+        {"unknown": {"low": 1, "high": 2}},
+        {"psa": {"values": 6.5}},
+        {"psa": {"values": "6.5"}},
+        {"psa": {"values": None}},
+        {"psa": {"values": [6.1, 6.5], "weights": 0.5}},
+        {"psa": {"values": [6.1, 6.5], "weights": [0.5, "half"]}},
+        {"psa": {"low": None, "high": 2}},
+        {"psa": {"sd": [1]}},
+        {"dre_abnormal": {"probability": "likely"}},
+    ])
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError):
+            PCPTCalculator().sensitivity(PCPT_INPUTS, spec)
+
+    def test_perturbation_is_abstract(self):
+        with pytest.raises(TypeError):
+            Perturbation("psa")
+
+    def test_enum_values_checked(self):
+        with pytest.raises(ValueError):
+            CAPRACalculator().sensitivity(CAPRA_INPUTS, {"t_stage": {"values": ["T9"]}})
+
+    def test_unknown_output(self):
+        with pytest.raises(ValueError):
+            PCPTCalculator().sensitivity(PCPT_INPUTS, {"psa": {"sd": 1}}, output="missing")
+
+    def test_requires_vectorized_scoring(self):
+        with pytest.raises(ValueError):
+            IPSSCalculator().sensitivity({}, {})
+
+
+@pytest.mark.calculator
+@pytest.mark.performance
+class TestSensitivityLatency:
+    """Analyses must be fast enough to show inline in the calculator UI."""
+
+    def test_thousands_of_samples_in_milliseconds(self):
+        calc = PCPTCalculator()
+        spec = {"psa": {"low": 6.1, "high": 6.5}, "dre_abnormal": {"probability": 0.5}, "age": {"sd": 2}}
+        calc.sensitivity(PCPT_INPUTS, spec, samples=5000)
+
+        start = time.perf_counter()
+        for _ in range(5):
+            calc.sensitivity(PCPT_INPUTS, spec, samples=5000)
+        elapsed_ms = (time.perf_counter() - start) / 5 * 1000
+
+        assert elapsed_ms < 100
@@ -0,0 +1,212 @@
+"""
+Tests for validators compiled from calculator input schemas.
+
+Validates:
+- Structured errors for each rule (missing, type, range, allowed values)
+- Numeric strings pass unless the calculator opts out
+- The generated validate() agrees with errors() for every calculator
+- Column checks agree with per-row validation
+- Calculators with their own validate_inputs() report structured errors
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from calculators.base import InputMetadata, InputType
+from calculators.prostate.capra import CAPRACalculator
+from calculators.prostate.free_psa import FreePSACalculator
+from calculators.prostate.pcpt_risk import PCPTCalculator
+from calculators.registry import registry
+from calculators.validation import CompiledValidator, get_validator
+
+SCHEMA = [
+    InputMetadata("age", "Age", InputType.NUMERIC, min_value=40, max_value=100),
+    InputMetadata("stage", "Stage", InputType.ENUM, allowed_values=["T1", "T2"]),
+    InputMetadata("smoker", "Smoker", InputType.BOOLEAN, required=False),
+    InputMetadata("note", "Note", InputType.TEXT, required=False),
+]
+
+VALID = {"age": 65, "stage": "T1", "smoker": False}
+
+
+def random_value(meta, rng):
+    """A value for a field: usually valid, sometimes missing or invalid."""
+    roll = rng.random()
+    if roll < 0.1:
+        return None
+    if meta.input_type == InputType.NUMERIC:
+        if roll < 0.15:
+            return rng.choice(["12", "1e3", "twelve", "nan"])
+        low = meta.min_value if meta.min_value is not None else 0
+        high = meta.max_value if meta.max_value is not None else low + 10
+        return rng.choice([low - 1, low, (low + high) / 2, high, high + 1, int(high)])
+    if meta.input_type == InputType.ENUM and meta.allowed_values:
+        return rng.choice(list(meta.allowed_values) + ["invalid"] + [str(value) for value in meta.allowed_values])
+    if meta.input_type == InputType.BOOLEAN:
+        return rng.choice([True, False, "yes"])
+    return meta.example or "text"
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestCompiledValidator:
+    """Test the rules compiled from a schema."""
+
+    def setup_method(self):
+        self.validator = CompiledValidator(SCHEMA)
+
+    def test_valid(self):
+        assert self.validator.validate(VALID) == (True, None)
+        assert self.validator.validate({"age": 40.0, "stage": "T2"}) == (True, None)
+        assert self.validator.errors(VALID) == []
+
+    @pytest.mark.parametrize("inputs,field,code", [
+        ({"stage": "T1"}, "age", "missing"),
+        ({"age": float("nan"), "stage": "T1"}, "age", "missing"),
+        ({"age": "sixty-five", "stage": "T1"}, "age", "not_a_number"),
+        ({"age": "nan", "stage": "T1"}, "age", "not_a_number"),
+        ({"age": "65", "stage": "T1"}, "age", "not_a_number"),
+        ({"age": 39, "stage": "T1"}, "age", "below_min"),
+        ({"age": 101, "stage": "T1"}, "age", "above_max"),
+        ({"age": 65, "stage": "T3"}, "stage", "not_allowed"),
+        ({"age": 65, "stage": ["T1"]}, "stage", "not_allowed"),
+        ({"age": 65, "stage": "T1", "smoker": "yes"}, "smoker", "not_boolean"),
+    ])
+    def test_structured_errors(self, inputs, field, code):
+        errors = self.validator.errors(inputs)
+
+        assert [(e.field, e.code) for e in errors] == [(field, code)]
+        assert self.validator.validate(inputs)[0] is False
+        assert errors[0].to_dict()["field"] == field
+
+    def test_missing_reported_first(self):
+        """All missing fields are named before any other error."""
+        assert self.validator.validate({"stage": "T9"}) == (False, "Missing required inputs: age")
+        assert self.validator.validate({}) == (False, "Missing required inputs: age, stage")
+
+    def test_optional_fields_may_be_absent(self):
+        assert self.validator.validate({"age": 65, "stage": "T1", "smoker": None}) == (True, None)
+
+    def test_required_inputs_outside_schema(self):
+        validator = CompiledValidator(SCHEMA, required_inputs=["age", "weight"])
+
+        assert validator.required == ("age", "stage", "weight")
+        assert validator.validate(VALID) == (False, "Missing required inputs: weight")
+
+    def test_numeric_strings(self):
+        validator = CompiledValidator(SCHEMA + [
+            InputMetadata("grade", "Grade", InputType.ENUM, allowed_values=[1, 2, 3]),
+        ], numeric_strings=True)
+        inputs = {"age": "65", "stage": "T1", "grade": "2"}
+
+        assert validator.validate(inputs) == (True, None)
+        assert validator.errors(inputs) == []
+        assert validator.validate({**inputs, "grade": "4"})[0] is False
+        assert validator.validate({**inputs, "stage": "1"})[0] is False
+        assert [e.code for e in validator.errors({**inputs, "age": "39"})] == ["below_min"]
+
+    def test_numeric_strings_opt_out(self):
+        validator = CompiledValidator(SCHEMA)
+        inputs = {"age": "65", "stage": "T1"}
+
+        assert validator.validate(inputs) == (False, "age must be a number")
+        assert [e.code for e in validator.errors(inputs)] == ["not_a_number"]
+
+    def test_compiled_once_per_class(self):
+        assert get_validator(CAPRACalculator()) is get_validator(CAPRACalculator())
+        assert CAPRACalculator().validator is get_validator(CAPRACalculator())
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestValidatorParity:
+    """The generated validate(), errors() and column checks must agree."""
+
+    @pytest.mark.parametrize("calculator_id", registry.get_all_ids())
+    def test_validate_matches_errors(self, calculator_id):
+        calc = registry.get(calculator_id)
+        validator = calc.validator
+        rng = random.Random(calculator_id)
+
+        for _ in range(200):
+            inputs = {meta.field_name: random_value(meta, rng) for meta in validator.schema}
+            errors = validator.errors(inputs)
+            is_valid, message = validator.validate(inputs)
+
+            assert is_valid == (not errors), inputs
+            if errors and errors[0].code != "missing":
+                assert message == errors[0].message
+
+    @pytest.mark.parametrize("calculator_id", registry.get_all_ids())
+    def test_columns_match_rows(self, calculator_id):
+        calc = registry.get(calculator_id)
+        validator = calc.validator
+        rng = random.Random(calculator_id)
+        rows = [
+            {meta.field_name: random_value(meta, rng) for meta in validator.schema}
+            for _ in range(100)
+        ]
+        columns = {
+            meta.field_name: np.array([row[meta.field_name] for row in rows], dtype=object)
+            for meta in validator.schema
+        }
+
+        validation = validator.check_columns(columns, len(rows))
+
+        for index, row in enumerate(rows):
+            expected = {(e.field, e.code) for e in validator.errors(row)}
+            assert {(e.field, e.code) for e in validation.row_errors(index)} == expected, row
+        assert validation.valid.tolist() == [validator.validate(row)[0] for row in rows]
+
+
+@pytest.mark.calculator
+@pytest.mark.unit
+class TestCalculatorValidation:
+    """Test validate_inputs() and input_errors() on calculators."""
+
+    def test_schema_validated_calculator(self):
+        calc = PCPTCalculator()
+        inputs = {"age": 65, "psa": 4.5, "dre_abnormal": "yes", "african_american": False,
+                  "family_history": False, "prior_negative_biopsy": False}
+
+        assert calc.uses_schema_validation
+        assert calc.validate_inputs(inputs) == (False, "dre_abnormal must be true or false")
+        assert [e.code for e in calc.input_errors(inputs)] == ["not_boolean"]
+
+    def test_numeric_string_answers(self):
+        """Questionnaires score string answers as they did with hand-written validators."""
+        calc = registry.get("ipsscalculator")
+        inputs = {question: "2" for question in calc.required_inputs}
+
+        assert calc.validate_inputs(inputs) == (True, None)
+        assert calc.calculate(inputs).result["total_ipss"] == 14
+        assert calc.validate_inputs({**inputs, "nocturia": "9"})[0] is False
+
+    def test_numeric_strings_rejected_when_calculate_needs_numbers(self):
+        for calc in (CAPRACalculator(), PCPTCalculator()):
+            assert not calc.accepts_numeric_strings
+            assert calc.validate_inputs({**{name: 1 for name in calc.required_inputs}, "psa": "4.5"})[0] is False
+
+    @pytest.mark.parametrize("count, expected", [("0.9", 0), ("4.0", 4), ("2", 2), (3.7, 3)])
+    def test_string_counts_scored_like_numbers(self, count, expected):
+        """Every string that passes validation can be calculated."""
+        calc = registry.get("rcricalculator")
+        inputs = {"risk_factors_count": count}
+
+        assert calc.validate_inputs(inputs) == (True, None)
+        assert calc.run(inputs).result["rcri_score"] == expected
+        assert calc.validate_inputs({"risk_factors_count": "two"})[0] is False
+
+    def test_custom_rules_are_kept(self):
+        """Cross-field rules in an overridden validate_inputs() still apply."""
+        calc = FreePSACalculator()
+        inputs = {"total_psa": 4.0, "free_psa": 5.0}
+
+        assert not calc.uses_schema_validation
+        assert calc.validate_inputs(inputs) == (False, "Free PSA cannot exceed total PSA")
+        errors = calc.input_errors(inputs)
+        assert [(e.field, e.code, e.message) for e in errors] == \
+            [(None, "invalid", "Free PSA cannot exceed total PSA")]
+        assert calc.input_errors({"total_psa": 5.0, "free_psa": 1.0}) == []
@@ -0,0 +1,148 @@
+"""
+Tests for the per-note extraction cache.
+
+Validates:
+- Cache hits for unchanged notes, misses for new notes
+- Encrypted persistence across cache instances
+- LRU eviction by entry count
+- Extractor version invalidation
+- Wiring into the Stage-1 note build
+"""
+
+import sqlite3
+
+import pytest
+
+from app.services.note_processing import llm_helper, note_builder
+from app.services.note_processing.extraction_cache import CacheStats, NoteExtractionCache
+from app.services.note_processing.note_builder import build_urology_note_state
+
+
+GU_NOTE = """STANDARD TITLE: UROLOGY OUTPATIENT NOTE
+Date Signed: 01/15/2024
+CC: Elevated PSA
+HPI: 68 year old male with rising PSA, nocturia x2.
+"""
+
+TEST_KEY = "unit-test-extraction-cache-secret"
+
+
+@pytest.mark.unit
+class TestNoteExtractionCache:
+    """Test cache lookup, persistence and eviction."""
+
+    def test_miss_then_hit(self):
+        """Second lookup of the same note is served from cache."""
+        cache = NoteExtractionCache()
+        stats = CacheStats()
+        calls = []
+
+        def extract(content):
+            calls.append(content)
+            return {"CC": "Elevated PSA"}
+
+        first = cache.get_or_extract("gu", GU_NOTE, extract, stats)
+        second = cache.get_or_extract("gu", GU_NOTE, extract, stats)
+
+        assert first == second == {"CC": "Elevated PSA"}
+        assert len(calls) == 1
+        assert stats.to_dict() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_kind_is_part_of_key(self):
+        """GU and non-GU dictionaries for the same text are cached separately."""
+        cache = NoteExtractionCache()
+        cache.put("gu", GU_NOTE, {"CC": "gu"})
+
+        assert cache.get("non_gu", GU_NOTE) is None
+        assert cache.get("gu", GU_NOTE) == {"CC": "gu"}
+
+    def test_returned_dict_is_a_copy(self):
+        """Callers mutating a cached result do not corrupt the cache."""
+        cache = NoteExtractionCache()
+        cache.put("gu", GU_NOTE, {"CC": "Elevated PSA"})
+
+        cache.get("gu", GU_NOTE)["CC"] = "changed"
+
+        assert cache.get("gu", GU_NOTE) == {"CC": "Elevated PSA"}
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted at the entry limit."""
+        cache = NoteExtractionCache(max_entries=2)
+        cache.put("gu", "note a", {"CC": "a"})
+        cache.put("gu", "note b", {"CC": "b"})
+        cache.get("gu", "note a")  # a is now most recently used
+        cache.put("gu", "note c", {"CC": "c"})
+
+        assert cache.get("gu", "note b") is None
+        assert cache.get("gu", "note a") == {"CC": "a"}
+        assert cache.get("gu", "note c") == {"CC": "c"}
+
+    def test_extractor_version_invalidates(self):
+        """Entries written by another extractor version are not reused."""
+        old = NoteExtractionCache(extractor_version="old")
+        old.put("gu", GU_NOTE, {"CC": "stale"})
+        key_old = old.make_key("gu", GU_NOTE)
+
+        new = NoteExtractionCache(extractor_version="new")
+
+        assert new.make_key("gu", GU_NOTE) != key_old
+
+    def test_persistent_level_is_encrypted(self, tmp_path):
+        """Entries survive a restart and are not stored in plaintext."""
+        path = str(tmp_path / "cache.db")
+        writer = NoteExtractionCache(path=path, encryption_key=TEST_KEY)
+        writer.put("gu", GU_NOTE, {"HPI": "rising PSA, nocturia x2"})
+        assert writer.persistent
+
+        reader = NoteExtractionCache(path=path, encryption_key=TEST_KEY)
+        assert reader.get("gu", GU_NOTE) == {"HPI": "rising PSA, nocturia x2"}
+
+        payloads = sqlite3.connect(path).execute("SELECT payload FROM note_extractions").fetchall()
+        assert payloads
+        assert all(b"nocturia" not in bytes(row[0]) for row in payloads)
+
+    def test_no_key_means_memory_only(self, tmp_path):
+        """Without an encryption key nothing is written to disk."""
+        path = tmp_path / "cache.db"
+        cache = NoteExtractionCache(path=str(path))
+        cache.put("gu", GU_NOTE, {"CC": "Elevated PSA"})
+
+        assert not cache.persistent
+        assert not path.exists()
+
+    def test_persistent_size_limit(self, tmp_path):
+        """Persistent level evicts oldest entries beyond the byte limit."""
+        path = str(tmp_path / "cache.db")
+        cache = NoteExtractionCache(path=path, encryption_key=TEST_KEY, max_bytes=600)
+        for i in range(10):
+            cache.put("gu", f"note {i}", {"CC": f"complaint {i}"})
+
+        total = sqlite3.connect(path).execute(
+            "SELECT COALESCE(SUM(size), 0) FROM note_extractions"
+        ).fetchone()[0]
+        assert 0 < total <= 600
+
+
+@pytest.mark.unit
+class TestBuildCacheIntegration:
+    """Test that the Stage-1 build uses the cache transparently."""
+
+    def test_cached_build_matches_uncached(self, monkeypatch):
+        """Cached and uncached builds produce identical notes; unchanged notes hit."""
+        monkeypatch.setattr(note_builder, "synthesize_hpi", lambda gu_notes, non_gu_notes: "HPI")
+        monkeypatch.setattr(llm_helper, "synthesize_with_llm", lambda prompt, *args, **kwargs: "combined")
+
+        monkeypatch.setattr(note_builder, "get_extraction_cache", lambda: None)
+        uncached = build_urology_note_state(GU_NOTE)
+
+        cache = NoteExtractionCache()
+        monkeypatch.setattr(note_builder, "get_extraction_cache", lambda: cache)
+        cold_metadata, warm_metadata = {}, {}
+        cold = build_urology_note_state(GU_NOTE, cold_metadata)
+        warm = build_urology_note_state(GU_NOTE, warm_metadata)
+
+        assert uncached.final_note == cold.final_note == warm.final_note
+        assert uncached.note_extractions == cold.note_extractions == warm.note_extractions
+        assert cold_metadata["extraction_cache"]["misses"] == 1
+        assert warm_metadata["extraction_cache"]["hits"] == 1
+        assert warm_metadata["extraction_cache"]["misses"] == 0
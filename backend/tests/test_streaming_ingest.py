@@ -0,0 +1,126 @@
+"""
+Tests for streaming ingestion of large clinical inputs.
+
+Validates:
+- IncrementalNoteSplitter matches identify_notes() for any chunking
+- Markers and multi-byte characters split across chunks
+- The kept document text is exact and shares the notes' content strings
+- StreamingNoteIngestor output builds the same note as the full input
+- Input size limit
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.note_processing import llm_helper
+from app.services.note_processing.note_builder import build_urology_note, build_urology_note_state
+from app.services.note_processing.note_identifier import IncrementalNoteSplitter, identify_notes
+from app.services.note_processing.streaming_ingest import PayloadTooLargeError, StreamingNoteIngestor
+
+
+def make_document(note_count: int = 12, seed: int = 7) -> str:
+    """Synthetic CPRS-style export with mixed GU / non-GU notes."""
+    rng = random.Random(seed)
+    parts = ["Printed 03/01/2024 - header text without a note marker\n"]
+    for i in range(note_count):
+        title = rng.choice(["UROLOGY OUTPATIENT", "SLEEP MEDICINE", "PRIMARY CARE", "Urology Telephone"])
+        marker = "standard title:" if i % 4 == 0 else "STANDARD TITLE:"
+        parts.append(
+            f"{marker} {title} NOTE\n"
+            f"Date Signed: {i % 9 + 1:02d}/15/2024\n"
+            f"CC: Visit {i} – café résumé\n"
+            f"{'Body text. ' * rng.randint(1, 40)}\n"
+        )
+    return "".join(parts)
+
+
+def chunked(data, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.unit
+class TestIncrementalNoteSplitter:
+    """Test on-the-fly STANDARD TITLE detection."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 14, 15, 16, 97, 4096])
+    def test_matches_identify_notes(self, chunk_size):
+        """Any chunking yields exactly the notes identify_notes() finds."""
+        document = make_document()
+        expected = identify_notes(document)
+
+        splitter = IncrementalNoteSplitter()
+        notes = []
+        for chunk in chunked(document, chunk_size):
+            notes.extend(splitter.feed(chunk))
+        notes.extend(splitter.close())
+
+        assert [n for kind, n in notes if kind == "gu"] == expected["gu_notes"]
+        assert [n for kind, n in notes if kind == "non_gu"] == expected["non_gu_notes"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 15, 97, 4096])
+    def test_keep_text(self, chunk_size):
+        """document() reproduces the input without a second copy of the note bodies."""
+        document = make_document()
+        splitter = IncrementalNoteSplitter(keep_text=True)
+        notes = []
+        for chunk in chunked(document, chunk_size):
+            notes.extend(splitter.feed(chunk))
+        notes.extend(splitter.close())
+        pieces = splitter._text
+
+        assert splitter.document() == document
+        assert all(any(piece is note["content"] for piece in pieces) for _, note in notes)
+        assert splitter.document() == ""
+
+    def test_notes_emitted_before_end_of_input(self):
+        """A note is returned as soon as the next marker arrives."""
+        splitter = IncrementalNoteSplitter()
+
+        assert splitter.feed("STANDARD TITLE: UROLOGY NOTE\nCC: ED\n") == []
+        completed = splitter.feed("STANDARD TITLE: SLEEP MEDICINE NOTE\n")
+
+        assert [kind for kind, _ in completed] == ["gu"]
+        assert completed[0][1]["content"] == "STANDARD TITLE: UROLOGY NOTE\nCC: ED"
+
+    def test_preamble_is_dropped(self):
+        """Text before the first marker is not a note."""
+        splitter = IncrementalNoteSplitter()
+        splitter.feed("Patient header\nno marker here\n")
+
+        assert splitter.close() == []
+
+
+@pytest.mark.unit
+class TestStreamingNoteIngestor:
+    """Test chunked ingestion feeding the note builder."""
+
+    def test_byte_chunks_build_same_note(self, monkeypatch):
+        """Streaming bytes (split mid-character) builds the same note as the full text."""
+        # Multi-note sections combine through the LLM; keep the test offline
+        monkeypatch.setattr(llm_helper, "synthesize_with_llm", lambda prompt, *args, **kwargs: "combined")
+        document = make_document(note_count=3)
+        ingestor = StreamingNoteIngestor(executor=ThreadPoolExecutor(max_workers=2))
+
+        for chunk in chunked(document.encode("utf-8"), 5):
+            ingestor.feed(chunk)
+        clinical_document, notes_dict, note_extractions = ingestor.finish()
+
+        assert clinical_document == document
+        assert notes_dict == identify_notes(document)
+        assert len(note_extractions) == len({n["content"] for n in notes_dict["gu_notes"]}) + \
+            len({n["content"] for n in notes_dict["non_gu_notes"]})
+
+        state = build_urology_note_state(
+            clinical_document, notes_dict=notes_dict, note_extractions=note_extractions
+        )
+        assert state.final_note == build_urology_note(document)
+
+    def test_size_limit(self):
+        """Inputs beyond max_chars are rejected while streaming."""
+        ingestor = StreamingNoteIngestor(executor=ThreadPoolExecutor(max_workers=1), max_chars=10)
+        ingestor.feed("12345")
+
+        with pytest.raises(PayloadTooLargeError):
+            ingestor.feed("678901")
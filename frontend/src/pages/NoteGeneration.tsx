@@ -349,7 +349,9 @@ export const NoteGeneration: React.FC = () => {
         body: JSON.stringify({
           stage2_note: finalNote,
           transcription: ambientTranscription,
-          speaker_map: {} // TODO: Get from ambient listening component
+          speaker_map: {}, // TODO: Get from ambient listening component
+          // Continue this encounter's merge so only new sentences are parsed
+          merge_id: stage3Metadata?.merge_id
         })
       })
 